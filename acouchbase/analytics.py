@@ -27,6 +27,8 @@ from couchbase.logic.analytics import AnalyticsRequestLogic
 
 
 class AsyncAnalyticsRequest(AnalyticsRequestLogic):
+    _WAIT_FOR_RATE_LIMITER = False
+
     def __init__(self,
                  connection,
                  loop,
@@ -46,7 +46,8 @@ from couchbase.result import (AnalyticsResult,
                               DiagnosticsResult,
                               PingResult,
                               QueryResult,
-                              SearchResult)
+                              SearchResult,
+                              WarmUpResult)
 
 if TYPE_CHECKING:
     from acouchbase.search import SearchQuery
@@ -55,7 +56,8 @@ if TYPE_CHECKING:
                                    DiagnosticsOptions,
                                    QueryOptions,
                                    SearchOptions,
-                                   WaitUntilReadyOptions)
+                                   WaitUntilReadyOptions,
+                                   WarmUpOptions)
 
 
 class AsyncCluster(ClusterLogic):
@@ -357,6 +359,47 @@ class AsyncCluster(ClusterLogic):
 
             await asyncio.sleep(interval_millis / 1000)
 
+    async def warm_up(self,
+                      *opts,  # type: WarmUpOptions
+                      **kwargs  # type: Any
+                      ) -> WarmUpResult:
+        """Pre-establishes the connections to the cluster's nodes so the first requests after the cluster is
+        created do not pay for connecting, TLS and authentication.
+
+        The key-value connections of the provided buckets (opened if necessary) are verified.  For the HTTP
+        services, ``connections_per_node`` concurrent pings are sent to each node, the connections opened by the
+        pings are returned to the HTTP connection pool.
+
+        Args:
+            opts (:class:`~couchbase.options.WarmUpOptions`): Optional parameters for this operation.
+            **kwargs (Dict[str, Any]): keyword arguments that can be used as optional parameters
+                for this operation.
+
+        Returns:
+            :class:`~couchbase.result.WarmUpResult`: A report of the warmed up endpoints, including the connection
+            time per node.
+
+        Raises:
+            :class:`~couchbase.exceptions.InvalidArgumentException`: If ``connections_per_node`` is not a positive
+                integer or exceeds ``max_http_connections``.
+
+        """
+        service_types, connections_per_node, bucket_names, timeout = self._get_warm_up_args(*opts, **kwargs)
+        start = perf_counter()
+        await asyncio.gather(*[self.bucket(bucket_name).on_connect() for bucket_name in bucket_names])
+
+        ping_opts = {'timeout': timeout} if timeout is not None else {}
+        pings = []
+        if ServiceType.KeyValue.value in service_types:
+            pings.append(self.ping(PingOptions(service_types=[ServiceType.KeyValue.value], **ping_opts)))
+        http_service_types = [st for st in service_types if st != ServiceType.KeyValue.value]
+        if http_service_types:
+            # concurrent pings are needed to open more than a single connection per node
+            pings.extend(self.ping(PingOptions(service_types=http_service_types, **ping_opts))
+                         for _ in range(connections_per_node))
+        results = await asyncio.gather(*pings)
+        return WarmUpResult(results, timedelta(seconds=perf_counter() - start))
+
     def query(
         self,
         statement,  # type: str
@@ -433,7 +476,8 @@ class AsyncCluster(ClusterLogic):
         return QueryResult(AsyncN1QLRequest.generate_n1ql_request(self.connection,
                                                                   self.loop,
                                                                   query.params,
-                                                                  default_serializer=self.default_serializer))
+                                                                  default_serializer=self.default_serializer,
+                                                                  rate_limiter=self.rate_limiter))
 
     def analytics_query(
         self,  # type: Cluster
@@ -516,7 +560,8 @@ class AsyncCluster(ClusterLogic):
             self.connection,
             self.loop,
             query.params,
-            default_serializer=self.default_serializer))
+            default_serializer=self.default_serializer,
+            rate_limiter=self.rate_limiter))
 
     def search_query(
         self,
@@ -618,7 +663,8 @@ class AsyncCluster(ClusterLogic):
         return SearchResult(AsyncSearchRequest.generate_search_request(self.connection,
                                                                        self.loop,
                                                                        query.as_encodable(),
-                                                                       default_serializer=self.default_serializer))
+                                                                       default_serializer=self.default_serializer,
+                                                                       rate_limiter=self.rate_limiter))
 
     def buckets(self) -> BucketManager:
         """
@@ -15,11 +15,14 @@
 
 from __future__ import annotations
 
+import asyncio
+import time
 from typing import (TYPE_CHECKING,
                     Any,
                     Awaitable,
                     Dict,
                     Iterable,
+                    Optional,
                     Union)
 
 from acouchbase.binary_collection import BinaryCollection
@@ -30,6 +33,7 @@ from acouchbase.datastructures import (CouchbaseList,
 from acouchbase.logic import AsyncWrapper
 from acouchbase.management.queries import CollectionQueryIndexManager
 from couchbase.logic.collection import CollectionLogic
+from couchbase.logic.hedging import HedgedRead
 from couchbase.options import forward_args
 from couchbase.result import (CounterResult,
                               ExistsResult,
@@ -50,7 +54,9 @@ if TYPE_CHECKING:
                                    GetAndLockOptions,
                                    GetAndTouchOptions,
                                    GetAnyReplicaOptions,
+                                   GetHedgedOptions,
                                    GetOptions,
+                                   GetReplicaQuorumOptions,
                                    IncrementOptions,
                                    InsertOptions,
                                    LookupInOptions,
@@ -207,6 +213,73 @@ class AsyncCollection(CollectionLogic):
         """
         super().get_any_replica(key, **kwargs)
 
+    async def get_hedged(self,
+                         key,  # type: str
+                         *opts,  # type: GetHedgedOptions
+                         **kwargs,  # type: Dict[str, Any]
+                         ) -> GetReplicaResult:
+        """Retrieves the value of a document from the active, sending a replica read if the active has not
+        responded within the hedge delay.  The first successful response is returned.
+
+        Unlike :meth:`get_any_replica`, which always reads from the active and all replicas, a replica read is only
+        sent for the slowest reads (by default reads slower than the p95 get latency recorded by the cluster's
+        :class:`~couchbase.metrics.HistogramMeter`).  The hedge reads from a single replica, successive hedges rotate
+        over the bucket's replicas.  See :meth:`~acouchbase.cluster.Cluster.hedged_read_stats` for how often reads are
+        hedged.
+
+        .. note::
+            A replica might not have received the latest mutation of the document yet, check
+            :attr:`~couchbase.result.GetReplicaResult.is_replica` if that is a concern.
+
+        Args:
+            key (str): The key for the document to retrieve.
+            opts (:class:`~couchbase.options.GetHedgedOptions`): Optional parameters for this operation.
+            **kwargs (Dict[str, Any]): keyword arguments that can be used in place or to
+                override provided :class:`~couchbase.options.GetHedgedOptions`
+
+        Returns:
+            :class:`~couchbase.result.GetReplicaResult`: An instance of :class:`~couchbase.result.GetReplicaResult`.
+
+        Raises:
+            :class:`~couchbase.exceptions.DocumentNotFoundException`: If the key provided does not exist
+                on the server.
+            :class:`~couchbase.exceptions.UnAmbiguousTimeoutException`: If neither read responded within the
+                operation's timeout.
+
+        Examples:
+
+            Simple get_hedged operation::
+
+                bucket = cluster.bucket('travel-sample')
+                collection = bucket.scope('inventory').collection('airline')
+
+                res = await collection.get_hedged('airline_10')
+                print(f'Document is replica: {res.is_replica}')
+                print(f'Document value: {res.content_as[dict]}')
+
+        """
+        if not self._connection:
+            await self._scope._connect_bucket()
+            self._scope._set_connection()
+            self._set_connection()
+
+        final_args, hedge_delay, deadline = self._get_hedged_args(*opts, **kwargs)
+        ft = self.loop.create_future()
+
+        def set_done():
+            if not ft.done():
+                ft.set_result(None)
+
+        read = HedgedRead(lambda _: self.loop.call_soon_threadsafe(set_done))
+        self._send_hedged_read(key, read, **final_args)
+        done, _ = await asyncio.wait({ft}, timeout=hedge_delay)
+        if not done:
+            self._send_hedged_read(key, read, is_replica=True, **final_args)
+            done, _ = await asyncio.wait({ft}, timeout=max(deadline - time.monotonic(), 0))
+            if not done:
+                self._expire_hedged_read(read)
+        return self._hedged_read_result(read, final_args['transcoder'])
+
     def get_all_replicas(self,
                          key,  # type: str
                          *opts,  # type: GetAllReplicasOptions
@@ -272,6 +345,15 @@ class AsyncCollection(CollectionLogic):
                         print('Done streaming replicas.')
                         break
 
+            Stop after the two fastest responses::
+
+                from couchbase.options import GetAllReplicasOptions
+
+                # ... other code ...
+
+                result = await collection.get_all_replicas('airline_10', GetAllReplicasOptions(max_responses=2))
+                cas_values = set(res.cas for res in result)
+
         """
 
         final_args = forward_args(kwargs, *opts)
@@ -279,8 +361,27 @@ class AsyncCollection(CollectionLogic):
         if not transcoder:
             transcoder = self.default_transcoder
         final_args['transcoder'] = transcoder
+        max_responses = self._validate_replica_count('max_responses', final_args.pop('max_responses', None))
 
-        return self._get_all_replicas_internal(key, **final_args)
+        if max_responses is None:
+            return self._get_all_replicas_internal(key, **final_args)
+        return self._get_limited_replicas(key, max_responses, **final_args)
+
+    async def _get_limited_replicas(
+        self,
+        key,  # type: str
+        max_responses,  # type: int
+        **kwargs,  # type: Dict[str, Any]
+    ) -> Iterable[GetReplicaResult]:
+        """ **Internal Operation**
+
+        Internal use only.  Use :meth:`AsyncCollection.get_all_replicas` instead.
+        """
+        if max_responses == 1:
+            # completes with the fastest response rather than once all replicas responded
+            return iter([await self._get_any_replica_internal(key, **kwargs)])
+        # the read completes once max_responses copies responded
+        return await self._get_all_replicas_internal(key, max_responses=max_responses, **kwargs)
 
     @AsyncWrapper.inject_callbacks_and_decode(GetReplicaResult)
     def _get_all_replicas_internal(
@@ -295,6 +396,52 @@ class AsyncCollection(CollectionLogic):
         # return super().get_all_replicas(key, **kwargs)
         super().get_all_replicas(key, **kwargs)
 
+    async def get_replica_quorum(self,
+                                 key,  # type: str
+                                 *opts,  # type: GetReplicaQuorumOptions
+                                 **kwargs,  # type: Dict[str, Any]
+                                 ) -> GetReplicaResult:
+        """Retrieves the version of a document that a quorum of its copies (active and replicas) agree on, i.e.
+        return the same CAS for.
+
+        Args:
+            key (str): The key for the document to retrieve.
+            opts (:class:`~couchbase.options.GetReplicaQuorumOptions`): Optional parameters for this operation.
+            **kwargs (Dict[str, Any]): keyword arguments that can be used in place or to
+                override provided :class:`~couchbase.options.GetReplicaQuorumOptions`
+
+        Returns:
+            :class:`~couchbase.result.GetReplicaResult`: The active's response if it returned the agreed on
+            version, otherwise the response of one of the replicas that did.
+
+        Raises:
+            :class:`~couchbase.exceptions.DocumentNotFoundException`: If the key provided does not exist
+                on the server.
+            :class:`~couchbase.exceptions.DocumentUnretrievableException`: If no version of the document was
+                returned by a quorum of the copies.
+
+        Examples:
+
+            Simple get_replica_quorum operation::
+
+                bucket = cluster.bucket('travel-sample')
+                collection = bucket.scope('inventory').collection('airline')
+
+                res = await collection.get_replica_quorum('airline_10')
+                print(f'Document value: {res.content_as[dict]}')
+
+        """
+
+        final_args = forward_args(kwargs, *opts)
+        transcoder = final_args.get('transcoder', None)
+        if not transcoder:
+            transcoder = self.default_transcoder
+        final_args['transcoder'] = transcoder
+        # 0: a majority of the document's copies, as per the bucket's configuration
+        final_args['quorum'] = self._validate_replica_count('quorum', final_args.pop('quorum', None)) or 0
+
+        return self._select_replica_quorum(await self._get_all_replicas_internal(key, **final_args))
+
     @AsyncWrapper.inject_callbacks(ExistsResult)
     def exists(
         self,
@@ -1050,18 +1197,25 @@ class AsyncCollection(CollectionLogic):
         """
         return CouchbaseMap(key, self)
 
-    def couchbase_set(self, key  # type: str
+    def couchbase_set(self, key,  # type: str
+                      num_buckets=None  # type: Optional[int]
                       ) -> CouchbaseSet:
         """Returns a CouchbaseSet permitting simple map storage in a document.
 
         .. seealso::
             :class:`~acouchbase.datastructures.CouchbaseSet`
 
+        Args:
+            key (str): Document key to use for the set.
+            num_buckets (int, optional): **VOLATILE** This API is subject to change at any time.  Number of
+                arrays the set's values are hashed into, see :class:`~acouchbase.datastructures.CouchbaseSet`.
+                Defaults to None (the set is stored as a single array).
+
         Returns:
             :class:`~acouchbase.datastructures.CouchbaseSet`: A CouchbaseSet instance.
 
         """
-        return CouchbaseSet(key, self)
+        return CouchbaseSet(key, self, num_buckets=num_buckets)
 
     def couchbase_queue(self, key  # type: str
                         ) -> CouchbaseQueue:
@@ -18,20 +18,40 @@ import time
 from datetime import timedelta
 from typing import (TYPE_CHECKING,
                     Any,
+                    AsyncGenerator,
                     Dict,
                     Generator,
+                    Iterable,
                     List,
-                    Optional)
+                    Mapping,
+                    Optional,
+                    Tuple,
+                    Union)
 
 from acouchbase.logic.wrappers import AsyncWrapper
 from couchbase.exceptions import (CasMismatchException,
+                                  DocumentExistsException,
                                   DocumentNotFoundException,
                                   InvalidArgumentException,
                                   PathExistsException,
+                                  PathMismatchException,
                                   PathNotFoundException,
                                   QueueEmpty,
                                   UnAmbiguousTimeoutException)
-from couchbase.options import MutateInOptions
+from couchbase.logic.datastructures import (MAX_SUBDOC_SPECS,
+                                            MapBatchLogic,
+                                            bucket_path,
+                                            bucket_paths,
+                                            chunked,
+                                            jittered_backoff,
+                                            missing_values,
+                                            page_specs,
+                                            set_layout,
+                                            set_values,
+                                            unique_values,
+                                            validate_page_size)
+from couchbase.options import MutateInOptions, ReplaceOptions
+from couchbase.result import LookupInResult
 from couchbase.subdocument import (array_addunique,
                                    array_append,
                                    array_prepend,
@@ -45,6 +65,28 @@ from couchbase.subdocument import (remove,
 if TYPE_CHECKING:
     from acouchbase.collection import Collection
     from couchbase._utils import JSONType
+    from couchbase.subdocument import Spec
+
+
+async def _iter_array_pages(collection,  # type: Collection
+                            key,  # type: str
+                            page_size  # type: int
+                            ) -> AsyncGenerator[Any, None]:
+    """**INTERNAL**
+
+    Yields the elements of the array document ``key``, looking up ``page_size`` elements per request.
+    """
+    start = 0
+    while True:
+        try:
+            sd_res = await collection.lookup_in(key, page_specs(start, page_size))
+        except DocumentNotFoundException:
+            return
+        for idx in range(page_size):
+            if not sd_res.exists(idx):
+                return
+            yield sd_res.value[idx].get('value', None)
+        start += page_size
 
 
 class CouchbaseList:
@@ -104,6 +146,23 @@ class CouchbaseList:
         op = array_prepend('', value)
         await self._collection.mutate_in(self._key, (op,))
 
+    async def extend(self, values  # type: Iterable[JSONType]
+                     ) -> None:
+        """
+        Add items to the end of a list with a single sub-document mutation.
+
+        :param values: The values to append
+        """
+        values = list(values)
+        if values:
+            await self._append_values(values)
+
+    @AsyncWrapper.datastructure_op(create_type=list)
+    async def _append_values(self, values  # type: List[JSONType]
+                             ) -> None:
+        op = array_append('', *values)
+        await self._collection.mutate_in(self._key, (op,))
+
     async def set_at(self, index,  # type: int
                      value  # type: JSONType
                      ) -> None:
@@ -217,6 +276,23 @@ class CouchbaseList:
         except DocumentNotFoundException:
             pass
 
+    def iter_paged(self, page_size=MAX_SUBDOC_SPECS  # type: int
+                   ) -> AsyncGenerator[Any, None]:
+        """
+        **VOLATILE** This API is subject to change at any time.
+
+        Iterate over the list, looking up ``page_size`` items per request instead of fetching the entire document.
+        Items are yielded as soon as the first page is read and at most one page is held in memory.
+
+        Each page is read separately, so items added or removed during the iteration may be skipped or yielded twice.
+
+        :param page_size: The number of items looked up per request, at most 16.  Defaults to 16.
+        :return: An async generator of the list's items, use with ``async for``
+        :raise: :cb_exc:`InvalidArgumentException` if ``page_size`` is not an int between 1 and 16.
+        """
+        validate_page_size(page_size)
+        return _iter_array_pages(self._collection, self._key, page_size)
+
     def __aiter__(self):
         return self
 
@@ -236,6 +312,129 @@ class CouchbaseList:
             raise StopAsyncIteration
 
 
+class CouchbaseMapBatch(MapBatchLogic):
+    """
+    **VOLATILE** This API is subject to change at any time.
+
+    CouchbaseMapBatch records mutations of a :class:`CouchbaseMap` locally and writes them back with as few
+    sub-document mutations as possible (up to 16 keys per mutation) when flushed.  Reads return the recorded
+    mutations, falling back to the map.
+
+    Used as an async context manager, the batch is flushed when the block exits without an exception and the
+    recorded mutations are discarded otherwise::
+
+        async with collection.couchbase_map(key).batch() as session:
+            session.add('last_seen', now)
+            session.remove('cart')
+
+    Each mutation is CAS-checked against the document state it was planned with.  If the map is modified
+    concurrently, the document is read again and the mutation re-applied.  Keys set by the batch overwrite
+    concurrent changes to the same keys.
+
+    :param cb_map: The :class:`CouchbaseMap` to record mutations for
+    """
+
+    async def get(self, mapkey  # type: str
+                  ) -> Any:
+        """
+        Get a value from the recorded mutations if the key was modified in the batch, from the map otherwise.
+
+        :param mapkey: The key to fetch
+        :return: The value of the key
+        """
+        if mapkey in self._pending:
+            return self._pending[mapkey][1]
+        return await self._map.get(mapkey)
+
+    async def exists(self, mapkey  # type: str
+                     ) -> bool:
+        """
+        Check whether a key exists, from the recorded mutations if the key was modified in the batch.
+
+        :param mapkey: The key to check for
+        :return: True if the key exists in the map, False otherwise
+        """
+        if mapkey in self._pending:
+            return self._pending[mapkey][0]
+        return await self._map.exists(mapkey)
+
+    async def flush(self, timeout=None  # type: Optional[timedelta]
+                    ) -> None:
+        """
+        Write the recorded mutations back to the map.
+
+        :param timeout: Amount of time allowed when attempting to re-apply mutations after CAS conflicts.  Defaults
+            to 10 seconds.
+        :raise: :cb_exc:`UnAmbiguousTimeoutException` if the mutations could not be applied within the timeout due
+            to concurrent modifications.  Mutations that were not applied remain recorded.
+        """
+        if timeout is None:
+            timeout = timedelta(seconds=10)
+
+        deadline = time.monotonic() + timeout.total_seconds()
+        cas = None
+        for chunk in self._chunks():
+            cas = await self._flush_chunk(chunk, cas, deadline)
+            self._applied(chunk)
+
+    async def _flush_chunk(self, chunk,  # type: List[Tuple[str, Tuple[bool, Any]]]
+                           cas,  # type: Optional[int]
+                           deadline  # type: float
+                           ) -> Optional[int]:
+        """
+        Apply a chunk of mutations with a CAS-checked mutation, returns the document's CAS afterwards.
+        """
+        attempt = 0
+        while True:
+            sd_res = None
+            try:
+                if self._needs_lookup(chunk, cas):
+                    sd_res = await self._collection.lookup_in(self._key, self._lookup_specs(chunk))
+                    cas = sd_res.cas
+                ops = self._mutation_specs(chunk, sd_res)
+                if not ops:
+                    return cas
+                res = await self._collection.mutate_in(self._key, ops, MutateInOptions(cas=cas))
+                return res.cas
+            except DocumentNotFoundException:
+                if not await self._create_missing_map(chunk):
+                    return None
+                cas = None
+                continue
+            except CasMismatchException:
+                cas = None
+
+            time_left = deadline - time.monotonic()
+            if time_left <= 0:
+                raise UnAmbiguousTimeoutException(message="Unable to flush the CouchbaseMap batch.")
+            await asyncio.sleep(jittered_backoff(attempt, time_left))
+            attempt += 1
+
+    async def _create_missing_map(self, chunk  # type: List[Tuple[str, Tuple[bool, Any]]]
+                                  ) -> bool:
+        """
+        Create the map's document, which did not exist when the chunk was flushed, so the chunk can be re-applied.
+        Returns False if the chunk only removes keys, there is nothing to flush then.
+        """
+        if not self._has_upserts(chunk):
+            return False
+        try:
+            await self._collection.insert(self._key, {})
+        except DocumentExistsException:
+            # created concurrently
+            pass
+        return True
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            await self.flush()
+        else:
+            self.discard()
+
+
 class CouchbaseMap:
     def __init__(self, key,  # type: str
                  collection  # type: Collection
@@ -277,6 +476,23 @@ class CouchbaseMap:
         op = upsert(mapkey, value)
         await self._collection.mutate_in(self._key, (op,))
 
+    async def update(self, mapping  # type: Union[Mapping[str, JSONType], Iterable[Tuple[str, JSONType]]]
+                     ) -> None:
+        """
+        Set the keys of the provided mapping to their values in a map.  Up to 16 keys are set with a single
+        sub-document mutation, each mutation is applied atomically.
+
+        :param mapping: The keys and values to set
+        """
+        for chunk in chunked(dict(mapping).items(), MAX_SUBDOC_SPECS):
+            await self._upsert_values(chunk)
+
+    @AsyncWrapper.datastructure_op(create_type=dict)
+    async def _upsert_values(self, items  # type: List[Tuple[str, JSONType]]
+                             ) -> None:
+        ops = tuple(upsert(mapkey, value) for mapkey, value in items)
+        await self._collection.mutate_in(self._key, ops)
+
     @AsyncWrapper.datastructure_op(create_type=dict)
     async def get(self, mapkey,  # type: str
                   ) -> Any:
@@ -405,13 +621,45 @@ class CouchbaseMap:
         map_ = await self._get()
         return ((k, v) for k, v in map_.content_as[dict].items())
 
+    def batch(self) -> CouchbaseMapBatch:
+        """
+        **VOLATILE** This API is subject to change at any time.
+
+        Get a batch view of the map which records mutations locally and writes them back with as few sub-document
+        mutations as possible, see :class:`CouchbaseMapBatch`.
+
+        :return: A :class:`CouchbaseMapBatch` instance, use with ``async with``
+        """
+        return CouchbaseMapBatch(self)
+
 
 class CouchbaseSet:
+    """
+    CouchbaseSet provides a simplified interface for storing a set within a Couchbase document.
+
+    By default the set is stored as a single JSON array, so checking for or removing a value reads the entire
+    document.  With ``num_buckets`` the values are hashed into ``num_buckets`` arrays within the document and
+    :meth:`contains` and :meth:`remove` only read the array the value hashes to.  All clients of a set must use the
+    same ``num_buckets``.  A set stored as a single array is migrated to the bucketed layout on first use, see
+    :meth:`migrate`.
+
+    :param key: Document key to use for the set
+    :param collection: The :class:`~acouchbase.collection.Collection` where the set belongs
+    :param num_buckets: **VOLATILE** This API is subject to change at any time.  Number of arrays the set's values
+        are hashed into.  Defaults to None (the set is stored as a single array).
+    :raise: :cb_exc:`InvalidArgumentException` if ``num_buckets`` is not a positive int.
+    """
+
     def __init__(self, key,  # type: str
-                 collection  # type: Collection
+                 collection,  # type: Collection
+                 num_buckets=None  # type: Optional[int]
                  ) -> None:
+        if num_buckets is not None and (not isinstance(num_buckets, int) or isinstance(num_buckets, bool)
+                                        or num_buckets < 1):
+            raise InvalidArgumentException(message='num_buckets must be a positive int.')
         self._key = key
         self._collection = collection
+        self._num_buckets = num_buckets
 
     @AsyncWrapper.datastructure_op(create_type=list)
     async def _get(self) -> List:
@@ -420,6 +668,59 @@ class CouchbaseSet:
         """
         return await self._collection.get(self._key)
 
+    def _value_path(self, value  # type: Any
+                    ) -> str:
+        if self._num_buckets is None:
+            return ''
+        return bucket_path(value, self._num_buckets)
+
+    async def _mutate(self, ops  # type: Iterable[Spec]
+                      ) -> None:
+        if self._num_buckets is None:
+            await self._collection.mutate_in(self._key, ops)
+            return
+        try:
+            await self._collection.mutate_in(self._key, ops)
+        except DocumentNotFoundException:
+            try:
+                await self._collection.insert(self._key, {path: [] for path in bucket_paths(self._num_buckets)})
+            except DocumentExistsException:
+                pass
+            await self._collection.mutate_in(self._key, ops)
+        except (PathMismatchException, PathNotFoundException):
+            # the document is not in the bucketed layout yet
+            await self.migrate()
+            await self._collection.mutate_in(self._key, ops)
+
+    async def _lookup_buckets(self, specs  # type: Tuple[Spec, ...]
+                              ) -> Optional[LookupInResult]:
+        """
+        Look up paths of the bucket arrays, migrating the document to the bucketed layout first if a bucket array
+        is missing.  Returns None if the set does not exist.
+        """
+        try:
+            sd_res = await self._collection.lookup_in(self._key, specs)
+            if not all(sd_res.exists(idx) for idx in range(len(specs))):
+                await self.migrate()
+                sd_res = await self._collection.lookup_in(self._key, specs)
+        except DocumentNotFoundException:
+            return None
+        return sd_res
+
+    async def _get_bucket(self, value  # type: Any
+                          ) -> Tuple[List[Any], Optional[int], str]:
+        """
+        Get the values of the array ``value`` belongs to, the document's CAS and the array's path.
+        """
+        if self._num_buckets is None:
+            sd_res = await self._get()
+            return sd_res.content_as[list], sd_res.cas, ''
+        path = bucket_path(value, self._num_buckets)
+        sd_res = await self._lookup_buckets((subdoc_get(path),))
+        if sd_res is None:
+            return [], None, path
+        return sd_res.value[0].get('value', None) or [], sd_res.cas, path
+
     @AsyncWrapper.datastructure_op(create_type=list)
     async def add(self, value  # type: Any
                   ) -> None:
@@ -430,12 +731,68 @@ class CouchbaseSet:
         .. seealso:: :meth:`map_add`
         """
         try:
-            op = array_addunique('', value)
-            await self._collection.mutate_in(self._key, (op,))
+            op = array_addunique(self._value_path(value), value)
+            await self._mutate((op,))
             return True
         except PathExistsException:
             return False
 
+    async def add_all(self, values  # type: Iterable[Any]
+                      ) -> int:
+        """
+        Add the items that do not exist in a set yet.  Up to 16 items are added with a single sub-document
+        mutation.
+
+        :param values: The values to add, JSON primitives (str, int, float, bool or None)
+        :return: The number of values that were added
+        :raise: :cb_exc:`InvalidArgumentException` if a value is not a JSON primitive.
+        """
+        try:
+            values = unique_values(values)
+        except TypeError:
+            raise InvalidArgumentException(message='CouchbaseSet values must be JSON primitives.') from None
+        if not values:
+            return 0
+        # the mutation fails as a whole if any value exists, so only the values that are not members are sent
+        values = missing_values(values, await self._members(values))
+        added = 0
+        for chunk in chunked(values, MAX_SUBDOC_SPECS):
+            added += await self._add_unique_values(chunk)
+        return added
+
+    async def _members(self, values  # type: List[Any]
+                       ) -> List[Any]:
+        """
+        Get the members of the set ``values`` could collide with: every member, or the members of the bucket arrays
+        the values belong to for a bucketed set.
+        """
+        if self._num_buckets is None:
+            sd_res = await self._get()
+            return sd_res.content_as[list]
+        paths = sorted({bucket_path(value, self._num_buckets) for value in values})
+        members = []
+        for chunk in chunked(paths, MAX_SUBDOC_SPECS):
+            sd_res = await self._lookup_buckets(tuple(subdoc_get(path) for path in chunk))
+            if sd_res is None:
+                return []
+            for idx in range(len(chunk)):
+                members.extend(sd_res.value[idx].get('value', None) or [])
+        return members
+
+    @AsyncWrapper.datastructure_op(create_type=list)
+    async def _add_unique_values(self, values  # type: List[Any]
+                                 ) -> int:
+        try:
+            ops = tuple(array_addunique(self._value_path(value), value) for value in values)
+            await self._mutate(ops)
+            return len(values)
+        except PathExistsException:
+            # another client added one of the values since the members were read
+            added = 0
+            for value in values:
+                added += await self.add(value)
+            return added
+
     async def remove(self, value,  # type: Any  # noqa: C901
                      timeout=None  # type: Optional[timedelta]
                      ) -> None:
@@ -458,8 +815,7 @@ class CouchbaseSet:
         start = time.perf_counter()
         time_left = timeout_millis
         while True:
-            sd_res = await self._get()
-            list_ = sd_res.content_as[list]
+            list_, cas, path = await self._get_bucket(value)
             val_idx = -1
             for idx, v in enumerate(list_):
                 if v == value:
@@ -468,8 +824,8 @@ class CouchbaseSet:
 
             if val_idx >= 0:
                 try:
-                    op = remove(f'[{val_idx}]')
-                    await self._collection.mutate_in(self._key, (op,), MutateInOptions(cas=sd_res.cas))
+                    op = remove(f'{path}[{val_idx}]')
+                    await self._collection.mutate_in(self._key, (op,), MutateInOptions(cas=cas))
                     break
                 except CasMismatchException:
                     pass
@@ -501,11 +857,9 @@ class CouchbaseSet:
 
         .. seealso:: :meth:`set_add`, :meth:`map_add`
         """
-        sd_res = await self._get()
-        list_ = sd_res.content_as[list]
+        list_, _, _ = await self._get_bucket(value)
         return value in list_
 
-    @AsyncWrapper.datastructure_op(create_type=list)
     async def size(self) -> int:
         """
         Get the number of items in the set.
@@ -515,6 +869,18 @@ class CouchbaseSet:
 
         .. seealso:: :meth:`map_add`
         """
+        if self._num_buckets is None:
+            return await self._size()
+        size = 0
+        for paths in chunked(bucket_paths(self._num_buckets), MAX_SUBDOC_SPECS):
+            sd_res = await self._lookup_buckets(tuple(count(path) for path in paths))
+            if sd_res is None:
+                return 0
+            size += sum(sd_res.value[idx].get("value", None) for idx in range(len(paths)))
+        return size
+
+    @AsyncWrapper.datastructure_op(create_type=list)
+    async def _size(self) -> int:
         op = count('')
         sd_res = await self._collection.lookup_in(self._key, (op,))
         return sd_res.value[0].get("value", None)
@@ -530,7 +896,6 @@ class CouchbaseSet:
         except DocumentNotFoundException:
             pass
 
-    @AsyncWrapper.datastructure_op(create_type=list)
     async def values(self) -> List[Any]:
         """
         Returns a list of all the values which exist in the set.
@@ -538,9 +903,52 @@ class CouchbaseSet:
         :return: The keys in CouchbaseSet
         :raise: :cb_exc:`DocumentNotFoundException` if the map does not exist
         """
+        if self._num_buckets is None:
+            list_ = await self._get()
+            return list_.content_as[list]
+        try:
+            res = await self._collection.get(self._key)
+        except DocumentNotFoundException:
+            return []
+        return set_values(res.value)
 
-        list_ = await self._get()
-        return list_.content_as[list]
+    async def migrate(self, timeout=None  # type: Optional[timedelta]
+                      ) -> None:
+        """
+        **VOLATILE** This API is subject to change at any time.
+
+        Convert the set's document to the layout of this instance: one array per bucket if the set was created with
+        ``num_buckets``, a single array otherwise.  A set stored with a different number of buckets is rehashed.
+        Values are preserved and the document is replaced with a CAS check, so concurrent modifications are not lost.
+
+        :param timeout: Amount of time allowed when attempting to migrate the set.  Defaults to 10 seconds.
+        :raise: :cb_exc:`UnAmbiguousTimeoutException` if the set could not be migrated within the timeout due to
+            concurrent modifications.
+        """
+        if timeout is None:
+            timeout = timedelta(seconds=10)
+
+        deadline = time.monotonic() + timeout.total_seconds()
+        attempt = 0
+        while True:
+            try:
+                res = await self._collection.get(self._key)
+            except DocumentNotFoundException:
+                return
+            content = set_layout(res.value, self._num_buckets)
+            if content is None:
+                return
+            try:
+                await self._collection.replace(self._key, content, ReplaceOptions(cas=res.cas))
+                return
+            except CasMismatchException:
+                pass
+
+            time_left = deadline - time.monotonic()
+            if time_left <= 0:
+                raise UnAmbiguousTimeoutException(message="Unable to migrate the CouchbaseSet.")
+            await asyncio.sleep(jittered_backoff(attempt, time_left))
+            attempt += 1
 
 
 class CouchbaseQueue:
@@ -643,6 +1051,24 @@ class CouchbaseQueue:
         except DocumentNotFoundException:
             pass
 
+    def iter_paged(self, page_size=MAX_SUBDOC_SPECS  # type: int
+                   ) -> AsyncGenerator[Any, None]:
+        """
+        **VOLATILE** This API is subject to change at any time.
+
+        Iterate over the queue in the same order as iterating the queue with ``async for``, looking up
+        ``page_size`` items per request instead of fetching the entire document.  Items are yielded as soon as the
+        first page is read and at most one page is held in memory.
+
+        Each page is read separately, so items pushed or popped during the iteration may be skipped or yielded twice.
+
+        :param page_size: The number of items looked up per request, at most 16.  Defaults to 16.
+        :return: An async generator of the queue's items, use with ``async for``
+        :raise: :cb_exc:`InvalidArgumentException` if ``page_size`` is not an int between 1 and 16.
+        """
+        validate_page_size(page_size)
+        return _iter_array_pages(self._collection, self._key, page_size)
+
     def __iter__(self):
         raise TypeError('CouchbaseQueue is not iterable.  Try using `async for`.')
 
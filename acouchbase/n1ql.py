@@ -27,6 +27,8 @@ from couchbase.logic.n1ql import QueryRequestLogic
 
 
 class AsyncN1QLRequest(QueryRequestLogic):
+    _WAIT_FOR_RATE_LIMITER = False
+
     def __init__(self,
                  connection,
                  loop,
@@ -22,12 +22,15 @@ from acouchbase.analytics import AnalyticsQuery, AsyncAnalyticsRequest
 from acouchbase.collection import Collection
 from acouchbase.n1ql import AsyncN1QLRequest, N1QLQuery
 from acouchbase.search import AsyncSearchRequest, SearchQueryBuilder
+from couchbase.logic.hedging import HedgedReads
 from couchbase.options import (AnalyticsOptions,
                                QueryOptions,
                                SearchOptions)
+from couchbase.rate_limiter import ClientRateLimiter
 from couchbase.result import (AnalyticsResult,
                               QueryResult,
                               SearchResult)
+from couchbase.retry import RetryStrategy
 from couchbase.transcoder import Transcoder
 
 if TYPE_CHECKING:
@@ -69,6 +72,34 @@ class AsyncScope:
     def default_transcoder(self) -> Optional[Transcoder]:
         return self._bucket.default_transcoder
 
+    @property
+    def rate_limiter(self) -> Optional[ClientRateLimiter]:
+        """
+        **INTERNAL**
+        """
+        return self._bucket.rate_limiter
+
+    @property
+    def retry_strategy(self) -> Optional[RetryStrategy]:
+        """
+        **INTERNAL**
+        """
+        return self._bucket.retry_strategy
+
+    @property
+    def kv_timeout(self) -> float:
+        """
+        **INTERNAL**
+        """
+        return self._bucket.kv_timeout
+
+    @property
+    def hedged_reads(self) -> HedgedReads:
+        """
+        **INTERNAL**
+        """
+        return self._bucket.hedged_reads
+
     @property
     def name(self):
         """
@@ -195,7 +226,8 @@ class AsyncScope:
             statement, opt, **kwargs)
         return QueryResult(AsyncN1QLRequest.generate_n1ql_request(self.connection,
                                                                   self.loop,
-                                                                  query.params))
+                                                                  query.params,
+                                                                  rate_limiter=self.rate_limiter))
 
     def analytics_query(
         self,
@@ -285,7 +317,8 @@ class AsyncScope:
             statement, *options, **kwargs)
         return AnalyticsResult(AsyncAnalyticsRequest.generate_analytics_request(self.connection,
                                                                                 self.loop,
-                                                                                query.params))
+                                                                                query.params,
+                                                                                rate_limiter=self.rate_limiter))
 
     def search_query(
         self,
@@ -397,7 +430,8 @@ class AsyncScope:
         )
         return SearchResult(AsyncSearchRequest.generate_search_request(self.connection,
                                                                        self.loop,
-                                                                       query.as_encodable()))
+                                                                       query.as_encodable(),
+                                                                       rate_limiter=self.rate_limiter))
 
     @staticmethod
     def default_name():
@@ -27,6 +27,8 @@ from couchbase.logic.search import SearchRequestLogic
 
 
 class AsyncSearchRequest(SearchRequestLogic):
+    _WAIT_FOR_RATE_LIMITER = False
+
     def __init__(self,
                  connection,
                  loop,
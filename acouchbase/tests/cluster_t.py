@@ -30,8 +30,12 @@ from couchbase.exceptions import (InternalServerFailureException,
                                   InvalidArgumentException,
                                   ParsingFailedException,
                                   QueryIndexNotFoundException)
-from couchbase.options import DiagnosticsOptions, PingOptions
-from couchbase.result import DiagnosticsResult, PingResult
+from couchbase.options import (DiagnosticsOptions,
+                               PingOptions,
+                               WarmUpOptions)
+from couchbase.result import (DiagnosticsResult,
+                              PingResult,
+                              WarmUpResult)
 
 from ._test_utils import TestEnvironment
 
@@ -118,6 +122,24 @@ class ClusterDiagnosticsTests:
         with pytest.raises(InvalidArgumentException):
             await cluster.ping(PingOptions(service_types=ServiceType.KeyValue))
 
+    @pytest.mark.usefixtures("check_diagnostics_supported")
+    @pytest.mark.asyncio
+    async def test_warm_up(self, cb_env):
+        cluster = cb_env.cluster
+        result = await cluster.warm_up(WarmUpOptions(service_types=[ServiceType.KeyValue, ServiceType.Query],
+                                                     connections_per_node=2,
+                                                     bucket_names=[cb_env.bucket.name]))
+        assert isinstance(result, WarmUpResult)
+        assert result.errors == []
+        assert len(result.endpoints[ServiceType.KeyValue]) > 0
+        assert len(result.node_connect_times()) > 0
+
+    @pytest.mark.asyncio
+    async def test_warm_up_invalid_args(self, cb_env):
+        cluster = cb_env.cluster
+        with pytest.raises(InvalidArgumentException):
+            await cluster.warm_up(WarmUpOptions(connections_per_node=0))
+
     @pytest.mark.usefixtures("check_diagnostics_supported")
     @pytest.mark.asyncio
     async def test_ping_as_json(self, cb_env):
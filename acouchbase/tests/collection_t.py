@@ -31,7 +31,9 @@ from couchbase.exceptions import (CasMismatchException,
                                   InvalidArgumentException,
                                   PathNotFoundException,
                                   TemporaryFailException)
-from couchbase.options import (GetOptions,
+from couchbase.options import (GetAllReplicasOptions,
+                               GetHedgedOptions,
+                               GetOptions,
                                InsertOptions,
                                ReplaceOptions,
                                UpsertOptions)
@@ -597,6 +599,29 @@ class CollectionTests:
         with pytest.raises(DocumentUnretrievableException):
             await cb_env.collection.get_any_replica('not-a-key')
 
+    @pytest.mark.asyncio
+    async def test_get_hedged(self, cb_env, default_kvp):
+        result = await cb_env.collection.get_hedged(default_kvp.key,
+                                                    GetHedgedOptions(hedge_delay=timedelta(seconds=5)))
+        assert isinstance(result, GetReplicaResult)
+        assert result.is_replica is False
+        assert default_kvp.value == result.content_as[dict]
+
+    @pytest.mark.asyncio
+    async def test_get_hedged_fail(self, cb_env):
+        with pytest.raises(DocumentNotFoundException):
+            await cb_env.collection.get_hedged(self.NO_KEY, hedge_delay=timedelta(seconds=5))
+
+    @pytest.mark.usefixtures("check_replicas")
+    @pytest.mark.asyncio
+    async def test_get_hedged_replica(self, cb_env, default_kvp):
+        result = await cb_env.try_n_times(10, 3, cb_env.collection.get_hedged, default_kvp.key,
+                                          hedge_delay=timedelta(0))
+        assert isinstance(result.is_replica, bool)
+        assert default_kvp.value == result.content_as[dict]
+        stats = cb_env.cluster.hedged_read_stats()
+        assert stats['replica_wins'] <= stats['hedged'] <= stats['reads']
+
     @pytest.mark.usefixtures("check_multi_node")
     @pytest.mark.usefixtures("check_replicas")
     @pytest.mark.asyncio
@@ -638,6 +663,27 @@ class CollectionTests:
         assert active_cnt == 1
         assert replica_cnt >= active_cnt
 
+    @pytest.mark.usefixtures("check_multi_node")
+    @pytest.mark.usefixtures("check_replicas")
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize('max_responses', [1, 2])
+    async def test_get_all_replicas_max_responses(self, cb_env, default_kvp, max_responses):
+        result = await cb_env.try_n_times(10, 3, cb_env.collection.get_all_replicas, default_kvp.key,
+                                          GetAllReplicasOptions(max_responses=max_responses))
+        results = list(result)
+        assert 1 <= len(results) <= max_responses
+        for res in results:
+            assert isinstance(res, GetReplicaResult)
+            assert default_kvp.value == res.content_as[dict]
+
+    @pytest.mark.usefixtures("check_multi_node")
+    @pytest.mark.usefixtures("check_replicas")
+    @pytest.mark.asyncio
+    async def test_get_replica_quorum(self, cb_env, default_kvp):
+        result = await cb_env.try_n_times(10, 3, cb_env.collection.get_replica_quorum, default_kvp.key)
+        assert isinstance(result, GetReplicaResult)
+        assert default_kvp.value == result.content_as[dict]
+
     # @TODO(jc): - should an expiry of -1 raise an InvalidArgumentException?
     @pytest.mark.usefixtures("check_xattr_supported")
     @pytest.mark.asyncio
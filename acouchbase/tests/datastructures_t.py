@@ -19,6 +19,7 @@ import pytest_asyncio
 from acouchbase.cluster import get_event_loop
 from acouchbase.datastructures import (CouchbaseList,
                                        CouchbaseMap,
+                                       CouchbaseMapBatch,
                                        CouchbaseQueue,
                                        CouchbaseSet)
 from couchbase.exceptions import (DocumentNotFoundException,
@@ -61,6 +62,27 @@ class DatastructuresTests:
         except DocumentNotFoundException:
             pass
 
+    @pytest.mark.usefixtures("remove_ds")
+    @pytest.mark.asyncio
+    async def test_iter_paged(self, cb_env):
+        cb_list = cb_env.collection.couchbase_list(self.TEST_DS_KEY)
+        await cb_list.extend(range(40))
+
+        assert [v async for v in cb_list.iter_paged()] == list(range(40))
+        # the list is looked up in pages of 8, the last one partially filled
+        assert [v async for v in cb_list.iter_paged(page_size=8)] == list(range(40))
+        assert [v async for v in cb_list.iter_paged(page_size=3)] == list(range(40))
+        with pytest.raises(InvalidArgumentException):
+            cb_list.iter_paged(page_size=17)
+        await cb_list.clear()
+        assert [v async for v in cb_list.iter_paged()] == []
+
+        cb_queue = cb_env.collection.couchbase_queue(self.TEST_DS_KEY)
+        await cb_queue.push(1)
+        await cb_queue.push(2)
+        await cb_queue.push(3)
+        assert [v async for v in cb_queue.iter_paged(page_size=2)] == [3, 2, 1]
+
     @pytest.mark.usefixtures("remove_ds")
     @pytest.mark.asyncio
     async def test_list(self, cb_env):
@@ -108,6 +130,20 @@ class DatastructuresTests:
 
         assert 0 == await cb_list.size()
 
+    @pytest.mark.usefixtures("remove_ds")
+    @pytest.mark.asyncio
+    async def test_list_extend(self, cb_env):
+        cb_list = cb_env.collection.couchbase_list(self.TEST_DS_KEY)
+
+        await cb_list.extend(['hello', 'world'])
+        await cb_list.extend(str(i) for i in range(20))
+        await cb_list.extend([])
+        res = await cb_env.collection.get(self.TEST_DS_KEY)
+        assert ['hello', 'world'] + [str(i) for i in range(20)] == res.content_as[list]
+
+        await cb_list.clear()
+        assert 0 == await cb_list.size()
+
     @pytest.mark.usefixtures("remove_ds")
     @pytest.mark.asyncio
     async def test_map(self, cb_env):
@@ -154,6 +190,98 @@ class DatastructuresTests:
         await cb_map.clear()
         assert 0 == await cb_map.size()
 
+    @pytest.mark.usefixtures("remove_ds")
+    @pytest.mark.asyncio
+    async def test_map_batch(self, cb_env):
+        cb_map = cb_env.collection.couchbase_map(self.TEST_DS_KEY)
+        await cb_map.add('key0', 'val')
+
+        async with cb_map.batch() as batch:
+            assert isinstance(batch, CouchbaseMapBatch)
+            # more keys than fit in a single sub-document mutation
+            for i in range(1, 20):
+                batch.add(f'key{i}', i)
+            batch.remove('key0')
+            batch.remove('missing')
+            assert await batch.get('key1') == 1
+            assert await batch.exists('key0') is False
+            # nothing is written before the batch is flushed
+            assert 1 == await cb_map.size()
+        assert batch.pending == 0
+        res = await cb_env.collection.get(self.TEST_DS_KEY)
+        assert {f'key{i}': i for i in range(1, 20)} == res.content_as[dict]
+
+        with pytest.raises(ValueError):
+            async with cb_map.batch() as batch:
+                batch.add('key1', 'changed')
+                raise ValueError('discard the batch')
+        assert await cb_map.get('key1') == 1
+
+        await cb_map.clear()
+        assert 0 == await cb_map.size()
+
+    @pytest.mark.usefixtures("remove_ds")
+    @pytest.mark.asyncio
+    async def test_map_update(self, cb_env):
+        cb_map = cb_env.collection.couchbase_map(self.TEST_DS_KEY)
+
+        await cb_map.add('key0', 'val')
+        # more keys than fit in a single sub-document mutation
+        await cb_map.update({f'key{i}': i for i in range(20)})
+        await cb_map.update([('key20', 20)])
+        res = await cb_env.collection.get(self.TEST_DS_KEY)
+        assert {f'key{i}': i for i in range(21)} == res.content_as[dict]
+
+        await cb_map.clear()
+        assert 0 == await cb_map.size()
+
+    @pytest.mark.usefixtures("remove_ds")
+    @pytest.mark.asyncio
+    async def test_set_add_all(self, cb_env):
+        cb_set = cb_env.collection.couchbase_set(self.TEST_DS_KEY)
+
+        assert await cb_set.add_all([1, 2, 2, 3]) == 3
+        # 1 and 3 exist already, True is not the same value as 1
+        assert await cb_set.add_all([1, True, 'a'] + list(range(3, 25))) == 23
+        assert await cb_set.add_all([1, 2]) == 0
+        assert 25 == await cb_set.size()
+        with pytest.raises(InvalidArgumentException):
+            await cb_set.add_all([{'a': 1}])
+
+        await cb_set.clear()
+        assert 0 == await cb_set.size()
+
+    @pytest.mark.usefixtures("remove_ds")
+    @pytest.mark.asyncio
+    async def test_set_buckets(self, cb_env):
+        cb_set = cb_env.collection.couchbase_set(self.TEST_DS_KEY)
+        await cb_set.add_all(range(20))
+
+        # the single array is migrated on first use
+        bucketed = cb_env.collection.couchbase_set(self.TEST_DS_KEY, num_buckets=4)
+        assert await bucketed.contains(5) is True
+        res = await cb_env.collection.get(self.TEST_DS_KEY)
+        assert sorted(res.content_as[dict].keys()) == ['b0', 'b1', 'b2', 'b3']
+        assert 20 == await bucketed.size()
+
+        await bucketed.remove(5)
+        assert await bucketed.contains(5) is False
+        assert await bucketed.add(5) is True
+        assert await bucketed.add(5) is False
+        assert await bucketed.add_all([1, 20, 21]) == 2
+        assert sorted(await bucketed.values()) == list(range(22))
+
+        await cb_set.migrate()
+        res = await cb_env.collection.get(self.TEST_DS_KEY)
+        assert sorted(res.content_as[list]) == list(range(22))
+        assert 22 == await cb_set.size()
+
+        await bucketed.clear()
+        assert 0 == await bucketed.size()
+        assert await bucketed.contains(5) is False
+        with pytest.raises(InvalidArgumentException):
+            cb_env.collection.couchbase_set(self.TEST_DS_KEY, num_buckets=0)
+
     @pytest.mark.usefixtures("remove_ds")
     @pytest.mark.asyncio
     async def test_sets(self, cb_env):
@@ -32,6 +32,7 @@ from couchbase.management.options import (CreatePrimaryQueryIndexOptions,
                                           DropQueryIndexOptions,
                                           GetAllQueryIndexOptions,
                                           WatchQueryIndexOptions)
+from couchbase.management.queries import QueryIndexWatch
 
 from ._test_utils import TestEnvironment
 
@@ -389,6 +390,21 @@ class QueryIndexManagementTests:
         assert isinstance(results[1], InternalServerFailureException)
         assert isinstance(results[1].context, ManagementErrorContext)
 
+    @pytest.mark.flaky(reruns=5, reruns_delay=2)
+    @pytest.mark.usefixtures("check_query_index_mgmt_supported")
+    @pytest.mark.usefixtures("clear_all_indexes")
+    @pytest.mark.asyncio
+    async def test_build_and_watch(self, cb_env):
+        bucket_name = cb_env.bucket.name
+        ixm = cb_env.ixm
+        await ixm.create_primary_index(bucket_name, deferred=True)
+        await ixm.build_and_watch(bucket_name,
+                                  {f'ix{n}': [f'fld{n}'] for n in range(3)},
+                                  WatchQueryIndexOptions(timeout=timedelta(seconds=30), watch_primary=True))
+        ixs = await ixm.get_all_indexes(bucket_name)
+        assert sorted(i.name for i in ixs) == ['#primary', 'ix0', 'ix1', 'ix2']
+        assert all(i.state == 'online' for i in ixs)
+
 
 class QueryIndexCollectionManagementTests:
 
@@ -896,6 +912,43 @@ class QueryIndexCollectionManagementTests:
         assert len(all_ixs) == 4
         assert len(collection_ixs) == 2
 
+    @pytest.mark.flaky(reruns=5, reruns_delay=2)
+    @pytest.mark.usefixtures("check_query_index_mgmt_supported")
+    @pytest.mark.usefixtures("clear_all_indexes")
+    @pytest.mark.asyncio
+    async def test_watch_keyspaces(self, cb_env):
+        bucket_name = cb_env.bucket.name
+        ixm = cb_env.ixm
+        await ixm.create_index(bucket_name, 'ix0', ['fld0'], deferred=True)
+        await ixm.create_index(bucket_name,
+                               'ix1',
+                               ['fld1'],
+                               deferred=True,
+                               scope_name=self.TEST_SCOPE,
+                               collection_name=self.TEST_COLLECTION)
+        watches = [QueryIndexWatch(bucket_name, ['ix0'], '_default', '_default'),
+                   QueryIndexWatch(bucket_name, ['ix1'], self.TEST_SCOPE, self.TEST_COLLECTION)]
+        # the index of the named collection is not built, so should timeout
+        await ixm.build_deferred_indexes(bucket_name)
+        progress = []
+        with pytest.raises(WatchQueryIndexTimeoutException):
+            await ixm.watch_keyspaces(watches,
+                                      WatchQueryIndexOptions(timeout=timedelta(seconds=5),
+                                                             progress_callback=progress.append))
+        assert progress[-1].total == 2
+        assert progress[-1].pending[f'{bucket_name}.{self.TEST_SCOPE}.{self.TEST_COLLECTION}'] == ['ix1']
+
+        await ixm.build_deferred_indexes(bucket_name,
+                                         scope_name=self.TEST_SCOPE,
+                                         collection_name=self.TEST_COLLECTION)
+        await ixm.watch_keyspaces(watches, timeout=timedelta(seconds=30))
+        with pytest.raises(QueryIndexNotFoundException):
+            await ixm.watch_keyspaces([QueryIndexWatch(bucket_name,
+                                                       ['idontexist'],
+                                                       self.TEST_SCOPE,
+                                                       self.TEST_COLLECTION)],
+                                      timeout=timedelta(seconds=10))
+
 
 class CollectionQueryIndexManagerTests:
 
@@ -1193,3 +1246,22 @@ class CollectionQueryIndexManagerTests:
                                                                watch_primary=True))  # Should be OK again
         with pytest.raises(QueryIndexNotFoundException):
             await cb_env.cixm.watch_indexes(['idontexist'], WatchQueryIndexOptions(timeout=timedelta(seconds=10)))
+
+    @pytest.mark.flaky(reruns=5, reruns_delay=2)
+    @pytest.mark.usefixtures("check_query_index_mgmt_supported")
+    @pytest.mark.usefixtures("clear_all_indexes")
+    @pytest.mark.asyncio
+    async def test_build_and_watch(self, cb_env):
+        # an existing deferred index is built with the new ones
+        await cb_env.cixm.create_index('ix0', ['fld0'], deferred=True)
+        progress = []
+        await cb_env.cixm.build_and_watch({f'ix{n}': [f'fld{n}'] for n in range(3)},
+                                          WatchQueryIndexOptions(timeout=timedelta(seconds=30),
+                                                                 progress_callback=progress.append))
+        ixs = await cb_env.cixm.get_all_indexes()
+        assert sorted(i.name for i in ixs) == ['ix0', 'ix1', 'ix2']
+        assert all(i.state == 'online' for i in ixs)
+        assert progress[-1].online == progress[-1].total == 3
+        assert progress[-1].pending == {}
+        # the indexes exist and are online already
+        await cb_env.cixm.build_and_watch({'ix0': ['fld0']}, timeout=timedelta(seconds=30))
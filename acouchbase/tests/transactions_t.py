@@ -14,6 +14,7 @@
 #  limitations under the License.
 
 
+import asyncio
 import json
 from datetime import timedelta
 
@@ -24,6 +25,7 @@ from acouchbase.cluster import get_event_loop
 from couchbase.durability import DurabilityLevel, ServerDurability
 from couchbase.exceptions import (DocumentExistsException,
                                   DocumentNotFoundException,
+                                  InvalidArgumentException,
                                   ParsingFailedException,
                                   TransactionExpired,
                                   TransactionFailed,
@@ -32,7 +34,9 @@ from couchbase.n1ql import QueryProfile, QueryScanConsistency
 from couchbase.options import (TransactionConfig,
                                TransactionOptions,
                                TransactionQueryOptions)
-from couchbase.transactions import TransactionKeyspace, TransactionResult
+from couchbase.transactions import (TransactionKeyspace,
+                                    TransactionMetrics,
+                                    TransactionResult)
 from tests.environments import CollectionType
 from tests.environments.test_environment import AsyncTestEnvironment
 from tests.test_features import EnvironmentFeatures
@@ -42,17 +46,21 @@ class TransactionTestSuite:
     TEST_MANIFEST = [
         'test_adhoc',
         'test_bad_query',
+        'test_bulk_apply',
         'test_cleanup_client_attempts',
         'test_cleanup_lost_attempts',
         'test_cleanup_window',
         'test_client_context_id',
+        'test_concurrent_ops',
         'test_expiration_time',
         'test_get',
         'test_get_lambda_raises_doc_not_found',
         'test_get_inner_exc_doc_not_found',
+        'test_get_multi_not_found',
         'test_insert',
         'test_insert_lambda_raises_doc_exists',
         'test_insert_inner_exc_doc_exists',
+        'test_insert_replace_multi',
         'test_kv_timeout',
         'test_max_parallelism',
         'test_metadata_collection',
@@ -77,6 +85,7 @@ class TransactionTestSuite:
         'test_scan_consistency',
         'test_scope_qualifier',
         'test_transaction_config_durability',
+        'test_transaction_metrics',
         'test_transaction_result',
     ]
 
@@ -114,6 +123,29 @@ class TransactionTestSuite:
 
         await cb_env.cluster.transactions.run(txn_logic)
 
+    @pytest.mark.asyncio
+    async def test_bulk_apply(self, cb_env):
+        existing = dict(cb_env.get_new_doc() for _ in range(4))
+        for key, value in existing.items():
+            await cb_env.collection.upsert(key, value)
+        docs = {key: {'updated': key} for key in existing}
+        docs.update(cb_env.get_new_doc() for _ in range(6))
+
+        results = await cb_env.cluster.transactions.bulk_apply(cb_env.collection, docs, chunk_size=3, parallelism=2)
+        assert len(results) == 4
+        assert [key for res in results for key in res.keys] == list(docs)
+        for res in results:
+            assert res.success is True
+            assert res.error is None
+            assert res.attempts == 1
+            assert isinstance(res.result, TransactionResult)
+        for key, value in docs.items():
+            result = await cb_env.collection.get(key)
+            assert result.content_as[dict] == value
+
+        with pytest.raises(InvalidArgumentException):
+            await cb_env.cluster.transactions.bulk_apply(cb_env.collection, docs, chunk_size=0)
+
     @pytest.mark.parametrize('cleanup', [False, True])
     def test_cleanup_client_attempts(self, cleanup):
         cfg = TransactionConfig(cleanup_client_attempts=cleanup)
@@ -150,6 +182,33 @@ class TransactionTestSuite:
         assert cfg_expiry is not None
         assert cfg_expiry == exp.total_seconds() * 1000*1000*1000  # nanoseconds - and can't use 'is' here
 
+    @pytest.mark.asyncio
+    async def test_concurrent_ops(self, cb_env):
+        key, value = cb_env.get_new_doc()
+        unawaited_key, unawaited_value = cb_env.get_new_doc()
+        docs = dict(cb_env.get_new_doc() for _ in range(10))
+        for doc_key, doc_value in docs.items():
+            await cb_env.collection.upsert(doc_key, doc_value)
+
+        async def txn_logic(ctx):
+            # operations on the same document are staged in the order they were called
+            _, get_res = await asyncio.gather(ctx.insert(cb_env.collection, key, value),
+                                              ctx.get(cb_env.collection, key))
+            assert get_res.content_as[dict] == value
+            res = await asyncio.gather(*(ctx.get(cb_env.collection, doc_key) for doc_key in docs))
+            await asyncio.gather(*(ctx.replace(r, {'replaced': r.id}) for r in res))
+            # the transaction waits for operations that were not awaited
+            ctx.insert(cb_env.collection, unawaited_key, unawaited_value)
+
+        await cb_env.cluster.transactions.run(txn_logic)
+        result = await cb_env.collection.get(key)
+        assert result.content_as[dict] == value
+        result = await cb_env.collection.get(unawaited_key)
+        assert result.content_as[dict] == unawaited_value
+        for doc_key in docs:
+            result = await cb_env.collection.get(doc_key)
+            assert result.content_as[dict] == {'replaced': doc_key}
+
     @pytest.mark.asyncio
     async def test_get(self, cb_env):
         key, value = cb_env.get_existing_doc()
@@ -207,6 +266,19 @@ class TransactionTestSuite:
 
         assert num_attempts == 1
 
+    @pytest.mark.asyncio
+    async def test_get_multi_not_found(self, cb_env):
+        key, value = cb_env.get_existing_doc()
+        missing_key = cb_env.get_new_doc(key_only=True)
+
+        async def txn_logic(ctx):
+            with pytest.raises(DocumentNotFoundException):
+                await ctx.get_multi(cb_env.collection, [key, missing_key])
+            res = await ctx.get_multi(cb_env.collection, [key])
+            assert res[0].content_as[dict] == value
+
+        await cb_env.cluster.transactions.run(txn_logic)
+
     @pytest.mark.asyncio
     async def test_insert(self, cb_env):
         key, value = cb_env.get_new_doc()
@@ -218,6 +290,29 @@ class TransactionTestSuite:
         get_result = await cb_env.collection.get(key)
         assert get_result.content_as[dict] == value
 
+    @pytest.mark.asyncio
+    async def test_insert_replace_multi(self, cb_env):
+        docs = dict(cb_env.get_new_doc() for _ in range(5))
+        keys = list(docs.keys())
+
+        async def insert_logic(ctx):
+            res = await ctx.insert_multi(cb_env.collection, docs)
+            assert [r.id for r in res] == keys
+
+        await cb_env.cluster.transactions.run(insert_logic)
+
+        async def replace_logic(ctx):
+            res = await ctx.get_multi(cb_env.collection, keys)
+            assert [r.id for r in res] == keys
+            assert [r.content_as[dict] for r in res] == list(docs.values())
+            replaced = await ctx.replace_multi((r, {'replaced': r.id}) for r in res)
+            assert all(r.cas != replaced_r.cas for r, replaced_r in zip(res, replaced))
+
+        await cb_env.cluster.transactions.run(replace_logic)
+        for key in keys:
+            result = await cb_env.collection.get(key)
+            assert result.content_as[dict] == {'replaced': key}
+
     @pytest.mark.asyncio
     async def test_insert_lambda_raises_doc_exists(self, cb_env):
         key, value = cb_env.get_existing_doc()
@@ -609,6 +704,37 @@ class TransactionTestSuite:
         assert result.transaction_id is not None
         assert result.unstaging_complete is True
 
+    @pytest.mark.asyncio
+    async def test_transaction_metrics(self, cb_env):
+        key = cb_env.get_new_doc(key_only=True)
+        txns = cb_env.cluster.transactions
+        before = txns.stats()
+
+        async def txn_logic(ctx):
+            await ctx.insert(cb_env.collection, key, {'some': 'thing'})
+            doc = await ctx.get(cb_env.collection, key)
+            await ctx.replace(doc, {'some': 'thing else'})
+
+        result = await txns.run(txn_logic)
+        metrics = result.metrics
+        assert isinstance(metrics, TransactionMetrics)
+        assert metrics.attempts >= 1
+        assert len(metrics.staging_durations) == metrics.attempts
+        assert len(metrics.retry_reasons) == metrics.attempts - 1
+        assert metrics.duration >= metrics.commit_duration + metrics.staging_durations[-1]
+
+        async def failing_logic(ctx):
+            raise RuntimeError('failing the transaction')
+
+        with pytest.raises(TransactionFailed):
+            await txns.run(failing_logic)
+
+        stats = txns.stats()
+        assert stats['transactions'] == before['transactions'] + 2
+        assert stats['outcomes']['committed'] == before['outcomes'].get('committed', 0) + 1
+        assert stats['outcomes']['failed'] == before['outcomes'].get('failed', 0) + 1
+        assert stats['attempts'] >= before['attempts'] + 2
+
 
 class ClassicTransactionTests(TransactionTestSuite):
     @pytest.fixture(scope='class')
@@ -15,22 +15,33 @@
 
 import asyncio
 import logging
-from functools import wraps
+from functools import partial, wraps
 from typing import (TYPE_CHECKING,
                     Any,
                     Awaitable,
                     Callable,
                     Dict,
-                    Optional)
-
-from couchbase.exceptions import ErrorMapper
+                    Iterable,
+                    List,
+                    Mapping,
+                    Optional,
+                    Set,
+                    Tuple,
+                    Union)
+
+from couchbase.exceptions import (DocumentNotFoundException,
+                                  ErrorMapper,
+                                  TransactionException)
 from couchbase.exceptions import exception as BaseCouchbaseException
 from couchbase.logic.supportability import Supportability
 from couchbase.options import TransactionQueryOptions
-from couchbase.transactions import (TransactionGetResult,
+from couchbase.transactions import (TransactionChunkResult,
+                                    TransactionGetResult,
+                                    TransactionMetrics,
                                     TransactionQueryResults,
                                     TransactionResult)
 from couchbase.transactions.logic import AttemptContextLogic, TransactionsLogic
+from couchbase.transactions.logic.transaction_metrics import TransactionMetricsCollector
 
 if TYPE_CHECKING:
     from asyncio import AbstractEventLoop
@@ -104,19 +115,38 @@ class Transactions(TransactionsLogic):
                  ):
         super().__init__(cluster, config)
 
+    async def run(self,
+                  txn_logic,  # type:  Callable[[AttemptContextLogic], None]
+                  transaction_options=None,  # type: Optional[TransactionOptions]
+                  **kwargs) -> TransactionResult:
+        metrics = TransactionMetricsCollector()
+        try:
+            res = await self._run(txn_logic, metrics, transaction_options, **kwargs)
+        except Exception as ex:
+            self._stats.record(TransactionMetrics(**metrics.finish()), self._stats.outcome(ex))
+            raise
+        txn_metrics = TransactionMetrics(**metrics.finish())
+        self._stats.record(txn_metrics, self._stats.outcome())
+        res['metrics'] = txn_metrics
+        return res
+
     @AsyncWrapper.inject_callbacks(TransactionResult)
-    def run(self,
-            txn_logic,  # type:  Callable[[AttemptContextLogic], None]
-            transaction_options=None,  # type: Optional[TransactionOptions]
-            **kwargs) -> Awaitable[TransactionResult]:
+    def _run(self,
+             txn_logic,  # type:  Callable[[AttemptContextLogic], None]
+             metrics,  # type: TransactionMetricsCollector
+             transaction_options=None,  # type: Optional[TransactionOptions]
+             **kwargs) -> Awaitable[TransactionResult]:
         def wrapped_logic(c):
+            metrics.attempt_started()
             try:
-                ctx = AttemptContext(c, self._loop, self._serializer)
-                asyncio.run_coroutine_threadsafe(txn_logic(ctx), self._loop).result()
+                ctx = AttemptContext(c, self._loop, self._serializer, metrics)
+                asyncio.run_coroutine_threadsafe(ctx._run_logic(txn_logic), self._loop).result()
                 log.debug('wrapped logic completed')
             except Exception as e:
+                metrics.attempt_ended(e)
                 log.debug('wrapped_logic raised %s', e)
                 raise e
+            metrics.attempt_ended()
 
         opts = None
         if transaction_options:
@@ -127,6 +157,76 @@ class Transactions(TransactionsLogic):
 
         return super().run(wrapped_logic, opts, **kwargs)
 
+    async def bulk_apply(self,
+                         collection,  # type: AsyncCollection
+                         items,  # type: Union[Mapping[str, JSONType], Iterable[Tuple[str, JSONType]]]
+                         chunk_size=100,  # type: int
+                         parallelism=4,  # type: int
+                         retries=2,  # type: int
+                         transaction_options=None,  # type: Optional[TransactionOptions]
+                         ) -> List[TransactionChunkResult]:
+        """
+        **VOLATILE** This API is subject to change at any time.
+
+        Upserts documents in independent transactions of at most ``chunk_size`` documents each, so every chunk is
+        applied atomically while the size of a single transaction stays bounded.  Up to ``parallelism`` chunks run
+        concurrently, and a chunk whose transaction failed is run again up to ``retries`` times.  A failed chunk does
+        not stop the others, check the returned results.
+
+        Args:
+            collection (:class:`acouchbase.collection.AsyncCollection`): Collection to upsert the documents into.
+            items (Union[Mapping[str, :class:`couchbase._utils.JSONType`], Iterable[Tuple[str, :class:`couchbase._utils.JSONType`]]]):
+                Document keys and their contents.  Items are read lazily, in chunks.  If a key appears more than once
+                in a chunk, its last content is used.
+            chunk_size (int, optional): The maximum number of documents per transaction.  Defaults to 100.  Keep
+                chunks small enough to be applied well within the transaction's expiration time.
+            parallelism (int, optional): The maximum number of chunks run concurrently.  Defaults to 4.
+            retries (int, optional): The number of times a failed chunk is run again.  Defaults to 2.
+            transaction_options (:class:`~couchbase.options.TransactionOptions`, optional): Options to override those
+                in the :class:`couchbase.options.TransactionConfig` for each chunk's transaction.
+
+        Returns:
+            List[:class:`~couchbase.transactions.TransactionChunkResult`]: The outcome of each chunk, in the order of
+            ``items``.
+
+        Raises:
+            :class:`~couchbase.exceptions.InvalidArgumentException`: If ``chunk_size``, ``parallelism`` or
+                ``retries`` is invalid.
+        """  # noqa: E501
+        self._validate_bulk_apply(chunk_size, parallelism, retries)
+        chunks = enumerate(self._bulk_chunks(items, chunk_size))
+        results = {}
+
+        async def worker():
+            for idx, chunk in chunks:
+                results[idx] = await self._apply_chunk(collection, chunk, retries, transaction_options)
+
+        await asyncio.gather(*(worker() for _ in range(parallelism)))
+        return [results[idx] for idx in range(len(results))]
+
+    async def _apply_chunk(self,
+                           collection,  # type: AsyncCollection
+                           chunk,  # type: Dict[str, JSONType]
+                           retries,  # type: int
+                           transaction_options  # type: Optional[TransactionOptions]
+                           ) -> TransactionChunkResult:
+        """**INTERNAL**
+
+        Upserts the chunk's documents in a transaction, running it again if it failed.
+        """
+        error = None
+        for attempt in range(1, retries + 2):
+            try:
+                result = await self.run(lambda ctx: ctx._upsert_multi(collection, chunk), transaction_options)
+                return TransactionChunkResult(list(chunk), result=result, attempts=attempt)
+            except TransactionException as ex:
+                log.debug('bulk_apply chunk failed on attempt %s: %s', attempt, ex)
+                error = ex
+            except Exception as ex:
+                # not a transaction failure, running the chunk again will not help
+                return TransactionChunkResult(list(chunk), error=ex, attempts=attempt)
+        return TransactionChunkResult(list(chunk), error=error, attempts=retries + 1)
+
     # TODO: make async?
     def close(self):
         """
@@ -142,14 +242,34 @@ class Transactions(TransactionsLogic):
 
 
 class AttemptContext(AttemptContextLogic):
+    """
+    The operations of a transaction attempt.
+
+    Operations may run concurrently, e.g. with :func:`asyncio.gather`, with the following ordering guarantees:
+
+    * Operations on the same document key are dispatched in the order they were called, each once the previous one
+      completed.
+    * A query is dispatched once every operation called before it completed, and operations called after a query are
+      dispatched once the query completed.
+    * The transaction logic only completes once every operation it called completed, whether or not it was awaited.
+
+    Operations on different documents are staged concurrently.
+    """
+
     def __init__(self,
                  ctx,    # type: PyCapsuleType
                  loop,    # type: AbstractEventLoop
-                 serializer  # type: Serializer
+                 serializer,  # type: Serializer
+                 metrics=None  # type: Optional[TransactionMetricsCollector]
                  ):
-        super().__init__(ctx, loop, serializer)
+        super().__init__(ctx, loop, serializer, metrics)
+        # operations that have not completed yet
+        self._pending_ops = set()  # type: Set[asyncio.Future]
+        # the latest operation per document key
+        self._doc_ops = {}  # type: Dict[str, asyncio.Future]
+        # the latest query, which operations called after it wait for
+        self._barrier = None  # type: Optional[asyncio.Future]
 
-    @AsyncWrapper.inject_callbacks(TransactionGetResult)
     def get(self,
             coll,  # type: AsyncCollection
             key,   # type: JSONType
@@ -171,9 +291,8 @@ class AttemptContext(AttemptContextLogic):
             no need to handle the exception, as the transaction will rollback regardless.
 
         """
-        return super().get(coll, key, **kwargs)
+        return self._dispatch_ordered(key, self._get, coll, key, **kwargs)
 
-    @AsyncWrapper.inject_callbacks(TransactionGetResult)
     def insert(self,
                coll,    # type: AsyncCollection
                key,     # type: str
@@ -197,9 +316,8 @@ class AttemptContext(AttemptContextLogic):
                 no need to handle the exception, as the transaction will rollback regardless.
 
         """
-        return super().insert(coll, key, value, **kwargs)
+        return self._dispatch_ordered(key, self._insert, coll, key, value, **kwargs)
 
-    @AsyncWrapper.inject_callbacks(TransactionGetResult)
     def replace(self,
                 txn_get_result,  # type: TransactionGetResult
                 value,  # type: JSONType
@@ -221,9 +339,8 @@ class AttemptContext(AttemptContextLogic):
             :class:`couchbase.exceptions.TransactionOperationFailed`: If the operation failed.  In practice, there is
                 no need to handle the exception, as the transaction will rollback regardless.
         """
-        return super().replace(txn_get_result, value, **kwargs)
+        return self._dispatch_ordered(txn_get_result.id, self._replace, txn_get_result, value, **kwargs)
 
-    @AsyncWrapper.inject_callbacks(None)
     def remove(self,
                txn_get_result,
                **kwargs
@@ -240,9 +357,119 @@ class AttemptContext(AttemptContextLogic):
             :class:`couchbase.exceptions.TransactionOperationFailed`: If the operation failed.  In practice, there is
                 no need to handle the exception, as the transaction will rollback regardless.
         """
-        return super().remove(txn_get_result, **kwargs)
+        return self._dispatch_ordered(txn_get_result.id, self._remove, txn_get_result, **kwargs)
+
+    async def get_multi(self,
+                        coll,  # type: AsyncCollection
+                        keys,  # type: Iterable[str]
+                        **kwargs  # type: Dict[str, Any]
+                        ) -> List[TransactionGetResult]:
+        """
+        **VOLATILE** This API is subject to change at any time.
+
+        Get multiple documents within this transaction.  The gets are dispatched concurrently and awaited once.
+
+        Args:
+            coll (:class:`couchbase.collection.Collection`): Collection to use to find the documents.
+            keys (Iterable[str]): document keys.
+            **kwargs (Dict[str, Any]): currently unused.
+
+        Returns:
+            List[:class:`couchbase.transactions.TransactionGetResult`]: Documents in collection, in the order of
+            ``keys``, in a form useful for passing to other transaction operations.
+        Raises:
+            :class:`couchbase.exceptions.DocumentNotFoundException`: If a document was not found.
+            :class:`couchbase.exceptions.TransactionOperationFailed`: If an operation failed.  In practice, there is
+            no need to handle the exception, as the transaction will rollback regardless.  The first error is raised
+            once every operation completed.
+        """
+        return await self._gather([self.get(coll, key, **kwargs) for key in keys])
+
+    async def insert_multi(self,
+                           coll,  # type: AsyncCollection
+                           docs,  # type: Mapping[str, JSONType]
+                           **kwargs  # type: Dict[str, Any]
+                           ) -> List[TransactionGetResult]:
+        """
+        **VOLATILE** This API is subject to change at any time.
+
+        Insert multiple new documents within a transaction.  The inserts are dispatched concurrently and awaited once.
+
+        Args:
+            coll (:class:`couchbase.collection.Collection`): Collection to insert the documents into.
+            docs (Mapping[str, :class:`couchbase._utils.JSONType`]): document keys and their contents.
+            **kwargs (Dict[str, Any]): currently unused.
+
+        Returns:
+            List[:class:`couchbase.transactions.TransactionGetResult`]: Documents in collection, in the order of
+            ``docs``, in a form useful for passing to other transaction operations.
+        Raises:
+            :class:`couchbase.exceptions.TransactionOperationFailed`: If an operation failed.  In practice, there is
+            no need to handle the exception, as the transaction will rollback regardless.  The first error is raised
+            once every operation completed.
+        """
+        return await self._gather([self.insert(coll, key, value, **kwargs) for key, value in docs.items()])
+
+    async def replace_multi(self,
+                            docs,  # type: Iterable[Tuple[TransactionGetResult, JSONType]]
+                            **kwargs  # type: Dict[str, Any]
+                            ) -> List[TransactionGetResult]:
+        """
+        **VOLATILE** This API is subject to change at any time.
+
+        Replace the contents of multiple documents within a transaction.  The replaces are dispatched concurrently and
+        awaited once.
+
+        Args:
+            docs (Iterable[Tuple[:class:`couchbase.transactions.TransactionGetResult`, :class:`couchbase._utils.JSONType`]]):
+                Documents to replace, gotten from previous calls to other transaction operations, and their new
+                contents.
+            **kwargs (Dict[str, Any]): currently unused.
+
+        Returns:
+            List[:class:`couchbase.transactions.TransactionGetResult`]: Documents in collection, in the order of
+            ``docs``, in a form useful for passing to other transaction operations.
+        Raises:
+            :class:`couchbase.exceptions.TransactionOperationFailed`: If an operation failed.  In practice, there is
+            no need to handle the exception, as the transaction will rollback regardless.  The first error is raised
+            once every operation completed.
+        """  # noqa: E501
+        return await self._gather([self.replace(txn_get_result, value, **kwargs) for txn_get_result, value in docs])
+
+    async def _upsert_multi(self,
+                            coll,  # type: AsyncCollection
+                            docs  # type: Mapping[str, JSONType]
+                            ) -> None:
+        """**INTERNAL**
+
+        Replaces the documents that exist and inserts the others, dispatching the gets, then the mutations,
+        concurrently.
+        """
+        keys = list(docs)
+        found = await asyncio.gather(*(self.get(coll, key) for key in keys), return_exceptions=True)
+        ftrs = []
+        for key, res in zip(keys, found):
+            if isinstance(res, DocumentNotFoundException):
+                ftrs.append(self.insert(coll, key, docs[key]))
+            elif isinstance(res, BaseException):
+                raise res
+            else:
+                ftrs.append(self.replace(res, docs[key]))
+        await self._gather(ftrs)
+
+    async def _gather(self,
+                      ftrs  # type: List[Awaitable[Any]]
+                      ) -> List[Any]:
+        """**INTERNAL**
+
+        Awaits all of the transaction operations, then raises the first error if any operation failed.
+        """
+        results = await asyncio.gather(*ftrs, return_exceptions=True)
+        for res in results:
+            if isinstance(res, BaseException):
+                raise res
+        return results
 
-    @AsyncWrapper.inject_callbacks(TransactionQueryResults)
     def query(self,
               query,
               options=TransactionQueryOptions(),
@@ -264,4 +491,89 @@ class AttemptContext(AttemptContextLogic):
                 necessarily be rolled back, a CouchbaseException other than TransactionOperationFailed will be raised.
                 If handled, the transaction will not rollback.
         """
+        return self._dispatch_ordered(None, self._query, query, options, **kwargs)
+
+    @AsyncWrapper.inject_callbacks(TransactionGetResult)
+    def _get(self, coll, key, **kwargs):
+        return super().get(coll, key, **kwargs)
+
+    @AsyncWrapper.inject_callbacks(TransactionGetResult)
+    def _insert(self, coll, key, value, **kwargs):
+        return super().insert(coll, key, value, **kwargs)
+
+    @AsyncWrapper.inject_callbacks(TransactionGetResult)
+    def _replace(self, txn_get_result, value, **kwargs):
+        return super().replace(txn_get_result, value, **kwargs)
+
+    @AsyncWrapper.inject_callbacks(None)
+    def _remove(self, txn_get_result, **kwargs):
+        return super().remove(txn_get_result, **kwargs)
+
+    @AsyncWrapper.inject_callbacks(TransactionQueryResults)
+    def _query(self, query, options, **kwargs):
         return super().query(query, options, **kwargs)
+
+    def _dispatch_ordered(self,
+                          doc_key,  # type: Optional[str]
+                          dispatch,  # type: Callable[..., asyncio.Future]
+                          *args,  # type: Any
+                          **kwargs  # type: Dict[str, Any]
+                          ) -> asyncio.Future:
+        """**INTERNAL**
+
+        Dispatches an operation once the operations it is ordered after completed, see :class:`AttemptContext`.  A
+        ``doc_key`` of None orders the operation after all pending operations (a query).
+        """
+        deps = []
+        if self._barrier is not None and not self._barrier.done():
+            deps.append(self._barrier)
+        if doc_key is None:
+            deps.extend(self._pending_ops)
+        elif doc_key in self._doc_ops:
+            deps.append(self._doc_ops[doc_key])
+
+        if deps:
+            ftr = asyncio.ensure_future(self._dispatch_after(deps, dispatch, *args, **kwargs), loop=self._loop)
+        else:
+            ftr = dispatch(*args, **kwargs)
+
+        self._pending_ops.add(ftr)
+        if doc_key is None:
+            self._barrier = ftr
+        else:
+            self._doc_ops[doc_key] = ftr
+        ftr.add_done_callback(partial(self._on_op_done, doc_key))
+        return ftr
+
+    async def _dispatch_after(self,
+                              deps,  # type: List[asyncio.Future]
+                              dispatch,  # type: Callable[..., asyncio.Future]
+                              *args,  # type: Any
+                              **kwargs  # type: Dict[str, Any]
+                              ) -> Any:
+        # a failed operation fails the attempt, the core rejects the operations that follow it
+        await asyncio.wait(deps)
+        return await dispatch(*args, **kwargs)
+
+    def _on_op_done(self,
+                    doc_key,  # type: Optional[str]
+                    ftr  # type: asyncio.Future
+                    ) -> None:
+        self._pending_ops.discard(ftr)
+        if doc_key is not None and self._doc_ops.get(doc_key) is ftr:
+            del self._doc_ops[doc_key]
+        if not ftr.cancelled() and ftr.exception() is not None:
+            self._record_op_error(doc_key, ftr.exception())
+
+    async def _run_logic(self,
+                         txn_logic  # type: Callable[[AttemptContext], Awaitable[None]]
+                         ) -> None:
+        """**INTERNAL**
+
+        Runs the transaction logic, then waits for the operations it did not await.
+        """
+        try:
+            await txn_logic(self)
+        finally:
+            while self._pending_ops:
+                await asyncio.wait(list(self._pending_ops))
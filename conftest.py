@@ -100,8 +100,12 @@ _SLOW_MGMT_TESTS = [
 
 _MISC_TESTS = [
     "acouchbase/tests/rate_limit_t.py::RateLimitTests",
-    "couchbase/tests/connection_t.py::ConnectionTests"
+    "couchbase/tests/client_rate_limiter_t.py::ClassicClientRateLimiterTests",
+    "couchbase/tests/connection_t.py::ConnectionTests",
+    "couchbase/tests/import_t.py::ClassicImportTimeTests",
+    "couchbase/tests/logging_t.py::ClassicLoggingTests",
     "couchbase/tests/rate_limit_t.py::RateLimitTests",
+    "couchbase/tests/retry_strategy_t.py::ClassicRetryStrategyTests",
 ]
 
 _TXNS_TESTS = [
@@ -84,6 +84,10 @@ import atexit  # nopep8 # isort:skip # noqa: E402
 def _pycbc_teardown(**kwargs):
     """**INTERNAL**"""
     global _PYCBC_LOGGER
+    global _PYCBC_LOG_DRAINER
+    if _PYCBC_LOG_DRAINER:
+        _PYCBC_LOG_DRAINER.stop()
+        _PYCBC_LOG_DRAINER = None
     if _PYCBC_LOGGER:
         # TODO:  see about synchronizing the logger's shutdown here
         _PYCBC_LOGGER = None
@@ -135,6 +139,44 @@ def get_transactions_protocol() -> Optional[Tuple[Optional[float], Optional[List
 Logging methods
 
 """
+import threading  # nopep8 # isort:skip # noqa: E402
+
+
+class _PycbcLogDrainer(threading.Thread):
+    """**INTERNAL**
+
+    Delivers messages buffered by the C++ client's asynchronous logging sink to the Python logger.  The
+    IO threads only copy messages into a bounded ring buffer, this thread converts them to
+    :class:`logging.LogRecord` instances in batches.
+    """
+
+    def __init__(self, pycbc_logger, poll_interval_ms=100, max_batch=512):
+        super().__init__(name='pycbc-log-drainer', daemon=True)
+        self._pycbc_logger = pycbc_logger
+        self._poll_interval_ms = poll_interval_ms
+        self._max_batch = max_batch
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.is_set():
+            try:
+                self._pycbc_logger.drain_logging_sink(timeout_ms=self._poll_interval_ms,
+                                                      max_batch=self._max_batch)
+            except Exception:  # nosec
+                # never let a misbehaving handler kill the drain thread
+                pass
+
+    def stop(self, timeout=1.0):
+        self._stop_event.set()
+        if self.is_alive():
+            self.join(timeout)
+        # deliver whatever is left, w/o waiting for new messages
+        while self._pycbc_logger.drain_logging_sink(timeout_ms=0, max_batch=self._max_batch) > 0:
+            pass
+
+
+_PYCBC_LOG_DRAINER = None
+_PYCBC_PY_LOGGER = None
 
 
 def configure_console_logger():
@@ -145,12 +187,47 @@ def configure_console_logger():
         logging.getLogger().debug(get_metadata(as_str=True))
 
 
-def configure_logging(name, level=logging.INFO, parent_logger=None):
+def configure_logging(name, level=logging.INFO, parent_logger=None, async_sink=False, queue_size=8192):
+    """Configure the SDK's C++ logging to be handled by Python's logging module.
+
+    The SDK's logging can only be configured once per process.
+
+    Args:
+        name (str): Name of the logger to use.
+        level (int, optional): Minimum log level to capture. Defaults to logging.INFO.
+        parent_logger (:class:`logging.Logger`, optional): Parent logger.  If provided, the SDK logger will be
+            created as a child of the parent logger.
+        async_sink (bool, optional): Set to True to deliver log messages asynchronously.  The SDK's IO threads
+            only buffer messages (they do not acquire the GIL), a background Python thread delivers them to the
+            logger in batches.  Recommended when using debug or trace level logging.  Defaults to False.
+        queue_size (int, optional): Maximum number of buffered messages when `async_sink` is True.  If the buffer
+            is full, new messages are dropped (see :func:`get_logging_stats`).  Defaults to 8192.
+    """
+    global _PYCBC_LOG_DRAINER
+    global _PYCBC_PY_LOGGER
     if parent_logger:
         name = f'{parent_logger.name}.{name}'
     logger = logging.getLogger(name)
-    _PYCBC_LOGGER.configure_logging_sink(logger, level)
+    if async_sink is True:
+        _PYCBC_LOGGER.configure_logging_sink(logger, level, async_sink=1, queue_size=queue_size)
+        if _PYCBC_LOG_DRAINER is None:
+            _PYCBC_LOG_DRAINER = _PycbcLogDrainer(_PYCBC_LOGGER)
+            _PYCBC_LOG_DRAINER.start()
+    else:
+        _PYCBC_LOGGER.configure_logging_sink(logger, level)
+    _PYCBC_PY_LOGGER = logger
     logger.debug(get_metadata(as_str=True))
 
 
+def get_logging_stats():
+    """Get the counters of the asynchronous logging sink.
+
+    Returns:
+        Dict[str, int]: The sink's `capacity`, the number of currently `queued` messages, the number of `delivered`
+        messages and the number of `dropped` messages (messages logged while the buffer was full).  Empty if the
+        asynchronous logging sink is not in use.
+    """
+    return _PYCBC_LOGGER.logging_sink_stats()
+
+
 configure_console_logger()
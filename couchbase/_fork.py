@@ -0,0 +1,74 @@
+#  Copyright 2016-2022. Couchbase, Inc.
+#  All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License")
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""
+**INTERNAL**
+
+Fork detection for the blocking API.
+
+The C++ client's IO threads do not survive a ``fork()``.  A connection inherited from the parent process can
+neither be used nor closed in the child (closing it waits on IO threads that no longer exist), so after a fork
+the child abandons every native object inherited from the parent and the owning objects re-bootstrap lazily the
+next time they are used.  Objects compare their generation against ``_GENERATION`` to detect a fork.
+"""
+
+import os
+import weakref
+from typing import Any, List
+
+_GENERATION = 0
+
+# Native objects inherited from the parent process.  These are intentionally never released in the child as
+# deallocating them would try to shut down IO threads that only exist in the parent.
+_ABANDONED = []  # type: List[Any]
+
+_LISTENERS = weakref.WeakSet()
+
+
+def generation() -> int:
+    """
+    **INTERNAL**
+    """
+    return _GENERATION
+
+
+def register(obj  # type: Any
+             ) -> None:
+    """
+    **INTERNAL**
+
+    Registers an object whose ``_abandon_after_fork()`` method is called in the child process after a fork.
+    """
+    _LISTENERS.add(obj)
+
+
+def abandon(native_obj  # type: Any
+            ) -> None:
+    """
+    **INTERNAL**
+    """
+    if native_obj is not None:
+        _ABANDONED.append(native_obj)
+
+
+def _after_fork_in_child() -> None:
+    global _GENERATION
+    _GENERATION += 1
+    for obj in list(_LISTENERS):
+        obj._abandon_after_fork()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
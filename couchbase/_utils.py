@@ -13,6 +13,8 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 
+import importlib
+import os
 from datetime import timedelta
 from enum import Enum
 from time import time
@@ -108,6 +110,36 @@ def validate_int(value  # type: int
     return value
 
 
+def available_cpu_count() -> int:
+    """
+    **INTERNAL**
+
+    The number of CPUs the process is allowed to run on, falls back to the total number of CPUs on platforms
+    that do not support CPU affinity.
+    """
+    if hasattr(os, 'sched_getaffinity'):
+        return max(1, len(os.sched_getaffinity(0)))
+    return os.cpu_count() or 1
+
+
+# upper bound of num_io_threads='auto', which also leaves one of the available CPUs to the Python interpreter
+MAX_AUTO_IO_THREADS = 8
+
+
+def validate_io_threads(value  # type: Union[int, str]
+                        ) -> int:
+    if isinstance(value, str):
+        if value.lower() == 'auto':
+            return max(1, min(available_cpu_count() - 1, MAX_AUTO_IO_THREADS))
+        if value.isdigit():
+            value = int(value)
+    if not isinstance(value, int) or isinstance(value, bool):
+        raise InvalidArgumentException(message='Expected value to be of type int or "auto".')
+    if value < 1:
+        raise InvalidArgumentException(message='Expected value to be greater than 0.')
+    return value
+
+
 def validate_bool(value  # type: bool
                   ) -> int:
     if not isinstance(value, bool):
@@ -122,6 +154,27 @@ def validate_str(value  # type: str
     return value
 
 
+def lazy_module_getattr(module_globals,  # type: Dict[str, Any]
+                        lazy_attrs  # type: Dict[str, str]
+                        ) -> Callable[[str], Any]:
+    """
+    **INTERNAL**
+
+    Returns a module level ``__getattr__`` (PEP 562) that imports the attributes of ``lazy_attrs`` (attribute name
+    -> module name) on first access.  Keeps importing a module cheap while names it used to import eagerly remain
+    importable from it.
+    """
+    def __getattr__(name  # type: str
+                    ) -> Any:
+        module_name = lazy_attrs.get(name, None)
+        if module_name is None:
+            raise AttributeError(f"module {module_globals['__name__']!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(module_name), name)
+        module_globals[name] = value
+        return value
+    return __getattr__
+
+
 class Identity:
     def __init__(self, type_  # type: Callable
                  ):
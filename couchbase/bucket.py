@@ -13,24 +13,27 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 
+from __future__ import annotations
+
 from typing import (TYPE_CHECKING,
                     Any,
                     Dict)
 
+from couchbase import _fork
+from couchbase._utils import lazy_module_getattr
 from couchbase.collection import Collection
 from couchbase.exceptions import ErrorMapper
 from couchbase.exceptions import exception as BaseCouchbaseException
 from couchbase.logic import BlockingWrapper
 from couchbase.logic.bucket import BucketLogic
 from couchbase.logic.supportability import Supportability
-from couchbase.management.collections import CollectionManager
-from couchbase.management.views import ViewIndexManager
 from couchbase.result import PingResult, ViewResult
 from couchbase.scope import Scope
-from couchbase.views import ViewQuery, ViewRequest
 
 if TYPE_CHECKING:
     from couchbase.cluster import Cluster
+    from couchbase.management.collections import CollectionManager
+    from couchbase.management.views import ViewIndexManager
     from couchbase.options import PingOptions, ViewOptions
 
 
@@ -53,18 +56,59 @@ class Bucket(BucketLogic):
                  cluster,  # type: Cluster
                  bucket_name  # type: str
                  ):
+        self._fork_generation = _fork.generation()
         super().__init__(cluster, bucket_name)
         self._open_bucket()
 
+    @property
+    def _connection(self):
+        if self._fork_generation != _fork._GENERATION:
+            self._reopen_after_fork()
+        return self._conn
+
+    @_connection.setter
+    def _connection(self, conn):
+        self._conn = conn
+
+    @_connection.deleter
+    def _connection(self):
+        del self._conn
+
+    def _reopen_after_fork(self) -> None:
+        prev_generation = self._fork_generation
+        self._fork_generation = _fork._GENERATION
+        if not self._connected or '_conn' not in self.__dict__:
+            # never opened or already closed
+            return
+        try:
+            # the cluster lazily re-bootstraps its connection, the bucket then needs to be opened on it
+            self._conn = self._cluster.connection
+            self._open_bucket()
+        except Exception:
+            self._fork_generation = prev_generation
+            raise
+
     @BlockingWrapper.block(True)
     def _open_bucket(self, **kwargs):
         ret = super()._open_or_close_bucket(open_bucket=True, **kwargs)
         if isinstance(ret, BaseCouchbaseException):
             raise ErrorMapper.build_exception(ret)
+        kv_connections = self._cluster.kv_connections
+        if kv_connections is not None:
+            # the bucket also needs to be opened on the connections the cluster shards key-value operations across
+            for conn in kv_connections[1:]:
+                shard_ret = super()._open_or_close_bucket(open_bucket=True, conn=conn)
+                if isinstance(shard_ret, BaseCouchbaseException):
+                    raise ErrorMapper.build_exception(shard_ret)
+        self._kv_connections = kv_connections
         self._set_connected(ret)
 
     @BlockingWrapper.block(True)
     def _close_bucket(self, **kwargs):
+        if self._kv_connections is not None:
+            for conn in self._kv_connections[1:]:
+                super()._open_or_close_bucket(open_bucket=False, conn=conn)
+            self._kv_connections = None
         super()._open_or_close_bucket(open_bucket=False, **kwargs)
         self._destroy_connection()
 
@@ -191,6 +235,7 @@ class Bucket(BucketLogic):
 
         """
 
+        from couchbase.views import ViewQuery, ViewRequest
         query = ViewQuery.create_view_query_object(
             self.name, design_doc, view_name, *view_options, **kwargs
         )
@@ -206,6 +251,7 @@ class Bucket(BucketLogic):
         Returns:
             :class:`~couchbase.management.collections.CollectionManager`: A :class:`~couchbase.management.collections.CollectionManager` instance.
         """  # noqa: E501
+        from couchbase.management.collections import CollectionManager
         return CollectionManager(self.connection, self.name)
 
     def view_indexes(self) -> ViewIndexManager:
@@ -216,6 +262,7 @@ class Bucket(BucketLogic):
         Returns:
             :class:`~couchbase.management.views.ViewIndexManager`: A :class:`~couchbase.management.views.ViewIndexManager` instance.
         """  # noqa: E501
+        from couchbase.management.views import ViewIndexManager
         return ViewIndexManager(self.connection, self.name)
 
 
@@ -243,6 +290,13 @@ class ViewOptions(ViewOptionsBase):  # noqa: F811
     pass
 
 
-from couchbase.views import ViewScanConsistency  # nopep8 # isort:skip # noqa: E402, F401
-from couchbase.views import ViewOrdering  # nopep8 # isort:skip # noqa: E402, F401
-from couchbase.views import ViewErrorMode  # nopep8 # isort:skip # noqa: E402, F401
+# the views and management modules are imported on first use
+__getattr__ = lazy_module_getattr(globals(), {
+    'CollectionManager': 'couchbase.management.collections',
+    'ViewErrorMode': 'couchbase.views',
+    'ViewIndexManager': 'couchbase.management.views',
+    'ViewOrdering': 'couchbase.views',
+    'ViewQuery': 'couchbase.views',
+    'ViewRequest': 'couchbase.views',
+    'ViewScanConsistency': 'couchbase.views',
+})
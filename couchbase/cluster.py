@@ -15,45 +15,80 @@
 
 from __future__ import annotations
 
+import logging
+import os
+import threading
 import time
 from datetime import timedelta
 from typing import (TYPE_CHECKING,
                     Any,
-                    Dict)
+                    Dict,
+                    List,
+                    Optional,
+                    Tuple)
 
-from couchbase.analytics import AnalyticsQuery, AnalyticsRequest
+from couchbase import _fork
+from couchbase._utils import lazy_module_getattr
 from couchbase.bucket import Bucket
 from couchbase.diagnostics import ClusterState, ServiceType
-from couchbase.exceptions import ErrorMapper, UnAmbiguousTimeoutException
+from couchbase.exceptions import (ErrorMapper,
+                                  InvalidArgumentException,
+                                  UnAmbiguousTimeoutException)
 from couchbase.exceptions import exception as BaseCouchbaseException
 from couchbase.logic import BlockingWrapper
 from couchbase.logic.cluster import ClusterLogic
+from couchbase.logic.hedging import HedgedReads
 from couchbase.logic.supportability import Supportability
-from couchbase.management.analytics import AnalyticsIndexManager
-from couchbase.management.buckets import BucketManager
-from couchbase.management.eventing import EventingFunctionManager
-from couchbase.management.queries import QueryIndexManager
-from couchbase.management.search import SearchIndexManager
-from couchbase.management.users import UserManager
-from couchbase.n1ql import N1QLQuery, N1QLRequest
 from couchbase.options import PingOptions, forward_args
+from couchbase.pycbc_core import close_connection
 from couchbase.result import (AnalyticsResult,
                               ClusterInfoResult,
                               DiagnosticsResult,
                               PingResult,
                               QueryResult,
-                              SearchResult)
-from couchbase.search import SearchQueryBuilder, SearchRequest
-from couchbase.transactions import Transactions
+                              SearchResult,
+                              WarmUpResult)
 
 if TYPE_CHECKING:
+    from concurrent.futures import Future
+
+    from couchbase.management.analytics import AnalyticsIndexManager
+    from couchbase.management.buckets import BucketManager
+    from couchbase.management.eventing import EventingFunctionManager
+    from couchbase.management.queries import QueryIndexManager
+    from couchbase.management.search import SearchIndexManager
+    from couchbase.management.users import UserManager
     from couchbase.options import (AnalyticsOptions,
                                    ClusterOptions,
                                    DiagnosticsOptions,
                                    QueryOptions,
                                    SearchOptions,
-                                   WaitUntilReadyOptions)
+                                   WaitUntilReadyOptions,
+                                   WarmUpOptions)
     from couchbase.search import SearchQuery
+    from couchbase.transactions import Transactions
+
+log = logging.getLogger(__name__)
+
+# management, query, search, analytics and transactions modules are imported on first use, see
+# test_import_time in couchbase/tests/import_t.py
+__getattr__ = lazy_module_getattr(globals(), {
+    'AnalyticsIndexManager': 'couchbase.management.analytics',
+    'AnalyticsQuery': 'couchbase.analytics',
+    'AnalyticsRequest': 'couchbase.analytics',
+    'BucketManager': 'couchbase.management.buckets',
+    'EventingFunctionManager': 'couchbase.management.eventing',
+    'N1QLQuery': 'couchbase.n1ql',
+    'N1QLRequest': 'couchbase.n1ql',
+    'QueryProfile': 'couchbase.n1ql',
+    'QueryScanConsistency': 'couchbase.n1ql',
+    'QueryIndexManager': 'couchbase.management.queries',
+    'SearchIndexManager': 'couchbase.management.search',
+    'SearchQueryBuilder': 'couchbase.search',
+    'SearchRequest': 'couchbase.search',
+    'Transactions': 'couchbase.transactions',
+    'UserManager': 'couchbase.management.users',
+})
 
 
 class Cluster(ClusterLogic):
@@ -89,14 +124,136 @@ class Cluster(ClusterLogic):
 
     """
 
+    _SUPPORTS_CONNECTION_SHARDING = True
+    _SUPPORTS_BOOTSTRAP_CACHE = True
+
     def __init__(self,
                  connstr,  # type: str
                  *options,  # type: ClusterOptions
                  **kwargs,  # type: Dict[str, Any]
                  ) -> Cluster:
 
+        self._shard_connections = []
+        self._fork_generation = _fork.generation()
+        self._bootstrap_info = None
+        self._bootstrap_thread = None
+        self._bootstrap_error = None
+        self._bootstrap_lock = threading.Lock()
+        self._close_lock = threading.Lock()
+        self._close_future = None
         super().__init__(connstr, *options, **kwargs)
-        self._connect()
+        seed_connstr = self._get_cached_seed_connstr()
+        if seed_connstr is not None:
+            self._start_background_bootstrap(seed_connstr)
+        else:
+            self._bootstrap()
+            self._update_bootstrap_cache(self._conn)
+        _fork.register(self)
+
+    @property
+    def _connection(self):
+        if self._fork_generation != _fork._GENERATION:
+            self._ensure_connection()
+        return self._conn
+
+    @_connection.setter
+    def _connection(self, conn):
+        self._conn = conn
+
+    def _bootstrap(self,
+                   connstr=None,  # type: Optional[str]
+                   after_fork=False  # type: Optional[bool]
+                   ) -> None:
+        start = time.perf_counter()
+        self._connect(connstr=connstr)
+        duration = time.perf_counter() - start
+        self._bootstrap_info = {
+            'pid': os.getpid(),
+            'duration_ms': round(duration * 1e3, 3),
+            'after_fork': after_fork,
+            'cached_seeds': connstr is not None,
+        }
+        if after_fork:
+            log.info('Cluster connection re-established in forked process %s in %.3fms.',
+                     self._bootstrap_info['pid'], self._bootstrap_info['duration_ms'])
+
+    def _start_background_bootstrap(self, seed_connstr  # type: str
+                                    ) -> None:
+        # a generation that never matches, so the first use of the connection waits on the bootstrap
+        self._fork_generation = -1
+        self._bootstrap_thread = threading.Thread(target=self._background_bootstrap,
+                                                  args=(seed_connstr,),
+                                                  name='pycbc-bootstrap',
+                                                  daemon=True)
+        self._bootstrap_thread.start()
+
+    def _background_bootstrap(self, seed_connstr  # type: str
+                              ) -> None:
+        try:
+            self._bootstrap(connstr=seed_connstr)
+        except Exception as ex:
+            # the cached nodes are stale, fall back to the connection string
+            log.debug('Bootstrap from cached cluster nodes failed: %s', ex)
+            self._invalidate_bootstrap_cache()
+            try:
+                self._bootstrap()
+            except Exception as retry_ex:
+                self._bootstrap_error = retry_ex
+                return
+        try:
+            self._update_bootstrap_cache(self._conn)
+        except Exception as ex:
+            log.debug('Unable to update the bootstrap cache: %s', ex)
+
+    def _abandon_after_fork(self) -> None:
+        """
+        **INTERNAL**
+
+        Called in the child process after a fork.  The connection (and transactions) inherited from the parent
+        are owned by IO threads that do not exist in the child, so they are abandoned rather than closed.
+        """
+        # a lock held by another thread at the time of the fork is never released in the child
+        self._bootstrap_lock = threading.Lock()
+        self._close_lock = threading.Lock()
+        self._close_future = None
+        self._hedged_reads = HedgedReads(self._cluster_opts.get('meter', None))
+        _fork.abandon(self.__dict__.pop('_conn', None))
+        self._conn = None
+        for conn in self._shard_connections:
+            _fork.abandon(conn)
+        self._shard_connections = []
+        if getattr(self, '_transactions', None) is not None:
+            _fork.abandon(self._transactions)
+            self._transactions = None
+
+    def _ensure_connection(self) -> None:
+        with self._bootstrap_lock:
+            if self._fork_generation == _fork._GENERATION:
+                # another thread established the connection while we waited on the lock
+                return
+            if self._bootstrap_error is not None:
+                raise self._bootstrap_error
+            bootstrap_thread = self._bootstrap_thread
+            if bootstrap_thread is not None:
+                bootstrap_thread.join()
+                if self._bootstrap_error is not None:
+                    raise self._bootstrap_error
+                self._bootstrap_thread = None
+                if self._conn is not None:
+                    self._fork_generation = _fork._GENERATION
+                    return
+                # the process forked while bootstrapping, the bootstrap thread does not exist in the child
+            elif self._bootstrap_info is None:
+                # the cluster was closed prior to the fork
+                self._fork_generation = _fork._GENERATION
+                return
+            prev_generation = self._fork_generation
+            self._fork_generation = _fork._GENERATION
+            try:
+                self._bootstrap(after_fork=True)
+            except Exception:
+                self._fork_generation = prev_generation
+                raise
 
     @BlockingWrapper.block(True)
     def _connect(self, **kwargs):
@@ -104,11 +261,92 @@ class Cluster(ClusterLogic):
         if isinstance(ret, BaseCouchbaseException):
             raise ErrorMapper.build_exception(ret)
         self._set_connection(ret)
+        try:
+            self._connect_shards()
+        except Exception:
+            close_connection(ret)
+            self._set_connection(None)
+            raise
+
+    def _connect_shards(self) -> None:
+        shards = []
+        try:
+            for _ in range(self._num_connections - 1):
+                ret = super()._connect_cluster()
+                if isinstance(ret, BaseCouchbaseException):
+                    raise ErrorMapper.build_exception(ret)
+                shards.append(ret)
+        except Exception:
+            self._close_shards(shards)
+            raise
+        self._shard_connections = shards
+
+    @staticmethod
+    def _close_shards(shards  # type: List[Any]
+                      ) -> None:
+        for conn in shards:
+            close_connection(conn)
+
+    @property
+    def kv_connections(self) -> Optional[Tuple[Any, ...]]:
+        """
+        **INTERNAL**
+
+        The connections key-value operations are sharded across, None if the cluster uses a single connection.
+        """
+        conn = self.connection
+        if conn is None or not self._shard_connections:
+            return None
+        return (conn, *self._shard_connections)
 
     @BlockingWrapper.block(True)
     def _close_cluster(self):
-        super()._close_cluster()
-        super()._destroy_connection()
+        shards, self._shard_connections = self._shard_connections, []
+        self._close_shards(shards)
+        bootstrap_thread = self._bootstrap_thread
+        if self._conn is not None or (bootstrap_thread is not None and bootstrap_thread.is_alive()):
+            super()._close_cluster()
+        else:
+            # forked and not used since, the connection inherited from the parent was abandoned, re-bootstrapping
+            # only to close the connection is pointless
+            self._bootstrap_thread = None
+        self._destroy_connection()
+        self._bootstrap_info = None
+
+    @property
+    def connected(self) -> bool:
+        """
+            bool: Indicator on if the cluster has been connected or not.
+        """
+        # avoid the connection property, checking the state of a cluster in a forked process should not re-bootstrap
+        # it.  The connection of a forked (or still bootstrapping) cluster is established on first use.
+        return (self.__dict__.get('_conn', None) is not None
+                or self._bootstrap_thread is not None
+                or self._bootstrap_info is not None)
+
+    def _destroy_connection(self):
+        # avoid the connection property, a cluster that is garbage collected in a forked process should not
+        # re-bootstrap only to be destroyed
+        if '_conn' in self.__dict__:
+            self._conn = None
+
+    @property
+    def bootstrap_info(self) -> Optional[Dict[str, Any]]:
+        """
+            Optional[Dict[str, Any]]: Timing of the most recent bootstrap of this cluster's connection, None if the
+                cluster is not connected. The dict contains the ``pid`` of the process that bootstrapped the
+                connection, the bootstrap ``duration_ms``, ``after_fork``, set if the connection was
+                re-established lazily in a forked worker process and ``cached_seeds``, set if the cluster
+                bootstrapped against the nodes found in the bootstrap cache (see ``bootstrap_cache_path`` in
+                :class:`~couchbase.options.ClusterOptions`).
+
+        .. note::
+            A :class:`~couchbase.cluster.Cluster` created prior to ``os.fork()`` can continue to be used in the
+            child process.  The child abandons the connection inherited from the parent and transparently
+            re-bootstraps on first use.  Buckets, scopes and collections obtained from the cluster follow the
+            new connection, management API instances (e.g. ``cluster.query_indexes()``) need to be re-created.
+        """
+        return self._bootstrap_info
 
     @property
     def transactions(self) -> Transactions:
@@ -117,20 +355,104 @@ class Cluster(ClusterLogic):
                 perform transactions on this cluster.
         """
         if not self._transactions:
+            from couchbase.transactions import Transactions
             self._transactions = Transactions(self, self._transaction_config)
         return self._transactions
 
-    def close(self):
+    def close(self,
+              timeout=None,  # type: Optional[timedelta]
+              background=False  # type: Optional[bool]
+              ) -> Optional[Future]:
         """Shuts down this cluster instance. Cleaning up all resources associated with it.
 
+        Closing the cluster waits for in-flight operations to complete and for the cluster's IO threads to exit,
+        the GIL is released while waiting so other Python threads are not blocked by the shutdown.
+
         .. warning::
             Use of this method is almost *always* unnecessary.  Cluster resources should be cleaned
             up once the cluster instance falls out of scope.  However, in some applications tuning resources
             is necessary and in those types of applications, this method might be beneficial.
 
+        Args:
+            timeout (timedelta, optional): Maximum amount of time to wait for the cluster to close.  If the timeout
+                is reached, the close continues in the background and a
+                :class:`~couchbase.exceptions.UnAmbiguousTimeoutException` is raised.
+            background (bool, optional): If set, the cluster is closed on a background thread and a
+                :class:`concurrent.futures.Future` that completes once the cluster is closed is returned
+                immediately.  Cannot be combined with ``timeout``, use ``Future.result(timeout)`` instead.
+
+        Returns:
+            Optional[:class:`concurrent.futures.Future`]: The Future tracking the close if ``background`` is set,
+            otherwise None.
+
+        Raises:
+            :class:`~couchbase.exceptions.InvalidArgumentException`: If both ``timeout`` and ``background`` are
+                provided.
+            :class:`~couchbase.exceptions.UnAmbiguousTimeoutException`: If the timeout is reached prior to the
+                cluster being closed.
+
+        Examples:
+            Close the cluster as part of a graceful shutdown w/o blocking the application's request threads::
+
+                close_future = cluster.close(background=True)
+                # ... finish handling outstanding requests ...
+                close_future.result(timeout=5)
+
+        """
+        if timeout is not None and background:
+            raise InvalidArgumentException(message='Cannot provide both timeout and background.')
+        if timeout is None and not background:
+            close_future = self._close_future
+            if close_future is not None:
+                # a background close is in progress, wait for it rather than closing the connection twice
+                close_future.result()
+            elif self.connected:
+                self._close_cluster()
+            return None
+
+        close_future = self._close_in_background()
+        if background:
+            return close_future
+
+        from concurrent.futures import TimeoutError as FutureTimeoutError
+        try:
+            close_future.result(timeout=timeout.total_seconds())
+        except FutureTimeoutError:
+            raise UnAmbiguousTimeoutException(message='Cluster close did not complete within the timeout, '
+                                              'the close continues in the background.') from None
+        return None
+
+    def _close_in_background(self) -> Future:
         """
-        if self.connected:
-            self._close_cluster()
+        **INTERNAL**
+
+        Closes the cluster on a daemon thread, returns the Future for the close.  Concurrent callers share the
+        same Future.
+        """
+        # keeps concurrent.futures out of `import couchbase.cluster`
+        from concurrent.futures import Future
+        connected = self.connected
+        with self._close_lock:
+            if self._close_future is not None:
+                return self._close_future
+            close_future = Future()
+            if not connected:
+                close_future.set_result(None)
+                return close_future
+            self._close_future = close_future
+
+        def _close():
+            try:
+                self._close_cluster()
+            except BaseException as ex:
+                close_future.set_exception(ex)
+            else:
+                close_future.set_result(None)
+            finally:
+                self._close_future = None
+
+        threading.Thread(target=_close, name='pycbc-close', daemon=True).start()
+        return close_future
 
     def bucket(self, bucket_name) -> Bucket:
         """Creates a Bucket instance to a specific bucket.
@@ -309,6 +631,78 @@ class Cluster(ClusterLogic):
 
             time.sleep(interval_millis / 1000)
 
+    def warm_up(self,
+                *opts,  # type: WarmUpOptions
+                **kwargs  # type: Any
+                ) -> WarmUpResult:
+        """Pre-establishes the connections to the cluster's nodes so the first requests after the cluster is
+        created do not pay for connecting, TLS and authentication.
+
+        The key-value connections of the provided buckets (opened if necessary) are verified on every connection
+        of the cluster (see ``num_connections`` in :class:`~couchbase.options.ClusterOptions`).  For the HTTP
+        services, ``connections_per_node`` concurrent pings are sent to each node, the connections opened by the
+        pings are returned to the HTTP connection pool.
+
+        Args:
+            opts (:class:`~couchbase.options.WarmUpOptions`): Optional parameters for this operation.
+            **kwargs (Dict[str, Any]): keyword arguments that can be used as optional parameters
+                for this operation.
+
+        Returns:
+            :class:`~couchbase.result.WarmUpResult`: A report of the warmed up endpoints, including the connection
+            time per node.
+
+        Raises:
+            :class:`~couchbase.exceptions.InvalidArgumentException`: If ``connections_per_node`` is not a positive
+                integer or exceeds ``max_http_connections``.
+
+        Examples:
+
+            Warm up the key-value connections of the travel-sample bucket and 4 query connections per node::
+
+                from couchbase.diagnostics import ServiceType
+                from couchbase.options import WarmUpOptions
+
+                result = cluster.warm_up(WarmUpOptions(service_types=[ServiceType.KeyValue, ServiceType.Query],
+                                                       connections_per_node=4,
+                                                       bucket_names=['travel-sample']))
+                for node, connect_times in result.node_connect_times().items():
+                    print(f'{node}: {connect_times}')
+
+        """
+        service_types, connections_per_node, bucket_names, timeout = self._get_warm_up_args(*opts, **kwargs)
+        start = time.perf_counter()
+        for bucket_name in bucket_names:
+            # opens the bucket on all the cluster's connections
+            self.bucket(bucket_name)
+
+        ping_opts = {'timeout': timeout} if timeout is not None else {}
+        pings = []
+        if ServiceType.KeyValue.value in service_types:
+            pings.extend((conn, [ServiceType.KeyValue.value]) for conn in (self.kv_connections or (self.connection,)))
+        http_service_types = [st for st in service_types if st != ServiceType.KeyValue.value]
+        if http_service_types:
+            # concurrent pings are needed to open more than a single connection per node
+            pings.extend((self.connection, http_service_types) for _ in range(connections_per_node))
+
+        results = []
+        if pings:
+            # keeps concurrent.futures out of `import couchbase.cluster`
+            from concurrent.futures import ThreadPoolExecutor
+            with ThreadPoolExecutor(max_workers=len(pings), thread_name_prefix='pycbc-warm-up') as executor:
+                futures = [executor.submit(self._ping_connection, conn, PingOptions(service_types=sts, **ping_opts))
+                           for conn, sts in pings]
+                results = [f.result() for f in futures]
+        return WarmUpResult(results, timedelta(seconds=time.perf_counter() - start))
+
+    @BlockingWrapper.block(PingResult)
+    def _ping_connection(self,
+                         conn,  # type: Any
+                         *opts,  # type: PingOptions
+                         **kwargs  # type: Any
+                         ) -> PingResult:
+        return super()._ping(conn, *opts, **kwargs)
+
     def query(
         self,
         statement,  # type: str
@@ -380,12 +774,14 @@ class Cluster(ClusterLogic):
 
         """
 
+        from couchbase.n1ql import N1QLQuery, N1QLRequest
         query = N1QLQuery.create_query_object(statement,
                                               *options,
                                               **kwargs)
         return QueryResult(N1QLRequest.generate_n1ql_request(self.connection,
                                                              query.params,
-                                                             default_serializer=self.default_serializer))
+                                                             default_serializer=self.default_serializer,
+                                                             rate_limiter=self.rate_limiter))
 
     def analytics_query(
         self,  # type: Cluster
@@ -462,13 +858,15 @@ class Cluster(ClusterLogic):
                 print(f'Analytics query metrics: {q_res.metadata().metrics()}')
 
         """  # noqa: E501
+        from couchbase.analytics import AnalyticsQuery, AnalyticsRequest
         query = AnalyticsQuery.create_query_object(statement,
                                                    *options,
                                                    **kwargs)
         return AnalyticsResult(AnalyticsRequest.generate_analytics_request(
             self.connection,
             query.params,
-            default_serializer=self.default_serializer))
+            default_serializer=self.default_serializer,
+            rate_limiter=self.rate_limiter))
 
     def search_query(
         self,
@@ -565,12 +963,14 @@ class Cluster(ClusterLogic):
 
         """
 
+        from couchbase.search import SearchQueryBuilder, SearchRequest
         query = SearchQueryBuilder.create_search_query_object(
             index, query, *options, **kwargs
         )
         return SearchResult(SearchRequest.generate_search_request(self.connection,
                                                                   query.as_encodable(),
-                                                                  default_serializer=self.default_serializer))
+                                                                  default_serializer=self.default_serializer,
+                                                                  rate_limiter=self.rate_limiter))
 
     def buckets(self) -> BucketManager:
         """
@@ -581,6 +981,7 @@ class Cluster(ClusterLogic):
             :class:`~couchbase.management.buckets.BucketManager`: A :class:`~couchbase.management.buckets.BucketManager` instance.
         """  # noqa: E501
         # TODO:  AlreadyShutdownException?
+        from couchbase.management.buckets import BucketManager
         return BucketManager(self.connection)
 
     def users(self) -> UserManager:
@@ -592,6 +993,7 @@ class Cluster(ClusterLogic):
             :class:`~couchbase.management.users.UserManager`: A :class:`~couchbase.management.users.UserManager` instance.
         """  # noqa: E501
         # TODO:  AlreadyShutdownException?
+        from couchbase.management.users import UserManager
         return UserManager(self.connection)
 
     def query_indexes(self) -> QueryIndexManager:
@@ -603,6 +1005,7 @@ class Cluster(ClusterLogic):
             :class:`~couchbase.management.queries.QueryIndexManager`: A :class:`~couchbase.management.queries.QueryIndexManager` instance.
         """  # noqa: E501
         # TODO:  AlreadyShutdownException?
+        from couchbase.management.queries import QueryIndexManager
         return QueryIndexManager(self.connection)
 
     def analytics_indexes(self) -> AnalyticsIndexManager:
@@ -614,6 +1017,7 @@ class Cluster(ClusterLogic):
             :class:`~couchbase.management.analytics.AnalyticsIndexManager`: An :class:`~couchbase.management.analytics.AnalyticsIndexManager` instance.
         """  # noqa: E501
         # TODO:  AlreadyShutdownException?
+        from couchbase.management.analytics import AnalyticsIndexManager
         return AnalyticsIndexManager(self.connection)
 
     def search_indexes(self) -> SearchIndexManager:
@@ -626,6 +1030,7 @@ class Cluster(ClusterLogic):
 
         """  # noqa: E501
         # TODO:  AlreadyShutdownException?
+        from couchbase.management.search import SearchIndexManager
         return SearchIndexManager(self.connection)
 
     def eventing_functions(self) -> EventingFunctionManager:
@@ -642,6 +1047,7 @@ class Cluster(ClusterLogic):
 
         """  # noqa: E501
         # TODO:  AlreadyShutdownException?
+        from couchbase.management.eventing import EventingFunctionManager
         return EventingFunctionManager(self.connection)
 
     @staticmethod
@@ -755,6 +1161,4 @@ class QueryOptions(QueryOptionsBase):  # noqa: F811
     pass
 
 
-from couchbase.n1ql import QueryScanConsistency  # nopep8 # isort:skip # noqa: E402, F401
-from couchbase.n1ql import QueryProfile  # nopep8 # isort:skip # noqa: E402, F401
 from couchbase.options import Compression  # nopep8 # isort:skip # noqa: E402, F401
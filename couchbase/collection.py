@@ -15,9 +15,12 @@
 
 from __future__ import annotations
 
+import threading
+import time
 from copy import copy
 from typing import (TYPE_CHECKING,
                     Any,
+                    Callable,
                     Dict,
                     Iterable,
                     List,
@@ -25,6 +28,7 @@ from typing import (TYPE_CHECKING,
                     Tuple,
                     Union)
 
+from couchbase import _fork
 from couchbase.binary_collection import BinaryCollection
 from couchbase.datastructures import (CouchbaseList,
                                       CouchbaseMap,
@@ -40,8 +44,8 @@ from couchbase.logic import (BlockingWrapper,
                              decode_replicas,
                              decode_value)
 from couchbase.logic.collection import CollectionLogic
+from couchbase.logic.hedging import HedgedRead
 from couchbase.logic.supportability import Supportability
-from couchbase.management.queries import CollectionQueryIndexManager
 from couchbase.options import (AppendMultiOptions,
                                DecrementMultiOptions,
                                ExistsMultiOptions,
@@ -62,6 +66,7 @@ from couchbase.options import (AppendMultiOptions,
 from couchbase.pycbc_core import (binary_multi_operation,
                                   kv_multi_operation,
                                   operations)
+from couchbase.rate_limiter import kv_payload_size
 from couchbase.result import (CounterResult,
                               ExistsResult,
                               GetReplicaResult,
@@ -89,13 +94,16 @@ if TYPE_CHECKING:
     from datetime import timedelta
 
     from couchbase._utils import JSONType
+    from couchbase.management.queries import CollectionQueryIndexManager
     from couchbase.options import (AppendOptions,
                                    DecrementOptions,
                                    ExistsOptions,
                                    GetAndLockOptions,
                                    GetAndTouchOptions,
                                    GetAnyReplicaOptions,
+                                   GetHedgedOptions,
                                    GetOptions,
+                                   GetReplicaQuorumOptions,
                                    IncrementOptions,
                                    InsertOptions,
                                    LookupInOptions,
@@ -115,7 +123,22 @@ if TYPE_CHECKING:
 class Collection(CollectionLogic):
 
     def __init__(self, scope, name):
+        self._fork_generation = _fork.generation()
         super().__init__(scope, name)
+        self._kv_connections = scope.kv_connections
+
+    @property
+    def _connection(self):
+        if self._fork_generation != _fork._GENERATION:
+            # forked since the connection was cached, the bucket re-opens on the child's connection
+            self._conn = self._scope.connection
+            self._kv_connections = self._scope.kv_connections
+            self._fork_generation = _fork._GENERATION
+        return self._conn
+
+    @_connection.setter
+    def _connection(self, conn):
+        self._conn = conn
 
     def get(self,
             key,  # type: str
@@ -246,6 +269,73 @@ class Collection(CollectionLogic):
         """
         return super().get_any_replica(key, **kwargs)
 
+    def get_hedged(self,
+                   key,  # type: str
+                   *opts,  # type: GetHedgedOptions
+                   **kwargs,  # type: Dict[str, Any]
+                   ) -> GetReplicaResult:
+        """Retrieves the value of a document from the active, sending a replica read if the active has not
+        responded within the hedge delay.  The first successful response is returned.
+
+        Unlike :meth:`get_any_replica`, which always reads from the active and all replicas, a replica read is only
+        sent for the slowest reads (by default reads slower than the p95 get latency recorded by the cluster's
+        :class:`~couchbase.metrics.HistogramMeter`).  The hedge reads from a single replica, successive hedges rotate
+        over the bucket's replicas.  See :meth:`~couchbase.cluster.Cluster.hedged_read_stats` for how often reads are
+        hedged.
+
+        .. note::
+            A replica might not have received the latest mutation of the document yet, check
+            :attr:`~couchbase.result.GetReplicaResult.is_replica` if that is a concern.
+
+        Args:
+            key (str): The key for the document to retrieve.
+            opts (:class:`~couchbase.options.GetHedgedOptions`): Optional parameters for this operation.
+            **kwargs (Dict[str, Any]): keyword arguments that can be used in place or to
+                override provided :class:`~couchbase.options.GetHedgedOptions`
+
+        Returns:
+            :class:`~couchbase.result.GetReplicaResult`: An instance of :class:`~couchbase.result.GetReplicaResult`.
+
+        Raises:
+            :class:`~couchbase.exceptions.DocumentNotFoundException`: If the key provided does not exist
+                on the server.
+            :class:`~couchbase.exceptions.UnAmbiguousTimeoutException`: If neither read responded within the
+                operation's timeout.
+
+        Examples:
+
+            Simple get_hedged operation::
+
+                bucket = cluster.bucket('travel-sample')
+                collection = bucket.scope('inventory').collection('airline')
+
+                res = collection.get_hedged('airline_10')
+                print(f'Document is replica: {res.is_replica}')
+                print(f'Document value: {res.content_as[dict]}')
+
+
+            Simple get_hedged operation with options::
+
+                from datetime import timedelta
+                from couchbase.options import GetHedgedOptions
+
+                # ... other code ...
+
+                res = collection.get_hedged('airline_10', GetHedgedOptions(hedge_delay=timedelta(milliseconds=20)))
+                print(f'Document is replica: {res.is_replica}')
+                print(f'Document value: {res.content_as[dict]}')
+
+        """
+        final_args, hedge_delay, deadline = self._get_hedged_args(*opts, **kwargs)
+        done = threading.Event()
+        read = HedgedRead(lambda _: done.set())
+        self._send_hedged_read(key, read, **final_args)
+        if not done.wait(hedge_delay):
+            self._send_hedged_read(key, read, is_replica=True, **final_args)
+            if not done.wait(max(deadline - time.monotonic(), 0)):
+                self._expire_hedged_read(read)
+        return self._hedged_read_result(read, final_args['transcoder'])
+
     def get_all_replicas(self,
                          key,  # type: str
                          *opts,  # type: GetAllReplicasOptions
@@ -309,6 +399,15 @@ class Collection(CollectionLogic):
                         print('Done streaming replicas.')
                         break
 
+            Stop after the two fastest responses::
+
+                from couchbase.options import GetAllReplicasOptions
+
+                # ... other code ...
+
+                result = collection.get_all_replicas('airline_10', GetAllReplicasOptions(max_responses=2))
+                cas_values = set(res.cas for res in result)
+
         """
 
         final_args = forward_args(kwargs, *opts)
@@ -316,7 +415,14 @@ class Collection(CollectionLogic):
         if not transcoder:
             transcoder = self.default_transcoder
         final_args['transcoder'] = transcoder
-
+        max_responses = self._validate_replica_count('max_responses', final_args.pop('max_responses', None))
+
+        if max_responses == 1:
+            # completes with the fastest response rather than once all replicas responded
+            return iter([self._get_any_replica_internal(key, **final_args)])
+        if max_responses is not None:
+            # the read completes once max_responses copies responded
+            final_args['max_responses'] = max_responses
         return self._get_all_replicas_internal(key, **final_args)
 
     @BlockingWrapper.block_and_decode(GetReplicaResult)
@@ -331,6 +437,61 @@ class Collection(CollectionLogic):
         """
         return super().get_all_replicas(key, **kwargs)
 
+    def get_replica_quorum(self,
+                           key,  # type: str
+                           *opts,  # type: GetReplicaQuorumOptions
+                           **kwargs,  # type: Dict[str, Any]
+                           ) -> GetReplicaResult:
+        """Retrieves the version of a document that a quorum of its copies (active and replicas) agree on, i.e.
+        return the same CAS for.
+
+        Args:
+            key (str): The key for the document to retrieve.
+            opts (:class:`~couchbase.options.GetReplicaQuorumOptions`): Optional parameters for this operation.
+            **kwargs (Dict[str, Any]): keyword arguments that can be used in place or to
+                override provided :class:`~couchbase.options.GetReplicaQuorumOptions`
+
+        Returns:
+            :class:`~couchbase.result.GetReplicaResult`: The active's response if it returned the agreed on
+            version, otherwise the response of one of the replicas that did.
+
+        Raises:
+            :class:`~couchbase.exceptions.DocumentNotFoundException`: If the key provided does not exist
+                on the server.
+            :class:`~couchbase.exceptions.DocumentUnretrievableException`: If no version of the document was
+                returned by a quorum of the copies.
+
+        Examples:
+
+            Simple get_replica_quorum operation::
+
+                bucket = cluster.bucket('travel-sample')
+                collection = bucket.scope('inventory').collection('airline')
+
+                res = collection.get_replica_quorum('airline_10')
+                print(f'Document value: {res.content_as[dict]}')
+
+            Require two copies (e.g. the active and one of two replicas) to agree::
+
+                from couchbase.options import GetReplicaQuorumOptions
+
+                # ... other code ...
+
+                res = collection.get_replica_quorum('airline_10', GetReplicaQuorumOptions(quorum=2))
+                print(f'Document value: {res.content_as[dict]}')
+
+        """
+
+        final_args = forward_args(kwargs, *opts)
+        transcoder = final_args.get('transcoder', None)
+        if not transcoder:
+            transcoder = self.default_transcoder
+        final_args['transcoder'] = transcoder
+        # 0: a majority of the document's copies, as per the bucket's configuration
+        final_args['quorum'] = self._validate_replica_count('quorum', final_args.pop('quorum', None)) or 0
+
+        return self._select_replica_quorum(self._get_all_replicas_internal(key, **final_args))
+
     @BlockingWrapper.block(ExistsResult)
     def exists(
         self,
@@ -1381,18 +1542,25 @@ class Collection(CollectionLogic):
         sd_res = self.lookup_in(key, (op,), **kwargs)
         return sd_res.value[0].get("value", None)
 
-    def couchbase_set(self, key  # type: str
+    def couchbase_set(self, key,  # type: str
+                      num_buckets=None  # type: Optional[int]
                       ) -> CouchbaseSet:
         """Returns a CouchbaseSet permitting simple map storage in a document.
 
         .. seealso::
             :class:`~couchbase.datastructures.CouchbaseSet`
 
+        Args:
+            key (str): Document key to use for the set.
+            num_buckets (int, optional): **VOLATILE** This API is subject to change at any time.  Number of
+                arrays the set's values are hashed into, see :class:`~couchbase.datastructures.CouchbaseSet`.
+                Defaults to None (the set is stored as a single array).
+
         Returns:
             :class:`~couchbase.datastructures.CouchbaseSet`: A CouchbaseSet instance.
 
         """
-        return CouchbaseSet(key, self)
+        return CouchbaseSet(key, self, num_buckets=num_buckets)
 
     @BlockingWrapper._dsop(create_type='list')
     def set_add(self,
@@ -1515,18 +1683,25 @@ class Collection(CollectionLogic):
         rv = self.get(key, **kwargs)
         return value in rv.value
 
-    def couchbase_queue(self, key  # type: str
+    def couchbase_queue(self, key,  # type: str
+                        num_shards=None  # type: Optional[int]
                         ) -> CouchbaseQueue:
         """Returns a CouchbaseQueue permitting simple map storage in a document.
 
         .. seealso::
             :class:`~couchbase.datastructures.CouchbaseQueue`
 
+        Args:
+            key (str): Document key to use for the queue.
+            num_shards (int, optional): **VOLATILE** This API is subject to change at any time.  Number of
+                documents the queue's items are spread across, see :class:`~couchbase.datastructures.CouchbaseQueue`.
+                Defaults to None (the queue is stored in a single document).
+
         Returns:
             :class:`~couchbase.datastructures.CouchbaseQueue`: A CouchbaseQueue instance.
 
         """
-        return CouchbaseQueue(key, self)
+        return CouchbaseQueue(key, self, num_shards=num_shards)
 
     @BlockingWrapper._dsop(create_type='list')
     def queue_push(self,
@@ -1618,6 +1793,28 @@ class Collection(CollectionLogic):
         """
         return self.list_size(key)
 
+    def _kv_multi_operation(self,
+                            operation,  # type: Callable[..., Any]
+                            **kwargs  # type: Dict[str, Any]
+                            ) -> Any:
+        """**INTERNAL**
+
+        Dispatches the multi operation once admitted by the cluster's
+        :class:`~couchbase.rate_limiter.ClientRateLimiter` (if any), each key counts as an operation.
+        """
+        op_args = kwargs.get('op_args', {})
+        if self._kv_connections is not None:
+            # route each key as its single document operations are routed
+            for key, args in op_args.items():
+                op_args[key] = dict(args, conn=self._kv_connection(key))
+        rate_limiter = self._rate_limiter
+        if rate_limiter is not None:
+            num_bytes = sum(kv_payload_size(args.get('value', None)) for args in op_args.values())
+            delay = rate_limiter.acquire_kv(num_ops=len(op_args), num_bytes=num_bytes)
+            if delay > 0:
+                time.sleep(delay)
+        return operation(**kwargs)
+
     def _get_multi_mutation_transcoded_op_args(
         self,
         keys_and_docs,  # type: Dict[str, JSONType]
@@ -1764,7 +1961,8 @@ class Collection(CollectionLogic):
                                                                           opts_type=GetMultiOptions,
                                                                           **kwargs)
         op_type = operations.GET.value
-        res = kv_multi_operation(
+        res = self._kv_multi_operation(
+            kv_multi_operation,
             **self._get_connection_args(),
             op_type=op_type,
             op_args=op_args
@@ -1863,7 +2061,8 @@ class Collection(CollectionLogic):
                                                                           opts_type=GetAnyReplicaMultiOptions,
                                                                           **kwargs)
         op_type = operations.GET_ANY_REPLICA.value
-        res = kv_multi_operation(
+        res = self._kv_multi_operation(
+            kv_multi_operation,
             **self._get_connection_args(),
             op_type=op_type,
             op_args=op_args
@@ -1964,8 +2163,20 @@ class Collection(CollectionLogic):
                                                                           *opts,
                                                                           opts_type=GetAllReplicasMultiOptions,
                                                                           **kwargs)
-        op_type = operations.GET_ALL_REPLICAS.value
-        res = kv_multi_operation(
+        max_responses = {k: self._validate_replica_count('max_responses', args.pop('max_responses', None))
+                         for k, args in op_args.items()}
+        # if every key only needs its fastest response, the reads do not have to wait for the slowest replica
+        first_response_only = bool(max_responses) and all(limit == 1 for limit in max_responses.values())
+        if first_response_only:
+            op_type = operations.GET_ANY_REPLICA.value
+        else:
+            op_type = operations.GET_ALL_REPLICAS.value
+            for k, limit in max_responses.items():
+                if limit is not None:
+                    # the key's read completes once max_responses copies responded
+                    op_args[k]['max_responses'] = limit
+        res = self._kv_multi_operation(
+            kv_multi_operation,
             **self._get_connection_args(),
             op_type=op_type,
             op_args=op_args
@@ -1983,7 +2194,13 @@ class Collection(CollectionLogic):
         for k in result_keys:
             value = res.raw_result.pop(k)
             tc = transcoders[k]
-            res.raw_result[k] = list(r for r in decode_replicas(tc, value, GetReplicaResult))
+            if first_response_only:
+                value.raw_result['value'] = decode_value(tc,
+                                                         value.raw_result.get('value', None),
+                                                         value.raw_result.get('flags', None))
+                res.raw_result[k] = [GetReplicaResult(value)]
+            else:
+                res.raw_result[k] = list(decode_replicas(tc, value, GetReplicaResult))
 
         return MultiGetReplicaResult(res, return_exceptions)
 
@@ -2023,7 +2240,8 @@ class Collection(CollectionLogic):
                                                                           opts_type=LockMultiOptions,
                                                                           **kwargs)
         op_type = operations.GET_AND_LOCK.value
-        res = kv_multi_operation(
+        res = self._kv_multi_operation(
+            kv_multi_operation,
             **self._get_connection_args(),
             op_type=op_type,
             op_args=op_args
@@ -2069,7 +2287,8 @@ class Collection(CollectionLogic):
                                                                 opts_type=ExistsMultiOptions,
                                                                 **kwargs)
         op_type = operations.EXISTS.value
-        res = kv_multi_operation(
+        res = self._kv_multi_operation(
+            kv_multi_operation,
             **self._get_connection_args(),
             op_type=op_type,
             op_args=op_args
@@ -2110,7 +2329,8 @@ class Collection(CollectionLogic):
                                                                                  opts_type=InsertMultiOptions,
                                                                                  **kwargs)
         op_type = operations.INSERT.value
-        res = kv_multi_operation(
+        res = self._kv_multi_operation(
+            kv_multi_operation,
             **self._get_connection_args(),
             op_type=op_type,
             op_args=op_args
@@ -2146,7 +2366,8 @@ class Collection(CollectionLogic):
                                                                                  opts_type=UpsertMultiOptions,
                                                                                  **kwargs)
         op_type = operations.UPSERT.value
-        res = kv_multi_operation(
+        res = self._kv_multi_operation(
+            kv_multi_operation,
             **self._get_connection_args(),
             op_type=op_type,
             op_args=op_args
@@ -2187,7 +2408,8 @@ class Collection(CollectionLogic):
                                                                                  opts_type=ReplaceMultiOptions,
                                                                                  **kwargs)
         op_type = operations.REPLACE.value
-        res = kv_multi_operation(
+        res = self._kv_multi_operation(
+            kv_multi_operation,
             **self._get_connection_args(),
             op_type=op_type,
             op_args=op_args
@@ -2228,7 +2450,8 @@ class Collection(CollectionLogic):
                                                                 opts_type=RemoveMultiOptions,
                                                                 **kwargs)
         op_type = operations.REMOVE.value
-        res = kv_multi_operation(
+        res = self._kv_multi_operation(
+            kv_multi_operation,
             **self._get_connection_args(),
             op_type=op_type,
             op_args=op_args
@@ -2272,7 +2495,8 @@ class Collection(CollectionLogic):
                                                                 opts_type=TouchMultiOptions,
                                                                 **kwargs)
         op_type = operations.TOUCH.value
-        res = kv_multi_operation(
+        res = self._kv_multi_operation(
+            kv_multi_operation,
             **self._get_connection_args(),
             op_type=op_type,
             op_args=op_args
@@ -2335,7 +2559,8 @@ class Collection(CollectionLogic):
             v['cas'] = op_keys_cas[k]
 
         op_type = operations.UNLOCK.value
-        res = kv_multi_operation(
+        res = self._kv_multi_operation(
+            kv_multi_operation,
             **self._get_connection_args(),
             op_type=op_type,
             op_args=op_args
@@ -2445,7 +2670,8 @@ class Collection(CollectionLogic):
                                                                              opts_type=AppendMultiOptions,
                                                                              **kwargs)
         op_type = operations.APPEND.value
-        res = binary_multi_operation(
+        res = self._kv_multi_operation(
+            binary_multi_operation,
             **self._get_connection_args(),
             op_type=op_type,
             op_args=op_args
@@ -2463,7 +2689,8 @@ class Collection(CollectionLogic):
                                                                              opts_type=PrependMultiOptions,
                                                                              **kwargs)
         op_type = operations.PREPEND.value
-        res = binary_multi_operation(
+        res = self._kv_multi_operation(
+            binary_multi_operation,
             **self._get_connection_args(),
             op_type=op_type,
             op_args=op_args
@@ -2481,7 +2708,8 @@ class Collection(CollectionLogic):
                                                                      opts_type=IncrementMultiOptions,
                                                                      **kwargs)
         op_type = operations.INCREMENT.value
-        res = binary_multi_operation(
+        res = self._kv_multi_operation(
+            binary_multi_operation,
             **self._get_connection_args(),
             op_type=op_type,
             op_args=op_args
@@ -2499,7 +2727,8 @@ class Collection(CollectionLogic):
                                                                      opts_type=DecrementMultiOptions,
                                                                      **kwargs)
         op_type = operations.DECREMENT.value
-        res = binary_multi_operation(
+        res = self._kv_multi_operation(
+            binary_multi_operation,
             **self._get_connection_args(),
             op_type=op_type,
             op_args=op_args
@@ -2514,6 +2743,7 @@ class Collection(CollectionLogic):
         Returns:
             :class:`~couchbase.management.queries.CollectionQueryIndexManager`: A :class:`~couchbase.management.queries.CollectionQueryIndexManager` instance.
         """  # noqa: E501
+        from couchbase.management.queries import CollectionQueryIndexManager
         return CollectionQueryIndexManager(self.connection, self._scope.bucket_name, self._scope.name, self.name)
 
     @staticmethod
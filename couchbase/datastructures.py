@@ -13,24 +13,44 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 
+import random
 import time
 from datetime import timedelta
 from typing import (TYPE_CHECKING,
                     Any,
                     Dict,
                     Generator,
+                    Iterable,
                     List,
-                    Optional)
+                    Mapping,
+                    Optional,
+                    Tuple,
+                    Union)
 
 from couchbase.exceptions import (CasMismatchException,
+                                  DocumentExistsException,
                                   DocumentNotFoundException,
                                   InvalidArgumentException,
                                   PathExistsException,
+                                  PathMismatchException,
                                   PathNotFoundException,
                                   QueueEmpty,
                                   UnAmbiguousTimeoutException)
+from couchbase.logic.datastructures import (MAX_SUBDOC_SPECS,
+                                            MapBatchLogic,
+                                            bucket_path,
+                                            bucket_paths,
+                                            chunked,
+                                            jittered_backoff,
+                                            missing_values,
+                                            page_specs,
+                                            set_layout,
+                                            set_values,
+                                            unique_values,
+                                            validate_page_size)
 from couchbase.logic.wrappers import BlockingWrapper
-from couchbase.options import MutateInOptions
+from couchbase.options import MutateInOptions, ReplaceOptions
+from couchbase.result import LookupInResult
 from couchbase.subdocument import (array_addunique,
                                    array_append,
                                    array_prepend,
@@ -44,6 +64,28 @@ from couchbase.subdocument import (remove,
 if TYPE_CHECKING:
     from couchbase._utils import JSONType
     from couchbase.collection import Collection
+    from couchbase.subdocument import Spec
+
+
+def _iter_array_pages(collection,  # type: Collection
+                      key,  # type: str
+                      page_size  # type: int
+                      ) -> Generator[Any, None, None]:
+    """**INTERNAL**
+
+    Yields the elements of the array document ``key``, looking up ``page_size`` elements per request.
+    """
+    start = 0
+    while True:
+        try:
+            sd_res = collection.lookup_in(key, page_specs(start, page_size))
+        except DocumentNotFoundException:
+            return
+        for idx in range(page_size):
+            if not sd_res.exists(idx):
+                return
+            yield sd_res.value[idx].get('value', None)
+        start += page_size
 
 
 class CouchbaseList:
@@ -96,6 +138,24 @@ class CouchbaseList:
         op = array_prepend('', value)
         self._collection.mutate_in(self._key, (op,))
 
+    def extend(self, values  # type: Iterable[JSONType]
+               ) -> None:
+        """Adds items to the end of the list with a single sub-document mutation.
+
+        Args:
+            values (Iterable[JSONType]): The values to add.
+
+        """
+        values = list(values)
+        if values:
+            self._append_values(values)
+
+    @BlockingWrapper.datastructure_op(create_type=list)
+    def _append_values(self, values  # type: List[JSONType]
+                       ) -> None:
+        op = array_append('', *values)
+        self._collection.mutate_in(self._key, (op,))
+
     def set_at(self, index,  # type: int
                value  # type: JSONType
                ) -> None:
@@ -207,6 +267,29 @@ class CouchbaseList:
         except DocumentNotFoundException:
             pass
 
+    def iter_paged(self,
+                   page_size=MAX_SUBDOC_SPECS  # type: int
+                   ) -> Generator[Any, None, None]:
+        """**VOLATILE** This API is subject to change at any time.
+
+        Iterates over the list, looking up ``page_size`` items per request instead of fetching the entire
+        document.  Items are yielded as soon as the first page is read and at most one page is held in memory.
+
+        Each page is read separately, so items added or removed during the iteration may be skipped or yielded
+        twice.
+
+        Args:
+            page_size (int, optional): The number of items looked up per request, at most 16.  Defaults to 16.
+
+        Returns:
+            Generator: A generator of the list's items.
+
+        Raises:
+            :class:`~couchbase.exceptions.InvalidArgumentException`: If ``page_size`` is not an int between 1 and 16.
+        """
+        validate_page_size(page_size)
+        return _iter_array_pages(self._collection, self._key, page_size)
+
     def __iter__(self):
         list_ = self._get()
         self._full_list = (v for v in list_.content_as[list])
@@ -216,6 +299,127 @@ class CouchbaseList:
         return next(self._full_list)
 
 
+class CouchbaseMapBatch(MapBatchLogic):
+    """
+    **VOLATILE** This API is subject to change at any time.
+
+    CouchbaseMapBatch records mutations of a :class:`CouchbaseMap` locally and writes them back with as few
+    sub-document mutations as possible (up to 16 keys per mutation) when flushed.  Reads return the recorded
+    mutations, falling back to the map.
+
+    Used as a context manager, the batch is flushed when the block exits without an exception and the recorded
+    mutations are discarded otherwise::
+
+        with collection.couchbase_map(key).batch() as session:
+            session.add('last_seen', now)
+            session.remove('cart')
+
+    Each mutation is CAS-checked against the document state it was planned with.  If the map is modified
+    concurrently, the document is read again and the mutation re-applied.  Keys set by the batch overwrite
+    concurrent changes to the same keys.
+
+    Args:
+        cb_map (:class:`CouchbaseMap`): The map to record mutations for.
+
+    """
+
+    def get(self,
+            mapkey  # type: str
+            ) -> Any:
+        """Fetches a specific key, from the recorded mutations if the key was modified in the batch.
+
+        Args:
+            mapkey (str): The key to fetch.
+
+        Returns:
+            Any: The value of the specified key.
+
+        """
+        if mapkey in self._pending:
+            return self._pending[mapkey][1]
+        return self._map.get(mapkey)
+
+    def exists(self,
+               mapkey  # type: str
+               ) -> bool:
+        """Checks whether a specific key exists, from the recorded mutations if the key was modified in the batch.
+
+        Args:
+            mapkey (str): The key to check for.
+
+        Returns:
+            bool: True if the key exists in the map, False otherwise.
+
+        """
+        if mapkey in self._pending:
+            return self._pending[mapkey][0]
+        return self._map.exists(mapkey)
+
+    def flush(self,
+              timeout=None  # type: Optional[timedelta]
+              ) -> None:
+        """Writes the recorded mutations back to the map.
+
+        Args:
+            timeout (timedelta, optional): Amount of time allowed when attempting
+                to re-apply mutations after CAS conflicts.  Defaults to 10 seconds.
+
+        Raises:
+            :class:`~couchbase.exceptions.UnAmbiguousTimeoutException`: If the mutations could not be applied within
+                the timeout due to concurrent modifications.  Mutations that were not applied remain recorded.
+        """
+        if timeout is None:
+            timeout = timedelta(seconds=10)
+
+        deadline = time.monotonic() + timeout.total_seconds()
+        cas = None
+        for chunk in self._chunks():
+            cas = self._flush_chunk(chunk, cas, deadline)
+            self._applied(chunk)
+
+    def _flush_chunk(self,
+                     chunk,  # type: List[Tuple[str, Tuple[bool, Any]]]
+                     cas,  # type: Optional[int]
+                     deadline  # type: float
+                     ) -> Optional[int]:
+        """
+        Applies a chunk of mutations with a CAS-checked mutation, returns the document's CAS afterwards.
+        """
+        attempt = 0
+        while True:
+            sd_res = None
+            try:
+                if self._needs_lookup(chunk, cas):
+                    sd_res = self._collection.lookup_in(self._key, self._lookup_specs(chunk))
+                    cas = sd_res.cas
+                ops = self._mutation_specs(chunk, sd_res)
+                if not ops:
+                    return cas
+                return self._collection.mutate_in(self._key, ops, MutateInOptions(cas=cas)).cas
+            except DocumentNotFoundException:
+                if not self._create_missing_map(chunk):
+                    return None
+                cas = None
+                continue
+            except CasMismatchException:
+                cas = None
+
+            time_left = deadline - time.monotonic()
+            if time_left <= 0:
+                raise UnAmbiguousTimeoutException(message="Unable to flush the CouchbaseMap batch.")
+            time.sleep(jittered_backoff(attempt, time_left))
+            attempt += 1
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.flush()
+        else:
+            self.discard()
+
+
 class CouchbaseMap:
     """
     CouchbaseMap provides a simplified interface for storing a map within a Couchbase document.
@@ -256,6 +460,25 @@ class CouchbaseMap:
         op = upsert(mapkey, value)
         self._collection.mutate_in(self._key, (op,))
 
+    def update(self,
+               mapping  # type: Union[Mapping[str, JSONType], Iterable[Tuple[str, JSONType]]]
+               ) -> None:
+        """Sets the keys of the provided mapping to their values in the map.  Up to 16 keys are set with a single
+        sub-document mutation, each mutation is applied atomically.
+
+        Args:
+            mapping (Union[Mapping[str, JSONType], Iterable[Tuple[str, JSONType]]]): The keys and values to set.
+
+        """
+        for chunk in chunked(dict(mapping).items(), MAX_SUBDOC_SPECS):
+            self._upsert_values(chunk)
+
+    @BlockingWrapper.datastructure_op(create_type=dict)
+    def _upsert_values(self, items  # type: List[Tuple[str, JSONType]]
+                       ) -> None:
+        ops = tuple(upsert(mapkey, value) for mapkey, value in items)
+        self._collection.mutate_in(self._key, ops)
+
     @BlockingWrapper.datastructure_op(create_type=dict)
     def get(self,
             mapkey,  # type: str
@@ -367,24 +590,51 @@ class CouchbaseMap:
         map_ = self._get()
         return ((k, v) for k, v in map_.content_as[dict].items())
 
+    def batch(self) -> CouchbaseMapBatch:
+        """**VOLATILE** This API is subject to change at any time.
+
+        Returns a batch view of the map which records mutations locally and writes them back with as few
+        sub-document mutations as possible, see :class:`CouchbaseMapBatch`.
+
+        Returns:
+            :class:`CouchbaseMapBatch`: A CouchbaseMapBatch instance.
+        """
+        return CouchbaseMapBatch(self)
+
 
 class CouchbaseSet:
     """
     CouchbaseSet provides a simplified interface for storing a set within a Couchbase document.
 
+    By default the set is stored as a single JSON array, so checking for or removing a value reads the entire
+    document.  With ``num_buckets`` the values are hashed into ``num_buckets`` arrays within the document and
+    :meth:`contains` and :meth:`remove` only read the array the value hashes to.  All clients of a set must use the
+    same ``num_buckets``.  A set stored as a single array is migrated to the bucketed layout on first use, see
+    :meth:`migrate`.
+
     Args:
         key (str): Document key to use for the set.
         collection (:class:`~.collection.Collection`): The :class:`~.collection.Collection` where the
             set belongs.
+        num_buckets (int, optional): **VOLATILE** This API is subject to change at any time.  Number of arrays
+            the set's values are hashed into.  Defaults to None (the set is stored as a single array).
+
+    Raises:
+        :class:`~couchbase.exceptions.InvalidArgumentException`: If ``num_buckets`` is not a positive int.
 
     """
 
     def __init__(self,
                  key,  # type: str
-                 collection  # type: Collection
+                 collection,  # type: Collection
+                 num_buckets=None  # type: Optional[int]
                  ) -> None:
+        if num_buckets is not None and (not isinstance(num_buckets, int) or isinstance(num_buckets, bool)
+                                        or num_buckets < 1):
+            raise InvalidArgumentException(message='num_buckets must be a positive int.')
         self._key = key
         self._collection = collection
+        self._num_buckets = num_buckets
 
     @BlockingWrapper.datastructure_op(create_type=list)
     def _get(self) -> List:
@@ -393,6 +643,63 @@ class CouchbaseSet:
         """
         return self._collection.get(self._key)
 
+    def _value_path(self,
+                    value  # type: Any
+                    ) -> str:
+        if self._num_buckets is None:
+            return ''
+        return bucket_path(value, self._num_buckets)
+
+    def _mutate(self,
+                ops  # type: Iterable[Spec]
+                ) -> None:
+        if self._num_buckets is None:
+            self._collection.mutate_in(self._key, ops)
+            return
+        try:
+            self._collection.mutate_in(self._key, ops)
+        except DocumentNotFoundException:
+            try:
+                self._collection.insert(self._key, {path: [] for path in bucket_paths(self._num_buckets)})
+            except DocumentExistsException:
+                pass
+            self._collection.mutate_in(self._key, ops)
+        except (PathMismatchException, PathNotFoundException):
+            # the document is not in the bucketed layout yet
+            self.migrate()
+            self._collection.mutate_in(self._key, ops)
+
+    def _lookup_buckets(self,
+                        specs  # type: Tuple[Spec, ...]
+                        ) -> Optional[LookupInResult]:
+        """
+        Looks up paths of the bucket arrays, migrating the document to the bucketed layout first if a bucket array
+        is missing.  Returns None if the set does not exist.
+        """
+        try:
+            sd_res = self._collection.lookup_in(self._key, specs)
+            if not all(sd_res.exists(idx) for idx in range(len(specs))):
+                self.migrate()
+                sd_res = self._collection.lookup_in(self._key, specs)
+        except DocumentNotFoundException:
+            return None
+        return sd_res
+
+    def _get_bucket(self,
+                    value  # type: Any
+                    ) -> Tuple[List[Any], Optional[int], str]:
+        """
+        Returns the values of the array ``value`` belongs to, the document's CAS and the array's path.
+        """
+        if self._num_buckets is None:
+            sd_res = self._get()
+            return sd_res.content_as[list], sd_res.cas, ''
+        path = bucket_path(value, self._num_buckets)
+        sd_res = self._lookup_buckets((subdoc_get(path),))
+        if sd_res is None:
+            return [], None, path
+        return sd_res.value[0].get('value', None) or [], sd_res.cas, path
+
     @BlockingWrapper.datastructure_op(create_type=list)
     def add(self,
             value  # type: Any
@@ -408,12 +715,68 @@ class CouchbaseSet:
 
         """
         try:
-            op = array_addunique('', value)
-            self._collection.mutate_in(self._key, (op,))
+            op = array_addunique(self._value_path(value), value)
+            self._mutate((op,))
             return True
         except PathExistsException:
             return False
 
+    def add_all(self,
+                values  # type: Iterable[Any]
+                ) -> int:
+        """Adds the items that do not exist in the set yet.  Up to 16 items are added with a single sub-document
+        mutation.
+
+        Args:
+            values (Iterable[Any]): The values to add, JSON primitives (str, int, float, bool or None).
+
+        Returns:
+            int: The number of values that were added.
+
+        Raises:
+            :class:`~couchbase.exceptions.InvalidArgumentException`: If a value is not a JSON primitive.
+
+        """
+        try:
+            values = unique_values(values)
+        except TypeError:
+            raise InvalidArgumentException(message='CouchbaseSet values must be JSON primitives.') from None
+        if not values:
+            return 0
+        # the mutation fails as a whole if any value exists, so only the values that are not members are sent
+        values = missing_values(values, self._members(values))
+        return sum(self._add_unique_values(chunk) for chunk in chunked(values, MAX_SUBDOC_SPECS))
+
+    def _members(self,
+                 values  # type: List[Any]
+                 ) -> List[Any]:
+        """
+        Returns the members of the set ``values`` could collide with: every member, or the members of the bucket
+        arrays the values belong to for a bucketed set.
+        """
+        if self._num_buckets is None:
+            return self._get().content_as[list]
+        paths = sorted({bucket_path(value, self._num_buckets) for value in values})
+        members = []
+        for chunk in chunked(paths, MAX_SUBDOC_SPECS):
+            sd_res = self._lookup_buckets(tuple(subdoc_get(path) for path in chunk))
+            if sd_res is None:
+                return []
+            for idx in range(len(chunk)):
+                members.extend(sd_res.value[idx].get('value', None) or [])
+        return members
+
+    @BlockingWrapper.datastructure_op(create_type=list)
+    def _add_unique_values(self, values  # type: List[Any]
+                           ) -> int:
+        try:
+            ops = tuple(array_addunique(self._value_path(value), value) for value in values)
+            self._mutate(ops)
+            return len(values)
+        except PathExistsException:
+            # another client added one of the values since the members were read
+            return sum(self.add(value) for value in values)
+
     def remove(self,   # noqa: C901
                value,  # type: Any
                timeout=None  # type: Optional[timedelta]
@@ -436,8 +799,7 @@ class CouchbaseSet:
         start = time.perf_counter()
         time_left = timeout_millis
         while True:
-            sd_res = self._get()
-            list_ = sd_res.content_as[list]
+            list_, cas, path = self._get_bucket(value)
             val_idx = -1
             for idx, v in enumerate(list_):
                 if v == value:
@@ -446,8 +808,8 @@ class CouchbaseSet:
 
             if val_idx >= 0:
                 try:
-                    op = remove(f'[{val_idx}]')
-                    self._collection.mutate_in(self._key, (op,), MutateInOptions(cas=sd_res.cas))
+                    op = remove(f'{path}[{val_idx}]')
+                    self._collection.mutate_in(self._key, (op,), MutateInOptions(cas=cas))
                     break
                 except CasMismatchException:
                     pass
@@ -480,10 +842,9 @@ class CouchbaseSet:
             bool:  True if the specified value exists in the set.  False otherwise.
 
         """
-        list_ = self._get().content_as[list]
+        list_, _, _ = self._get_bucket(value)
         return value in list_
 
-    @BlockingWrapper.datastructure_op(create_type=list)
     def size(self) -> int:
         """Returns the number of items in the set.
 
@@ -491,6 +852,18 @@ class CouchbaseSet:
             int: The number of items in the set.
 
         """
+        if self._num_buckets is None:
+            return self._size()
+        size = 0
+        for paths in chunked(bucket_paths(self._num_buckets), MAX_SUBDOC_SPECS):
+            sd_res = self._lookup_buckets(tuple(count(path) for path in paths))
+            if sd_res is None:
+                return 0
+            size += sum(sd_res.value[idx].get("value", None) for idx in range(len(paths)))
+        return size
+
+    @BlockingWrapper.datastructure_op(create_type=list)
+    def _size(self) -> int:
         op = count('')
         sd_res = self._collection.lookup_in(self._key, (op,))
         return sd_res.value[0].get("value", None)
@@ -503,36 +876,100 @@ class CouchbaseSet:
         except DocumentNotFoundException:
             pass
 
-    @BlockingWrapper.datastructure_op(create_type=list)
     def values(self) -> List[Any]:
         """Returns a list of all the values which exist in the set.
 
         Returns:
             List[Any]: The values that exist in the set.
         """
+        if self._num_buckets is None:
+            list_ = self._get()
+            return list_.content_as[list]
+        try:
+            return set_values(self._collection.get(self._key).value)
+        except DocumentNotFoundException:
+            return []
 
-        list_ = self._get()
-        return list_.content_as[list]
+    def migrate(self,
+                timeout=None  # type: Optional[timedelta]
+                ) -> None:
+        """**VOLATILE** This API is subject to change at any time.
+
+        Converts the set's document to the layout of this instance: one array per bucket if the set was created with
+        ``num_buckets``, a single array otherwise.  A set stored with a different number of buckets is rehashed.
+        Values are preserved and the document is replaced with a CAS check, so concurrent modifications are not lost.
+
+        Args:
+            timeout (timedelta, optional): Amount of time allowed when attempting
+                to migrate the set.  Defaults to 10 seconds.
+
+        Raises:
+            :class:`~couchbase.exceptions.UnAmbiguousTimeoutException`: If the set could not be migrated within the
+                timeout due to concurrent modifications.
+        """
+        if timeout is None:
+            timeout = timedelta(seconds=10)
+
+        deadline = time.monotonic() + timeout.total_seconds()
+        attempt = 0
+        while True:
+            try:
+                res = self._collection.get(self._key)
+            except DocumentNotFoundException:
+                return
+            content = set_layout(res.value, self._num_buckets)
+            if content is None:
+                return
+            try:
+                self._collection.replace(self._key, content, ReplaceOptions(cas=res.cas))
+                return
+            except CasMismatchException:
+                pass
+
+            time_left = deadline - time.monotonic()
+            if time_left <= 0:
+                raise UnAmbiguousTimeoutException(message="Unable to migrate the CouchbaseSet.")
+            time.sleep(jittered_backoff(attempt, time_left))
+            attempt += 1
 
 
 class CouchbaseQueue:
     """
     CouchbaseQueue provides a simplified interface for storing a queue within a Couchbase document.
 
+    With ``num_shards`` the queue is meant to be used as a work queue by many concurrent producers and consumers:
+    items are spread across ``num_shards`` documents (``<key>::0`` to ``<key>::<num_shards - 1>``), producers push to
+    a random shard and consumers that lose a CAS race on a shard move on to the next shard instead of waiting.  Items
+    are then only popped in FIFO order per shard.
+
     Args:
         key (str): Document key to use for the queue.
         collection (:class:`~.collection.Collection`): The :class:`~.collection.Collection` where the
             queue belongs.
+        num_shards (int, optional): **VOLATILE** This API is subject to change at any time.  Number of documents
+            the queue's items are spread across.  Defaults to None (the queue is stored in the ``key`` document).
+
+    Raises:
+        :class:`~couchbase.exceptions.InvalidArgumentException`: If ``num_shards`` is not a positive int.
 
     """
 
     def __init__(self,
                  key,  # type: str
-                 collection  # type: Collection
+                 collection,  # type: Collection
+                 num_shards=None  # type: Optional[int]
                  ) -> None:
+        if num_shards is not None and (not isinstance(num_shards, int) or isinstance(num_shards, bool)
+                                       or num_shards < 1):
+            raise InvalidArgumentException(message='num_shards must be a positive int.')
         self._key = key
         self._collection = collection
         self._full_queue = None
+        self._num_shards = num_shards
+        if num_shards is None:
+            self._shard_keys = [key]
+        else:
+            self._shard_keys = [f'{key}::{idx}' for idx in range(num_shards)]
 
     @BlockingWrapper.datastructure_op(create_type=list)
     def _get(self) -> List:
@@ -541,7 +978,50 @@ class CouchbaseQueue:
         """
         return self._collection.get(self._key)
 
-    @BlockingWrapper.datastructure_op(create_type=list)
+    def _get_shard(self,
+                   shard_key  # type: str
+                   ) -> List[Any]:
+        try:
+            return self._collection.get(shard_key).content_as[list]
+        except DocumentNotFoundException:
+            return []
+
+    def _mutate_shard(self,
+                      shard_key,  # type: str
+                      ops  # type: Iterable[Spec]
+                      ) -> None:
+        try:
+            self._collection.mutate_in(shard_key, ops)
+        except DocumentNotFoundException:
+            try:
+                self._collection.insert(shard_key, [])
+            except DocumentExistsException:
+                pass
+            self._collection.mutate_in(shard_key, ops)
+
+    def _pop_shard(self,
+                   shard_key,  # type: str
+                   max_items  # type: int
+                   ) -> List[Any]:
+        """
+        Removes up to ``max_items`` items from the front of a shard with one lookup and one CAS-checked mutation.
+
+        Raises:
+            :class:`~couchbase.exceptions.CasMismatchException`: If the shard was modified in between.
+        """
+        specs = tuple(subdoc_get(f'[-{idx}]') for idx in range(1, max_items + 1))
+        try:
+            sd_res = self._collection.lookup_in(shard_key, specs)
+        except DocumentNotFoundException:
+            return []
+        values = [sd_res.value[idx].get('value', None) for idx in range(max_items) if sd_res.exists(idx)]
+        if not values:
+            return []
+        self._collection.mutate_in(shard_key,
+                                   tuple(remove('[-1]') for _ in values),
+                                   MutateInOptions(cas=sd_res.cas))
+        return values
+
     def push(self,
              value  # type: JSONType
              ) -> None:
@@ -551,8 +1031,24 @@ class CouchbaseQueue:
             value (JSONType): The value to push onto the queue.
 
         """
-        op = array_prepend('', value)
-        self._collection.mutate_in(self._key, (op,))
+        self.push_many((value,))
+
+    def push_many(self,
+                  values  # type: Iterable[JSONType]
+                  ) -> None:
+        """Adds items to the back of the queue with a single sub-document mutation.  The items are popped in the
+        order provided.
+
+        Args:
+            values (Iterable[JSONType]): The values to push onto the queue.
+
+        """
+        values = list(values)
+        if not values:
+            return
+        shard_key = random.choice(self._shard_keys)  # nosec
+        # items are popped from the end of the array
+        self._mutate_shard(shard_key, (array_prepend('', *reversed(values)),))
 
     def pop(self,
             timeout=None  # type: Optional[timedelta]
@@ -566,45 +1062,91 @@ class CouchbaseQueue:
 
         Returns:
             Any: The value that was removed from the front of the queue.
-        """
-
-        if timeout is None:
-            timeout = timedelta(seconds=10)
 
-        timeout_millis = timeout.total_seconds() * 1000
+        Raises:
+            :class:`~couchbase.exceptions.QueueEmpty`: If the queue is empty.
+            :class:`~couchbase.exceptions.UnAmbiguousTimeoutException`: If no item could be removed within the
+                timeout due to concurrent modifications.
+        """
+        return self.pop_many(1, timeout=timeout)[0]
 
-        interval_millis = float(50)
-        start = time.perf_counter()
-        time_left = timeout_millis
-        while True:
-            try:
-                op = subdoc_get('[-1]')
-                sd_res = self._collection.lookup_in(self._key, (op,))
-                val = sd_res.value[0].get("value", None)
+    def pop_many(self,
+                 max_items,  # type: int
+                 timeout=None  # type: Optional[timedelta]
+                 ) -> List[Any]:
+        """Removes up to ``max_items`` items from the front of the queue.  Up to 16 items are removed from a
+        document with a single sub-document lookup and mutation.
 
-                try:
-                    op = remove('[-1]')
-                    self._collection.mutate_in(self._key, (op,), MutateInOptions(cas=sd_res.cas))
-                    return val
-                except CasMismatchException:
-                    pass
+        If another client modified the queue in between (CAS mismatch), a sharded queue moves on to the next shard.
+        Once every shard had a conflict, the pop is retried after a short random backoff.
 
-                interval_millis += 500
-                if interval_millis > 1000:
-                    interval_millis = 1000
+        Args:
+            max_items (int): The maximum number of items to remove.
+            timeout (timedelta, optional): Amount of time allowed when attempting
+                to remove the values.  Defaults to 10 seconds.
 
-                time_left = timeout_millis - ((time.perf_counter() - start) * 1000)
-                if interval_millis > time_left:
-                    interval_millis = time_left
+        Returns:
+            List[Any]: The values that were removed, at least one value.  Fewer than ``max_items`` values are returned
+            if the queue did not hold more items.
 
-                if time_left <= 0:
-                    raise UnAmbiguousTimeoutException(message="Unable to pop from the CouchbaseQueue.")
+        Raises:
+            :class:`~couchbase.exceptions.InvalidArgumentException`: If ``max_items`` is not a positive int.
+            :class:`~couchbase.exceptions.QueueEmpty`: If the queue is empty.
+            :class:`~couchbase.exceptions.UnAmbiguousTimeoutException`: If no item could be removed within the
+                timeout due to concurrent modifications.
+        """
+        if not isinstance(max_items, int) or isinstance(max_items, bool) or max_items < 1:
+            raise InvalidArgumentException(message='max_items must be a positive int.')
+        if timeout is None:
+            timeout = timedelta(seconds=10)
 
-                time.sleep(interval_millis / 1000)
-            except PathNotFoundException:
+        deadline = time.monotonic() + timeout.total_seconds()
+        num_shards = len(self._shard_keys)
+        items = []
+        attempt = 0
+        while True:
+            conflicts = 0
+            start = random.randrange(num_shards)  # nosec
+            for offset in range(num_shards):
+                shard_key = self._shard_keys[(start + offset) % num_shards]
+                popped, conflicted = self._drain_shard(shard_key, max_items - len(items))
+                items.extend(popped)
+                conflicts += conflicted
+                if len(items) >= max_items:
+                    return items
+
+            if items:
+                return items
+            if conflicts == 0:
                 raise QueueEmpty('No items to remove from the queue')
 
-    @BlockingWrapper.datastructure_op(create_type=list)
+            time_left = deadline - time.monotonic()
+            if time_left <= 0:
+                raise UnAmbiguousTimeoutException(message="Unable to pop from the CouchbaseQueue.")
+            time.sleep(jittered_backoff(attempt, time_left))
+            attempt += 1
+
+    def _drain_shard(self,
+                     shard_key,  # type: str
+                     max_items  # type: int
+                     ) -> Tuple[List[Any], bool]:
+        """**INTERNAL**
+
+        Pops up to ``max_items`` items from the shard, in batches of up to 16 items.  Returns the items and whether
+        the shard was modified concurrently (CAS mismatch), in which case fewer items may have been popped.
+        """
+        items = []
+        while len(items) < max_items:
+            batch_size = min(max_items - len(items), MAX_SUBDOC_SPECS)
+            try:
+                popped = self._pop_shard(shard_key, batch_size)
+            except CasMismatchException:
+                return items, True
+            items.extend(popped)
+            if len(popped) < batch_size:
+                break
+        return items, False
+
     def size(self) -> int:
         """Returns the number of items in the queue.
 
@@ -612,6 +1154,19 @@ class CouchbaseQueue:
             int: The number of items in the queue.
 
         """
+        if self._num_shards is None:
+            return self._size()
+        size = 0
+        for shard_key in self._shard_keys:
+            try:
+                sd_res = self._collection.lookup_in(shard_key, (count(''),))
+            except DocumentNotFoundException:
+                continue
+            size += sd_res.value[0].get("value", None)
+        return size
+
+    @BlockingWrapper.datastructure_op(create_type=list)
+    def _size(self) -> int:
         op = count('')
         sd_res = self._collection.lookup_in(self._key, (op,))
         return sd_res.value[0].get("value", None)
@@ -619,14 +1174,42 @@ class CouchbaseQueue:
     def clear(self) -> None:
         """Clears the queue.
         """
-        try:
-            self._collection.remove(self._key)
-        except DocumentNotFoundException:
-            pass
+        for shard_key in self._shard_keys:
+            try:
+                self._collection.remove(shard_key)
+            except DocumentNotFoundException:
+                pass
+
+    def iter_paged(self,
+                   page_size=MAX_SUBDOC_SPECS  # type: int
+                   ) -> Generator[Any, None, None]:
+        """**VOLATILE** This API is subject to change at any time.
+
+        Iterates over the queue in the same order as iterating the queue directly, looking up ``page_size`` items
+        per request instead of fetching entire documents.  Items are yielded as soon as the first page is read and at
+        most one page is held in memory.
+
+        Each page is read separately, so items pushed or popped during the iteration may be skipped or yielded twice.
+
+        Args:
+            page_size (int, optional): The number of items looked up per request, at most 16.  Defaults to 16.
+
+        Returns:
+            Generator: A generator of the queue's items.
+
+        Raises:
+            :class:`~couchbase.exceptions.InvalidArgumentException`: If ``page_size`` is not an int between 1 and 16.
+        """
+        validate_page_size(page_size)
+        return (v for shard_key in self._shard_keys
+                for v in _iter_array_pages(self._collection, shard_key, page_size))
 
     def __iter__(self):
-        list_ = self._get()
-        self._full_queue = (v for v in list_.content_as[list])
+        if self._num_shards is None:
+            list_ = self._get()
+            self._full_queue = (v for v in list_.content_as[list])
+        else:
+            self._full_queue = (v for shard_key in self._shard_keys for v in self._get_shard(shard_key))
         return self
 
     def __next__(self):
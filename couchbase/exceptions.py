@@ -1865,6 +1865,9 @@ class ErrorMapper:
                         base_exc,  # type: exception
                         mapping=None,  # type: Dict[str, CouchbaseException]
                         ) -> CouchbaseException:
+        if not isinstance(base_exc, exception):
+            # raised by the SDK (e.g. when dispatching a queued operation), passed to an errback as is
+            return base_exc
         exc_class = None
         err_ctx = None
         ctx = base_exc.error_context()
@@ -16,3 +16,4 @@
 from .wrappers import BlockingWrapper  # noqa: F401
 from .wrappers import decode_replicas  # noqa: F401
 from .wrappers import decode_value  # noqa: F401
+from .wrappers import encode_value  # noqa: F401
@@ -379,6 +379,9 @@ class AnalyticsQuery:
 
 
 class AnalyticsRequestLogic:
+    # APIs that submit requests from an event loop cannot wait for a rate limiter permit, requests are shed instead
+    _WAIT_FOR_RATE_LIMITER = True
+
     def __init__(self,
                  connection,
                  query_params,
@@ -391,6 +394,7 @@ class AnalyticsRequestLogic:
         self.row_factory = row_factory
         self._streaming_result = None
         self._default_serializer = kwargs.pop('default_serializer', DefaultJsonSerializer())
+        self._rate_limiter = kwargs.pop('rate_limiter', None)
         self._serializer = None
         self._started_streaming = False
         self._done_streaming = False
@@ -434,6 +438,9 @@ class AnalyticsRequestLogic:
         if self.done_streaming:
             return
 
+        permit = None
+        if self._rate_limiter is not None:
+            permit = self._rate_limiter.acquire_permit('analytics', blocking=self._WAIT_FOR_RATE_LIMITER)
         self._started_streaming = True
         analytics_kwargs = {
             'conn': self._connection,
@@ -449,7 +456,16 @@ class AnalyticsRequestLogic:
         if errback:
             analytics_kwargs['errback'] = errback
 
-        self._streaming_result = analytics_query(**analytics_kwargs)
+        if permit is None:
+            self._streaming_result = analytics_query(**analytics_kwargs)
+            return
+
+        try:
+            streaming_result = analytics_query(**analytics_kwargs)
+        except BaseException:
+            permit.release()
+            raise
+        self._streaming_result = self._rate_limiter.track_stream(streaming_result, permit)
 
     def __iter__(self):
         raise NotImplementedError(
@@ -0,0 +1,134 @@
+#  Copyright 2016-2022. Couchbase, Inc.
+#  All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License")
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import time
+from typing import (Any,
+                    Dict,
+                    List,
+                    Optional,
+                    Tuple)
+from urllib.parse import urlparse
+
+log = logging.getLogger(__name__)
+
+
+class BootstrapCache:
+    """
+    **INTERNAL**
+
+    On-disk cache of the nodes found in the last cluster config seen for a connection string.
+
+    Cold starts bootstrap against the cached nodes, which skips DNS SRV resolution and seed nodes that are no
+    longer part of the cluster.  The cache is a single JSON file that can be shared by several processes,
+    updates are written to a temporary file and atomically moved into place.
+
+    Args:
+        path (str): Path to the cache file.
+        ttl (float, optional): Entries older than ``ttl`` seconds are ignored. Defaults to one day.
+    """
+
+    DEFAULT_TTL = 24 * 60 * 60
+
+    def __init__(self,
+                 path,  # type: str
+                 ttl=None  # type: Optional[float]
+                 ):
+        self._path = os.path.abspath(os.path.expanduser(path))
+        self._ttl = ttl if ttl is not None else self.DEFAULT_TTL
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    @staticmethod
+    def cache_key(connstr,  # type: str
+                  network=None  # type: Optional[str]
+                  ) -> str:
+        # the nodes' addresses differ per network (alternate addresses), so the network is part of the key
+        return hashlib.sha256(f'{connstr}|{network or "default"}'.encode('utf-8')).hexdigest()
+
+    def _load(self) -> Dict[str, Any]:
+        try:
+            with open(self._path, 'r') as cache_file:
+                entries = json.load(cache_file)
+            return entries if isinstance(entries, dict) else {}
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as ex:
+            log.debug('Ignoring unreadable bootstrap cache %s: %s', self._path, ex)
+            return {}
+
+    def _store(self, entries  # type: Dict[str, Any]
+               ) -> None:
+        # only needed when the cache is written, keeps tempfile out of `import couchbase.cluster`
+        import tempfile
+        cache_dir = os.path.dirname(self._path)
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=cache_dir, prefix='.pycbc-bootstrap-')
+            try:
+                with os.fdopen(fd, 'w') as tmp_file:
+                    json.dump(entries, tmp_file)
+                os.replace(tmp_path, self._path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except OSError as ex:
+            # the cache is an optimization, failing to write it should not fail the application
+            log.debug('Unable to write bootstrap cache %s: %s', self._path, ex)
+
+    def get(self, key  # type: str
+            ) -> Optional[List[Tuple[str, str]]]:
+        """
+        Returns the cached nodes for the key, None if there is no (fresh) entry.
+        """
+        entry = self._load().get(key, None)
+        if not entry or time.time() - entry.get('updated', 0) > self._ttl:
+            return None
+        nodes = [tuple(node) for node in entry.get('nodes', []) if len(node) == 2]
+        return nodes or None
+
+    def put(self,
+            key,  # type: str
+            nodes  # type: List[Tuple[str, str]]
+            ) -> None:
+        if not nodes:
+            return
+        entries = self._load()
+        entries[key] = {'nodes': [list(node) for node in nodes], 'updated': time.time()}
+        self._store(entries)
+
+    def invalidate(self, key  # type: str
+                   ) -> None:
+        entries = self._load()
+        if entries.pop(key, None) is not None:
+            self._store(entries)
+
+    @staticmethod
+    def seed_connstr(connstr,  # type: str
+                     nodes  # type: List[Tuple[str, str]]
+                     ) -> str:
+        """
+        Returns the connection string with its hosts replaced by the cached nodes.
+        """
+        parsed = urlparse(connstr)
+        hosts = ','.join(f'[{host}]:{port}' if ':' in host else f'{host}:{port}' for host, port in nodes)
+        return f'{parsed.scheme}://{hosts}{parsed.path}'
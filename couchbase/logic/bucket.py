@@ -20,11 +20,14 @@ from typing import (TYPE_CHECKING,
 
 from couchbase.diagnostics import ServiceType
 from couchbase.exceptions import InvalidArgumentException
+from couchbase.logic.hedging import HedgedReads
 from couchbase.options import forward_args
 from couchbase.pycbc_core import (diagnostics_operation,
                                   open_or_close_bucket,
                                   operations)
+from couchbase.rate_limiter import ClientRateLimiter
 from couchbase.result import PingResult
+from couchbase.retry import RetryStrategy
 from couchbase.serializer import Serializer
 from couchbase.transcoder import Transcoder
 
@@ -38,6 +41,7 @@ class BucketLogic:
         self._connection = cluster.connection
         self._bucket_name = bucket_name
         self._connected = False
+        self._kv_connections = None
 
     @property
     def connection(self):
@@ -46,6 +50,13 @@ class BucketLogic:
         """
         return self._connection
 
+    @property
+    def kv_connections(self):
+        """
+        **INTERNAL**
+        """
+        return self._kv_connections
+
     @property
     def default_transcoder(self) -> Optional[Transcoder]:
         return self._cluster.default_transcoder
@@ -54,6 +65,34 @@ class BucketLogic:
     def default_serializer(self) -> Optional[Serializer]:
         return self._cluster.default_serializer
 
+    @property
+    def rate_limiter(self) -> Optional[ClientRateLimiter]:
+        """
+        **INTERNAL**
+        """
+        return self._cluster.rate_limiter
+
+    @property
+    def retry_strategy(self) -> Optional[RetryStrategy]:
+        """
+        **INTERNAL**
+        """
+        return self._cluster.retry_strategy
+
+    @property
+    def kv_timeout(self) -> float:
+        """
+        **INTERNAL**
+        """
+        return self._cluster.kv_timeout
+
+    @property
+    def hedged_reads(self) -> HedgedReads:
+        """
+        **INTERNAL**
+        """
+        return self._cluster.hedged_reads
+
     @property
     def connected(self) -> bool:
         """
@@ -68,8 +107,10 @@ class BucketLogic:
         """
         return self._bucket_name
 
-    def _open_or_close_bucket(self, open_bucket=True, **kwargs):
-        if not self._connection:
+    def _open_or_close_bucket(self, open_bucket=True, conn=None, **kwargs):
+        if conn is None:
+            conn = self._connection
+        if not conn:
             raise RuntimeError("No cluster connection")
 
         bucket_kwargs = {
@@ -84,7 +125,7 @@ class BucketLogic:
         if errback:
             bucket_kwargs['errback'] = errback
 
-        return open_or_close_bucket(self._connection, self._bucket_name, **bucket_kwargs)
+        return open_or_close_bucket(conn, self._bucket_name, **bucket_kwargs)
 
     def _set_connected(self, value):
         self._connected = value
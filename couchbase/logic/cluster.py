@@ -17,9 +17,11 @@ from __future__ import annotations
 
 import logging
 import warnings
+from datetime import timedelta
 from typing import (TYPE_CHECKING,
                     Any,
                     Dict,
+                    List,
                     Optional,
                     Tuple,
                     Union)
@@ -28,7 +30,10 @@ from urllib.parse import parse_qs, urlparse
 from couchbase import PYCBC_VERSION
 from couchbase.auth import CertificateAuthenticator, PasswordAuthenticator
 from couchbase.diagnostics import ServiceType
-from couchbase.exceptions import InvalidArgumentException
+from couchbase.exceptions import FeatureUnavailableException, InvalidArgumentException
+from couchbase.logic.bootstrap_cache import BootstrapCache
+from couchbase.logic.hedging import HedgedReads
+from couchbase.metrics import HistogramMeter
 from couchbase.options import (ClusterOptions,
                                ClusterTimeoutOptions,
                                ClusterTracingOptions,
@@ -44,20 +49,31 @@ from couchbase.pycbc_core import (close_connection,
                                   management_operation,
                                   mgmt_operations,
                                   operations)
+from couchbase.rate_limiter import ClientRateLimiter
 from couchbase.result import (ClusterInfoResult,
                               DiagnosticsResult,
                               PingResult)
+from couchbase.retry import RetryStrategy
 from couchbase.serializer import DefaultJsonSerializer, Serializer
 from couchbase.transcoder import JSONTranscoder, Transcoder
 
 if TYPE_CHECKING:
-    from couchbase.options import DiagnosticsOptions, PingOptions
+    from couchbase.options import (DiagnosticsOptions,
+                                   PingOptions,
+                                   WarmUpOptions)
 
 log = logging.getLogger(__name__)
 
 
 class ClusterLogic:
 
+    # APIs that shard key-value traffic over several connections (ClusterOptions.num_connections) override this
+    _SUPPORTS_CONNECTION_SHARDING = False
+    # APIs that bootstrap from cached cluster nodes (ClusterOptions.bootstrap_cache_path) override this
+    _SUPPORTS_BOOTSTRAP_CACHE = False
+    # the C++ core's default key-value timeout (seconds)
+    _DEFAULT_KV_TIMEOUT = 2.5
+
     _LEGACY_CONNSTR_QUERY_ARGS = {
         'ssl': {'tls_verify': TLSVerifyMode.to_str},
         'certpath': {'cert_path': lambda x: x},
@@ -138,6 +154,8 @@ class ClusterLogic:
                 timeout_opts[key] = cluster_opts.pop(key)
         if timeout_opts:
             cluster_opts['timeout_options'] = timeout_opts
+        kv_timeout = timeout_opts.get('key_value_timeout', None)
+        self._kv_timeout = kv_timeout / 1e6 if kv_timeout else self._DEFAULT_KV_TIMEOUT
 
         tracing_opts = {}
         for key in ClusterTracingOptions.get_allowed_option_keys(use_transform_keys=True):
@@ -154,9 +172,33 @@ class ClusterLogic:
         if not self._default_transcoder:
             self._default_transcoder = JSONTranscoder()
 
+        self._num_connections = cluster_opts.pop('num_connections', 1)
+        if self._num_connections < 1:
+            raise InvalidArgumentException(message='num_connections must be greater than 0.')
+        if self._num_connections > 1 and not self._SUPPORTS_CONNECTION_SHARDING:
+            raise FeatureUnavailableException(
+                message=f'num_connections is not supported by {type(self).__name__}.')
+
+        bootstrap_cache_path = cluster_opts.pop('bootstrap_cache_path', None)
+        self._bootstrap_cache = None
+        if bootstrap_cache_path:
+            if not self._SUPPORTS_BOOTSTRAP_CACHE:
+                raise FeatureUnavailableException(
+                    message=f'bootstrap_cache_path is not supported by {type(self).__name__}.')
+            self._bootstrap_cache = BootstrapCache(bootstrap_cache_path)
+
+        self._rate_limiter = cluster_opts.pop('rate_limiter', None)
+        if self._rate_limiter is not None and not isinstance(self._rate_limiter, ClientRateLimiter):
+            raise InvalidArgumentException(message='rate_limiter must be a ClientRateLimiter.')
+
+        self._retry_strategy = cluster_opts.pop('retry_strategy', None)
+        if self._retry_strategy is not None and not isinstance(self._retry_strategy, RetryStrategy):
+            raise InvalidArgumentException(message='retry_strategy must be a RetryStrategy.')
+
         cluster_opts['user_agent_extra'] = PYCBC_VERSION
 
         self._cluster_opts = cluster_opts
+        self._hedged_reads = HedgedReads(cluster_opts.get('meter', None))
         self._connection = None
         self._cluster_info = None
         self._server_version = None
@@ -196,6 +238,36 @@ class ClusterLogic:
     def default_serializer(self) -> Optional[Serializer]:
         return self._default_serializer
 
+    @property
+    def rate_limiter(self) -> Optional[ClientRateLimiter]:
+        """
+        **INTERNAL**
+        """
+        return self._rate_limiter
+
+    @property
+    def retry_strategy(self) -> Optional[RetryStrategy]:
+        """
+        **INTERNAL**
+        """
+        return self._retry_strategy
+
+    @property
+    def kv_timeout(self) -> float:
+        """
+        **INTERNAL**
+
+        The default timeout (seconds) of key-value operations.
+        """
+        return self._kv_timeout
+
+    @property
+    def hedged_reads(self) -> HedgedReads:
+        """
+        **INTERNAL**
+        """
+        return self._hedged_reads
+
     @property
     def serializer(self) -> Serializer:
         return self._serializer
@@ -234,6 +306,49 @@ class ClusterLogic:
             return False
         return None
 
+    def metrics_snapshot(self,
+                         reset=False  # type: Optional[bool]
+                         ) -> Dict[str, Any]:
+        """Export the operation latency percentiles recorded by the built-in
+        :class:`~couchbase.metrics.HistogramMeter`.
+
+        The meter must have been provided via the ``meter`` cluster option.  See
+        :meth:`~couchbase.metrics.HistogramMeter.snapshot` for details on the returned format.
+
+        Args:
+            reset (bool, optional): If True, the histograms are reset after the snapshot is taken.
+                Defaults to False.
+
+        Returns:
+            Dict[str, Any]: Counts and p50/p90/p99/p99.9 latencies (in microseconds) per service and operation.
+
+        Raises:
+            :class:`~couchbase.exceptions.FeatureUnavailableException`: If the cluster was not created with a
+                :class:`~couchbase.metrics.HistogramMeter`.
+        """
+        meter = self._cluster_opts.get('meter', None)
+        if not isinstance(meter, HistogramMeter):
+            raise FeatureUnavailableException(
+                message='Metrics snapshots require the cluster to be created with a HistogramMeter.')
+        return meter.snapshot(reset=reset)
+
+    def hedged_read_stats(self,
+                          reset=False  # type: Optional[bool]
+                          ) -> Dict[str, Any]:
+        """Export the counters of the hedged reads (see :meth:`~couchbase.collection.Collection.get_hedged`)
+        executed against this cluster.
+
+        Args:
+            reset (bool, optional): If True, the counters are reset after the snapshot is taken.
+                Defaults to False.
+
+        Returns:
+            Dict[str, Any]: The number of ``reads``, ``hedged`` reads (a replica read was sent), ``replica_wins``
+            (the replica responded first) and ``failed`` reads, the ``hedge_rate`` and ``replica_win_rate`` and the
+            current ``hedge_delay_us`` learned per bucket and percentile.
+        """
+        return self._hedged_reads.snapshot(reset=reset)
+
     def _parse_connection_string(self, connection_str  # type: str
                                  ) -> Tuple[str, Dict[str, Any], Dict[str, Any]]:
         """Parse the provided connection string
@@ -334,7 +449,42 @@ class ClusterLogic:
 
         return get_connection_info(self._connection)
 
-    def _connect_cluster(self, **kwargs):
+    def _bootstrap_cache_key(self) -> str:
+        return BootstrapCache.cache_key(self._connstr, self._cluster_opts.get('network', None))
+
+    def _get_cached_seed_connstr(self) -> Optional[str]:
+        """
+        **INTERNAL**
+
+        Returns the connection string with the nodes of the cached cluster config as seeds, None if there is no
+        bootstrap cache or no entry for this cluster.
+        """
+        if self._bootstrap_cache is None:
+            return None
+        nodes = self._bootstrap_cache.get(self._bootstrap_cache_key())
+        if not nodes:
+            return None
+        return BootstrapCache.seed_connstr(self._connstr, nodes)
+
+    def _update_bootstrap_cache(self, conn  # type: Any
+                                ) -> None:
+        """
+        **INTERNAL**
+        """
+        if self._bootstrap_cache is None or conn is None:
+            return
+        info = get_connection_info(conn)
+        if info:
+            self._bootstrap_cache.put(self._bootstrap_cache_key(), info.get('nodes', None))
+
+    def _invalidate_bootstrap_cache(self) -> None:
+        """
+        **INTERNAL**
+        """
+        if self._bootstrap_cache is not None:
+            self._bootstrap_cache.invalidate(self._bootstrap_cache_key())
+
+    def _connect_cluster(self, connstr=None, **kwargs):
 
         connect_kwargs = {
             'auth': self._auth,
@@ -350,7 +500,7 @@ class ClusterLogic:
             connect_kwargs['errback'] = errback
 
         return create_connection(
-            self._connstr, **connect_kwargs,
+            connstr or self._connstr, **connect_kwargs,
         )
 
     def _close_cluster(self, **kwargs):
@@ -427,9 +577,20 @@ class ClusterLogic:
              *opts,  # type: PingOptions
              **kwargs  # type: Any
              ) -> Optional[PingResult]:
+        return self._ping(self._connection, *opts, **kwargs)
+
+    def _ping(self,
+              conn,  # type: Any
+              *opts,  # type: PingOptions
+              **kwargs  # type: Any
+              ) -> Optional[PingResult]:
+        """
+        **INTERNAL**
 
+        Pings the cluster using the provided connection.
+        """
         ping_kwargs = {
-            'conn': self._connection,
+            'conn': conn,
             'op_type': operations.PING.value
         }
 
@@ -458,6 +619,42 @@ class ClusterLogic:
         ping_kwargs.update(final_args)
         return diagnostics_operation(**ping_kwargs)
 
+    def _get_warm_up_args(self,
+                          *opts,  # type: WarmUpOptions
+                          **kwargs  # type: Any
+                          ) -> Tuple[List[str], int, List[str], Optional[timedelta]]:
+        """
+        **INTERNAL**
+
+        Validates the warm up options, returns the service types, connections per node, bucket names and the
+        timeout for each ping.
+        """
+        final_args = forward_args(kwargs, *opts)
+        service_types = final_args.get('service_types', None)
+        if not service_types:
+            service_types = [ServiceType.KeyValue, ServiceType.Query, ServiceType.Search]
+        if not isinstance(service_types, (list, set, tuple)):
+            raise InvalidArgumentException('Service types must be a list/set.')
+        service_types = [st.value if isinstance(st, ServiceType) else st for st in service_types]
+
+        connections_per_node = final_args.get('connections_per_node', 1)
+        if not isinstance(connections_per_node, int) or connections_per_node < 1:
+            raise InvalidArgumentException('connections_per_node must be a positive integer.')
+        max_http_connections = self._cluster_opts.get('max_http_connections', None)
+        if max_http_connections is not None and connections_per_node > max_http_connections:
+            raise InvalidArgumentException(f'connections_per_node ({connections_per_node}) cannot exceed '
+                                           f'max_http_connections ({max_http_connections}).')
+
+        bucket_names = final_args.get('bucket_names', None) or []
+        if isinstance(bucket_names, str):
+            bucket_names = [bucket_names]
+
+        timeout = final_args.get('timeout', None)
+        if timeout is not None:
+            # forwarded as microseconds
+            timeout = timedelta(microseconds=timeout)
+        return service_types, connections_per_node, list(bucket_names), timeout
+
     def diagnostics(self,
                     *opts,  # type: DiagnosticsOptions
                     **kwargs  # type: Dict[str, Any]
@@ -13,22 +13,36 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 import json
+import time
 from datetime import timedelta
 from typing import (TYPE_CHECKING,
                     Any,
+                    Callable,
                     Dict,
                     Iterable,
+                    List,
                     Optional,
+                    Tuple,
                     Union)
 
+from couchbase import profiling
 from couchbase._utils import timedelta_as_microseconds
-from couchbase.exceptions import InvalidArgumentException
+from couchbase.exceptions import (CouchbaseException,
+                                  DocumentUnretrievableException,
+                                  ErrorMapper,
+                                  InternalSDKException,
+                                  InvalidArgumentException,
+                                  UnAmbiguousTimeoutException)
+from couchbase.exceptions import exception as CouchbaseBaseException
+from couchbase.logic.hedging import HedgedRead
 from couchbase.logic.options import DeltaValueBase, SignedInt64Base
+from couchbase.logic.wrappers import decode_value, encode_value
 from couchbase.options import forward_args
 from couchbase.pycbc_core import (binary_operation,
                                   kv_operation,
                                   operations,
                                   subdoc_operation)
+from couchbase.rate_limiter import kv_payload_size
 from couchbase.result import (CounterResult,
                               ExistsResult,
                               GetReplicaResult,
@@ -36,6 +50,7 @@ from couchbase.result import (CounterResult,
                               LookupInResult,
                               MutateInResult,
                               MutationResult)
+from couchbase.retry import RetryRequest
 from couchbase.subdocument import (Spec,
                                    StoreSemantics,
                                    SubDocOp)
@@ -46,6 +61,7 @@ if TYPE_CHECKING:
     from couchbase.options import (AppendOptions,
                                    DecrementOptions,
                                    ExistsOptions,
+                                   GetHedgedOptions,
                                    IncrementOptions,
                                    InsertOptions,
                                    MutateInOptions,
@@ -56,6 +72,17 @@ if TYPE_CHECKING:
                                    TouchOptions,
                                    UnlockOptions,
                                    UpsertOptions)
+    from couchbase.retry import RetryStrategy
+
+
+# retrying a read after an ambiguous error cannot apply a change twice
+_IDEMPOTENT_OPERATIONS = frozenset(op.value for op in (operations.GET,
+                                                       operations.GET_ANY_REPLICA,
+                                                       operations.GET_ALL_REPLICAS,
+                                                       operations.EXISTS,
+                                                       operations.LOOKUP_IN))
+# the core's timeout resolution, a retry is not sent with less time remaining
+_MIN_RETRY_TIMEOUT = 0.001
 
 
 class CollectionLogic:
@@ -67,6 +94,12 @@ class CollectionLogic:
         self._scope = scope
         self._collection_name = name
         self._connection = scope.connection
+        # set by APIs that shard key-value operations across several connections
+        self._kv_connections = None
+        rate_limiter = scope.rate_limiter
+        self._rate_limiter = rate_limiter if rate_limiter is not None and rate_limiter.limits_kv else None
+        self._retry_strategy = scope.retry_strategy
+        self._kv_timeout = scope.kv_timeout if self._retry_strategy is not None else None
 
     @property
     def connection(self):
@@ -100,6 +133,227 @@ class CollectionLogic:
             "collection_name": self.name
         }
 
+    def _kv_operation(self, **kwargs  # type: Dict[str, Any]
+                      ) -> Any:
+        return self._rate_limited(kv_operation, **kwargs)
+
+    def _kv_connection(self,
+                       key  # type: str
+                       ) -> Optional[Any]:
+        """**INTERNAL**
+
+        Returns the connection the key's operations are routed to, None if key-value operations are not sharded
+        across several connections.
+        """
+        kv_connections = self._kv_connections
+        if kv_connections is None:
+            return None
+        return kv_connections[hash(key) % len(kv_connections)]
+
+    def _rate_limited(self,
+                      operation,  # type: Callable[..., Any]
+                      **kwargs  # type: Dict[str, Any]
+                      ) -> Any:
+        """**INTERNAL**
+
+        Dispatches the key-value operation once admitted by the cluster's
+        :class:`~couchbase.rate_limiter.ClientRateLimiter` (if any).
+        """
+        if self._kv_connections is not None:
+            # route by key so all operations on a document use the same connection
+            kwargs['conn'] = self._kv_connection(kwargs['key'])
+        rate_limiter = self._rate_limiter
+        if rate_limiter is not None:
+            delay = rate_limiter.acquire_kv(num_bytes=kv_payload_size(kwargs.get('value', None)))
+            if delay > 0:
+                if 'callback' in kwargs.get('op_args', {}):
+                    # non-blocking APIs (results are delivered via callbacks) cannot sleep on the event loop
+                    rate_limiter.dispatch_later(delay, self._dispatch_delayed_kv_operation, operation, kwargs)
+                    return None
+                time.sleep(delay)
+        return self._dispatch_kv_operation(operation, kwargs)
+
+    def _dispatch_delayed_kv_operation(self,
+                                       operation,  # type: Callable[..., Any]
+                                       kwargs  # type: Dict[str, Any]
+                                       ) -> None:
+        """**INTERNAL**
+
+        Dispatches a key-value operation of the non-blocking APIs that was queued by the rate limiter.  The caller
+        is no longer waiting for an exception raised while dispatching it, the operation's errback completes it
+        instead.
+        """
+        try:
+            self._dispatch_kv_operation(operation, kwargs)
+        except Exception as ex:
+            # as the non-blocking APIs do for operations that fail when they are called
+            if not isinstance(ex, (CouchbaseException, TypeError, ValueError)):
+                ex = InternalSDKException(str(ex))
+            kwargs['op_args']['errback'](ex)
+
+    def _dispatch_kv_operation(self,
+                               operation,  # type: Callable[..., Any]
+                               kwargs  # type: Dict[str, Any]
+                               ) -> Any:
+        retry_strategy = self._retry_strategy
+        if retry_strategy is not None:
+            return self._dispatch_with_retries(retry_strategy, operation, kwargs)
+        return self._send_kv_operation(operation, kwargs)
+
+    def _dispatch_with_retries(self,
+                               retry_strategy,  # type: RetryStrategy
+                               operation,  # type: Callable[..., Any]
+                               kwargs  # type: Dict[str, Any]
+                               ) -> Any:
+        """**INTERNAL**
+
+        Dispatches the key-value operation, attempts that failed are retried as decided by the cluster's
+        :class:`~couchbase.retry.RetryStrategy`.  The operation's timeout bounds all of its attempts.
+        """
+        op_type = kwargs['op_type']
+        op_name = operations(op_type).name.lower()
+        idempotent = op_type in _IDEMPOTENT_OPERATIONS
+        retry_strategy.on_request('kv')
+        op_args = kwargs.setdefault('op_args', {})
+        deadline = self._get_op_deadline(op_args)
+        if 'callback' in op_args:
+            return self._dispatch_with_async_retries(retry_strategy, operation, kwargs, op_name, idempotent, deadline)
+
+        attempt = 1
+        failed = None
+        while True:
+            try:
+                ret = self._send_kv_operation(operation, kwargs)
+                exc = ErrorMapper.build_exception(ret) if isinstance(ret, CouchbaseBaseException) else None
+            except CouchbaseException as ex:
+                ret = None
+                exc = ex
+            if exc is None:
+                if failed is not None:
+                    retry_strategy.on_retry_success(failed)
+                return ret
+            failed = RetryRequest('kv', op_name, attempt, idempotent, exc)
+            delay = self._get_retry_delay(retry_strategy, failed, op_args, deadline)
+            if delay is None:
+                if ret is None:
+                    raise exc
+                return ret
+            time.sleep(delay)
+            attempt += 1
+
+    def _dispatch_with_async_retries(self,
+                                     retry_strategy,  # type: RetryStrategy
+                                     operation,  # type: Callable[..., Any]
+                                     kwargs,  # type: Dict[str, Any]
+                                     op_name,  # type: str
+                                     idempotent,  # type: bool
+                                     deadline  # type: float
+                                     ) -> Any:
+        """**INTERNAL**
+
+        Retries of the non-blocking APIs (results are delivered via callbacks) are scheduled on the retry
+        strategy's dispatch thread so the event loop never sleeps.
+        """
+        op_args = kwargs['op_args']
+        callback = op_args['callback']
+        errback = op_args['errback']
+        attempt = 1
+        failed = None
+
+        def on_ok(res):
+            if failed is not None:
+                retry_strategy.on_retry_success(failed)
+            callback(res)
+
+        def on_err(exc):
+            nonlocal attempt, failed
+            ex = exc if isinstance(exc, CouchbaseException) else ErrorMapper.build_exception(exc)
+            failed = RetryRequest('kv', op_name, attempt, idempotent, ex)
+            delay = self._get_retry_delay(retry_strategy, failed, op_args, deadline)
+            if delay is None:
+                errback(exc)
+                return
+            attempt += 1
+            retry_strategy.dispatch_later(delay, retry, failed, exc)
+
+        def retry(request, exc):
+            try:
+                self._send_kv_operation(operation, kwargs)
+            except Exception:
+                # the retry could not be sent, complete the request with the error that was retried
+                retry_strategy.on_retry_abandoned(request)
+                errback(exc)
+
+        op_args['callback'] = on_ok
+        op_args['errback'] = on_err
+        return self._send_kv_operation(operation, kwargs)
+
+    def _get_op_deadline(self,
+                         op_args  # type: Dict[str, Any]
+                         ) -> float:
+        """**INTERNAL**
+
+        Returns the time (:func:`time.monotonic`) at which the operation's timeout, or the cluster's key-value
+        timeout if the operation does not provide one, elapses.
+        """
+        timeout = op_args.get('timeout', None)
+        if timeout:
+            return time.monotonic() + timeout / 1e6
+        # only cached if the operations are retried
+        kv_timeout = self._kv_timeout
+        return time.monotonic() + (kv_timeout if kv_timeout is not None else self._scope.kv_timeout)
+
+    def _get_retry_delay(self,
+                         retry_strategy,  # type: RetryStrategy
+                         request,  # type: RetryRequest
+                         op_args,  # type: Dict[str, Any]
+                         deadline  # type: float
+                         ) -> Optional[float]:
+        """**INTERNAL**
+
+        Returns the delay before the failed request is retried (the retry's timeout is set to the time that remains),
+        None if it is not retried.
+        """
+        if deadline - time.monotonic() < _MIN_RETRY_TIMEOUT:
+            # the operation timed out, the strategy is not consulted so the retry is not accounted for
+            return None
+        delay = retry_strategy.retry_after(request)
+        if delay is None:
+            return None
+        if isinstance(delay, timedelta):
+            delay = delay.total_seconds()
+        delay = max(float(delay), 0.0)
+        if not self._set_retry_timeout(op_args, deadline, delay):
+            # the backoff uses up the operation's timeout, the granted retry (possibly a node's probe) is not sent
+            retry_strategy.on_retry_abandoned(request)
+            return None
+        return delay
+
+    @staticmethod
+    def _set_retry_timeout(op_args,  # type: Dict[str, Any]
+                           deadline,  # type: float
+                           delay  # type: float
+                           ) -> bool:
+        """**INTERNAL**
+
+        Sets the timeout of a retry sent after ``delay`` seconds to the time that remains of the operation's timeout.
+        Returns False if less than a millisecond (the core's timeout resolution) would remain.
+        """
+        remaining = deadline - time.monotonic() - delay
+        if remaining < _MIN_RETRY_TIMEOUT:
+            return False
+        op_args['timeout'] = int(remaining * 1e6)
+        return True
+
+    def _send_kv_operation(self,
+                           operation,  # type: Callable[..., Any]
+                           kwargs  # type: Dict[str, Any]
+                           ) -> Any:
+        profiler = profiling._PROFILER
+        if profiler is not None and operation is kv_operation:
+            return profiler.profile_kv_operation(kv_operation, **kwargs)
+        return operation(**kwargs)
+
     def _get_mutation_options(self,
                               *opts,  # type: MutationOptions
                               **kwargs  # type: Dict[str, Any]
@@ -140,10 +394,10 @@ class CollectionLogic:
                 f"Maximum of 16 projects allowed. Provided {len(projections)}"
             )
         op_type = operations.GET.value
-        return kv_operation(**self._get_connection_args(),
-                            key=key,
-                            op_type=op_type,
-                            op_args=kwargs)
+        return self._kv_operation(**self._get_connection_args(),
+                                  key=key,
+                                  op_type=op_type,
+                                  op_args=kwargs)
 
     def get_any_replica(
         self,
@@ -164,10 +418,88 @@ class CollectionLogic:
             :class:`~.exceptions.DocumentNotFoundException`: If the provided document key does not exist.
         """
         op_type = operations.GET_ANY_REPLICA.value
-        return kv_operation(**self._get_connection_args(),
-                            key=key,
-                            op_type=op_type,
-                            op_args=kwargs)
+        return self._kv_operation(**self._get_connection_args(),
+                                  key=key,
+                                  op_type=op_type,
+                                  op_args=kwargs)
+
+    def _get_hedged_args(self,
+                         *opts,  # type: GetHedgedOptions
+                         **kwargs,  # type: Dict[str, Any]
+                         ) -> Tuple[Dict[str, Any], float, float]:
+        """**INTERNAL**
+
+        Returns the arguments of the active and replica reads, the hedge delay (in seconds) and the time
+        (:func:`time.monotonic`) after which the read is failed if neither request responded.
+        """
+        final_args = forward_args(kwargs, *opts)
+        final_args['transcoder'] = final_args.get('transcoder', None) or self.default_transcoder
+        hedged_reads = self._scope.hedged_reads
+        hedge_delay = hedged_reads.hedge_delay(self._scope.bucket_name,
+                                               hedge_delay=final_args.pop('hedge_delay', None),
+                                               percentile=final_args.pop('hedge_percentile', None))
+        return final_args, hedge_delay, self._get_op_deadline(final_args) + hedged_reads.WAIT_SLACK
+
+    def _send_hedged_read(self,
+                          key,  # type: str
+                          read,  # type: HedgedRead
+                          is_replica=False,  # type: Optional[bool]
+                          **kwargs,  # type: Dict[str, Any]
+                          ) -> None:
+        """**INTERNAL**
+
+        Sends the active (or replica) read of a hedged read, the response is delivered to the
+        :class:`~couchbase.logic.hedging.HedgedRead`.
+        """
+        callbacks = read.callbacks(is_replica=is_replica)
+        if callbacks is None:
+            # the active responded while the hedge was being sent
+            return
+        callback, errback = callbacks
+        kwargs.pop('transcoder', None)
+        try:
+            # the API classes override get/get_any_replica with their blocking/async variants
+            if is_replica:
+                # a single replica read, rotated over the bucket's replicas
+                CollectionLogic.get_any_replica(self,
+                                                key,
+                                                callback=callback,
+                                                errback=errback,
+                                                replica_index=self._scope.hedged_reads.next_replica_index(),
+                                                **kwargs)
+            else:
+                CollectionLogic.get(self, key, callback=callback, errback=errback, **kwargs)
+        except CouchbaseException as ex:
+            errback(ex)
+
+    def _expire_hedged_read(self,
+                            read  # type: HedgedRead
+                            ) -> None:
+        """**INTERNAL**
+
+        Fails a hedged read whose responses did not arrive within the operation's timeout.
+        """
+        read.expire(UnAmbiguousTimeoutException(message='Hedged read did not complete within the operation timeout.'))
+
+    def _hedged_read_result(self,
+                            read,  # type: HedgedRead
+                            transcoder,  # type: Transcoder
+                            ) -> GetReplicaResult:
+        """**INTERNAL**
+
+        Decodes the winning response of a completed hedged read.
+        """
+        self._scope.hedged_reads.record(read)
+        if read.exception is not None:
+            if isinstance(read.exception, CouchbaseException):
+                raise read.exception
+            raise ErrorMapper.build_exception(read.exception)
+        res = read.result
+        res.raw_result['value'] = decode_value(transcoder,
+                                               res.raw_result.get('value', None),
+                                               res.raw_result.get('flags', None))
+        res.raw_result['is_replica'] = read.is_replica
+        return GetReplicaResult(res)
 
     def get_all_replicas(
         self,
@@ -188,10 +520,42 @@ class CollectionLogic:
             :class:`~.exceptions.DocumentNotFoundException`: If the provided document key does not exist.
         """
         op_type = operations.GET_ALL_REPLICAS.value
-        return kv_operation(**self._get_connection_args(),
-                            key=key,
-                            op_type=op_type,
-                            op_args=kwargs)
+        return self._kv_operation(**self._get_connection_args(),
+                                  key=key,
+                                  op_type=op_type,
+                                  op_args=kwargs)
+
+    @staticmethod
+    def _validate_replica_count(name,  # type: str
+                                value  # type: Optional[int]
+                                ) -> Optional[int]:
+        """**INTERNAL**
+
+        Validates the ``max_responses`` and ``quorum`` options of the replica read operations.
+        """
+        if value is not None and (not isinstance(value, int) or isinstance(value, bool) or value < 1):
+            raise InvalidArgumentException(message=f'{name} must be a positive int.')
+        return value
+
+    @staticmethod
+    def _select_replica_quorum(replicas,  # type: Iterable[GetReplicaResult]
+                               ) -> GetReplicaResult:
+        """**INTERNAL**
+
+        Returns the response of the document version (CAS) a quorum of the copies returned, the active's response
+        if it is one of them.  The binding completes a quorum read once a version reached the quorum, its responses
+        then are the largest group.
+
+        Raises:
+            :class:`~couchbase.exceptions.DocumentUnretrievableException`: If no copy responded.
+        """
+        by_cas = {}  # type: Dict[int, List[GetReplicaResult]]
+        for res in replicas:
+            by_cas.setdefault(res.cas, []).append(res)
+        if not by_cas:
+            raise DocumentUnretrievableException(message='No copy of the document responded.')
+        group = max(by_cas.values(), key=len)
+        return next((r for r in group if not r.is_replica), group[0])
 
     def exists(
         self,
@@ -200,7 +564,7 @@ class CollectionLogic:
         **kwargs,  # type: Any
     ) -> Optional[ExistsResult]:
         op_type = operations.EXISTS.value
-        return kv_operation(
+        return self._kv_operation(
             **self._get_connection_args(), key=key, op_type=op_type, op_args=forward_args(kwargs, *opts)
         )
 
@@ -213,9 +577,9 @@ class CollectionLogic:
     ) -> Optional[MutationResult]:
         final_args = self._get_mutation_options(*opts, **kwargs)
         transcoder = final_args.pop('transcoder', self.default_transcoder)
-        transcoded_value = transcoder.encode_value(value)
+        transcoded_value = encode_value(transcoder, value)
         op_type = operations.INSERT.value
-        return kv_operation(
+        return self._kv_operation(
             **self._get_connection_args(),
             key=key,
             value=transcoded_value,
@@ -232,10 +596,10 @@ class CollectionLogic:
     ) -> Optional[MutationResult]:
         final_args = self._get_mutation_options(*opts, **kwargs)
         transcoder = final_args.pop('transcoder', self.default_transcoder)
-        transcoded_value = transcoder.encode_value(value)
+        transcoded_value = encode_value(transcoder, value)
 
         op_type = operations.UPSERT.value
-        return kv_operation(
+        return self._kv_operation(
             **self._get_connection_args(),
             key=key,
             value=transcoded_value,
@@ -258,10 +622,10 @@ class CollectionLogic:
             )
 
         transcoder = final_args.pop('transcoder', self.default_transcoder)
-        transcoded_value = transcoder.encode_value(value)
+        transcoded_value = encode_value(transcoder, value)
 
         op_type = operations.REPLACE.value
-        return kv_operation(
+        return self._kv_operation(
             **self._get_connection_args(),
             key=key,
             value=transcoded_value,
@@ -276,7 +640,7 @@ class CollectionLogic:
                ) -> Optional[MutationResult]:
         final_args = self._get_mutation_options(*opts, **kwargs)
         op_type = operations.REMOVE.value
-        return kv_operation(
+        return self._kv_operation(
             **self._get_connection_args(), key=key, op_type=op_type, op_args=final_args
         )
 
@@ -288,7 +652,7 @@ class CollectionLogic:
               ) -> Optional[MutationResult]:
         kwargs["expiry"] = expiry
         op_type = operations.TOUCH.value
-        return kv_operation(
+        return self._kv_operation(
             **self._get_connection_args(), key=key, op_type=op_type, op_args=forward_args(kwargs, *opts)
         )
 
@@ -297,7 +661,7 @@ class CollectionLogic:
                       **kwargs,  # type: Any
                       ) -> Optional[GetResult]:
         op_type = operations.GET_AND_TOUCH.value
-        return kv_operation(
+        return self._kv_operation(
             **self._get_connection_args(), key=key, op_type=op_type, op_args=kwargs
         )
 
@@ -306,7 +670,7 @@ class CollectionLogic:
                      **kwargs,  # type: Any
                      ) -> Optional[GetResult]:
         op_type = operations.GET_AND_LOCK.value
-        return kv_operation(
+        return self._kv_operation(
             **self._get_connection_args(), key=key, op_type=op_type, op_args=kwargs
         )
 
@@ -319,7 +683,7 @@ class CollectionLogic:
         op_type = operations.UNLOCK.value
         final_args = forward_args(kwargs, *opts)
         final_args['cas'] = cas
-        return kv_operation(
+        return self._kv_operation(
             **self._get_connection_args(),
             key=key,
             op_type=op_type,
@@ -333,7 +697,8 @@ class CollectionLogic:
                   ) -> Optional[LookupInResult]:
         op_type = operations.LOOKUP_IN.value
         final_args = forward_args(kwargs)
-        return subdoc_operation(
+        return self._rate_limited(
+            subdoc_operation,
             **self._get_connection_args(),
             key=key,
             spec=spec,
@@ -410,7 +775,8 @@ class CollectionLogic:
                 final_spec.append(s)
 
         op_type = operations.MUTATE_IN.value
-        return subdoc_operation(
+        return self._rate_limited(
+            subdoc_operation,
             **self._get_connection_args(),
             key=key,
             spec=final_spec,
@@ -458,10 +824,11 @@ class CollectionLogic:
         op_type = operations.INCREMENT.value
         final_args['initial'] = int(final_args['initial'])
         final_args['delta'] = int(final_args['delta'])
-        return binary_operation(**self._get_connection_args(),
-                                key=key,
-                                op_type=op_type,
-                                op_args=final_args)
+        return self._rate_limited(binary_operation,
+                                  **self._get_connection_args(),
+                                  key=key,
+                                  op_type=op_type,
+                                  op_args=final_args)
 
     def decrement(
         self,
@@ -481,10 +848,11 @@ class CollectionLogic:
         op_type = operations.DECREMENT.value
         final_args['initial'] = int(final_args['initial'])
         final_args['delta'] = int(final_args['delta'])
-        return binary_operation(**self._get_connection_args(),
-                                key=key,
-                                op_type=op_type,
-                                op_args=final_args)
+        return self._rate_limited(binary_operation,
+                                  **self._get_connection_args(),
+                                  key=key,
+                                  op_type=op_type,
+                                  op_args=final_args)
 
     def append(
         self,
@@ -504,11 +872,12 @@ class CollectionLogic:
                 "The value provided must of type str, bytes or bytearray.")
 
         op_type = operations.APPEND.value
-        return binary_operation(**self._get_connection_args(),
-                                key=key,
-                                op_type=op_type,
-                                value=value,
-                                op_args=final_args)
+        return self._rate_limited(binary_operation,
+                                  **self._get_connection_args(),
+                                  key=key,
+                                  op_type=op_type,
+                                  value=value,
+                                  op_args=final_args)
 
     def prepend(
         self,
@@ -528,8 +897,9 @@ class CollectionLogic:
                 "The value provided must of type str, bytes or bytearray.")
 
         op_type = operations.PREPEND.value
-        return binary_operation(**self._get_connection_args(),
-                                key=key,
-                                op_type=op_type,
-                                value=value,
-                                op_args=final_args)
+        return self._rate_limited(binary_operation,
+                                  **self._get_connection_args(),
+                                  key=key,
+                                  op_type=op_type,
+                                  value=value,
+                                  op_args=final_args)
@@ -0,0 +1,281 @@
+#  Copyright 2016-2022. Couchbase, Inc.
+#  All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License")
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import json
+import random
+import zlib
+from itertools import islice
+from typing import (Any,
+                    Dict,
+                    Iterable,
+                    Iterator,
+                    List,
+                    Mapping,
+                    Optional,
+                    Tuple,
+                    Union)
+
+from couchbase.exceptions import DocumentExistsException, InvalidArgumentException
+from couchbase.subdocument import Spec, count
+from couchbase.subdocument import exists as subdoc_exists
+from couchbase.subdocument import get as subdoc_get
+from couchbase.subdocument import remove as subdoc_remove
+from couchbase.subdocument import upsert
+
+# the maximum number of specs a single sub-document request can carry
+MAX_SUBDOC_SPECS = 16
+
+
+def chunked(values,  # type: Iterable[Any]
+            size=MAX_SUBDOC_SPECS  # type: int
+            ) -> Iterator[List[Any]]:
+    """**INTERNAL**
+
+    Yields lists of at most ``size`` values.
+    """
+    values = iter(values)
+    while True:
+        chunk = list(islice(values, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def validate_page_size(page_size  # type: int
+                       ) -> None:
+    """**INTERNAL**
+
+    Raises:
+        :class:`~couchbase.exceptions.InvalidArgumentException`: If ``page_size`` is not an int between 1 and 16.
+    """
+    if (not isinstance(page_size, int) or isinstance(page_size, bool)
+            or not 1 <= page_size <= MAX_SUBDOC_SPECS):
+        raise InvalidArgumentException(message=f'page_size must be an int between 1 and {MAX_SUBDOC_SPECS}.')
+
+
+def page_specs(start,  # type: int
+               page_size  # type: int
+               ) -> Tuple[Spec, ...]:
+    """**INTERNAL**
+
+    Returns the lookups for the array elements ``start`` to ``start + page_size - 1``.
+    """
+    return tuple(subdoc_get(f'[{idx}]') for idx in range(start, start + page_size))
+
+
+def unique_values(values  # type: Iterable[Any]
+                  ) -> List[Any]:
+    """**INTERNAL**
+
+    Returns the values without duplicates, in order.  Values are compared by type as well, JSON distinguishes
+    ``1`` and ``true``.
+    """
+    return list({(type(v), v): v for v in values}.values())
+
+
+def missing_values(values,  # type: List[Any]
+                   members  # type: Iterable[Any]
+                   ) -> List[Any]:
+    """**INTERNAL**
+
+    Returns the values that are not among ``members``, compared by type as well (see :func:`unique_values`).
+    """
+    existing = {(type(v), v) for v in members if not isinstance(v, (dict, list))}
+    return [v for v in values if (type(v), v) not in existing]
+
+
+def jittered_backoff(attempt,  # type: int
+                     time_left  # type: float
+                     ) -> float:
+    """**INTERNAL**
+
+    Returns the seconds to sleep after a CAS conflict: a random value between 0 and 1ms * 2 ** attempt (at most
+    100ms), so contending clients do not retry in lockstep.
+    """
+    return max(min(random.uniform(0, min(0.1, 0.001 * 2 ** attempt)), time_left), 0)  # nosec
+
+
+def bucket_paths(num_buckets  # type: int
+                 ) -> List[str]:
+    """**INTERNAL**
+
+    Returns the paths of the arrays a bucketed set stores its values in.
+    """
+    return [f'b{idx}' for idx in range(num_buckets)]
+
+
+def bucket_path(value,  # type: Any
+                num_buckets  # type: int
+                ) -> str:
+    """**INTERNAL**
+
+    Returns the path of the array holding ``value`` in a bucketed set.  Values are hashed by their compact JSON
+    encoding, so every client maps a value to the same bucket.
+    """
+    encoded = json.dumps(value, separators=(',', ':')).encode('utf-8')
+    return f'b{zlib.crc32(encoded) % num_buckets}'
+
+
+def set_values(content  # type: Union[List[Any], Dict[str, List[Any]]]
+               ) -> List[Any]:
+    """**INTERNAL**
+
+    Returns the values of a set document in either layout, a single array or an object of bucket arrays.
+    """
+    if isinstance(content, list):
+        return content
+    return [value for bucket in content.values() for value in bucket]
+
+
+def set_layout(content,  # type: Union[List[Any], Dict[str, List[Any]]]
+               num_buckets  # type: Optional[int]
+               ) -> Optional[Union[List[Any], Dict[str, List[Any]]]]:
+    """**INTERNAL**
+
+    Returns the set document ``content`` converted to the layout for ``num_buckets`` (a single array if None), or
+    None if the content already has that layout.
+    """
+    if num_buckets is None:
+        return None if isinstance(content, list) else set_values(content)
+    paths = bucket_paths(num_buckets)
+    if isinstance(content, dict) and content.keys() == set(paths):
+        return None
+    buckets = {path: [] for path in paths}
+    for value in set_values(content):
+        buckets[bucket_path(value, num_buckets)].append(value)
+    return buckets
+
+
+class MapBatchLogic:
+    """**INTERNAL**
+
+    Records the mutations of a map batch and plans the sub-document specs flushing them.
+    """
+
+    def __init__(self, cb_map  # type: Any
+                 ) -> None:
+        self._map = cb_map
+        self._key = cb_map._key
+        self._collection = cb_map._collection
+        # mapkey -> (True, value) for a key to set, (False, None) for a key to remove
+        self._pending = {}  # type: Dict[str, Tuple[bool, Any]]
+
+    @property
+    def pending(self) -> int:
+        """
+            int: The number of keys with mutations that have not been flushed yet.
+        """
+        return len(self._pending)
+
+    def add(self,
+            mapkey,  # type: str
+            value  # type: Any
+            ) -> None:
+        """Records setting a specific key to the specified value in the map.
+
+        Args:
+            mapkey (str): The key to set.
+            value (JSONType): The value to set.
+
+        """
+        self._pending[mapkey] = (True, value)
+
+    def update(self,
+               mapping  # type: Union[Mapping[str, Any], Iterable[Tuple[str, Any]]]
+               ) -> None:
+        """Records setting the keys of the provided mapping to their values in the map.
+
+        Args:
+            mapping (Union[Mapping[str, JSONType], Iterable[Tuple[str, JSONType]]]): The keys and values to set.
+
+        """
+        for mapkey, value in dict(mapping).items():
+            self.add(mapkey, value)
+
+    def remove(self,
+               mapkey  # type: str
+               ) -> None:
+        """Records removing a specific key from the map.  Keys that are not in the map when the batch is flushed are
+        ignored.
+
+        Args:
+            mapkey (str): The key in the map to remove.
+
+        """
+        self._pending[mapkey] = (False, None)
+
+    def discard(self) -> None:
+        """Discards the mutations that have not been flushed yet.
+        """
+        self._pending.clear()
+
+    def _chunks(self) -> List[List[Tuple[str, Tuple[bool, Any]]]]:
+        return list(chunked(list(self._pending.items()), MAX_SUBDOC_SPECS))
+
+    @staticmethod
+    def _needs_lookup(chunk,  # type: List[Tuple[str, Tuple[bool, Any]]]
+                      cas  # type: Optional[int]
+                      ) -> bool:
+        # removing a key that does not exist fails the whole mutation, so the removed keys are looked up first
+        return cas is None or any(not is_set for _, (is_set, _) in chunk)
+
+    @staticmethod
+    def _has_upserts(chunk  # type: List[Tuple[str, Tuple[bool, Any]]]
+                     ) -> bool:
+        return any(is_set for _, (is_set, _) in chunk)
+
+    @staticmethod
+    def _lookup_specs(chunk  # type: List[Tuple[str, Tuple[bool, Any]]]
+                      ) -> Tuple[Spec, ...]:
+        specs = tuple(subdoc_exists(mapkey) for mapkey, (is_set, _) in chunk if not is_set)
+        return specs or (count(''),)
+
+    @staticmethod
+    def _mutation_specs(chunk,  # type: List[Tuple[str, Tuple[bool, Any]]]
+                        sd_res  # type: Optional[Any]
+                        ) -> Tuple[Spec, ...]:
+        specs = []
+        lookup_idx = 0
+        for mapkey, (is_set, value) in chunk:
+            if is_set:
+                specs.append(upsert(mapkey, value))
+                continue
+            if sd_res is not None and sd_res.exists(lookup_idx):
+                specs.append(subdoc_remove(mapkey))
+            lookup_idx += 1
+        return tuple(specs)
+
+    def _create_missing_map(self, chunk  # type: List[Tuple[str, Tuple[bool, Any]]]
+                            ) -> bool:
+        """
+        Creates the map's document, which did not exist when the chunk was flushed, so the chunk can be re-applied.
+        Returns False if the chunk only removes keys, there is nothing to flush then.  The async API overrides this
+        with a coroutine.
+        """
+        if not self._has_upserts(chunk):
+            return False
+        try:
+            self._collection.insert(self._key, {})
+        except DocumentExistsException:
+            # created concurrently
+            pass
+        return True
+
+    def _applied(self, chunk  # type: List[Tuple[str, Tuple[bool, Any]]]
+                 ) -> None:
+        for mapkey, entry in chunk:
+            # keep mutations recorded again while the chunk was flushed
+            if self._pending.get(mapkey) is entry:
+                del self._pending[mapkey]
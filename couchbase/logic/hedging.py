@@ -0,0 +1,251 @@
+#  Copyright 2016-2022. Couchbase, Inc.
+#  All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License")
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+from __future__ import annotations
+
+import threading
+import time
+from datetime import timedelta
+from typing import (TYPE_CHECKING,
+                    Any,
+                    Callable,
+                    Dict,
+                    Optional,
+                    Tuple,
+                    Union)
+
+from couchbase.exceptions import (AmbiguousTimeoutException,
+                                  CouchbaseException,
+                                  DocumentLockedException,
+                                  ErrorMapper,
+                                  InvalidArgumentException,
+                                  RequestCanceledException,
+                                  ServiceUnavailableException,
+                                  TemporaryFailException,
+                                  TimeoutException,
+                                  UnAmbiguousTimeoutException)
+from couchbase.metrics import HistogramMeter
+
+if TYPE_CHECKING:
+    from couchbase.metrics import CouchbaseMeter
+
+
+class HedgedReads:
+    """
+    **INTERNAL**
+
+    Per cluster state of hedged reads (see :meth:`~couchbase.collection.Collection.get_hedged`): the hedge delay
+    learned from the cluster's :class:`~couchbase.metrics.HistogramMeter` and the hedging counters.
+    """
+
+    DEFAULT_HEDGE_DELAY = 0.1
+    DEFAULT_PERCENTILE = 95.0
+    # a percentile computed from a handful of samples is noise, use the default delay until the meter has seen more
+    MIN_SAMPLES = 100
+    # hedging requests that respond within a millisecond only adds load
+    MIN_HEDGE_DELAY = 0.001
+    # copying the histogram for every read is too expensive, the learned delay is refreshed periodically
+    REFRESH_INTERVAL = 1.0
+    # both reads are bound by the operation's timeout, the slack covers delivering their responses
+    WAIT_SLACK = 1.0
+
+    def __init__(self,
+                 meter=None  # type: Optional[CouchbaseMeter]
+                 ):
+        self._meter = meter if isinstance(meter, HistogramMeter) else None
+        self._lock = threading.Lock()
+        self._learned = {}  # type: Dict[Tuple[str, float], Tuple[float, float]]
+        self._replica_index = 0
+        self._reset_counters()
+
+    def _reset_counters(self) -> None:
+        self._reads = 0
+        self._hedged = 0
+        self._replica_wins = 0
+        self._failed = 0
+
+    def hedge_delay(self,
+                    bucket_name,  # type: str
+                    hedge_delay=None,  # type: Optional[Union[timedelta, float]]
+                    percentile=None,  # type: Optional[float]
+                    ) -> float:
+        """
+        Returns the number of seconds to wait for the active before a replica read is sent.
+
+        Raises:
+            :class:`~couchbase.exceptions.InvalidArgumentException`: If the provided delay or percentile is invalid.
+        """
+        if hedge_delay is not None:
+            if isinstance(hedge_delay, timedelta):
+                hedge_delay = hedge_delay.total_seconds()
+            if not isinstance(hedge_delay, (int, float)) or hedge_delay < 0:
+                raise InvalidArgumentException(message='hedge_delay must be a non-negative timedelta or float.')
+            return float(hedge_delay)
+
+        if percentile is None:
+            percentile = self.DEFAULT_PERCENTILE
+        if not isinstance(percentile, (int, float)) or not 0 < percentile < 100:
+            raise InvalidArgumentException(message='hedge_percentile must be between 0 and 100 (exclusive).')
+        if self._meter is None:
+            return self.DEFAULT_HEDGE_DELAY
+
+        key = (bucket_name, float(percentile))
+        now = time.monotonic()
+        learned = self._learned.get(key, None)
+        if learned is not None and now - learned[1] < self.REFRESH_INTERVAL:
+            return learned[0]
+
+        delay = self.DEFAULT_HEDGE_DELAY
+        hist = self._meter.operation_histogram('kv', 'get', bucket_name=bucket_name)
+        if hist is not None and hist.count >= self.MIN_SAMPLES:
+            delay = max(hist.percentile(percentile) / 1e6, self.MIN_HEDGE_DELAY)
+        self._learned[key] = (delay, now)
+        return delay
+
+    def next_replica_index(self) -> int:
+        """
+        Returns the index of the replica the next hedge reads from.  The binding takes the index modulo the bucket's
+        replica count, the hedges rotate over the replicas.
+        """
+        with self._lock:
+            self._replica_index += 1
+            return self._replica_index
+
+    def record(self,
+               read  # type: HedgedRead
+               ) -> None:
+        with self._lock:
+            self._reads += 1
+            if read.hedged:
+                self._hedged += 1
+            if read.exception is not None:
+                self._failed += 1
+            elif read.is_replica:
+                self._replica_wins += 1
+
+    def snapshot(self,
+                 reset=False  # type: Optional[bool]
+                 ) -> Dict[str, Any]:
+        with self._lock:
+            snapshot = {
+                'reads': self._reads,
+                'hedged': self._hedged,
+                'replica_wins': self._replica_wins,
+                'failed': self._failed,
+                'hedge_rate': self._hedged / self._reads if self._reads else 0.0,
+                'replica_win_rate': self._replica_wins / self._hedged if self._hedged else 0.0,
+                'hedge_delay_us': {f'{bucket}:{pct}': int(delay * 1e6)
+                                   for (bucket, pct), (delay, _) in self._learned.items()},
+            }
+            if reset:
+                self._reset_counters()
+        return snapshot
+
+
+class HedgedRead:
+    """
+    **INTERNAL**
+
+    Collects the responses of a hedged read.  The first successful response wins.  A definitive error from the
+    active (e.g. :class:`~couchbase.exceptions.DocumentNotFoundException`) fails the read, a replica can only win
+    if the active failed with a transient error or timed out.  Otherwise the read fails once every request that
+    was sent failed (the active's error is preferred).  Callbacks are invoked on the C++ core's IO threads,
+    ``on_done`` is called exactly once from the thread completing the read.
+    """
+
+    # errors of the active that a replica's response may still win over
+    TRANSIENT_EXCEPTIONS = (AmbiguousTimeoutException,
+                            DocumentLockedException,
+                            RequestCanceledException,
+                            ServiceUnavailableException,
+                            TemporaryFailException,
+                            TimeoutException,
+                            UnAmbiguousTimeoutException)
+
+    def __init__(self,
+                 on_done  # type: Callable[[HedgedRead], None]
+                 ):
+        self._lock = threading.Lock()
+        self._on_done = on_done
+        self._pending = 0
+        self._done = False
+        self.hedged = False
+        self.result = None  # type: Any
+        self.is_replica = False
+        self.exception = None  # type: Any
+
+    @property
+    def done(self) -> bool:
+        return self._done
+
+    def callbacks(self,
+                  is_replica=False  # type: Optional[bool]
+                  ) -> Optional[Tuple[Callable[[Any], None], Callable[[Any], None]]]:
+        """
+        Returns the (callback, errback) for a request, None if the read already completed and the request does not
+        need to be sent.
+        """
+        with self._lock:
+            if self._done:
+                return None
+            self._pending += 1
+            if is_replica:
+                self.hedged = True
+
+        def on_ok(res):
+            self._complete(res, None, is_replica)
+
+        def on_err(exc):
+            self._complete(None, exc, is_replica)
+
+        return on_ok, on_err
+
+    def expire(self,
+               exc  # type: CouchbaseException
+               ) -> bool:
+        """
+        Fails the read with ``exc`` if it has not completed (e.g. its deadline elapsed), later responses are ignored.
+        Returns True if the read was failed.
+        """
+        with self._lock:
+            if self._done:
+                return False
+            self._done = True
+            self.exception = exc
+        return True
+
+    def _complete(self,
+                  res,  # type: Any
+                  exc,  # type: Any
+                  is_replica  # type: bool
+                  ) -> None:
+        if exc is not None and not isinstance(exc, CouchbaseException):
+            exc = ErrorMapper.build_exception(exc)
+        with self._lock:
+            self._pending -= 1
+            if self._done:
+                return
+            if exc is None:
+                self.result = res
+                self.is_replica = is_replica
+                self.exception = None
+            else:
+                if self.exception is None or not is_replica:
+                    self.exception = exc
+                definitive = not is_replica and not isinstance(exc, self.TRANSIENT_EXCEPTIONS)
+                if self._pending > 0 and not definitive:
+                    return
+            self._done = True
+        self._on_done(self)
@@ -715,6 +715,9 @@ class N1QLQuery:
 
 
 class QueryRequestLogic:
+    # APIs that submit requests from an event loop cannot wait for a rate limiter permit, requests are shed instead
+    _WAIT_FOR_RATE_LIMITER = True
+
     def __init__(self,
                  connection,
                  query_params,
@@ -730,6 +733,7 @@ class QueryRequestLogic:
         self._done_streaming = False
         self._metadata = None
         self._default_serializer = kwargs.pop('default_serializer', DefaultJsonSerializer())
+        self._rate_limiter = kwargs.pop('rate_limiter', None)
         self._serializer = None
 
     @property
@@ -770,6 +774,9 @@ class QueryRequestLogic:
         if self.done_streaming:
             return
 
+        permit = None
+        if self._rate_limiter is not None:
+            permit = self._rate_limiter.acquire_permit('query', blocking=self._WAIT_FOR_RATE_LIMITER)
         self._started_streaming = True
         n1ql_kwargs = {
             'conn': self._connection,
@@ -785,4 +792,13 @@ class QueryRequestLogic:
         if errback:
             n1ql_kwargs['errback'] = errback
 
-        self._streaming_result = n1ql_query(**n1ql_kwargs)
+        if permit is None:
+            self._streaming_result = n1ql_query(**n1ql_kwargs)
+            return
+
+        try:
+            streaming_result = n1ql_query(**n1ql_kwargs)
+        except BaseException:
+            permit.release()
+            raise
+        self._streaming_result = self._rate_limiter.track_stream(streaming_result, permit)
@@ -33,6 +33,7 @@ from couchbase._utils import (timedelta_as_microseconds,
                               timedelta_as_timestamp,
                               validate_bool,
                               validate_int,
+                              validate_io_threads,
                               validate_str)
 from couchbase.exceptions import InvalidArgumentException
 
@@ -46,6 +47,8 @@ if TYPE_CHECKING:
     from couchbase.metrics import CouchbaseMeter
     from couchbase.mutation_state import MutationState
     from couchbase.n1ql import QueryProfile, QueryScanConsistency
+    from couchbase.rate_limiter import ClientRateLimiter
+    from couchbase.retry import RetryStrategy
     from couchbase.search import (Facet,
                                   HighlightStyle,
                                   SearchScanConsistency,
@@ -119,7 +122,8 @@ VALID_MULTI_OPTS = {
     'delta': lambda x: x,
     'initial': lambda x: x,
     'per_key_options': lambda x: x,
-    'return_exceptions': validate_bool
+    'return_exceptions': validate_bool,
+    'max_responses': validate_int
 }
 
 
@@ -541,7 +545,11 @@ class ClusterOptionsBase(dict):
         "trust_store_path": {"trust_store_path": validate_str},
         "cert_path": {"cert_path": validate_str},
         "logging_meter_emit_interval": {"emit_interval": timedelta_as_microseconds},
-        "num_io_threads": {"num_io_threads": validate_int},
+        "num_io_threads": {"num_io_threads": validate_io_threads},
+        "num_connections": {"num_connections": validate_int},
+        "bootstrap_cache_path": {"bootstrap_cache_path": validate_str},
+        "rate_limiter": {"rate_limiter": lambda x: x},
+        "retry_strategy": {"retry_strategy": lambda x: x},
         "transaction_config": {"transaction_config": lambda x: x},
         "tracer": {"tracer": lambda x: x},
         "meter": {"meter": lambda x: x},
@@ -586,6 +594,11 @@ class ClusterOptionsBase(dict):
         meter=None,  # type: Optional[CouchbaseMeter]
         dns_nameserver=None,  # type: Optional[str]
         dns_port=None,  # type: Optional[int]
+        num_io_threads=None,  # type: Optional[Union[int, str]]
+        num_connections=None,  # type: Optional[int]
+        bootstrap_cache_path=None,  # type: Optional[str]
+        rate_limiter=None,  # type: Optional[ClientRateLimiter]
+        retry_strategy=None,  # type: Optional[RetryStrategy]
     ):
         """ClusterOptions instance."""
 
@@ -735,6 +748,24 @@ class WaitUntilReadyOptionsBase(OptionsTimeoutBase):
         kwargs = {k: v for k, v in kwargs.items() if v is not None}
         super().__init__(**kwargs)
 
+
+class WarmUpOptionsBase(OptionsTimeoutBase):
+    @overload
+    def __init__(self,
+                 timeout=None,  # type: timedelta
+                 service_types=None,  # type: Iterable[ServiceType]
+                 connections_per_node=None,  # type: int
+                 bucket_names=None  # type: Iterable[str]
+                 ):
+        pass
+
+    def __init__(self,
+                 **kwargs
+                 ):
+
+        kwargs = {k: v for k, v in kwargs.items() if v is not None}
+        super().__init__(**kwargs)
+
 # Key-Value Operations
 
 
@@ -870,7 +901,22 @@ class GetAllReplicasOptionsBase(OptionsTimeoutBase):
     @overload
     def __init__(self,
                  timeout=None,  # type: Optional[timedelta]
-                 transcoder=None  # type: Optional[Transcoder]
+                 transcoder=None,  # type: Optional[Transcoder]
+                 max_responses=None  # type: Optional[int]
+                 ):
+        pass
+
+    def __init__(self, **kwargs):
+        kwargs = {k: v for k, v in kwargs.items() if v is not None}
+        super().__init__(**kwargs)
+
+
+class GetReplicaQuorumOptionsBase(OptionsTimeoutBase):
+    @overload
+    def __init__(self,
+                 timeout=None,  # type: Optional[timedelta]
+                 transcoder=None,  # type: Optional[Transcoder]
+                 quorum=None  # type: Optional[int]
                  ):
         pass
 
@@ -918,6 +964,21 @@ class GetAnyReplicaOptionsBase(OptionsTimeoutBase):
         super().__init__(**kwargs)
 
 
+class GetHedgedOptionsBase(OptionsTimeoutBase):
+    @overload
+    def __init__(self,
+                 timeout=None,  # type: Optional[timedelta]
+                 transcoder=None,  # type: Optional[Transcoder]
+                 hedge_delay=None,  # type: Optional[timedelta]
+                 hedge_percentile=None  # type: Optional[float]
+                 ):
+        pass
+
+    def __init__(self, **kwargs):
+        kwargs = {k: v for k, v in kwargs.items() if v is not None}
+        super().__init__(**kwargs)
+
+
 class UnlockOptionsBase(OptionsTimeoutBase):
     @overload
     def __init__(self,
@@ -17,16 +17,16 @@ from typing import (TYPE_CHECKING,
                     Any,
                     Optional)
 
-from couchbase.analytics import AnalyticsQuery, AnalyticsRequest
 from couchbase.collection import Collection
-from couchbase.n1ql import N1QLQuery, N1QLRequest
+from couchbase.logic.hedging import HedgedReads
 from couchbase.options import (AnalyticsOptions,
                                QueryOptions,
                                SearchOptions)
+from couchbase.rate_limiter import ClientRateLimiter
 from couchbase.result import (AnalyticsResult,
                               QueryResult,
                               SearchResult)
-from couchbase.search import SearchQueryBuilder, SearchRequest
+from couchbase.retry import RetryStrategy
 from couchbase.transcoder import Transcoder
 
 if TYPE_CHECKING:
@@ -45,10 +45,45 @@ class ScopeLogic:
         """
         return self._bucket.connection
 
+    @property
+    def kv_connections(self):
+        """
+        **INTERNAL**
+        """
+        return self._bucket.kv_connections
+
     @property
     def default_transcoder(self) -> Optional[Transcoder]:
         return self._bucket.default_transcoder
 
+    @property
+    def rate_limiter(self) -> Optional[ClientRateLimiter]:
+        """
+        **INTERNAL**
+        """
+        return self._bucket.rate_limiter
+
+    @property
+    def retry_strategy(self) -> Optional[RetryStrategy]:
+        """
+        **INTERNAL**
+        """
+        return self._bucket.retry_strategy
+
+    @property
+    def kv_timeout(self) -> float:
+        """
+        **INTERNAL**
+        """
+        return self._bucket.kv_timeout
+
+    @property
+    def hedged_reads(self) -> HedgedReads:
+        """
+        **INTERNAL**
+        """
+        return self._bucket.hedged_reads
+
     @property
     def name(self) -> str:
         """
@@ -159,10 +194,12 @@ class ScopeLogic:
         if not ('query_context' in opt or 'query_context' in kwargs):
             kwargs['query_context'] = '`{}`.`{}`'.format(self.bucket_name, self.name)
 
+        from couchbase.n1ql import N1QLQuery, N1QLRequest
         query = N1QLQuery.create_query_object(
             statement, opt, **kwargs)
         return QueryResult(N1QLRequest.generate_n1ql_request(self.connection,
-                                                             query.params))
+                                                             query.params,
+                                                             rate_limiter=self.rate_limiter))
 
     def analytics_query(
         self,
@@ -248,10 +285,12 @@ class ScopeLogic:
         if not ('query_context' in opt or 'query_context' in kwargs):
             kwargs['query_context'] = 'default:`{}`.`{}`'.format(self.bucket_name, self.name)
 
+        from couchbase.analytics import AnalyticsQuery, AnalyticsRequest
         query = AnalyticsQuery.create_query_object(
             statement, *options, **kwargs)
         return AnalyticsResult(AnalyticsRequest.generate_analytics_request(self.connection,
-                                                                           query.params))
+                                                                           query.params,
+                                                                           rate_limiter=self.rate_limiter))
 
     def search_query(
         self,
@@ -358,11 +397,13 @@ class ScopeLogic:
         if not ('scope_name' in opt or 'scope_name' in kwargs):
             kwargs['scope_name'] = f'{self.name}'
 
+        from couchbase.search import SearchQueryBuilder, SearchRequest
         query = SearchQueryBuilder.create_search_query_object(
             index, query, *options, **kwargs
         )
         return SearchResult(SearchRequest.generate_search_request(self.connection,
-                                                                  query.as_encodable()))
+                                                                  query.as_encodable(),
+                                                                  rate_limiter=self.rate_limiter))
 
     @staticmethod
     def default_name():
@@ -1272,6 +1272,9 @@ class SearchQueryBuilder:
 
 
 class SearchRequestLogic:
+    # APIs that submit requests from an event loop cannot wait for a rate limiter permit, requests are shed instead
+    _WAIT_FOR_RATE_LIMITER = True
+
     def __init__(self,
                  connection,
                  encoded_query,
@@ -1284,6 +1287,7 @@ class SearchRequestLogic:
         self.row_factory = row_factory
         self._streaming_result = None
         self._default_serializer = kwargs.pop('default_serializer', DefaultJsonSerializer())
+        self._rate_limiter = kwargs.pop('rate_limiter', None)
         self._serializer = None
         self._started_streaming = False
         self._done_streaming = False
@@ -1395,6 +1399,9 @@ class SearchRequestLogic:
         if self.done_streaming:
             return
 
+        permit = None
+        if self._rate_limiter is not None:
+            permit = self._rate_limiter.acquire_permit('search', blocking=self._WAIT_FOR_RATE_LIMITER)
         self._started_streaming = True
         span = self.encoded_query.pop('span', None)
         search_kwargs = {
@@ -1413,7 +1420,16 @@ class SearchRequestLogic:
         if errback:
             search_kwargs['errback'] = errback
 
-        self._streaming_result = search_query(**search_kwargs)
+        if permit is None:
+            self._streaming_result = search_query(**search_kwargs)
+            return
+
+        try:
+            streaming_result = search_query(**search_kwargs)
+        except BaseException:
+            permit.release()
+            raise
+        self._streaming_result = self._rate_limiter.track_stream(streaming_result, permit)
 
     def __iter__(self):
         raise NotImplementedError(
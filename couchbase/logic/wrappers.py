@@ -18,6 +18,7 @@ from __future__ import annotations
 from copy import copy
 from functools import wraps
 
+from couchbase import profiling
 from couchbase.constants import FMT_JSON
 from couchbase.exceptions import (PYCBC_ERROR_MAP,
                                   CouchbaseException,
@@ -33,7 +34,21 @@ from couchbase.exceptions import exception as BaseCouchbaseException
 from couchbase.exceptions import exception as CouchbaseBaseException
 
 
+def encode_value(transcoder, value):
+    profiler = profiling._PROFILER
+    if profiler is not None:
+        return profiler.time_stage(profiling.ProfileStage.TRANSCODE, transcoder.encode_value, value)
+    return transcoder.encode_value(value)
+
+
 def decode_value(transcoder, value, flags, is_subdoc=False):
+    profiler = profiling._PROFILER
+    if profiler is not None:
+        return profiler.time_stage(profiling.ProfileStage.DECODE, _decode_value, transcoder, value, flags, is_subdoc)
+    return _decode_value(transcoder, value, flags, is_subdoc)
+
+
+def _decode_value(transcoder, value, flags, is_subdoc):
     # if no flags, just assume default
     if not flags:
         flags = FMT_JSON
@@ -55,6 +70,13 @@ def decode_value(transcoder, value, flags, is_subdoc=False):
     return final_value
 
 
+def wrap_result(return_cls, result):
+    profiler = profiling._PROFILER
+    if profiler is not None:
+        return profiler.time_stage(profiling.ProfileStage.WRAP, return_cls, result)
+    return return_cls(result)
+
+
 def decode_replicas(transcoder, result, return_cls):
     while True:
         try:
@@ -92,7 +114,7 @@ class BlockingWrapper:
                     else:
                         if ret is None:
                             raise InternalSDKException('Expected return value to be non-empty.')
-                        retval = return_cls(ret)
+                        retval = wrap_result(return_cls, ret)
                     return retval
                 except CouchbaseException as e:
                     if isinstance(e, ServiceUnavailableException) and fn.__name__ == '_get_cluster_info':
@@ -132,7 +154,7 @@ class BlockingWrapper:
                     elif return_cls is True:
                         retval = ret
                     else:
-                        retval = return_cls(ret)
+                        retval = wrap_result(return_cls, ret)
                     return retval
                 except CouchbaseException as e:
                     raise e
@@ -16,13 +16,21 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
+from datetime import timedelta
+from time import perf_counter
 from typing import (TYPE_CHECKING,
                     Any,
+                    Callable,
                     Dict,
                     Iterable,
+                    List,
                     Optional)
 
-from couchbase.exceptions import QueryIndexAlreadyExistsException, QueryIndexNotFoundException
+from couchbase.exceptions import (InvalidArgumentException,
+                                  QueryIndexAlreadyExistsException,
+                                  QueryIndexNotFoundException,
+                                  WatchQueryIndexTimeoutException)
+from couchbase.logic.n1ql import N1QLQuery
 from couchbase.management.options import GetAllQueryIndexOptions
 from couchbase.options import forward_args
 from couchbase.pycbc_core import (management_operation,
@@ -370,3 +378,265 @@ class QueryIndex:
                    json_data.get('collection_name', None),
                    json_data.get('partition', None)
                    )
+
+
+@dataclass
+class QueryIndexWatch:
+    """The indexes of a keyspace to watch with
+    :meth:`~couchbase.management.queries.QueryIndexManager.watch_keyspaces`.
+
+    **VOLATILE** This API is subject to change at any time.
+
+    Args:
+        bucket_name (str): The name of the bucket of the indexes.
+        index_names (List[str]): The names of the indexes to watch.
+        scope_name (str, optional): The name of the scope of the indexes.  If not set, indexes on any collection of
+            the bucket are watched.
+        collection_name (str, optional): The name of the collection of the indexes.  If not set, indexes on any
+            collection of the scope are watched.
+        watch_primary (bool, optional): Specifies whether the primary index should be watched as well.  Defaults to
+            False.
+    """
+    bucket_name: str
+    index_names: List[str] = field(default_factory=list)
+    scope_name: Optional[str] = None
+    collection_name: Optional[str] = None
+    watch_primary: bool = False
+
+
+@dataclass
+class QueryIndexWatchProgress:
+    """The state of the watched indexes, passed to the ``progress_callback`` of a watch after each poll.
+
+    **VOLATILE** This API is subject to change at any time.
+
+    Args:
+        online (int): The number of watched indexes that are online.
+        total (int): The number of watched indexes.
+        pending (Dict[str, List[str]]): The names of the indexes that are not online yet, by keyspace.
+        indexes (List[:class:`.QueryIndex`]): The watched indexes found by the last poll of their keyspace.
+        elapsed (timedelta): The time since the watch started.
+    """
+    online: int
+    total: int
+    pending: Dict[str, List[str]]
+    indexes: List[QueryIndex]
+    elapsed: timedelta
+
+
+class WatchedKeyspace:
+    """**INTERNAL**
+
+    The watched indexes of a single keyspace.  Their state is polled with a ``system:indexes`` statement that only
+    returns the watched indexes, rather than every index of the bucket.
+    """
+
+    _STATEMENT = ('SELECT idx.name, idx.state, idx.is_primary, idx.`using`, idx.namespace_id, idx.datastore_id, '
+                  'idx.keyspace_id, idx.bucket_id, idx.scope_id, idx.index_key, idx.`condition`, idx.`partition` '
+                  'FROM system:indexes AS idx WHERE idx.`using` = "gsi" AND idx.name IN $index_names AND {}')
+    # indexes on the bucket itself (i.e. pre-collections) have no bucket_id, their keyspace_id is the bucket
+    _BUCKET_FILTER = '(idx.bucket_id IS MISSING AND idx.keyspace_id = $bucket_name)'
+    _SCOPE_FILTER = '(idx.bucket_id = $bucket_name AND idx.scope_id = $scope_name)'
+    _COLLECTION_FILTER = ('(idx.bucket_id = $bucket_name AND idx.scope_id = $scope_name '
+                          'AND idx.keyspace_id = $collection_name)')
+
+    def __init__(self,
+                 watch  # type: QueryIndexWatch
+                 ):
+        if not isinstance(watch, QueryIndexWatch):
+            raise InvalidArgumentException('Expected a QueryIndexWatch for each keyspace to watch.')
+        if not isinstance(watch.bucket_name, str):
+            raise InvalidArgumentException('The bucket_name must be provided when watching indexes.')
+        if not isinstance(watch.index_names, (list, tuple)):
+            raise InvalidArgumentException('One or more index_names must be provided when watching indexes.')
+        if watch.collection_name is not None and watch.scope_name is None:
+            raise InvalidArgumentException('The scope_name must be provided with the collection_name.')
+
+        self._watch = watch
+        names = list(watch.index_names)
+        if watch.watch_primary:
+            names.append('#primary')
+        # dict, to drop duplicate names while keeping their order
+        self._names = list(dict.fromkeys(names))
+        self._indexes = {}  # type: Dict[str, QueryIndex]
+
+    @property
+    def keyspace(self) -> str:
+        parts = [self._watch.bucket_name, self._watch.scope_name, self._watch.collection_name]
+        return '.'.join(p for p in parts if p is not None)
+
+    @property
+    def names(self) -> List[str]:
+        return self._names
+
+    @property
+    def indexes(self) -> List[QueryIndex]:
+        return list(self._indexes.values())
+
+    @property
+    def pending(self) -> List[str]:
+        return [n for n in self._names if n not in self._indexes or self._indexes[n].state != 'online']
+
+    @property
+    def deferred(self) -> List[str]:
+        return [n for n in self._names if n in self._indexes and self._indexes[n].state == 'deferred']
+
+    def _is_default_collection(self) -> bool:
+        return self._watch.scope_name == '_default' and self._watch.collection_name == '_default'
+
+    def statement(self) -> str:
+        if self._watch.scope_name is None:
+            keyspace_filter = f'({self._BUCKET_FILTER} OR idx.bucket_id = $bucket_name)'
+        elif self._watch.collection_name is None:
+            keyspace_filter = self._SCOPE_FILTER
+        elif self._is_default_collection():
+            keyspace_filter = f'({self._BUCKET_FILTER} OR {self._COLLECTION_FILTER})'
+        else:
+            keyspace_filter = self._COLLECTION_FILTER
+        return self._STATEMENT.format(keyspace_filter)
+
+    def named_parameters(self) -> Dict[str, Any]:
+        params = {'index_names': self._names, 'bucket_name': self._watch.bucket_name}
+        if self._watch.scope_name is not None:
+            params['scope_name'] = self._watch.scope_name
+        if self._watch.collection_name is not None:
+            params['collection_name'] = self._watch.collection_name
+        return params
+
+    def build_statement(self,
+                        index_names  # type: Iterable[str]
+                        ) -> str:
+        if self._watch.scope_name is None or self._is_default_collection():
+            # also valid for servers without collections
+            keyspace = f'`{self._watch.bucket_name}`'
+        else:
+            parts = [self._watch.bucket_name, self._watch.scope_name, self._watch.collection_name]
+            keyspace = '.'.join(f'`{p}`' for p in parts if p is not None)
+        names = ', '.join(f'`{n}`' for n in index_names)
+        return f'BUILD INDEX ON {keyspace}({names})'
+
+    @staticmethod
+    def _index_from_row(row  # type: Dict[str, Any]
+                        ) -> QueryIndex:
+        json_data = dict(row)
+        json_data['type'] = json_data.pop('using', None)
+        if 'bucket_id' in json_data:
+            json_data['bucket_name'] = json_data.pop('bucket_id')
+            json_data['scope_name'] = json_data.pop('scope_id', None)
+            json_data['collection_name'] = json_data.get('keyspace_id', None)
+        return QueryIndex.from_server(json_data)
+
+    def update(self,
+               rows  # type: Iterable[Dict[str, Any]]
+               ) -> None:
+        """Updates the state of the watched indexes from the rows returned by the keyspace's statement.
+
+        Raises:
+            :class:`~couchbase.exceptions.QueryIndexNotFoundException`: If a watched index does not exist.
+        """
+        indexes = {}  # type: Dict[str, QueryIndex]
+        for row in rows:
+            idx = self._index_from_row(row)
+            # without a scope, the same name can match indexes on several collections, all of them must be online
+            if idx.name not in indexes or indexes[idx.name].state == 'online':
+                indexes[idx.name] = idx
+        missing = next((n for n in self._names if n not in indexes), None)
+        if missing is not None:
+            raise QueryIndexNotFoundException(f'Cannot find index with name: {missing}')
+        self._indexes = indexes
+
+
+class QueryIndexWatcher:
+    """**INTERNAL**
+
+    Tracks the keyspaces of a watch, the time left and the interval between polls.  Polls start 50ms apart and back
+    off exponentially up to once a second, only the keyspaces with indexes that are not online yet are polled again.
+    """
+
+    INITIAL_INTERVAL = 0.05
+    MAX_INTERVAL = 1.0
+    # the maximum number of keyspaces polled at the same time
+    MAX_CONCURRENCY = 16
+
+    def __init__(self,
+                 watches,  # type: Iterable[QueryIndexWatch]
+                 timeout,  # type: int
+                 progress_callback=None  # type: Optional[Callable[[QueryIndexWatchProgress], None]]
+                 ):
+        self._keyspaces = [WatchedKeyspace(w) for w in watches]
+        if not self._keyspaces:
+            raise InvalidArgumentException('One or more keyspaces must be provided when watching indexes.')
+        if progress_callback is not None and not callable(progress_callback):
+            raise InvalidArgumentException('The progress_callback must be callable.')
+        self._progress_callback = progress_callback
+        # timeout is converted to microsecs via forward_args()
+        self._timeout = timeout / 1e6
+        self._start = perf_counter()
+        self._interval = self.INITIAL_INTERVAL
+
+    @classmethod
+    def from_args(cls,
+                  watches,  # type: Iterable[QueryIndexWatch]
+                  final_args  # type: Dict[str, Any]
+                  ) -> QueryIndexWatcher:
+        timeout = final_args.get('timeout', None)
+        if not timeout:
+            raise InvalidArgumentException('Must specify a timeout condition for watch indexes')
+        return cls(watches, timeout, final_args.get('progress_callback', None))
+
+    @property
+    def keyspaces(self) -> List[WatchedKeyspace]:
+        return self._keyspaces
+
+    @property
+    def pending(self) -> List[WatchedKeyspace]:
+        return [ks for ks in self._keyspaces if ks.pending]
+
+    @property
+    def time_left(self) -> timedelta:
+        # never 0, which would be the default timeout
+        return timedelta(seconds=max(self._timeout - (perf_counter() - self._start), 0.001))
+
+    def query_params(self,
+                     keyspace  # type: WatchedKeyspace
+                     ) -> Dict[str, Any]:
+        query = N1QLQuery.create_query_object(keyspace.statement(),
+                                              named_parameters=keyspace.named_parameters(),
+                                              read_only=True,
+                                              timeout=self.time_left)
+        return query.params
+
+    def build_params(self,
+                     keyspace,  # type: WatchedKeyspace
+                     index_names  # type: Iterable[str]
+                     ) -> Dict[str, Any]:
+        return N1QLQuery.create_query_object(keyspace.build_statement(index_names), timeout=self.time_left).params
+
+    def polled(self) -> bool:
+        """Reports the progress of the watch once its keyspaces have been polled.
+
+        Returns:
+            bool: True if all the watched indexes are online.
+        """
+        pending = {ks.keyspace: ks.pending for ks in self._keyspaces if ks.pending}
+        if self._progress_callback is not None:
+            total = sum(len(ks.names) for ks in self._keyspaces)
+            self._progress_callback(QueryIndexWatchProgress(total - sum(len(p) for p in pending.values()),
+                                                            total,
+                                                            pending,
+                                                            [idx for ks in self._keyspaces for idx in ks.indexes],
+                                                            timedelta(seconds=perf_counter() - self._start)))
+        return not pending
+
+    def next_interval(self) -> float:
+        """Returns the seconds to wait before polling again.
+
+        Raises:
+            :class:`~couchbase.exceptions.WatchQueryIndexTimeoutException`: If the watch timed out.
+        """
+        time_left = self._timeout - (perf_counter() - self._start)
+        if time_left <= 0:
+            raise WatchQueryIndexTimeoutException('Failed to find all indexes online within the alloted time.')
+        interval = min(self._interval, time_left)
+        self._interval = min(self._interval * 2, self.MAX_INTERVAL)
+        return interval
@@ -14,6 +14,7 @@
 #  limitations under the License.
 
 from typing import (TYPE_CHECKING,
+                    Callable,
                     Optional,
                     overload)
 
@@ -22,6 +23,8 @@ from couchbase.management.logic.analytics_logic import AnalyticsLinkType
 if TYPE_CHECKING:
     from datetime import timedelta
 
+    from couchbase.management.logic.query_index_logic import QueryIndexWatchProgress
+
 
 class CreateBucketOptions(dict):
     """Available options for a :class:`~couchbase.management.buckets.BucketManager`'s create bucket operation.
@@ -667,13 +670,16 @@ class WatchQueryIndexOptions(dict):
             management operation timeout.
         watch_primary (bool, optional): Specifies whether the primary indexes should
             be watched as well.
+        progress_callback (Callable[[:class:`~couchbase.management.queries.QueryIndexWatchProgress`], None], optional):
+            **VOLATILE** Called with the state of the watched indexes after each poll.
     """  # noqa: E501
     @overload
     def __init__(self,
                  watch_primary=None,      # type: Optional[bool]
                  timeout=None,            # type: Optional[timedelta]
                  scope_name=None,         # type: Optional[str]
-                 collection_name=None     # type: Optional[str]
+                 collection_name=None,    # type: Optional[str]
+                 progress_callback=None   # type: Optional[Callable[[QueryIndexWatchProgress], None]]
                  ):
         pass
 
@@ -13,17 +13,22 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 
-from datetime import timedelta
-from time import perf_counter, sleep
+from functools import partial
+from time import sleep
 from typing import (Any,
                     Dict,
-                    Iterable)
+                    Iterable,
+                    Mapping)
 
 from couchbase.exceptions import (AmbiguousTimeoutException,
                                   InvalidArgumentException,
-                                  QueryIndexNotFoundException,
-                                  WatchQueryIndexTimeoutException)
-from couchbase.management.logic.query_index_logic import QueryIndex, QueryIndexManagerLogic
+                                  UnAmbiguousTimeoutException)
+from couchbase.management.logic.query_index_logic import QueryIndexWatchProgress  # noqa: F401
+from couchbase.management.logic.query_index_logic import (QueryIndex,
+                                                          QueryIndexManagerLogic,
+                                                          QueryIndexWatch,
+                                                          QueryIndexWatcher,
+                                                          WatchedKeyspace)
 from couchbase.management.logic.wrappers import BlockingMgmtWrapper, ManagementType
 
 # @TODO:  lets deprecate import of options from couchbase.management.queries
@@ -34,9 +39,57 @@ from couchbase.management.options import (BuildDeferredQueryIndexOptions,
                                           DropQueryIndexOptions,
                                           GetAllQueryIndexOptions,
                                           WatchQueryIndexOptions)
+from couchbase.n1ql import N1QLRequest
 from couchbase.options import forward_args
 
 
+def _poll_keyspace(connection,
+                   watcher,  # type: QueryIndexWatcher
+                   keyspace  # type: WatchedKeyspace
+                   ) -> None:
+    try:
+        rows = N1QLRequest.generate_n1ql_request(connection, watcher.query_params(keyspace)).execute()
+    except (AmbiguousTimeoutException, UnAmbiguousTimeoutException):
+        return  # go ahead and move on, raise WatchQueryIndexTimeoutException later if needed
+    keyspace.update(rows)
+
+
+def _watch(connection,
+           watcher  # type: QueryIndexWatcher
+           ) -> None:
+    executor = None
+    if len(watcher.keyspaces) > 1:
+        # keeps concurrent.futures out of import
+        from concurrent.futures import ThreadPoolExecutor
+        executor = ThreadPoolExecutor(max_workers=min(len(watcher.keyspaces), watcher.MAX_CONCURRENCY))
+    try:
+        while True:
+            pending = watcher.pending
+            if executor is None or len(pending) == 1:
+                for keyspace in pending:
+                    _poll_keyspace(connection, watcher, keyspace)
+            else:
+                list(executor.map(partial(_poll_keyspace, connection, watcher), pending))
+            if watcher.polled():
+                return
+            sleep(watcher.next_interval())
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+
+def _build_and_watch(connection,
+                     watcher  # type: QueryIndexWatcher
+                     ) -> None:
+    keyspace = watcher.keyspaces[0]
+    _poll_keyspace(connection, watcher, keyspace)
+    # indexes that already existed may have been built already
+    deferred = keyspace.deferred
+    if deferred:
+        N1QLRequest.generate_n1ql_request(connection, watcher.build_params(keyspace, deferred)).execute()
+    _watch(connection, watcher)
+
+
 class QueryIndexManager(QueryIndexManagerLogic):
     def __init__(self, connection):
         super().__init__(connection)
@@ -202,7 +255,7 @@ class QueryIndexManager(QueryIndexManagerLogic):
 
         return super().build_deferred_indexes(bucket_name, *options, **kwargs)
 
-    def watch_indexes(self,   # noqa: C901
+    def watch_indexes(self,
                       bucket_name,  # type: str
                       index_names,  # type: Iterable[str]
                       *options,     # type: WatchQueryIndexOptions
@@ -231,60 +284,96 @@ class QueryIndexManager(QueryIndexManagerLogic):
             raise InvalidArgumentException('One or more index_names must be provided when watching indexes.')
 
         final_args = forward_args(kwargs, *options)
+        watch = QueryIndexWatch(bucket_name,
+                                index_names,
+                                scope_name=final_args.get('scope_name', None),
+                                collection_name=final_args.get('collection_name', None),
+                                watch_primary=final_args.get('watch_primary', False))
+        _watch(self._connection, QueryIndexWatcher.from_args([watch], final_args))
 
-        scope_name = final_args.get('scope_name', None)
-        collection_name = final_args.get('collection_name', None)
-
-        if final_args.get('watch_primary', False):
-            index_names.append('#primary')
-
-        timeout = final_args.get("timeout", None)
-        if not timeout:
-            raise InvalidArgumentException('Must specify a timeout condition for watch indexes')
+    def watch_keyspaces(self,
+                        watches,    # type: Iterable[QueryIndexWatch]
+                        *options,   # type: WatchQueryIndexOptions
+                        **kwargs    # type: Dict[str, Any]
+                        ) -> None:
+        """Waits for the indexes of a number of keyspaces to finish creation and be ready to use.
 
-        def check_indexes(index_names, indexes):
-            for idx_name in index_names:
-                match = next((i for i in indexes if i.name == idx_name), None)
-                if not match:
-                    raise QueryIndexNotFoundException(f'Cannot find index with name: {idx_name}')
+        Only the watched indexes are queried, and the keyspaces are polled concurrently.  A keyspace is no longer
+        polled once all of its indexes are online.
 
-            return all(map(lambda i: i.state == 'online', indexes))
+        **VOLATILE** This API is subject to change at any time.
 
-        # timeout is converted to microsecs via final_args()
-        timeout_millis = timeout / 1000
+        Args:
+            watches (Iterable[:class:`.QueryIndexWatch`]): The indexes to watch, by keyspace.
+            options (:class:`~couchbase.management.options.WatchQueryIndexOptions`): Optional parameters for this
+                operation.  The ``scope_name``, ``collection_name`` and ``watch_primary`` options are ignored, they
+                are set per keyspace.
+            **kwargs (Dict[str, Any]): keyword arguments that can be used as optional parameters
+                for this operation.
 
-        interval_millis = float(50)
-        start = perf_counter()
-        time_left = timeout_millis
-        while True:
+        Raises:
+            :class:`~couchbase.exceptions.InvalidArgumentException`: If the watches are invalid.
+            :class:`~couchbase.exceptions.QueryIndexNotFoundException`: If one of the indexes does not exist.
+            :class:`~couchbase.exceptions.WatchQueryIndexTimeoutException`: If the specified timeout is reached
+                before all the specified indexes are ready to use.
+        """
+        if isinstance(watches, QueryIndexWatch) or not isinstance(watches, Iterable):
+            raise InvalidArgumentException('The keyspaces to watch must be an iterable of QueryIndexWatch.')
 
-            opts = GetAllQueryIndexOptions(
-                timeout=timedelta(milliseconds=time_left))
-            if scope_name:
-                opts['scope_name'] = scope_name
-                opts['collection_name'] = collection_name
+        final_args = forward_args(kwargs, *options)
+        _watch(self._connection, QueryIndexWatcher.from_args(watches, final_args))
 
-            try:
-                indexes = self.get_all_indexes(bucket_name, opts)
-            except AmbiguousTimeoutException:
-                pass  # go ahead and move on, raise WatchQueryIndexTimeoutException later if needed
+    def build_and_watch(self,
+                        bucket_name,    # type: str
+                        indexes,        # type: Mapping[str, Iterable[str]]
+                        *options,       # type: WatchQueryIndexOptions
+                        **kwargs        # type: Dict[str, Any]
+                        ) -> None:
+        """Creates a number of deferred indexes, builds them with a single ``BUILD INDEX`` statement and waits for
+        them to be ready to use.
 
-            all_online = check_indexes(index_names, indexes)
-            if all_online:
-                break
+        Indexes that already exist are not created again, and only built if they are deferred.
 
-            interval_millis += 500
-            if interval_millis > 1000:
-                interval_millis = 1000
+        **VOLATILE** This API is subject to change at any time.
 
-            time_left = timeout_millis - ((perf_counter() - start) * 1000)
-            if interval_millis > time_left:
-                interval_millis = time_left
+        Args:
+            bucket_name (str): The name of the bucket to create the indexes on.
+            indexes (Mapping[str, Iterable[str]]): The fields each index should cover, by index name.
+            options (:class:`~couchbase.management.options.WatchQueryIndexOptions`): Optional parameters for this
+                operation.  The timeout covers creating, building and watching the indexes.
+            **kwargs (Dict[str, Any]): keyword arguments that can be used as optional parameters
+                for this operation.
 
-            if time_left <= 0:
-                raise WatchQueryIndexTimeoutException('Failed to find all indexes online within the alloted time.')
+        Raises:
+            :class:`~couchbase.exceptions.InvalidArgumentException`: If the bucket_name or indexes are invalid
+                types.
+            :class:`~couchbase.exceptions.WatchQueryIndexTimeoutException`: If the specified timeout is reached
+                before all the specified indexes are ready to use.
+        """
+        if not isinstance(bucket_name, str):
+            raise InvalidArgumentException('The bucket_name must be provided when building indexes.')
+        if not isinstance(indexes, Mapping) or not indexes:
+            raise InvalidArgumentException('One or more indexes must be provided when building indexes.')
 
-            sleep(interval_millis / 1000)
+        final_args = forward_args(kwargs, *options)
+        scope_name = final_args.get('scope_name', None)
+        collection_name = final_args.get('collection_name', None)
+        watch = QueryIndexWatch(bucket_name,
+                                list(indexes),
+                                scope_name=scope_name or '_default',
+                                collection_name=collection_name or '_default',
+                                watch_primary=final_args.get('watch_primary', False))
+        watcher = QueryIndexWatcher.from_args([watch], final_args)
+        for index_name, fields in indexes.items():
+            self.create_index(bucket_name,
+                              index_name,
+                              list(fields),
+                              CreateQueryIndexOptions(deferred=True,
+                                                      ignore_if_exists=True,
+                                                      timeout=watcher.time_left,
+                                                      scope_name=scope_name,
+                                                      collection_name=collection_name))
+        _build_and_watch(self._connection, watcher)
 
 
 class CollectionQueryIndexManager(QueryIndexManagerLogic):
@@ -445,7 +534,7 @@ class CollectionQueryIndexManager(QueryIndexManagerLogic):
         kwargs['collection_name'] = self._collection_name
         return super().build_deferred_indexes(self._bucket_name, *options, **kwargs)
 
-    def watch_indexes(self,   # noqa: C901
+    def watch_indexes(self,
                       index_names,  # type: Iterable[str]
                       *options,     # type: WatchQueryIndexOptions
                       **kwargs      # type: Dict[str,Any]
@@ -469,48 +558,49 @@ class CollectionQueryIndexManager(QueryIndexManagerLogic):
             raise InvalidArgumentException('One or more index_names must be provided when watching indexes.')
 
         final_args = forward_args(kwargs, *options)
-        if final_args.get('watch_primary', False):
-            index_names.append('#primary')
-
-        timeout = final_args.get('timeout', None)
-        if not timeout:
-            raise InvalidArgumentException('Must specify a timeout condition for watch indexes')
+        watch = QueryIndexWatch(self._bucket_name,
+                                index_names,
+                                scope_name=self._scope_name,
+                                collection_name=self._collection_name,
+                                watch_primary=final_args.get('watch_primary', False))
+        _watch(self._connection, QueryIndexWatcher.from_args([watch], final_args))
 
-        def check_indexes(index_names, indexes):
-            for idx_name in index_names:
-                match = next((i for i in indexes if i.name == idx_name), None)
-                if not match:
-                    raise QueryIndexNotFoundException(f'Cannot find index with name: {idx_name}')
+    def build_and_watch(self,
+                        indexes,        # type: Mapping[str, Iterable[str]]
+                        *options,       # type: WatchQueryIndexOptions
+                        **kwargs        # type: Dict[str, Any]
+                        ) -> None:
+        """Creates a number of deferred indexes, builds them with a single ``BUILD INDEX`` statement and waits for
+        them to be ready to use.
 
-            return all(map(lambda i: i.state == 'online', indexes))
-
-        # timeout is converted to microsecs via final_args()
-        timeout_millis = timeout / 1000
-
-        interval_millis = float(50)
-        start = perf_counter()
-        time_left = timeout_millis
-        while True:
-            opts = GetAllQueryIndexOptions(timeout=timedelta(milliseconds=time_left))
+        Indexes that already exist are not created again, and only built if they are deferred.
 
-            try:
-                indexes = self.get_all_indexes(opts)
-            except AmbiguousTimeoutException:
-                pass  # go ahead and move on, raise WatchQueryIndexTimeoutException later if needed
+        **VOLATILE** This API is subject to change at any time.
 
-            all_online = check_indexes(index_names, indexes)
-            if all_online:
-                break
-
-            interval_millis += 500
-            if interval_millis > 1000:
-                interval_millis = 1000
-
-            time_left = timeout_millis - ((perf_counter() - start) * 1000)
-            if interval_millis > time_left:
-                interval_millis = time_left
+        Args:
+            indexes (Mapping[str, Iterable[str]]): The fields each index should cover, by index name.
+            options (:class:`~couchbase.management.options.WatchQueryIndexOptions`): Optional parameters for this
+                operation.  The timeout covers creating, building and watching the indexes.
+            **kwargs (Dict[str, Any]): keyword arguments that can be used as optional parameters
+                for this operation.
 
-            if time_left <= 0:
-                raise WatchQueryIndexTimeoutException('Failed to find all indexes online within the alloted time.')
+        Raises:
+            :class:`~couchbase.exceptions.InvalidArgumentException`: If the indexes are invalid types.
+            :class:`~couchbase.exceptions.WatchQueryIndexTimeoutException`: If the specified timeout is reached
+                before all the specified indexes are ready to use.
+        """
+        if not isinstance(indexes, Mapping) or not indexes:
+            raise InvalidArgumentException('One or more indexes must be provided when building indexes.')
 
-            sleep(interval_millis / 1000)
+        final_args = forward_args(kwargs, *options)
+        watch = QueryIndexWatch(self._bucket_name,
+                                list(indexes),
+                                scope_name=self._scope_name,
+                                collection_name=self._collection_name,
+                                watch_primary=final_args.get('watch_primary', False))
+        watcher = QueryIndexWatcher.from_args([watch], final_args)
+        for index_name, fields in indexes.items():
+            self.create_index(index_name,
+                              list(fields),
+                              CreateQueryIndexOptions(deferred=True, ignore_if_exists=True, timeout=watcher.time_left))
+        _build_and_watch(self._connection, watcher)
@@ -13,10 +13,20 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 #
+from __future__ import annotations
+
+import math
+import threading
+import time
 from abc import ABC, abstractmethod
+from array import array
+from datetime import timedelta
 from typing import (Any,
                     Dict,
-                    Optional)
+                    Iterable,
+                    Optional,
+                    Tuple,
+                    Union)
 
 
 class CouchbaseValueRecorder(ABC):
@@ -82,3 +92,476 @@ class CouchbaseMeter(ABC):
             :class:`~couchbase.metrics.CouchbaseValueRecorder`:
         """
         pass
+
+
+class LatencyHistogram:
+    """
+    A compact, HDR-style histogram of integer latency values (microseconds, as reported by the C++ core).
+
+    Values are placed into log-linear buckets:  values below ``2**sub_bucket_bits`` are recorded exactly, larger
+    values are recorded with a relative error of at most ``1 / 2**(sub_bucket_bits - 1)``.  All counts are kept
+    in a single flat :class:`array.array` so a histogram costs a few KiB regardless of how many values are recorded.
+
+    Args:
+        sub_bucket_bits (int, optional): Precision of the histogram.  Defaults to 6 (~3% relative error).
+        max_value_bits (int, optional): Bit length of the largest trackable value, larger values are clamped.
+            Defaults to 40 (~12.7 days in microseconds).
+    """
+
+    def __init__(self,
+                 sub_bucket_bits=6,  # type: Optional[int]
+                 max_value_bits=40  # type: Optional[int]
+                 ):
+        if sub_bucket_bits < 2 or max_value_bits <= sub_bucket_bits:
+            raise ValueError('Expected 2 <= sub_bucket_bits < max_value_bits.')
+        self._sub_bits = sub_bucket_bits
+        self._sub_count = 1 << sub_bucket_bits
+        self._half_count = self._sub_count >> 1
+        self._max_value = (1 << max_value_bits) - 1
+        self._bucket_count = self._sub_count + (max_value_bits - sub_bucket_bits) * self._half_count
+        self._counts = array('Q', bytes(8 * self._bucket_count))
+        self._total = 0
+        self._sum = 0
+        self._min = None
+        self._max = None
+
+    @property
+    def count(self) -> int:
+        """
+            int: The number of values recorded.
+        """
+        return self._total
+
+    @property
+    def min(self) -> Optional[int]:
+        """
+            Optional[int]: The smallest value recorded, None if the histogram is empty.
+        """
+        return self._min
+
+    @property
+    def max(self) -> Optional[int]:
+        """
+            Optional[int]: The largest value recorded, None if the histogram is empty.
+        """
+        return self._max
+
+    @property
+    def mean(self) -> Optional[float]:
+        """
+            Optional[float]: The mean of the values recorded, None if the histogram is empty.
+        """
+        if self._total == 0:
+            return None
+        return self._sum / self._total
+
+    def _index_of(self, value  # type: int
+                  ) -> int:
+        if value < self._sub_count:
+            return value
+        shift = value.bit_length() - self._sub_bits
+        return self._sub_count + (shift - 1) * self._half_count + ((value >> shift) - self._half_count)
+
+    def _highest_value_at(self, idx  # type: int
+                          ) -> int:
+        if idx < self._sub_count:
+            return idx
+        shift, offset = divmod(idx - self._sub_count, self._half_count)
+        shift += 1
+        return ((offset + self._half_count + 1) << shift) - 1
+
+    def record(self, value  # type: int
+               ) -> None:
+        """
+        Record a single value.  Negative values are recorded as 0, values larger than the trackable range are
+        clamped to the largest bucket.  Not thread safe, see :class:`~couchbase.metrics.HistogramValueRecorder`.
+
+        Args:
+            value (int): The value to record.
+        """
+        value = int(value)
+        if value < 0:
+            value = 0
+        elif value > self._max_value:
+            value = self._max_value
+        self._counts[self._index_of(value)] += 1
+        self._total += 1
+        self._sum += value
+        if self._min is None or value < self._min:
+            self._min = value
+        if self._max is None or value > self._max:
+            self._max = value
+
+    def merge(self, other  # type: LatencyHistogram
+              ) -> None:
+        """
+        Add the values recorded in another histogram (with the same precision) to this histogram.
+
+        Args:
+            other (:class:`~couchbase.metrics.LatencyHistogram`): The histogram to merge.
+
+        Raises:
+            ValueError: If the histograms do not share the same bucket layout.
+        """
+        if other._bucket_count != self._bucket_count or other._sub_bits != self._sub_bits:
+            raise ValueError('Cannot merge histograms with a different bucket layout.')
+        if other._total == 0:
+            return
+        counts = self._counts
+        for idx, cnt in enumerate(other._counts):
+            if cnt:
+                counts[idx] += cnt
+        self._total += other._total
+        self._sum += other._sum
+        self._min = other._min if self._min is None else min(self._min, other._min)
+        self._max = other._max if self._max is None else max(self._max, other._max)
+
+    def copy(self) -> LatencyHistogram:
+        """
+        Returns:
+            :class:`~couchbase.metrics.LatencyHistogram`: An independent copy of this histogram.
+        """
+        hist = LatencyHistogram.__new__(LatencyHistogram)
+        hist.__dict__.update(self.__dict__)
+        hist._counts = array('Q', self._counts)
+        return hist
+
+    def reset(self) -> None:
+        """
+        Discard all recorded values.
+        """
+        self._counts = array('Q', bytes(8 * self._bucket_count))
+        self._total = 0
+        self._sum = 0
+        self._min = None
+        self._max = None
+
+    def percentiles(self, percentiles  # type: Iterable[float]
+                    ) -> Dict[float, Optional[int]]:
+        """
+        Compute the values at the given percentiles.  Values are reported as the highest value equivalent to the
+        bucket the percentile falls into, capped by the largest recorded value.
+
+        Args:
+            percentiles (Iterable[float]): The percentiles to compute, each in the range [0, 100].
+
+        Returns:
+            Dict[float, Optional[int]]: The value at each requested percentile, None if the histogram is empty.
+        """
+        wanted = sorted(set(float(p) for p in percentiles))
+        if any(p < 0 or p > 100 for p in wanted):
+            raise ValueError('Percentiles must be in the range [0, 100].')
+        if self._total == 0:
+            return {p: None for p in wanted}
+
+        result = {}
+        targets = [(p, max(1, math.ceil(p / 100.0 * self._total))) for p in wanted]
+        target_idx = 0
+        running = 0
+        for idx, cnt in enumerate(self._counts):
+            if cnt == 0:
+                continue
+            running += cnt
+            while target_idx < len(targets) and running >= targets[target_idx][1]:
+                result[targets[target_idx][0]] = min(self._highest_value_at(idx), self._max)
+                target_idx += 1
+            if target_idx == len(targets):
+                break
+        return result
+
+    def percentile(self, percentile  # type: float
+                   ) -> Optional[int]:
+        """
+        Compute the value at the given percentile.
+
+        Args:
+            percentile (float): The percentile to compute, in the range [0, 100].
+
+        Returns:
+            Optional[int]: The value at the percentile, None if the histogram is empty.
+        """
+        return self.percentiles([percentile])[float(percentile)]
+
+
+class HistogramValueRecorder(CouchbaseValueRecorder):
+    """
+    A :class:`~couchbase.metrics.CouchbaseValueRecorder` that records into a
+    :class:`~couchbase.metrics.LatencyHistogram`.
+
+    Recording only holds a per-recorder lock for the duration of a bucket increment, so recorders for different
+    service/operation/bucket combinations never contend with one another.
+    """
+
+    def __init__(self,
+                 meter,  # type: HistogramMeter
+                 tags,  # type: Dict[str, str]
+                 sub_bucket_bits=6,  # type: Optional[int]
+                 ):
+        self._meter = meter
+        self._tags = dict(tags)
+        self._lock = threading.Lock()
+        self._epoch = meter._epoch
+        super().__init__(LatencyHistogram(sub_bucket_bits=sub_bucket_bits))
+
+    @property
+    def tags(self) -> Dict[str, str]:
+        """
+            Dict[str, str]: The tags associated with this recorder.
+        """
+        return self._tags
+
+    def record_value(self,
+                     value,      # type: int
+                     ) -> None:
+        """
+        Record a value (the operation latency in microseconds).
+
+        Args:
+            value (int): The value to record.
+        """
+        epoch = self._meter._maybe_rotate()
+        with self._lock:
+            if self._epoch != epoch:
+                self._recorder.reset()
+                self._epoch = epoch
+            self._recorder.record(value)
+
+    def histogram(self) -> LatencyHistogram:
+        """
+        Returns:
+            :class:`~couchbase.metrics.LatencyHistogram`: A point-in-time copy of the recorded values.
+        """
+        epoch = self._meter._epoch
+        with self._lock:
+            if self._epoch != epoch:
+                self._recorder.reset()
+                self._epoch = epoch
+            return self._recorder.copy()
+
+    def reset(self) -> None:
+        """
+        Discard all recorded values.
+        """
+        with self._lock:
+            self._recorder.reset()
+
+
+class _NoOpHistogramValueRecorder(CouchbaseValueRecorder):
+    def record_value(self, value  # type: int
+                     ) -> None:
+        pass
+
+
+class HistogramMeter(CouchbaseMeter):
+    """
+    A built-in, in-process :class:`~couchbase.metrics.CouchbaseMeter` that keeps a latency histogram for each
+    service/operation/bucket combination the C++ core reports.  Percentiles can be read at any time via
+    :meth:`snapshot` (or :meth:`~couchbase.cluster.Cluster.metrics_snapshot`) without requiring an external metrics
+    stack.
+
+    Args:
+        reset_interval (Union[timedelta, float], optional): If provided, the histograms are reset every interval
+            (seconds if a float is provided).  The snapshot of the interval that just completed is available via
+            :meth:`last_interval_snapshot`.  Defaults to None (values are accumulated until :meth:`reset`).
+        percentiles (Iterable[float], optional): The percentiles to report.  Defaults to (50, 90, 99, 99.9).
+        sub_bucket_bits (int, optional): Histogram precision, see :class:`~couchbase.metrics.LatencyHistogram`.
+
+    Example:
+
+        .. code-block:: python
+
+            from couchbase.metrics import HistogramMeter
+            from couchbase.options import ClusterOptions
+
+            meter = HistogramMeter(reset_interval=timedelta(minutes=1))
+            cluster = Cluster('couchbase://localhost', ClusterOptions(auth, meter=meter))
+            ...
+            kv_get = cluster.metrics_snapshot()['operations']['kv']['get']
+            print(kv_get['total_count'], kv_get['percentiles_us']['99.0'])
+
+    """
+
+    OPERATIONS_METER_NAME = 'db.couchbase.operations'
+    SERVICE_TAG = 'db.couchbase.service'
+    OPERATION_TAG = 'db.operation'
+    BUCKET_TAG = 'db.name'
+    DEFAULT_PERCENTILES = (50.0, 90.0, 99.0, 99.9)
+
+    def __init__(self,
+                 reset_interval=None,  # type: Optional[Union[timedelta, float]]
+                 percentiles=None,  # type: Optional[Iterable[float]]
+                 sub_bucket_bits=6,  # type: Optional[int]
+                 ):
+        if isinstance(reset_interval, timedelta):
+            reset_interval = reset_interval.total_seconds()
+        if reset_interval is not None and reset_interval <= 0:
+            raise ValueError('reset_interval must be positive.')
+        self._reset_interval = reset_interval
+        self._percentiles = tuple(float(p) for p in (percentiles or self.DEFAULT_PERCENTILES))
+        self._sub_bucket_bits = sub_bucket_bits
+        self._recorders = {}  # type: Dict[Tuple[str, str, Optional[str]], HistogramValueRecorder]
+        self._noop_recorder = _NoOpHistogramValueRecorder()
+        self._lock = threading.Lock()
+        self._epoch = 0
+        self._window_start = time.time()
+        self._next_reset = None if reset_interval is None else time.monotonic() + reset_interval
+        self._last_snapshot = None
+        super().__init__()
+
+    def value_recorder(self,
+                       name,      # type: str
+                       tags       # type: Dict[str, str]
+                       ) -> CouchbaseValueRecorder:
+        if name != self.OPERATIONS_METER_NAME:
+            return self._noop_recorder
+
+        svc = tags.get(self.SERVICE_TAG, None)
+        op_type = tags.get(self.OPERATION_TAG, None)
+        if not (svc and op_type):
+            return self._noop_recorder
+
+        key = (svc, op_type, tags.get(self.BUCKET_TAG, None))
+        recorder = self._recorders.get(key, None)
+        if recorder is not None:
+            return recorder
+
+        with self._lock:
+            recorder = self._recorders.get(key, None)
+            if recorder is None:
+                recorder = HistogramValueRecorder(self, tags, sub_bucket_bits=self._sub_bucket_bits)
+                self._recorders[key] = recorder
+        return recorder
+
+    def operation_histogram(self,
+                            service,  # type: str
+                            operation,  # type: str
+                            bucket_name=None,  # type: Optional[str]
+                            ) -> Optional[LatencyHistogram]:
+        """
+        Returns the latencies recorded for an operation (in the current reset interval if one is configured).
+
+        Args:
+            service (str): The service, e.g. ``kv``.
+            operation (str): The operation, e.g. ``get``.
+            bucket_name (str, optional): Only include latencies recorded for this bucket, latencies the core did not
+                tag with a bucket are always included.  Defaults to None (all buckets).
+
+        Returns:
+            Optional[:class:`~couchbase.metrics.LatencyHistogram`]: A point-in-time copy of the recorded values, None
+            if nothing was recorded for the operation.
+        """
+        self._maybe_rotate()
+        total = None
+        for (svc, op_type, bucket), recorder in list(self._recorders.items()):
+            if svc != service or op_type != operation:
+                continue
+            if bucket_name is not None and bucket is not None and bucket != bucket_name:
+                continue
+            if total is None:
+                total = LatencyHistogram(sub_bucket_bits=self._sub_bucket_bits)
+            total.merge(recorder.histogram())
+        return total
+
+    def _maybe_rotate(self) -> int:
+        if self._next_reset is None or time.monotonic() < self._next_reset:
+            return self._epoch
+        with self._lock:
+            # another thread might have rotated while we waited on the lock
+            if time.monotonic() >= self._next_reset:
+                self._last_snapshot = self._build_snapshot()
+                self._epoch += 1
+                self._window_start = time.time()
+                self._next_reset = time.monotonic() + self._reset_interval
+        return self._epoch
+
+    def _stats(self, hist  # type: LatencyHistogram
+               ) -> Dict[str, Any]:
+        pcts = hist.percentiles(self._percentiles)
+        mean = hist.mean
+        return {
+            'total_count': hist.count,
+            'min_us': hist.min,
+            'max_us': hist.max,
+            'mean_us': None if mean is None else round(mean, 3),
+            'percentiles_us': {str(p): v for p, v in pcts.items()},
+        }
+
+    def _build_snapshot(self) -> Dict[str, Any]:
+        grouped = {}  # type: Dict[str, Dict[str, Dict[Optional[str], LatencyHistogram]]]
+        for (svc, op_type, bucket), recorder in list(self._recorders.items()):
+            grouped.setdefault(svc, {}).setdefault(op_type, {})[bucket] = recorder.histogram()
+
+        operations = {}
+        for svc, ops in grouped.items():
+            for op_type, by_bucket in ops.items():
+                total = LatencyHistogram(sub_bucket_bits=self._sub_bucket_bits)
+                for hist in by_bucket.values():
+                    total.merge(hist)
+                if total.count == 0:
+                    continue
+                stats = self._stats(total)
+                buckets = {b: self._stats(h) for b, h in by_bucket.items() if b is not None and h.count > 0}
+                if buckets:
+                    stats['buckets'] = buckets
+                operations.setdefault(svc, {})[op_type] = stats
+
+        return {
+            'meta': {
+                'window_start': self._window_start,
+                'window_end': time.time(),
+                'reset_interval_s': self._reset_interval,
+            },
+            'operations': operations,
+        }
+
+    def snapshot(self, reset=False  # type: Optional[bool]
+                 ) -> Dict[str, Any]:
+        """
+        Export the latency percentiles recorded so far (in the current reset interval if one is configured).
+
+        The returned dict mirrors the output of the C++ core's logging meter::
+
+            {
+                'meta': {'window_start': float, 'window_end': float, 'reset_interval_s': Optional[float]},
+                'operations': {
+                    '<service>': {
+                        '<operation>': {
+                            'total_count': int, 'min_us': int, 'max_us': int, 'mean_us': float,
+                            'percentiles_us': {'50.0': int, '90.0': int, '99.0': int, '99.9': int},
+                            'buckets': {'<bucket>': {...}}  # only if the core tags operations with the bucket
+                        }
+                    }
+                }
+            }
+
+        Args:
+            reset (bool, optional): If True, the histograms are reset after the snapshot is taken.
+                Defaults to False.
+
+        Returns:
+            Dict[str, Any]: The latency snapshot.
+        """
+        self._maybe_rotate()
+        with self._lock:
+            snapshot = self._build_snapshot()
+            if reset:
+                self._epoch += 1
+                self._window_start = time.time()
+        return snapshot
+
+    def last_interval_snapshot(self) -> Optional[Dict[str, Any]]:
+        """
+        Returns:
+            Optional[Dict[str, Any]]: The snapshot of the last completed reset interval, None if a reset
+            interval is not configured or has not elapsed yet.
+        """
+        self._maybe_rotate()
+        return self._last_snapshot
+
+    def reset(self) -> None:
+        """
+        Discard all recorded values.
+        """
+        with self._lock:
+            self._epoch += 1
+            self._window_start = time.time()
@@ -31,6 +31,7 @@ from typing import (TYPE_CHECKING,
                     Union,
                     overload)
 
+from couchbase import profiling
 from couchbase._utils import timedelta_as_microseconds, timedelta_as_timestamp
 from couchbase.durability import DurabilityParser
 from couchbase.exceptions import InvalidArgumentException
@@ -57,7 +58,9 @@ from couchbase.logic.options import (AnalyticsOptionsBase,
                                      GetAndLockOptionsBase,
                                      GetAndTouchOptionsBase,
                                      GetAnyReplicaOptionsBase,
+                                     GetHedgedOptionsBase,
                                      GetOptionsBase,
+                                     GetReplicaQuorumOptionsBase,
                                      IncrementOptionsBase,
                                      InsertOptionsBase,
                                      LookupInOptionsBase,
@@ -76,7 +79,8 @@ from couchbase.logic.options import (AnalyticsOptionsBase,
                                      UnsignedInt64Base,
                                      UpsertOptionsBase,
                                      ViewOptionsBase,
-                                     WaitUntilReadyOptionsBase)
+                                     WaitUntilReadyOptionsBase,
+                                     WarmUpOptionsBase)
 from couchbase.pycbc_core import (transaction_config,
                                   transaction_options,
                                   transaction_query_options)
@@ -349,6 +353,25 @@ class ClusterOptions(ClusterOptionsBase):
             enabling the `logging_meter`.   Note when this is set, the `logging_meter_emit_interval` option is ignored.
         dns_nameserver (str, optional):  **VOLATILE** This API is subject to change at any time. Set to configure custom DNS nameserver. Defaults to None.
         dns_port (int, optional):  **VOLATILE** This API is subject to change at any time. Set to configure custom DNS port. Defaults to None.
+        num_io_threads (Union[int, str], optional): Number of IO threads of each underlying connection.  Set to
+            ``'auto'`` to use one thread per available CPU (leaving one CPU to the Python interpreter), up to 8.
+            Defaults to 1.
+        num_connections (int, optional): **VOLATILE** This API is subject to change at any time. Number of underlying
+            connections the cluster's key-value traffic is sharded across.  Each connection has its own IO threads and
+            sockets, key-value operations (including sub-document, counter and multi operations) are routed to a
+            connection by the hash of the document key.  All other services use the first connection.  Only supported
+            by the blocking API. Defaults to 1.
+        bootstrap_cache_path (str, optional): **VOLATILE** This API is subject to change at any time. Path to a file
+            caching the cluster's nodes between process starts.  When the cache has an entry for the connection
+            string, the cluster bootstraps against the cached nodes in the background and the cluster is returned
+            without waiting on the bootstrap, the first operation waits for it to complete.  Intended for
+            short-lived processes.  Only supported by the blocking API.  Defaults to None (disabled).
+        rate_limiter (:class:`~couchbase.rate_limiter.ClientRateLimiter`, optional): **VOLATILE** This API is subject
+            to change at any time. Client-side rate and concurrency limits applied before requests are dispatched.
+            Defaults to None (no client-side limits).
+        retry_strategy (:class:`~couchbase.retry.RetryStrategy`, optional): **VOLATILE** This API is subject to
+            change at any time. Decides if key-value operations that failed after the C++ core's own retries are
+            retried, see :class:`~couchbase.retry.AdaptiveRetryStrategy`.  Defaults to None (no additional retries).
     """  # noqa: E501
 
     def apply_profile(self,
@@ -439,6 +462,22 @@ class WaitUntilReadyOptions(WaitUntilReadyOptionsBase):
     """
 
 
+class WarmUpOptions(WarmUpOptionsBase):
+    """Available options to for a warm up operation.
+
+    Args:
+        timeout (timedelta, optional): The timeout for each of the pings used to warm up the connections. Defaults
+            to the global timeout of the pinged services.
+        service_types (Iterable[class:`~couchbase.diagnostics.ServiceType`]): The services which should be warmed
+            up.  Defaults to the key-value, query and search services.
+        connections_per_node (int, optional): The number of HTTP connections to open to each node of the HTTP
+            services.  Cannot exceed ``max_http_connections`` (see :class:`~couchbase.options.ClusterOptions`).
+            Defaults to 1.
+        bucket_names (Iterable[str], optional): Buckets to open prior to warming up the key-value service, the
+            key-value connections of buckets that are not open are not warmed up.
+    """
+
+
 # Key-Value Operations
 
 class OptionsTimeout(OptionsTimeoutBase):
@@ -494,6 +533,24 @@ class GetAllReplicasOptions(GetAllReplicasOptionsBase):
             key-value operation timeout.
         transcoder (:class:`~.transcoder.Transcoder`, optional): Specifies an explicit transcoder
             to use for this specific operation. Defaults to :class:`~.transcoder.JsonTranscoder`.
+        max_responses (int, optional): Complete the read once the first ``max_responses`` copies (the active or a
+            replica, whichever respond first) responded, rather than waiting for the slowest copy.  With
+            ``max_responses=1`` the read completes with the fastest response (see
+            :meth:`~couchbase.collection.Collection.get_any_replica`).  Defaults to None (all responses).
+    """
+
+
+class GetReplicaQuorumOptions(GetReplicaQuorumOptionsBase):
+    """Available options to for a key-value replica quorum read operation.
+
+    Args:
+        timeout (timedelta, optional): The timeout for this operation. Defaults to global
+            key-value operation timeout.
+        transcoder (:class:`~.transcoder.Transcoder`, optional): Specifies an explicit transcoder
+            to use for this specific operation. Defaults to :class:`~.transcoder.JsonTranscoder`.
+        quorum (int, optional): The number of copies (active and replicas) that must return the same version (CAS)
+            of the document, the read completes once they did.  Defaults to a majority of all of the copies, i.e.
+            of the active and the replicas of the bucket's configuration.
     """
 
 
@@ -542,6 +599,23 @@ class GetAnyReplicaOptions(GetAnyReplicaOptionsBase):
     """
 
 
+class GetHedgedOptions(GetHedgedOptionsBase):
+    """Available options to for a key-value hedged get operation.
+
+    Args:
+        timeout (timedelta, optional): The timeout for this operation. Defaults to global
+            key-value operation timeout.
+        transcoder (:class:`~.transcoder.Transcoder`, optional): Specifies an explicit transcoder
+            to use for this specific operation. Defaults to :class:`~.transcoder.JsonTranscoder`.
+        hedge_delay (timedelta, optional): The amount of time to wait for the active before a replica read is
+            sent.  Defaults to the ``hedge_percentile`` of the get latencies recorded by the cluster's
+            :class:`~couchbase.metrics.HistogramMeter`, or 100 milliseconds if the cluster does not have one (or it
+            has not recorded enough get operations yet).
+        hedge_percentile (float, optional): The percentile of the recorded get latencies used as hedge delay if
+            ``hedge_delay`` is not provided.  Defaults to 95.
+    """
+
+
 class InsertOptions(InsertOptionsBase):
     """Available options to for a key-value insert operation.
 
@@ -772,13 +846,17 @@ class GetAllReplicasMultiOptions(dict):
             :class:`.GetAllReplicasOptions` per key.
         return_exceptions(bool, optional): If False, raise an Exception when encountered.  If True return the
             Exception without raising.  Default to True.
+        max_responses (int, optional): Complete each key's read once its first ``max_responses`` copies responded.
+            If it is 1 for every key, each key's read completes with its fastest response.  Defaults to None (all
+            responses).
     """
     @overload
     def __init__(
         self,
         transcoder=None,  # type: Transcoder
         per_key_options=None,       # type: Dict[str, GetAllReplicasOptions]
-        return_exceptions=None      # type: Optional[bool]
+        return_exceptions=None,     # type: Optional[bool]
+        max_responses=None          # type: Optional[int]
     ):
         pass
 
@@ -788,7 +866,7 @@ class GetAllReplicasMultiOptions(dict):
 
     @classmethod
     def get_valid_keys(cls):
-        return ['timeout', 'transcoder', 'per_key_options', 'return_exceptions']
+        return ['timeout', 'transcoder', 'per_key_options', 'return_exceptions', 'max_responses']
 
 
 class GetAnyReplicaMultiOptions(dict):
@@ -1596,18 +1674,32 @@ class Forwarder(metaclass=ABCMeta):
         *options  # type: OptionsBase
     ):
         # type: (...) -> OptionsBase[str,Any]
+        profiler = profiling._PROFILER
+        if profiler is not None:
+            return profiler.time_stage(profiling.ProfileStage.FORWARD_ARGS, self._forward_args, arg_vars, *options)
+        return self._forward_args(arg_vars, *options)
+
+    def _forward_args(
+        self,
+        arg_vars,  # type: Optional[Dict[str,Any]]
+        *options  # type: OptionsBase
+    ):
+        # type: (...) -> OptionsBase[str,Any]
+        has_options = options and options[0]
+        # fast path: most operations are executed w/o any options or kwargs
+        if not (arg_vars or has_options):
+            return {}
+
         arg_vars = copy.copy(arg_vars) if arg_vars else {}
-        temp_options = (
-            copy.copy(
-                options[0]) if (
-                options and options[0]) else OptionsBase())
+        temp_options = copy.copy(options[0]) if has_options else OptionsBase()
         kwargs = arg_vars.pop("kwargs", {})
         temp_options.update(kwargs)
         temp_options.update(arg_vars)
 
+        arg_mapping = self.arg_mapping()
         end_options = {}
         for k, v in temp_options.items():
-            map_item = self.arg_mapping().get(k, None)
+            map_item = arg_mapping.get(k, None)
             if not (map_item is None):
                 for out_k, out_f in map_item.items():
                     converted = out_f(v)
@@ -1623,23 +1715,26 @@ class Forwarder(metaclass=ABCMeta):
 
 
 class DefaultForwarder(Forwarder):
+    # built once, rather than per forwarded option
+    _ARG_MAPPING = {
+        "spec": {"specs": lambda x: x},
+        "id": {},
+        "timeout": {"timeout": timedelta_as_microseconds},
+        "expiry": {"expiry": timedelta_as_timestamp},
+        "lock_time": {"lock_time": lambda x: int(x.total_seconds())},
+        "self": {},
+        "options": {},
+        "durability": {
+            "durability": DurabilityParser.parse_durability},
+        "disable_scoring": {
+            "disable_scoring": lambda dis_score: True if dis_score else None
+        },
+        "preserve_expiry": {"preserve_expiry": lambda x: x},
+        "report_id": {"report_id": lambda x: str(x)}
+    }
+
     def arg_mapping(self):
-        return {
-            "spec": {"specs": lambda x: x},
-            "id": {},
-            "timeout": {"timeout": timedelta_as_microseconds},
-            "expiry": {"expiry": timedelta_as_timestamp},
-            "lock_time": {"lock_time": lambda x: int(x.total_seconds())},
-            "self": {},
-            "options": {},
-            "durability": {
-                "durability": DurabilityParser.parse_durability},
-            "disable_scoring": {
-                "disable_scoring": lambda dis_score: True if dis_score else None
-            },
-            "preserve_expiry": {"preserve_expiry": lambda x: x},
-            "report_id": {"report_id": lambda x: str(x)}
-        }
+        return self._ARG_MAPPING
 
 
 forward_args = DefaultForwarder().forward_args
@@ -14,7 +14,7 @@
 # limitations under the License.
 #
 
-from typing import Any
+from typing import Any, Optional
 
 from opentelemetry.trace import (Span,
                                  Tracer,
@@ -36,12 +36,17 @@ class CouchbaseOtelSpan(CouchbaseSpan):
         # type: (...) -> None
         self.span.set_attribute(key=key, value=value)
 
-    def finish(self):
+    def finish(self,
+               end_time=None    # type: Optional[int]
+               ):
         # type: (...) -> None
-        self.span.end()
+        self.span.end(end_time=end_time)
 
 
 class CouchbaseOtelTracer(CouchbaseTracer):
+    # allows the SamplingTracer to replay deferred spans w/ their original timings
+    supports_explicit_timestamps = True
+
     def __init__(self,
                  otel_tracer    # type: Tracer
                  ):
@@ -50,12 +55,15 @@ class CouchbaseOtelTracer(CouchbaseTracer):
 
     def start_span(self,
                    name,        # type: str
-                   parent=None       # type: CouchbaseOtelSpan
+                   parent=None,       # type: CouchbaseOtelSpan
+                   start_time=None    # type: Optional[int]
                    ):
         # type: (...) -> CouchbaseOtelSpan
         kwargs = {}
         if parent:
             kwargs['context'] = set_span_in_context(parent.span)
+        if start_time is not None:
+            kwargs['start_time'] = start_time
         return CouchbaseOtelSpan(
             self._external_tracer.start_span(name, **kwargs))
 
@@ -0,0 +1,312 @@
+#  Copyright 2016-2022. Couchbase, Inc.
+#  All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License")
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+from __future__ import annotations
+
+import threading
+from enum import Enum
+from time import perf_counter_ns
+from typing import (Any,
+                    Callable,
+                    Dict,
+                    Optional)
+
+from couchbase.metrics import LatencyHistogram
+
+
+class ProfileStage(Enum):
+    """
+    The stages of a key-value operation timed by the :class:`~couchbase.profiling.OperationProfiler`.
+
+    FORWARD_ARGS: Parsing the provided options and keyword arguments (``forward_args``).
+    TRANSCODE: Encoding the document value with the transcoder.
+    DISPATCH: Time spent in the native call excluding IO and GIL reacquisition, i.e. argument parsing,
+        request creation and queueing in the C++ client.
+    IO: Time from the request being handed to the C++ client until its response is received.
+    GIL_REACQUIRE: Time the IO thread waited on the GIL prior to building the result.
+    DECODE: Decoding the document value with the transcoder.
+    WRAP: Wrapping the native result into the Python result object (blocking API only).
+    """
+    FORWARD_ARGS = 'forward_args'
+    TRANSCODE = 'transcode'
+    DISPATCH = 'dispatch'
+    IO = 'io'
+    GIL_REACQUIRE = 'gil_reacquire'
+    DECODE = 'decode'
+    WRAP = 'wrap'
+
+
+class _NativeStageTimer:
+    """
+    **INTERNAL**
+
+    Passed to the C++ client as the ``profiler`` op arg, called with the IO and GIL reacquisition times (in
+    nanoseconds) once the operation completes.
+    """
+
+    __slots__ = ('_profiler', '_op_name', 'io_ns', 'gil_ns')
+
+    def __init__(self, profiler, op_name):
+        self._profiler = profiler
+        self._op_name = op_name
+        self.io_ns = 0
+        self.gil_ns = 0
+
+    def __call__(self, io_ns, gil_ns):
+        self.io_ns = io_ns
+        self.gil_ns = gil_ns
+        self._profiler.record(ProfileStage.IO, io_ns, op_name=self._op_name)
+        self._profiler.record(ProfileStage.GIL_REACQUIRE, gil_ns, op_name=self._op_name)
+
+
+class OperationProfiler:
+    """
+    Aggregates the time spent in each stage of key-value operations into
+    :class:`~couchbase.metrics.LatencyHistogram` instances (in nanoseconds).
+
+    Profiling is process wide and opt-in, see :func:`~couchbase.profiling.enable_profiling`.
+
+    Args:
+        sub_bucket_bits (int, optional): Histogram precision, see :class:`~couchbase.metrics.LatencyHistogram`.
+    """
+
+    def __init__(self,
+                 sub_bucket_bits=6,  # type: Optional[int]
+                 ):
+        self._sub_bucket_bits = sub_bucket_bits
+        self._lock = threading.Lock()
+        self._stages = {}  # type: Dict[ProfileStage, LatencyHistogram]
+        self._operations = {}  # type: Dict[str, Dict[ProfileStage, LatencyHistogram]]
+        self._op_names = {}  # type: Dict[Any, str]
+
+    def _histogram(self,
+                   stages,  # type: Dict[ProfileStage, LatencyHistogram]
+                   stage  # type: ProfileStage
+                   ) -> LatencyHistogram:
+        hist = stages.get(stage, None)
+        if hist is None:
+            hist = LatencyHistogram(sub_bucket_bits=self._sub_bucket_bits)
+            stages[stage] = hist
+        return hist
+
+    def record(self,
+               stage,  # type: ProfileStage
+               elapsed_ns,  # type: int
+               op_name=None  # type: Optional[str]
+               ) -> None:
+        """
+        Record the time spent in a stage.
+
+        Args:
+            stage (:class:`~couchbase.profiling.ProfileStage`): The stage.
+            elapsed_ns (int): The time spent in the stage, in nanoseconds.
+            op_name (str, optional): The operation the stage belongs to, if known.
+        """
+        with self._lock:
+            self._histogram(self._stages, stage).record(elapsed_ns)
+            if op_name is not None:
+                self._histogram(self._operations.setdefault(op_name, {}), stage).record(elapsed_ns)
+
+    def time_stage(self,
+                   stage,  # type: ProfileStage
+                   fn,  # type: Callable[..., Any]
+                   *args,  # type: Any
+                   op_name=None,  # type: Optional[str]
+                   **kwargs  # type: Any
+                   ) -> Any:
+        """
+        **INTERNAL**
+        """
+        start = perf_counter_ns()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            self.record(stage, perf_counter_ns() - start, op_name=op_name)
+
+    def _op_name(self, op_type  # type: Any
+                 ) -> str:
+        name = self._op_names.get(op_type, None)
+        if name is None:
+            from couchbase.pycbc_core import operations
+            try:
+                name = operations(op_type).name.lower()
+            except ValueError:
+                name = str(op_type)
+            self._op_names[op_type] = name
+        return name
+
+    def profile_kv_operation(self,
+                             kv_operation,  # type: Callable[..., Any]
+                             **kwargs  # type: Any
+                             ) -> Any:
+        """
+        **INTERNAL**
+
+        Executes the native KV operation, recording the dispatch stage and having the C++ client report the IO and
+        GIL reacquisition stages.
+        """
+        op_name = self._op_name(kwargs.get('op_type'))
+        op_args = kwargs.get('op_args', None)
+        if op_args is None:
+            op_args = {}
+            kwargs['op_args'] = op_args
+        timer = _NativeStageTimer(self, op_name)
+        op_args['profiler'] = timer
+        is_async = 'callback' in op_args
+
+        start = perf_counter_ns()
+        try:
+            return kv_operation(**kwargs)
+        finally:
+            elapsed = perf_counter_ns() - start
+            if not is_async:
+                # a blocking call also waits on the IO, the native timer has already fired at this point
+                elapsed = max(0, elapsed - timer.io_ns - timer.gil_ns)
+            self.record(ProfileStage.DISPATCH, elapsed, op_name=op_name)
+
+    @staticmethod
+    def _stats(hist  # type: LatencyHistogram
+               ) -> Dict[str, Any]:
+        pcts = hist.percentiles([50, 90, 99, 99.9])
+        mean = hist.mean
+        return {
+            'total_count': hist.count,
+            'min_ns': hist.min,
+            'max_ns': hist.max,
+            'mean_ns': None if mean is None else round(mean, 1),
+            'percentiles_ns': {str(p): v for p, v in pcts.items()},
+        }
+
+    def snapshot(self, reset=False  # type: Optional[bool]
+                 ) -> Dict[str, Any]:
+        """
+        Export the stage timings recorded so far.
+
+        The returned dict has the following format::
+
+            {
+                'stages': {'<stage>': {'total_count': int, 'min_ns': int, 'max_ns': int, 'mean_ns': float,
+                                       'percentiles_ns': {'50.0': int, '90.0': int, '99.0': int, '99.9': int}}},
+                'operations': {'<operation>': {'<stage>': {...}}}
+            }
+
+        Stages that can be attributed to an operation (dispatch, io and gil_reacquire) are also reported per operation.
+
+        Args:
+            reset (bool, optional): If True, the histograms are reset after the snapshot is taken.
+                Defaults to False.
+
+        Returns:
+            Dict[str, Any]: The stage timings.
+        """
+        with self._lock:
+            stages = {s: h.copy() for s, h in self._stages.items()}
+            operations = {op: {s: h.copy() for s, h in hists.items()} for op, hists in self._operations.items()}
+            if reset:
+                self._stages = {}
+                self._operations = {}
+
+        ordered = [s for s in ProfileStage]
+        return {
+            'stages': {s.value: self._stats(stages[s]) for s in ordered if s in stages},
+            'operations': {op: {s.value: self._stats(hists[s]) for s in ordered if s in hists}
+                           for op, hists in operations.items()},
+        }
+
+    def reset(self) -> None:
+        """
+        Discard all recorded timings.
+        """
+        with self._lock:
+            self._stages = {}
+            self._operations = {}
+
+
+_PROFILER = None  # type: Optional[OperationProfiler]
+
+
+def enable_profiling(profiler=None  # type: Optional[OperationProfiler]
+                     ) -> OperationProfiler:
+    """
+    Enable process wide profiling of key-value operations.  Each operation will be timed through the following
+    stages: options parsing, transcoding, native dispatch, IO, GIL reacquisition, decoding and result wrapping.
+
+    .. note::
+        Profiling adds a small amount of overhead to each operation and is intended for diagnosing latency issues,
+        not for always-on use.  See :class:`~couchbase.metrics.HistogramMeter` for always-on latency metrics.
+
+    Args:
+        profiler (:class:`~couchbase.profiling.OperationProfiler`, optional): The profiler to record into.
+            Defaults to a new :class:`~couchbase.profiling.OperationProfiler`.
+
+    Returns:
+        :class:`~couchbase.profiling.OperationProfiler`: The active profiler.
+
+    Example:
+
+        .. code-block:: python
+
+            from couchbase import profiling
+
+            profiler = profiling.enable_profiling()
+            for _ in range(1000):
+                collection.get('airline_10')
+            profiling.disable_profiling()
+            print(profiler.snapshot()['stages']['decode']['percentiles_ns'])
+
+    """
+    global _PROFILER
+    if profiler is None:
+        profiler = OperationProfiler()
+    _PROFILER = profiler
+    return profiler
+
+
+def disable_profiling() -> Optional[OperationProfiler]:
+    """
+    Disable profiling of key-value operations.
+
+    Returns:
+        Optional[:class:`~couchbase.profiling.OperationProfiler`]: The profiler that was active, if any.
+    """
+    global _PROFILER
+    profiler = _PROFILER
+    _PROFILER = None
+    return profiler
+
+
+def get_profiler() -> Optional[OperationProfiler]:
+    """
+    Returns:
+        Optional[:class:`~couchbase.profiling.OperationProfiler`]: The active profiler, None if profiling is disabled.
+    """
+    return _PROFILER
+
+
+def profiling_snapshot(reset=False  # type: Optional[bool]
+                       ) -> Dict[str, Any]:
+    """
+    Export the stage timings of the active profiler, see :meth:`~couchbase.profiling.OperationProfiler.snapshot`.
+
+    Args:
+        reset (bool, optional): If True, the histograms are reset after the snapshot is taken. Defaults to False.
+
+    Returns:
+        Dict[str, Any]: The stage timings, empty if profiling is disabled.
+    """
+    profiler = _PROFILER
+    if profiler is None:
+        return {}
+    return profiler.snapshot(reset=reset)
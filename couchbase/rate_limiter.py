@@ -0,0 +1,457 @@
+#  Copyright 2016-2022. Couchbase, Inc.
+#  All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License")
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import logging
+import threading
+import time
+from datetime import timedelta
+from typing import (Any,
+                    Callable,
+                    Dict,
+                    Iterator,
+                    Optional,
+                    Union)
+
+from couchbase import _fork
+from couchbase.exceptions import InvalidArgumentException, RateLimitedException
+from couchbase.exceptions import exception as CouchbaseBaseException
+from couchbase.metrics import LatencyHistogram
+
+log = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """
+    **INTERNAL**
+
+    Token bucket refilled at ``rate`` tokens per second, holding at most one second worth of tokens.  Not thread
+    safe, the owning :class:`~couchbase.rate_limiter.ClientRateLimiter` serializes access.
+    """
+
+    def __init__(self,
+                 rate  # type: float
+                 ):
+        self._rate = float(rate)
+        self._capacity = max(self._rate, 1.0)
+        self._tokens = self._capacity
+        self._last = time.monotonic()
+
+    @property
+    def rate(self) -> float:
+        return self._rate
+
+    def delay_for(self,
+                  amount,  # type: float
+                  now  # type: float
+                  ) -> float:
+        """
+        Returns the number of seconds until ``amount`` tokens are available.
+        """
+        self._tokens = min(self._capacity, self._tokens + (now - self._last) * self._rate)
+        self._last = now
+        if self._tokens >= amount:
+            return 0.0
+        return (amount - self._tokens) / self._rate
+
+    def take(self,
+             amount  # type: float
+             ) -> None:
+        # the balance can go negative, later requests then wait for the debt to be paid back
+        self._tokens -= amount
+
+
+class _LimiterStats:
+    def __init__(self):
+        self.admitted = 0
+        self.queued = 0
+        self.shed = 0
+        self.queue_delay = LatencyHistogram()
+
+    def record(self,
+               delay  # type: float
+               ) -> None:
+        self.admitted += 1
+        if delay > 0:
+            self.queued += 1
+        self.queue_delay.record(int(delay * 1e6))
+
+    def as_dict(self,
+                percentiles  # type: Any
+                ) -> Dict[str, Any]:
+        hist = self.queue_delay
+        return {
+            'admitted': self.admitted,
+            'queued': self.queued,
+            'shed': self.shed,
+            'queue_delay_us': {
+                'max': hist.max,
+                'mean': hist.mean,
+                'percentiles': {str(p): v for p, v in hist.percentiles(percentiles).items()},
+            },
+        }
+
+
+class _Permit:
+    """
+    **INTERNAL**
+
+    A concurrency permit, releasing it more than once is a no-op.
+    """
+
+    def __init__(self,
+                 limiter,  # type: ClientRateLimiter
+                 service  # type: str
+                 ):
+        self._limiter = limiter
+        self._service = service
+        self._released = False
+
+    def release(self) -> None:
+        if not self._released:
+            self._released = True
+            self._limiter._release(self._service)
+
+
+class _PermitReleasingIterator:
+    """
+    **INTERNAL**
+
+    Wraps the streaming result of an HTTP request and releases the request's concurrency permit once all rows have
+    been received (the core yields None after the last row), an error was received or the result is discarded.
+    """
+
+    def __init__(self,
+                 streaming_result,  # type: Iterator[Any]
+                 permit  # type: _Permit
+                 ):
+        self._streaming_result = streaming_result
+        self._permit = permit
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        try:
+            row = next(self._streaming_result)
+        except BaseException:
+            self._permit.release()
+            raise
+        if row is None or isinstance(row, CouchbaseBaseException):
+            self._permit.release()
+        return row
+
+    def __del__(self):
+        self._permit.release()
+
+
+class _DelayedDispatcher:
+    """
+    **INTERNAL**
+
+    Runs callables once their delay has passed on a single daemon thread.  Used to queue operations of the
+    non-blocking APIs (acouchbase, txcouchbase) whose results are delivered via callbacks, so the event loop is
+    never put to sleep by the limiter.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._heap = []
+        self._seq = itertools.count()
+        self._thread = None
+
+    def schedule(self,
+                 delay,  # type: float
+                 fn,  # type: Callable[..., Any]
+                 *args,  # type: Any
+                 ) -> None:
+        with self._cond:
+            heapq.heappush(self._heap, (time.monotonic() + delay, next(self._seq), fn, args))
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='pycbc-rate-limiter', daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while True:
+                    if not self._heap:
+                        self._cond.wait()
+                        continue
+                    wait = self._heap[0][0] - time.monotonic()
+                    if wait <= 0:
+                        _, _, fn, args = heapq.heappop(self._heap)
+                        break
+                    self._cond.wait(wait)
+            try:
+                fn(*args)
+            except Exception:
+                log.exception('Unable to dispatch rate limited operation.')
+
+
+class ClientRateLimiter:
+    """
+    **VOLATILE** This API is subject to change at any time.
+
+    A client-side rate and concurrency limiter, provided via the ``rate_limiter`` cluster option
+    (see :class:`~couchbase.options.ClusterOptions`).
+
+    Key-value operations are limited by a token bucket per configured limit (operations/s and request payload
+    bytes/s), the HTTP services by the number of concurrent requests.  Requests that exceed a limit are queued
+    locally for at most ``max_queue_delay``, requests that would need to wait longer are shed with a
+    :class:`~couchbase.exceptions.RateLimitedException` without being sent to the cluster.  This keeps a client
+    below the server's rate limits instead of having its requests rejected and retried.
+
+    The blocking API waits in the calling thread.  The acouchbase and txcouchbase APIs never block the event loop:
+    key-value operations are queued and dispatched once admitted, HTTP requests are shed if no permit is available
+    when the request is started.
+
+    A single limiter can be shared by several clusters to limit their combined traffic.
+
+    Args:
+        kv_ops_per_second (float, optional): Maximum rate of key-value operations.  Multi operations count each key.
+        kv_bytes_per_second (float, optional): Maximum rate of key-value request payload (document values) bytes.
+        query_concurrency (int, optional): Maximum number of concurrent query requests.
+        search_concurrency (int, optional): Maximum number of concurrent search requests.
+        analytics_concurrency (int, optional): Maximum number of concurrent analytics requests.
+        max_queue_delay (Union[timedelta, float], optional): Maximum amount of time (seconds if a float is
+            provided) a request is queued before it is shed.  Defaults to 1 second, 0 sheds requests immediately.
+
+    Raises:
+        :class:`~couchbase.exceptions.InvalidArgumentException`: If a limit is not positive.
+
+    Example:
+
+        .. code-block:: python
+
+            from couchbase.options import ClusterOptions
+            from couchbase.rate_limiter import ClientRateLimiter
+
+            limiter = ClientRateLimiter(kv_ops_per_second=5000, query_concurrency=8)
+            cluster = Cluster('couchbase://localhost', ClusterOptions(auth, rate_limiter=limiter))
+            ...
+            print(limiter.snapshot()['kv']['queue_delay_us'])
+
+    """
+
+    HTTP_SERVICES = ('query', 'search', 'analytics')
+    DEFAULT_MAX_QUEUE_DELAY = 1.0
+    DEFAULT_PERCENTILES = (50.0, 90.0, 99.0, 99.9)
+
+    def __init__(self,
+                 kv_ops_per_second=None,  # type: Optional[float]
+                 kv_bytes_per_second=None,  # type: Optional[float]
+                 query_concurrency=None,  # type: Optional[int]
+                 search_concurrency=None,  # type: Optional[int]
+                 analytics_concurrency=None,  # type: Optional[int]
+                 max_queue_delay=None,  # type: Optional[Union[timedelta, float]]
+                 ):
+        for name, limit in (('kv_ops_per_second', kv_ops_per_second),
+                            ('kv_bytes_per_second', kv_bytes_per_second),
+                            ('query_concurrency', query_concurrency),
+                            ('search_concurrency', search_concurrency),
+                            ('analytics_concurrency', analytics_concurrency)):
+            if limit is not None and (not isinstance(limit, (int, float)) or limit <= 0):
+                raise InvalidArgumentException(message=f'{name} must be a positive number.')
+        if isinstance(max_queue_delay, timedelta):
+            max_queue_delay = max_queue_delay.total_seconds()
+        if max_queue_delay is None:
+            max_queue_delay = self.DEFAULT_MAX_QUEUE_DELAY
+        if max_queue_delay < 0:
+            raise InvalidArgumentException(message='max_queue_delay cannot be negative.')
+        self._max_queue_delay = float(max_queue_delay)
+
+        self._kv_ops = TokenBucket(kv_ops_per_second) if kv_ops_per_second else None
+        self._kv_bytes = TokenBucket(kv_bytes_per_second) if kv_bytes_per_second else None
+        concurrency_limits = (('query', query_concurrency),
+                              ('search', search_concurrency),
+                              ('analytics', analytics_concurrency))
+        self._concurrency = {svc: int(limit) for svc, limit in concurrency_limits if limit is not None}
+        self._in_flight = {svc: 0 for svc in self._concurrency}
+        self._init_locks()
+        self._stats = {svc: _LimiterStats() for svc in ('kv', *self._concurrency)}
+        self._dispatcher = _DelayedDispatcher()
+        _fork.register(self)
+
+    def _init_locks(self) -> None:
+        self._lock = threading.Lock()
+        self._permit_available = threading.Condition(self._lock)
+
+    def _abandon_after_fork(self) -> None:
+        """
+        **INTERNAL**
+
+        Called in the child process after a fork, the locks might have been held by a thread that does not exist
+        in the child.  Permits held by the parent's in-flight requests are not owned by the child.
+        """
+        self._init_locks()
+        self._in_flight = {svc: 0 for svc in self._concurrency}
+        self._dispatcher = _DelayedDispatcher()
+
+    @property
+    def max_queue_delay(self) -> timedelta:
+        """
+            timedelta: The maximum amount of time a request is queued before it is shed.
+        """
+        return timedelta(seconds=self._max_queue_delay)
+
+    @property
+    def limits_kv(self) -> bool:
+        """
+        **INTERNAL**
+        """
+        return self._kv_ops is not None or self._kv_bytes is not None
+
+    def acquire_kv(self,
+                   num_ops=1,  # type: Optional[int]
+                   num_bytes=0  # type: Optional[int]
+                   ) -> float:
+        """
+        **INTERNAL**
+
+        Reserves capacity for key-value operations, returns the number of seconds the operations must be delayed.
+
+        Raises:
+            :class:`~couchbase.exceptions.RateLimitedException`: If the operations would need to be queued for longer
+                than the ``max_queue_delay``.
+        """
+        if not self.limits_kv:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            delay = 0.0
+            if self._kv_ops is not None:
+                delay = self._kv_ops.delay_for(num_ops, now)
+            if self._kv_bytes is not None and num_bytes:
+                delay = max(delay, self._kv_bytes.delay_for(num_bytes, now))
+            stats = self._stats['kv']
+            if delay > self._max_queue_delay:
+                stats.shed += 1
+                raise RateLimitedException(message=('Client-side key-value rate limit exceeded, '
+                                                    f'the operation would have been queued for {delay:.3f}s.'))
+            if self._kv_ops is not None:
+                self._kv_ops.take(num_ops)
+            if self._kv_bytes is not None and num_bytes:
+                self._kv_bytes.take(num_bytes)
+            stats.record(delay)
+        return delay
+
+    def dispatch_later(self,
+                       delay,  # type: float
+                       fn,  # type: Callable[..., Any]
+                       *args,  # type: Any
+                       ) -> None:
+        """
+        **INTERNAL**
+
+        Calls ``fn(*args)`` on the limiter's dispatch thread once ``delay`` seconds have passed.
+        """
+        self._dispatcher.schedule(delay, fn, *args)
+
+    def acquire_permit(self,
+                       service,  # type: str
+                       blocking=True  # type: Optional[bool]
+                       ) -> Optional[_Permit]:
+        """
+        **INTERNAL**
+
+        Acquires a concurrency permit for an HTTP service request, None if the service is not limited.  If
+        ``blocking`` is set the calling thread waits up to ``max_queue_delay`` for a permit.
+
+        Raises:
+            :class:`~couchbase.exceptions.RateLimitedException`: If no permit could be acquired.
+        """
+        limit = self._concurrency.get(service, None)
+        if limit is None:
+            return None
+        start = time.monotonic()
+        queued = False
+        with self._lock:
+            if blocking:
+                deadline = start + self._max_queue_delay
+                while self._in_flight[service] >= limit:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    queued = True
+                    self._permit_available.wait(remaining)
+            stats = self._stats[service]
+            if self._in_flight[service] >= limit:
+                stats.shed += 1
+                raise RateLimitedException(message=(f'Client-side {service} concurrency limit ({limit}) exceeded.'))
+            self._in_flight[service] += 1
+            stats.record(time.monotonic() - start if queued else 0.0)
+        return _Permit(self, service)
+
+    def _release(self,
+                 service  # type: str
+                 ) -> None:
+        with self._lock:
+            if self._in_flight[service] > 0:
+                self._in_flight[service] -= 1
+            self._permit_available.notify()
+
+    def track_stream(self,
+                     streaming_result,  # type: Iterator[Any]
+                     permit  # type: Optional[_Permit]
+                     ) -> Iterator[Any]:
+        """
+        **INTERNAL**
+
+        Returns the streaming result wrapped so the permit is released once the request completes.
+        """
+        if permit is None:
+            return streaming_result
+        return _PermitReleasingIterator(streaming_result, permit)
+
+    def snapshot(self,
+                 reset=False  # type: Optional[bool]
+                 ) -> Dict[str, Any]:
+        """Export the limiter's counters and the queueing delay percentiles.
+
+        Args:
+            reset (bool, optional): If True, the counters and histograms are reset after the snapshot is taken.
+                Defaults to False.
+
+        Returns:
+            Dict[str, Any]: Per limited service (``kv``, ``query``, ``search``, ``analytics``) the number of
+            ``admitted``, ``queued`` (admitted after a delay) and ``shed`` requests, the current number of
+            requests ``in_flight`` (HTTP services) and the ``queue_delay_us`` max, mean and p50/p90/p99/p99.9.
+        """
+        with self._lock:
+            snapshot = {svc: stats.as_dict(self.DEFAULT_PERCENTILES) for svc, stats in self._stats.items()}
+            for svc, in_flight in self._in_flight.items():
+                snapshot[svc]['in_flight'] = in_flight
+            if reset:
+                self._stats = {svc: _LimiterStats() for svc in self._stats}
+        return snapshot
+
+
+def kv_payload_size(value  # type: Any
+                    ) -> int:
+    """
+    **INTERNAL**
+
+    The size of a transcoded key-value payload, values are (bytes, flags) tuples once transcoded.
+    """
+    if isinstance(value, tuple) and value:
+        value = value[0]
+    if isinstance(value, (bytes, bytearray, memoryview, str)):
+        return len(value)
+    return 0
@@ -16,21 +16,20 @@
 from __future__ import annotations
 
 import json
-from datetime import datetime
+import sys
+from datetime import datetime, timedelta
 from typing import (Any,
                     Dict,
+                    List,
                     Optional,
                     Tuple,
                     Union)
 
-from acouchbase.analytics import AsyncAnalyticsRequest
-from acouchbase.n1ql import AsyncN1QLRequest
-from acouchbase.search import AsyncSearchRequest
-from acouchbase.views import AsyncViewRequest
 from couchbase.diagnostics import (ClusterState,
                                    EndpointDiagnosticsReport,
                                    EndpointPingReport,
                                    EndpointState,
+                                   PingState,
                                    ServiceType)
 from couchbase.exceptions import (CLIENT_ERROR_MAP,
                                   CouchbaseException,
@@ -312,6 +311,79 @@ class PingResult(Result):
         return "PingResult:{}".format(self._orig)
 
 
+class WarmUpResult:
+    """The outcome of warming up a cluster's connections.
+
+    Each endpoint report is the ping that opened (or re-used) a connection to the endpoint, for an endpoint that was
+    not yet connected its latency includes connecting, TLS and authentication.
+    """
+
+    def __init__(self,
+                 ping_results,  # type: List[PingResult]
+                 duration  # type: timedelta
+                 ):
+        self._endpoints = {}
+        for ping_result in ping_results:
+            for service_type, reports in ping_result.endpoints.items():
+                self._endpoints.setdefault(service_type, []).extend(reports)
+        self._duration = duration
+
+    @property
+    def endpoints(self) -> Dict[ServiceType, List[EndpointPingReport]]:
+        """
+            Dict[:class:`~couchbase.diagnostics.ServiceType`, List[:class:`~couchbase.diagnostics.EndpointPingReport`]]:
+            The reports of all endpoints that were warmed up, by service.
+        """
+        return self._endpoints
+
+    @property
+    def duration(self) -> timedelta:
+        """
+            timedelta: The total amount of time the warm up took.
+        """
+        return self._duration
+
+    @property
+    def errors(self) -> List[EndpointPingReport]:
+        """
+            List[:class:`~couchbase.diagnostics.EndpointPingReport`]: The reports of endpoints that could not be
+            warmed up.
+        """
+        return [report for reports in self._endpoints.values() for report in reports if report.state != PingState.OK]
+
+    def node_connect_times(self) -> Dict[str, Dict[ServiceType, timedelta]]:
+        """Returns the slowest (successful) connection time per node and service.
+
+        Returns:
+            Dict[str, Dict[:class:`~couchbase.diagnostics.ServiceType`, timedelta]]: The connection times keyed by the
+            remote address of the node.
+        """
+        connect_times = {}
+        for service_type, reports in self._endpoints.items():
+            for report in reports:
+                if report.state != PingState.OK or report.remote is None:
+                    continue
+                node_times = connect_times.setdefault(report.remote, {})
+                node_times[service_type] = max(report.latency, node_times.get(service_type, timedelta()))
+        return connect_times
+
+    def as_json(self) -> str:
+        """Returns a JSON formatted warm up report.
+
+        Returns:
+            str: JSON formatted warm up report.
+        """
+        return_val = {
+            'duration_us': int(self._duration.total_seconds() * 1e6),
+            'services': {k.value: list(map(lambda epr: epr.as_dict(), v)) for k, v in self._endpoints.items()}
+        }
+
+        return json.dumps(return_val)
+
+    def __repr__(self):
+        return f'WarmUpResult(duration={self._duration}, endpoints={self._endpoints})'
+
+
 class GetReplicaResult(Result):
 
     @property
@@ -955,6 +1027,16 @@ class HttpResult:
         self._orig = orig
 
 
+def _is_async_request(request,  # type: Any
+                      module_name,  # type: str
+                      class_name  # type: str
+                      ) -> bool:
+    # an async request only exists if its acouchbase module has been imported, checking sys.modules avoids
+    # importing acouchbase (and asyncio) for the blocking API
+    module = sys.modules.get(module_name, None)
+    return module is not None and isinstance(request, getattr(module, class_name))
+
+
 class QueryResult:
     def __init__(
         self,
@@ -971,7 +1053,7 @@ class QueryResult:
         Returns:
             Iterable: Either an iterable or async iterable.
         """
-        if isinstance(self._request, AsyncN1QLRequest):
+        if _is_async_request(self._request, 'acouchbase.n1ql', 'AsyncN1QLRequest'):
             return self.__aiter__()
         return self.__iter__()
 
@@ -1024,7 +1106,7 @@ class AnalyticsResult:
         Returns:
             Iterable: Either an iterable or async iterable.
         """
-        if isinstance(self._request, AsyncAnalyticsRequest):
+        if _is_async_request(self._request, 'acouchbase.analytics', 'AsyncAnalyticsRequest'):
             return self.__aiter__()
         return self.__iter__()
 
@@ -1063,7 +1145,7 @@ class SearchResult:
         Returns:
             Iterable: Either an iterable or async iterable.
         """
-        if isinstance(self._request, AsyncSearchRequest):
+        if _is_async_request(self._request, 'acouchbase.search', 'AsyncSearchRequest'):
             return self.__aiter__()
         return self.__iter__()
 
@@ -1108,7 +1190,7 @@ class ViewResult:
         Returns:
             Iterable: Either an iterable or async iterable.
         """
-        if isinstance(self._request, AsyncViewRequest):
+        if _is_async_request(self._request, 'acouchbase.views', 'AsyncViewRequest'):
             return self.__aiter__()
         return self.__iter__()
 
@@ -0,0 +1,549 @@
+#  Copyright 2016-2022. Couchbase, Inc.
+#  All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License")
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+from __future__ import annotations
+
+import random
+import threading
+import time
+from abc import ABC, abstractmethod
+from datetime import timedelta
+from typing import (TYPE_CHECKING,
+                    Any,
+                    Callable,
+                    Dict,
+                    List,
+                    Optional,
+                    Union)
+
+from couchbase import _fork
+from couchbase.exceptions import (AmbiguousTimeoutException,
+                                  CouchbaseException,
+                                  DurabilitySyncWriteInProgressException,
+                                  InvalidArgumentException,
+                                  ServiceUnavailableException,
+                                  TemporaryFailException,
+                                  UnAmbiguousTimeoutException)
+from couchbase.rate_limiter import _DelayedDispatcher
+
+if TYPE_CHECKING:
+    from couchbase.metrics import CouchbaseMeter
+
+
+class RetryRequest:
+    """
+    **VOLATILE** This API is subject to change at any time.
+
+    A failed request attempt, passed to :meth:`RetryStrategy.retry_after`.
+
+    Args:
+        service (str): The service the request was sent to, e.g. ``kv``.
+        operation (str): The operation, e.g. ``get``.
+        attempt (int): The number of the attempt that failed, starting at 1.
+        idempotent (bool): True if retrying the request cannot apply a change twice (reads).
+        exception (:class:`~couchbase.exceptions.CouchbaseException`): The attempt's error.
+    """
+
+    def __init__(self,
+                 service,  # type: str
+                 operation,  # type: str
+                 attempt,  # type: int
+                 idempotent,  # type: bool
+                 exception,  # type: CouchbaseException
+                 ):
+        self.service = service
+        self.operation = operation
+        self.attempt = attempt
+        self.idempotent = idempotent
+        self.exception = exception
+
+    @property
+    def node(self) -> Optional[str]:
+        """
+            Optional[str]: The node the failed attempt was last dispatched to (from the error context), if known.
+        """
+        try:
+            return self.exception.error_context.last_dispatched_to
+        except Exception:  # nosec
+            return None
+
+    def __repr__(self):
+        return (f'RetryRequest(service={self.service}, operation={self.operation}, attempt={self.attempt}, '
+                f'idempotent={self.idempotent}, exception={type(self.exception).__name__})')
+
+
+class RetryStrategy(ABC):
+    """
+    **VOLATILE** This API is subject to change at any time.
+
+    Decides if and when a failed request is retried by the Python client, provided via the ``retry_strategy``
+    cluster option (see :class:`~couchbase.options.ClusterOptions`).  Derive from this class to implement a custom
+    strategy, :class:`~couchbase.retry.AdaptiveRetryStrategy` is the built-in implementation.
+
+    The strategy is applied to key-value operations on top of the C++ core's own retries (which happen within the
+    operation's timeout), it is consulted once the core gave up on an attempt.  The operation's timeout bounds all
+    of its attempts: a retry is sent with the time that remains and is not sent once the timeout elapsed.  Methods
+    are called from the C++ core's IO threads for the acouchbase and txcouchbase APIs and must be thread safe.
+    """
+
+    def on_request(self,
+                   service  # type: str
+                   ) -> None:
+        """
+        Called once for every request (not for its retries) before the request is sent.
+        """
+
+    @abstractmethod
+    def retry_after(self,
+                    request  # type: RetryRequest
+                    ) -> Optional[Union[timedelta, float]]:
+        """
+        Returns how long to wait before the request is retried (seconds if a float is returned), None if the
+        request's error should be returned to the application.
+        """
+
+    def on_retry_success(self,
+                         request  # type: RetryRequest
+                         ) -> None:
+        """
+        Called when a retried request succeeded, ``request`` is the attempt that failed before.
+        """
+
+    def on_retry_abandoned(self,
+                           request  # type: RetryRequest
+                           ) -> None:
+        """
+        Called when a retry granted by :meth:`retry_after` is not sent (e.g. too little of the operation's timeout
+        remains after the backoff or the retry could not be dispatched), ``request`` is the attempt that failed.
+        """
+
+    def snapshot(self,
+                 reset=False  # type: Optional[bool]
+                 ) -> Dict[str, Any]:
+        """
+        Returns the strategy's metrics, see :meth:`AdaptiveRetryStrategy.snapshot`.
+        """
+        return {}
+
+    def dispatch_later(self,
+                       delay,  # type: float
+                       fn,  # type: Callable[..., Any]
+                       *args,  # type: Any
+                       ) -> None:
+        """
+        **INTERNAL**
+
+        Calls ``fn(*args)`` once ``delay`` seconds have passed, used to retry requests of the non-blocking APIs
+        without blocking the event loop.
+        """
+        dispatcher = getattr(self, '_dispatcher', None)
+        if dispatcher is None:
+            dispatcher = self._dispatcher = _DelayedDispatcher()
+        dispatcher.schedule(delay, fn, *args)
+
+
+class _RetryBudget:
+    """
+    **INTERNAL**
+
+    Limits the retries of a service to ``ratio`` of its requests plus ``min_retries_per_second`` over a sliding
+    window of ``WINDOW`` one second buckets.  Not thread safe, the owning strategy serializes access.
+    """
+
+    WINDOW = 10
+
+    def __init__(self,
+                 ratio,  # type: float
+                 min_retries_per_second  # type: float
+                 ):
+        self._ratio = ratio
+        self._min_retries_per_second = min_retries_per_second
+        self._requests = [0] * self.WINDOW
+        self._retries = [0] * self.WINDOW
+        self._second = int(time.monotonic())
+
+    def _advance(self) -> int:
+        now = int(time.monotonic())
+        elapsed = now - self._second
+        if elapsed > 0:
+            for i in range(1, min(elapsed, self.WINDOW) + 1):
+                idx = (self._second + i) % self.WINDOW
+                self._requests[idx] = 0
+                self._retries[idx] = 0
+            self._second = now
+        return now % self.WINDOW
+
+    def record_request(self) -> None:
+        self._requests[self._advance()] += 1
+
+    def try_withdraw(self) -> bool:
+        idx = self._advance()
+        allowed = self._ratio * sum(self._requests) + self._min_retries_per_second * self.WINDOW
+        if sum(self._retries) + 1 > allowed:
+            return False
+        self._retries[idx] += 1
+        return True
+
+
+class _CircuitBreaker:
+    """
+    **INTERNAL**
+
+    Per node failure tracking.  The breaker opens once ``threshold`` failures were seen within ``window`` seconds,
+    while open errors from the node are not retried.  After ``open_time`` seconds a single retry is let through
+    (half-open), the breaker closes if it succeeds and opens again if it fails.  If the probe is not sent or ends
+    with an error that tells nothing about the node's health, the breaker is half-open again.  Not thread safe.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self,
+                 threshold,  # type: int
+                 window,  # type: float
+                 open_time  # type: float
+                 ):
+        self._threshold = threshold
+        self._window = window
+        self._open_time = open_time
+        self._failures = []  # type: List[float]
+        self._opened_at = None  # type: Optional[float]
+        self._probing = False
+
+    def state(self,
+              now  # type: float
+              ) -> str:
+        if self._opened_at is None:
+            return self.CLOSED
+        if now - self._opened_at < self._open_time or self._probing:
+            return self.OPEN
+        return self.HALF_OPEN
+
+    def record_failure(self,
+                       now  # type: float
+                       ) -> None:
+        if self._probing:
+            # the probe failed
+            self._probing = False
+            self._opened_at = now
+            return
+        self._failures = [ts for ts in self._failures if now - ts < self._window]
+        self._failures.append(now)
+        if self._opened_at is None and len(self._failures) >= self._threshold:
+            self._opened_at = now
+
+    def allow_retry(self,
+                    now  # type: float
+                    ) -> bool:
+        state = self.state(now)
+        if state == self.CLOSED:
+            return True
+        if state == self.HALF_OPEN:
+            self._probing = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self._failures = []
+        self._opened_at = None
+        self._probing = False
+
+    def end_probe(self) -> None:
+        self._probing = False
+
+
+class _RetryStats:
+    def __init__(self):
+        self.requests = 0
+        self.retries = 0
+        self.retry_successes = 0
+        self.budget_rejected = 0
+        self.circuit_rejected = 0
+        self.attempts_exhausted = 0
+        self.not_retriable = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return dict(vars(self))
+
+
+class AdaptiveRetryStrategy(RetryStrategy):
+    """
+    **VOLATILE** This API is subject to change at any time.
+
+    The built-in :class:`~couchbase.retry.RetryStrategy`: retries transient errors with exponential backoff and full
+    jitter, bounded by a retry budget per service and a circuit breaker per node so retries do not amplify the load
+    during a partial outage.
+
+    Errors that did not apply the request (temporary failures, unavailable services and sync writes in progress)
+    are retried.  Timeouts are only retried if ``retry_timeouts`` is enabled, unambiguous timeouts then are, ambiguous
+    timeouts only for reads.  A retry is rejected (the error is returned) if:
+
+    * the request already had ``max_retries`` retries,
+    * the service's retry budget is used up: over the last 10 seconds at most ``retry_budget_ratio`` of the
+      requests plus ``min_retries_per_second`` may be retries,
+    * the node the request was dispatched to failed ``circuit_breaker_threshold`` times within
+      ``circuit_breaker_window``.  The node's circuit then stays open for ``circuit_breaker_open_time``, after which
+      a single retry probes the node.
+
+    A single strategy can be shared by several clusters, the budgets are then shared as well.
+
+    Args:
+        max_retries (int, optional): Maximum number of retries per request.  Defaults to 3.
+        initial_backoff (Union[timedelta, float], optional): Backoff cap of the first retry (seconds if a float is
+            provided), doubled for every retry.  Defaults to 10 milliseconds.
+        max_backoff (Union[timedelta, float], optional): Maximum backoff.  Defaults to 1 second.
+        retry_budget_ratio (float, optional): Maximum ratio of retries to requests per service.  Defaults to 0.1.
+        min_retries_per_second (float, optional): Retries per second allowed regardless of the ratio, so
+            low-traffic applications can still retry.  Defaults to 10.
+        circuit_breaker_threshold (int, optional): Number of failures after which a node's circuit opens.
+            Defaults to 20.
+        circuit_breaker_window (Union[timedelta, float], optional): Window in which failures are counted.
+            Defaults to 10 seconds.
+        circuit_breaker_open_time (Union[timedelta, float], optional): How long a node's circuit stays open.
+            Defaults to 5 seconds.
+        meter (:class:`~couchbase.metrics.CouchbaseMeter`, optional): If provided, every retry decision is recorded
+            (value 1) to the meter's ``db.couchbase.retries`` value recorder, tagged with the service
+            (``db.couchbase.service``) and the ``outcome`` (``retried``, ``budget_rejected``, ``circuit_rejected``,
+            ``attempts_exhausted``).
+        retry_timeouts (bool, optional): Set to True to retry timed out attempts (within the time that remains of
+            the operation's timeout).  Defaults to False.
+
+    Raises:
+        :class:`~couchbase.exceptions.InvalidArgumentException`: If an argument is invalid.
+
+    Example:
+
+        .. code-block:: python
+
+            from couchbase.options import ClusterOptions
+            from couchbase.retry import AdaptiveRetryStrategy
+
+            retry_strategy = AdaptiveRetryStrategy(max_retries=2, retry_budget_ratio=0.05)
+            cluster = Cluster('couchbase://localhost', ClusterOptions(auth, retry_strategy=retry_strategy))
+            ...
+            print(retry_strategy.snapshot()['kv'])
+
+    """
+
+    RETRIES_METER_NAME = 'db.couchbase.retries'
+    SERVICE_TAG = 'db.couchbase.service'
+    OUTCOME_TAG = 'outcome'
+    RETRIABLE_EXCEPTIONS = (TemporaryFailException,
+                            ServiceUnavailableException,
+                            DurabilitySyncWriteInProgressException)
+
+    def __init__(self,
+                 max_retries=3,  # type: Optional[int]
+                 initial_backoff=0.01,  # type: Optional[Union[timedelta, float]]
+                 max_backoff=1.0,  # type: Optional[Union[timedelta, float]]
+                 retry_budget_ratio=0.1,  # type: Optional[float]
+                 min_retries_per_second=10,  # type: Optional[float]
+                 circuit_breaker_threshold=20,  # type: Optional[int]
+                 circuit_breaker_window=10.0,  # type: Optional[Union[timedelta, float]]
+                 circuit_breaker_open_time=5.0,  # type: Optional[Union[timedelta, float]]
+                 meter=None,  # type: Optional[CouchbaseMeter]
+                 retry_timeouts=False,  # type: Optional[bool]
+                 ):
+        for name, value, minimum in (('max_retries', max_retries, 0),
+                                     ('circuit_breaker_threshold', circuit_breaker_threshold, 1)):
+            if not isinstance(value, int) or isinstance(value, bool) or value < minimum:
+                raise InvalidArgumentException(message=f'{name} must be an int >= {minimum}.')
+        for name, value in (('retry_budget_ratio', retry_budget_ratio),
+                            ('min_retries_per_second', min_retries_per_second)):
+            if not isinstance(value, (int, float)) or value < 0:
+                raise InvalidArgumentException(message=f'{name} must be a non-negative number.')
+        self._max_retries = max_retries
+        self._initial_backoff = self._to_seconds('initial_backoff', initial_backoff)
+        self._max_backoff = self._to_seconds('max_backoff', max_backoff)
+        self._budget_ratio = float(retry_budget_ratio)
+        self._min_retries_per_second = float(min_retries_per_second)
+        self._breaker_threshold = circuit_breaker_threshold
+        self._breaker_window = self._to_seconds('circuit_breaker_window', circuit_breaker_window)
+        self._breaker_open_time = self._to_seconds('circuit_breaker_open_time', circuit_breaker_open_time)
+        self._meter = meter
+        self._retry_timeouts = retry_timeouts is True
+        self._recorders = {}  # type: Dict[Any, Any]
+        self._lock = threading.Lock()
+        self._budgets = {}  # type: Dict[str, _RetryBudget]
+        self._breakers = {}  # type: Dict[str, _CircuitBreaker]
+        self._stats = {}  # type: Dict[str, _RetryStats]
+        _fork.register(self)
+
+    @staticmethod
+    def _to_seconds(name,  # type: str
+                    value  # type: Union[timedelta, float]
+                    ) -> float:
+        if isinstance(value, timedelta):
+            value = value.total_seconds()
+        if not isinstance(value, (int, float)) or value < 0:
+            raise InvalidArgumentException(message=f'{name} must be a non-negative timedelta or float.')
+        return float(value)
+
+    def _abandon_after_fork(self) -> None:
+        """
+        **INTERNAL**
+
+        Called in the child process after a fork, the lock might have been held by a thread that does not exist in
+        the child.
+        """
+        self._lock = threading.Lock()
+        self._dispatcher = None
+
+    def _stats_for(self,
+                   service  # type: str
+                   ) -> _RetryStats:
+        stats = self._stats.get(service, None)
+        if stats is None:
+            stats = self._stats[service] = _RetryStats()
+        return stats
+
+    def _budget_for(self,
+                    service  # type: str
+                    ) -> _RetryBudget:
+        budget = self._budgets.get(service, None)
+        if budget is None:
+            budget = self._budgets[service] = _RetryBudget(self._budget_ratio, self._min_retries_per_second)
+        return budget
+
+    def _breaker_for(self,
+                     node  # type: str
+                     ) -> _CircuitBreaker:
+        breaker = self._breakers.get(node, None)
+        if breaker is None:
+            breaker = self._breakers[node] = _CircuitBreaker(self._breaker_threshold,
+                                                             self._breaker_window,
+                                                             self._breaker_open_time)
+        return breaker
+
+    def _record_outcome(self,
+                        service,  # type: str
+                        outcome  # type: str
+                        ) -> None:
+        if self._meter is None:
+            return
+        key = (service, outcome)
+        recorder = self._recorders.get(key, None)
+        if recorder is None:
+            recorder = self._meter.value_recorder(self.RETRIES_METER_NAME, {self.SERVICE_TAG: service,
+                                                                            self.OUTCOME_TAG: outcome})
+            self._recorders[key] = recorder
+        recorder.record_value(1)
+
+    def is_retriable(self,
+                     request  # type: RetryRequest
+                     ) -> bool:
+        """
+        Returns True if the request's error can be retried.  Override to change which errors are retried.
+        """
+        if isinstance(request.exception, self.RETRIABLE_EXCEPTIONS):
+            return True
+        if not self._retry_timeouts:
+            # the attempt used up the operation's timeout (the core already retried within it)
+            return False
+        if isinstance(request.exception, UnAmbiguousTimeoutException):
+            return True
+        return request.idempotent and isinstance(request.exception, AmbiguousTimeoutException)
+
+    def backoff(self,
+                attempt  # type: int
+                ) -> float:
+        """
+        Returns the backoff (seconds) before retrying a request whose ``attempt`` failed: a random value between 0
+        and ``initial_backoff * 2 ** (attempt - 1)``, capped at ``max_backoff``.
+        """
+        cap = min(self._max_backoff, self._initial_backoff * 2 ** max(attempt - 1, 0))
+        return random.uniform(0, cap)  # nosec
+
+    def on_request(self,
+                   service  # type: str
+                   ) -> None:
+        with self._lock:
+            self._stats_for(service).requests += 1
+            self._budget_for(service).record_request()
+
+    def retry_after(self,
+                    request  # type: RetryRequest
+                    ) -> Optional[float]:
+        service = request.service
+        node = request.node
+        outcome = None
+        with self._lock:
+            stats = self._stats_for(service)
+            now = time.monotonic()
+            if not self.is_retriable(request):
+                stats.not_retriable += 1
+                if node and request.attempt > 1 and node in self._breakers:
+                    # the request might have been the node's probe
+                    self._breakers[node].end_probe()
+                return None
+            breaker = self._breaker_for(node) if node else None
+            if breaker is not None:
+                breaker.record_failure(now)
+            if request.attempt > self._max_retries:
+                stats.attempts_exhausted += 1
+                outcome = 'attempts_exhausted'
+            elif breaker is not None and not breaker.allow_retry(now):
+                stats.circuit_rejected += 1
+                outcome = 'circuit_rejected'
+            elif not self._budget_for(service).try_withdraw():
+                stats.budget_rejected += 1
+                outcome = 'budget_rejected'
+            else:
+                stats.retries += 1
+        if outcome is not None:
+            self._record_outcome(service, outcome)
+            return None
+        self._record_outcome(service, 'retried')
+        return self.backoff(request.attempt)
+
+    def on_retry_success(self,
+                         request  # type: RetryRequest
+                         ) -> None:
+        node = request.node
+        with self._lock:
+            self._stats_for(request.service).retry_successes += 1
+            if node and node in self._breakers:
+                self._breakers[node].record_success()
+
+    def on_retry_abandoned(self,
+                           request  # type: RetryRequest
+                           ) -> None:
+        node = request.node
+        with self._lock:
+            if node and node in self._breakers:
+                self._breakers[node].end_probe()
+
+    def snapshot(self,
+                 reset=False  # type: Optional[bool]
+                 ) -> Dict[str, Any]:
+        """Export the retry counters and the state of the circuit breakers.
+
+        Args:
+            reset (bool, optional): If True, the counters are reset after the snapshot is taken.  Defaults to False.
+
+        Returns:
+            Dict[str, Any]: Per service (e.g. ``kv``) the number of ``requests``, ``retries``, ``retry_successes``
+            (retried requests that succeeded) and rejected retries (``budget_rejected``, ``circuit_rejected``,
+            ``attempts_exhausted``, ``not_retriable``).  ``circuit_breakers`` maps each node with failures to its
+            circuit's state (``closed``, ``open`` or ``half_open``).
+        """
+        with self._lock:
+            now = time.monotonic()
+            snapshot = {svc: stats.as_dict() for svc, stats in self._stats.items()}
+            snapshot['circuit_breakers'] = {node: breaker.state(now) for node, breaker in self._breakers.items()}
+            if reset:
+                self._stats = {}
+        return snapshot
@@ -0,0 +1,177 @@
+#  Copyright 2016-2022. Couchbase, Inc.
+#  All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License")
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import threading
+import time
+from datetime import timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from couchbase.exceptions import InvalidArgumentException, RateLimitedException
+from couchbase.logic.collection import CollectionLogic
+from couchbase.rate_limiter import ClientRateLimiter, kv_payload_size
+
+
+class ClientRateLimiterTestSuite:
+    TEST_MANIFEST = [
+        'test_delayed_kv_dispatch_error',
+        'test_dispatch_later',
+        'test_invalid_limits',
+        'test_kv_bytes_limit',
+        'test_kv_ops_delay',
+        'test_kv_ops_shed',
+        'test_kv_payload_size',
+        'test_permit_blocking',
+        'test_permit_shed',
+        'test_snapshot_reset',
+        'test_track_stream_releases_permit',
+        'test_unlimited',
+    ]
+
+    def test_delayed_kv_dispatch_error(self):
+        limiter = ClientRateLimiter(kv_ops_per_second=10)
+        for _ in range(10):
+            limiter.acquire_kv()
+        scope = SimpleNamespace(connection=None, rate_limiter=limiter, retry_strategy=None)
+        collection = CollectionLogic(scope, '_default')
+        errors = []
+        failed = threading.Event()
+
+        def on_err(exc):
+            errors.append(exc)
+            failed.set()
+
+        def operation(**kwargs):
+            raise InvalidArgumentException('Cannot dispatch.')
+
+        # the operation is queued, it fails once dispatched by the limiter's thread
+        assert collection._rate_limited(operation, op_type=0, op_args={'callback': None, 'errback': on_err}) is None
+        assert failed.wait(5)
+        assert isinstance(errors[0], InvalidArgumentException)
+
+    def test_dispatch_later(self):
+        limiter = ClientRateLimiter(kv_ops_per_second=10)
+        called = threading.Event()
+        start = time.monotonic()
+        limiter.dispatch_later(0.05, called.set)
+        assert called.wait(5)
+        assert time.monotonic() - start >= 0.05
+
+    @pytest.mark.parametrize('kwargs', [{'kv_ops_per_second': 0},
+                                        {'kv_bytes_per_second': -1},
+                                        {'query_concurrency': 'ten'},
+                                        {'max_queue_delay': -1}])
+    def test_invalid_limits(self, kwargs):
+        with pytest.raises(InvalidArgumentException):
+            ClientRateLimiter(**kwargs)
+
+    def test_kv_bytes_limit(self):
+        limiter = ClientRateLimiter(kv_bytes_per_second=1000)
+        assert limiter.acquire_kv(num_bytes=1000) == 0
+        delay = limiter.acquire_kv(num_bytes=500)
+        assert 0 < delay <= 0.5
+
+    def test_kv_ops_delay(self):
+        limiter = ClientRateLimiter(kv_ops_per_second=10)
+        delays = [limiter.acquire_kv() for _ in range(12)]
+        # the bucket starts full, one second worth of operations is admitted without a delay
+        assert delays[:10] == [0] * 10
+        assert 0 < delays[10] < delays[11] <= 0.2
+
+    def test_kv_ops_shed(self):
+        limiter = ClientRateLimiter(kv_ops_per_second=10, max_queue_delay=timedelta(milliseconds=50))
+        for _ in range(10):
+            limiter.acquire_kv()
+        with pytest.raises(RateLimitedException):
+            limiter.acquire_kv(num_ops=5)
+        snapshot = limiter.snapshot()
+        assert snapshot['kv']['admitted'] == 10
+        assert snapshot['kv']['shed'] == 1
+
+    def test_kv_payload_size(self):
+        assert kv_payload_size((b'abcd', 0x02000006)) == 4
+        assert kv_payload_size('abc') == 3
+        assert kv_payload_size(None) == 0
+
+    def test_permit_blocking(self):
+        limiter = ClientRateLimiter(search_concurrency=1, max_queue_delay=5)
+        permit = limiter.acquire_permit('search')
+        timer = threading.Timer(0.05, permit.release)
+        timer.start()
+        second = limiter.acquire_permit('search')
+        timer.join()
+        assert second is not None
+        snapshot = limiter.snapshot()
+        assert snapshot['search']['queued'] == 1
+        assert snapshot['search']['in_flight'] == 1
+        assert snapshot['search']['queue_delay_us']['max'] >= 50000
+
+    def test_permit_shed(self):
+        limiter = ClientRateLimiter(query_concurrency=2)
+        permits = [limiter.acquire_permit('query', blocking=False) for _ in range(2)]
+        with pytest.raises(RateLimitedException):
+            limiter.acquire_permit('query', blocking=False)
+        permits[0].release()
+        # releasing a permit twice does not free a second slot
+        permits[0].release()
+        limiter.acquire_permit('query', blocking=False)
+        with pytest.raises(RateLimitedException):
+            limiter.acquire_permit('query', blocking=False)
+        assert limiter.snapshot()['query']['shed'] == 2
+
+    def test_snapshot_reset(self):
+        limiter = ClientRateLimiter(kv_ops_per_second=100, analytics_concurrency=1)
+        limiter.acquire_kv()
+        limiter.acquire_permit('analytics')
+        snapshot = limiter.snapshot(reset=True)
+        assert snapshot['kv']['admitted'] == 1
+        assert snapshot['analytics']['admitted'] == 1
+        snapshot = limiter.snapshot()
+        assert snapshot['kv']['admitted'] == 0
+        # in flight requests are not counters, they are not reset
+        assert snapshot['analytics']['in_flight'] == 1
+
+    def test_track_stream_releases_permit(self):
+        limiter = ClientRateLimiter(query_concurrency=1)
+        permit = limiter.acquire_permit('query')
+        rows = limiter.track_stream(iter([{'a': 1}, {'a': 2}, None]), permit)
+        assert next(rows) == {'a': 1}
+        assert limiter.snapshot()['query']['in_flight'] == 1
+        assert next(rows) == {'a': 2}
+        assert next(rows) is None
+        assert limiter.snapshot()['query']['in_flight'] == 0
+
+    def test_unlimited(self):
+        limiter = ClientRateLimiter()
+        assert limiter.limits_kv is False
+        assert limiter.acquire_kv(num_ops=1000000) == 0
+        assert limiter.acquire_permit('query') is None
+        stream = iter([])
+        assert limiter.track_stream(stream, None) is stream
+        assert limiter.max_queue_delay == timedelta(seconds=1)
+
+
+class ClassicClientRateLimiterTests(ClientRateLimiterTestSuite):
+
+    @pytest.fixture(scope='class', autouse=True)
+    def manifest_validated(self):
+        def valid_test_method(meth):
+            attr = getattr(ClassicClientRateLimiterTests, meth)
+            return callable(attr) and not meth.startswith('__') and meth.startswith('test')
+        method_list = [meth for meth in dir(ClassicClientRateLimiterTests) if valid_test_method(meth)]
+        test_list = set(ClientRateLimiterTestSuite.TEST_MANIFEST).symmetric_difference(method_list)
+        if test_list:
+            pytest.fail(f'Test manifest not validated.  Missing/extra tests: {test_list}.')
@@ -14,6 +14,7 @@
 #  limitations under the License.
 
 import json
+import os
 from datetime import timedelta
 from uuid import uuid4
 
@@ -32,17 +33,24 @@ from couchbase.exceptions import (InternalServerFailureException,
                                   QueryIndexNotFoundException)
 from couchbase.options import (ClusterOptions,
                                DiagnosticsOptions,
-                               PingOptions)
-from couchbase.result import DiagnosticsResult, PingResult
+                               PingOptions,
+                               WarmUpOptions)
+from couchbase.result import (DiagnosticsResult,
+                              PingResult,
+                              WarmUpResult)
 from tests.environments import CollectionType
 from tests.test_features import EnvironmentFeatures
 
 
 class ClusterDiagnosticsTestSuite:
     TEST_MANIFEST = [
+        'test_close_background',
+        'test_close_invalid_args',
+        'test_close_timeout',
         'test_diagnostics',
         'test_diagnostics_after_query',
         'test_diagnostics_as_json',
+        'test_fork_rebootstrap',
         'test_multiple_close_cluster',
         'test_ping',
         'test_ping_as_json',
@@ -51,6 +59,8 @@ class ClusterDiagnosticsTestSuite:
         'test_ping_report_id',
         'test_ping_restrict_services',
         'test_ping_str_services',
+        'test_warm_up',
+        'test_warm_up_invalid_args',
     ]
 
     @pytest.fixture(scope="class")
@@ -151,6 +161,70 @@ class ClusterDiagnosticsTestSuite:
         for _ in range(10):
             cluster.close()
 
+    def test_close_background(self, cb_env):
+        conn_string = cb_env.config.get_connection_string()
+        username, pw = cb_env.config.get_username_and_pw()
+        cluster = Cluster.connect(conn_string, ClusterOptions(PasswordAuthenticator(username, pw)))
+        close_future = cluster.close(background=True)
+        # concurrent closes share the in-progress close
+        assert cluster.close(background=True) is close_future
+        assert close_future.result(timeout=30) is None
+        assert cluster.connected is False
+        # closing an already closed cluster completes immediately
+        assert cluster.close(background=True).result(timeout=0) is None
+        cluster.close()
+
+    def test_close_invalid_args(self, cb_env):
+        conn_string = cb_env.config.get_connection_string()
+        username, pw = cb_env.config.get_username_and_pw()
+        cluster = Cluster.connect(conn_string, ClusterOptions(PasswordAuthenticator(username, pw)))
+        with pytest.raises(InvalidArgumentException):
+            cluster.close(timeout=timedelta(seconds=5), background=True)
+        assert cluster.connected is True
+        cluster.close()
+
+    def test_close_timeout(self, cb_env):
+        conn_string = cb_env.config.get_connection_string()
+        username, pw = cb_env.config.get_username_and_pw()
+        cluster = Cluster.connect(conn_string, ClusterOptions(PasswordAuthenticator(username, pw)))
+        assert cluster.close(timeout=timedelta(seconds=30)) is None
+        assert cluster.connected is False
+        cluster.close(timeout=timedelta(seconds=30))
+
+    @pytest.mark.skipif(not hasattr(os, 'fork'), reason='Requires os.fork()')
+    def test_fork_rebootstrap(self, cb_env):
+        conn_string = cb_env.config.get_connection_string()
+        username, pw = cb_env.config.get_username_and_pw()
+        cluster = Cluster.connect(conn_string, ClusterOptions(PasswordAuthenticator(username, pw)))
+        collection = cluster.bucket(cb_env.bucket.name).default_collection()
+        key, value = cb_env.get_new_doc()
+        collection.upsert(key, value)
+        parent_info = cluster.bootstrap_info
+        assert parent_info['pid'] == os.getpid()
+        assert parent_info['after_fork'] is False
+
+        pid = os.fork()
+        if pid == 0:
+            exit_code = 1
+            try:
+                # checking the state does not re-bootstrap, the connection is re-established on first use
+                if (cluster.connected
+                        and cluster.bootstrap_info == parent_info
+                        and collection.get(key).content_as[dict] == value):
+                    info = cluster.bootstrap_info
+                    if info['pid'] == os.getpid() and info['after_fork'] is True:
+                        exit_code = 0
+            finally:
+                os._exit(exit_code)
+
+        _, status = os.waitpid(pid, 0)
+        assert os.WIFEXITED(status)
+        assert os.WEXITSTATUS(status) == 0
+        # the parent's connection is not impacted by the child
+        assert collection.get(key).content_as[dict] == value
+        assert cluster.bootstrap_info == parent_info
+        cluster.close()
+
     @pytest.mark.usefixtures('check_diagnostics_supported')
     def test_ping(self, cb_env):
         cluster = cb_env.cluster
@@ -227,6 +301,31 @@ class ClusterDiagnosticsTestSuite:
         result = cluster.ping(PingOptions(service_types=services))
         assert len(result.endpoints) >= 1
 
+    @pytest.mark.usefixtures('check_diagnostics_supported')
+    def test_warm_up(self, cb_env):
+        cluster = cb_env.cluster
+        result = cluster.warm_up(WarmUpOptions(service_types=[ServiceType.KeyValue, ServiceType.Query],
+                                               connections_per_node=2,
+                                               bucket_names=[cb_env.bucket.name]))
+        assert isinstance(result, WarmUpResult)
+        assert result.duration > timedelta()
+        assert result.errors == []
+        kv_reports = result.endpoints[ServiceType.KeyValue]
+        assert len(kv_reports) > 0
+        assert all(isinstance(report, EndpointPingReport) for report in kv_reports)
+        connect_times = result.node_connect_times()
+        assert len(connect_times) > 0
+        for node_times in connect_times.values():
+            assert all(isinstance(latency, timedelta) for latency in node_times.values())
+        assert json.loads(result.as_json())['services']
+
+    def test_warm_up_invalid_args(self, cb_env):
+        cluster = cb_env.cluster
+        with pytest.raises(InvalidArgumentException):
+            cluster.warm_up(WarmUpOptions(connections_per_node=0))
+        with pytest.raises(InvalidArgumentException):
+            cluster.warm_up(WarmUpOptions(service_types=ServiceType.KeyValue))
+
 
 class ClassicClusterDiagnosticsTests(ClusterDiagnosticsTestSuite):
 
@@ -23,7 +23,8 @@ from couchbase.exceptions import (CouchbaseException,
                                   DocumentNotFoundException,
                                   DocumentUnretrievableException,
                                   InvalidArgumentException)
-from couchbase.options import (GetAnyReplicaMultiOptions,
+from couchbase.options import (GetAllReplicasMultiOptions,
+                               GetAnyReplicaMultiOptions,
                                GetMultiOptions,
                                InsertMultiOptions,
                                InsertOptions,
@@ -53,6 +54,7 @@ class CollectionMultiTestSuite:
         'test_multi_exists_simple',
         'test_multi_get_all_replicas_fail',
         'test_multi_get_all_replicas_invalid_input',
+        'test_multi_get_all_replicas_max_responses',
         'test_multi_get_all_replicas_simple',
         'test_multi_get_any_replica_fail',
         'test_multi_get_any_replica_invalid_input',
@@ -170,6 +172,22 @@ class CollectionMultiTestSuite:
         with pytest.raises(InvalidArgumentException):
             cb_env.collection.get_all_replicas_multi(keys_and_docs)
 
+    @pytest.mark.flaky(reruns=5, reruns_delay=1)
+    @pytest.mark.usefixtures("check_multi_node")
+    @pytest.mark.usefixtures("check_replicas")
+    @pytest.mark.parametrize('max_responses', [1, 2])
+    def test_multi_get_all_replicas_max_responses(self, cb_env, max_responses):
+        keys_and_docs = cb_env.get_docs(4)
+        keys = list(keys_and_docs.keys())
+        res = cb_env.collection.get_all_replicas_multi(keys, GetAllReplicasMultiOptions(max_responses=max_responses))
+        assert isinstance(res, MultiGetReplicaResult)
+        assert res.all_ok is True
+        for k, v in res.results.items():
+            assert 1 <= len(v) <= max_responses
+            for replica in v:
+                assert isinstance(replica, GetReplicaResult)
+                assert replica.content_as[dict] == keys_and_docs[k]
+
     @pytest.mark.flaky(reruns=5, reruns_delay=1)
     @pytest.mark.usefixtures("check_multi_node")
     @pytest.mark.usefixtures("check_replicas")
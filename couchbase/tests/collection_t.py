@@ -19,6 +19,7 @@ from time import time
 import pytest
 
 import couchbase.subdocument as SD
+from couchbase.collection import Collection
 from couchbase.diagnostics import ServiceType
 from couchbase.exceptions import (AmbiguousTimeoutException,
                                   CasMismatchException,
@@ -28,7 +29,10 @@ from couchbase.exceptions import (AmbiguousTimeoutException,
                                   DocumentUnretrievableException,
                                   InvalidArgumentException,
                                   TemporaryFailException)
-from couchbase.options import (GetOptions,
+from couchbase.options import (GetAllReplicasOptions,
+                               GetHedgedOptions,
+                               GetOptions,
+                               GetReplicaQuorumOptions,
                                InsertOptions,
                                ReplaceOptions,
                                UpsertOptions)
@@ -55,6 +59,7 @@ class CollectionTestSuite:
         'test_get_after_lock',
         'test_get_all_replicas',
         'test_get_all_replicas_fail',
+        'test_get_all_replicas_max_responses',
         'test_get_all_replicas_results',
         'test_get_and_lock',
         'test_get_and_lock_replace_with_cas',
@@ -63,7 +68,14 @@ class CollectionTestSuite:
         'test_get_any_replica',
         'test_get_any_replica_fail',
         'test_get_fails',
+        'test_get_hedged',
+        'test_get_hedged_fail',
+        'test_get_hedged_invalid_options',
+        'test_get_hedged_replica',
         'test_get_options',
+        'test_get_replica_quorum',
+        'test_get_replica_quorum_invalid_options',
+        'test_get_replica_quorum_selection',
         'test_get_with_expiry',
         'test_insert',
         'test_insert_document_exists',
@@ -243,6 +255,19 @@ class CollectionTestSuite:
         if num_replicas > 0:
             assert replica_cnt >= active_cnt
 
+    @pytest.mark.usefixtures("check_multi_node")
+    @pytest.mark.usefixtures("check_replicas")
+    @pytest.mark.parametrize('max_responses', [1, 2])
+    def test_get_all_replicas_max_responses(self, cb_env, max_responses):
+        key, value = cb_env.get_existing_doc()
+        result = TestEnvironment.try_n_times(10, 3, cb_env.collection.get_all_replicas, key,
+                                             GetAllReplicasOptions(max_responses=max_responses))
+        results = list(result)
+        assert 1 <= len(results) <= max_responses
+        for res in results:
+            assert isinstance(res, GetReplicaResult)
+            assert value == res.content_as[dict]
+
     def test_get_and_lock(self, cb_env):
         key, value = cb_env.get_existing_doc()
         result = cb_env.collection.get_and_lock(key, timedelta(seconds=3))
@@ -310,6 +335,68 @@ class CollectionTestSuite:
         with pytest.raises(DocumentUnretrievableException):
             cb_env.collection.get_any_replica('not-a-key')
 
+    def test_get_hedged(self, cb_env):
+        key, value = cb_env.get_existing_doc()
+        before = cb_env.cluster.hedged_read_stats()['reads']
+        result = cb_env.collection.get_hedged(key, GetHedgedOptions(hedge_delay=timedelta(seconds=5)))
+        assert isinstance(result, GetReplicaResult)
+        assert result.is_replica is False
+        assert result.cas is not None
+        assert value == result.content_as[dict]
+        assert cb_env.cluster.hedged_read_stats()['reads'] == before + 1
+
+    def test_get_hedged_fail(self, cb_env):
+        with pytest.raises(DocumentNotFoundException):
+            cb_env.collection.get_hedged(TestEnvironment.NOT_A_KEY, hedge_delay=timedelta(seconds=5))
+
+    @pytest.mark.parametrize('opts', [GetHedgedOptions(hedge_delay=timedelta(seconds=-1)),
+                                      GetHedgedOptions(hedge_percentile=100)])
+    def test_get_hedged_invalid_options(self, cb_env, opts):
+        key, _ = cb_env.get_existing_doc()
+        with pytest.raises(InvalidArgumentException):
+            cb_env.collection.get_hedged(key, opts)
+
+    @pytest.mark.usefixtures("check_replicas")
+    def test_get_hedged_replica(self, cb_env):
+        key, value = cb_env.get_existing_doc()
+        # with a hedge delay of 0 the replica read is sent unless the active responded immediately
+        result = TestEnvironment.try_n_times(10, 3, cb_env.collection.get_hedged, key, hedge_delay=timedelta(0))
+        assert isinstance(result.is_replica, bool)
+        assert value == result.content_as[dict]
+        stats = cb_env.cluster.hedged_read_stats()
+        assert stats['replica_wins'] <= stats['hedged'] <= stats['reads']
+
+    @pytest.mark.usefixtures("check_replicas")
+    def test_get_replica_quorum(self, cb_env):
+        key, value = cb_env.get_existing_doc()
+        result = TestEnvironment.try_n_times(10, 3, cb_env.collection.get_replica_quorum, key)
+        assert isinstance(result, GetReplicaResult)
+        assert value == result.content_as[dict]
+        result = TestEnvironment.try_n_times(10, 3, cb_env.collection.get_replica_quorum, key, quorum=1)
+        assert value == result.content_as[dict]
+
+    @pytest.mark.parametrize('opts', [GetReplicaQuorumOptions(quorum=0), {'quorum': '2'}])
+    def test_get_replica_quorum_invalid_options(self, cb_env, opts):
+        key, _ = cb_env.get_existing_doc()
+        with pytest.raises(InvalidArgumentException):
+            cb_env.collection.get_replica_quorum(key, opts)
+
+    def test_get_replica_quorum_selection(self):
+        class FakeReplica:
+            def __init__(self, cas, is_replica=True):
+                self.cas = cas
+                self.is_replica = is_replica
+
+        active = FakeReplica(1, is_replica=False)
+        # the binding completed the read once a version reached the quorum, its responses are the largest group
+        replicas = [FakeReplica(2), FakeReplica(1), FakeReplica(2), FakeReplica(2)]
+        assert Collection._select_replica_quorum(iter(replicas)) is replicas[0]
+        # the active is preferred if it returned the agreed on version
+        replicas = [FakeReplica(2), active, FakeReplica(1)]
+        assert Collection._select_replica_quorum(iter(replicas)) is active
+        with pytest.raises(DocumentUnretrievableException):
+            Collection._select_replica_quorum(iter([]))
+
     def test_get_options(self, cb_env):
         key, value = cb_env.get_existing_doc()
         result = cb_env.collection.get(key, GetOptions(
@@ -19,11 +19,14 @@ from datetime import timedelta
 
 import pytest
 
+from couchbase._utils import MAX_AUTO_IO_THREADS, available_cpu_count
 from couchbase.auth import CertificateAuthenticator, PasswordAuthenticator
 from couchbase.cluster import Cluster
 from couchbase.exceptions import (CouchbaseException,
+                                  FeatureUnavailableException,
                                   InvalidArgumentException,
                                   UnAmbiguousTimeoutException)
+from couchbase.logic.bootstrap_cache import BootstrapCache
 from couchbase.logic.cluster import ClusterLogic
 from couchbase.options import (CONFIG_PROFILES,
                                ClusterOptions,
@@ -40,16 +43,20 @@ from tests.environments import CollectionType
 
 class ConnectionTestSuite:
     TEST_MANIFEST = [
+        'test_bootstrap_cache',
         'test_cluster_auth_fail',
+        'test_cluster_bootstrap_cache',
         'test_cluster_cert_auth',
         'test_cluster_cert_auth_fail',
         'test_cluster_cert_auth_ts_connstr',
         'test_cluster_cert_auth_ts_kwargs',
         'test_cluster_ldap_auth',
         'test_cluster_ldap_auth_real',
+        'test_cluster_io_threads_auto',
         'test_cluster_legacy_sasl_mech_force',
         'test_cluster_legacy_sasl_mech_force_real',
         'test_cluster_legacy_ssl_no_verify',
+        'test_cluster_num_connections',
         'test_cluster_options',
         'test_cluster_pw_auth',
         'test_cluster_pw_auth_with_cert',
@@ -73,11 +80,48 @@ class ConnectionTestSuite:
         'test_wan_config_profile_with_auth',
     ]
 
+    def test_bootstrap_cache(self, tmp_path):
+        cache = BootstrapCache(str(tmp_path / 'cache' / 'bootstrap.json'))
+        key = BootstrapCache.cache_key('couchbase://host1,host2')
+        assert key != BootstrapCache.cache_key('couchbase://host1,host2', network='external')
+        assert cache.get(key) is None
+
+        nodes = [('node1.example.com', '11210'), ('::1', '11210')]
+        cache.put(key, nodes)
+        assert cache.get(key) == nodes
+        assert BootstrapCache(cache.path, ttl=-1).get(key) is None
+        seed_connstr = BootstrapCache.seed_connstr('couchbases://host1,host2/default', cache.get(key))
+        assert seed_connstr == 'couchbases://node1.example.com:11210,[::1]:11210/default'
+
+        cache.invalidate(key)
+        assert cache.get(key) is None
+
     def test_cluster_auth_fail(self, couchbase_config):
         conn_string = couchbase_config.get_connection_string()
         with pytest.raises(InvalidArgumentException):
             ClusterLogic(conn_string)
 
+    # creating a new connection, allow retries
+    @pytest.mark.flaky(reruns=5, reruns_delay=1)
+    def test_cluster_bootstrap_cache(self, couchbase_config, tmp_path):
+        conn_string = couchbase_config.get_connection_string()
+        username, pw = couchbase_config.get_username_and_pw()
+        opts = ClusterOptions(PasswordAuthenticator(username, pw),
+                              bootstrap_cache_path=str(tmp_path / 'bootstrap.json'))
+
+        cluster = Cluster.connect(conn_string, opts)
+        assert cluster.bootstrap_info['cached_seeds'] is False
+        cluster.close()
+
+        cluster = Cluster.connect(conn_string, opts)
+        # the first use of the cluster waits on the background bootstrap
+        assert cluster.connected is True
+        assert cluster.bootstrap_info['cached_seeds'] is True
+        cluster.close()
+
+        with pytest.raises(FeatureUnavailableException):
+            ClusterLogic(conn_string, opts)
+
     def test_cluster_cert_auth(self, couchbase_config):
         conn_string = couchbase_config.get_connection_string()
 
@@ -269,6 +313,39 @@ class ConnectionTestSuite:
         assert cluster_opts is not None
         assert cluster_opts['tls_verify'] == 'none'
 
+    def test_cluster_io_threads_auto(self, couchbase_config):
+        conn_string = couchbase_config.get_connection_string()
+        username, pw = couchbase_config.get_username_and_pw()
+        auth = PasswordAuthenticator(username, pw)
+
+        cluster = ClusterLogic(conn_string, ClusterOptions(auth, num_io_threads='auto'))
+        cluster_opts = cluster._get_connection_opts(conn_only=True)
+        expected = max(1, min(available_cpu_count() - 1, MAX_AUTO_IO_THREADS))
+        assert cluster_opts['num_io_threads'] == expected
+
+        cluster = ClusterLogic(conn_string, ClusterOptions(auth), num_io_threads=4)
+        assert cluster._get_connection_opts(conn_only=True)['num_io_threads'] == 4
+
+        for invalid in [0, 'many', 1.5]:
+            with pytest.raises(InvalidArgumentException):
+                ClusterLogic(conn_string, ClusterOptions(auth, num_io_threads=invalid))
+
+    def test_cluster_num_connections(self, couchbase_config):
+        conn_string = couchbase_config.get_connection_string()
+        username, pw = couchbase_config.get_username_and_pw()
+        auth = PasswordAuthenticator(username, pw)
+
+        cluster = ClusterLogic(conn_string, ClusterOptions(auth, num_connections=1))
+        # only used by the SDK, not passed to the connection
+        assert 'num_connections' not in cluster._get_connection_opts(conn_only=True)
+
+        with pytest.raises(InvalidArgumentException):
+            ClusterLogic(conn_string, ClusterOptions(auth, num_connections=0))
+
+        # sharding is only supported by the blocking API
+        with pytest.raises(FeatureUnavailableException):
+            ClusterLogic(conn_string, ClusterOptions(auth, num_connections=4))
+
     def test_cluster_options(self, couchbase_config):
         opts = {
             "enable_tls": True,
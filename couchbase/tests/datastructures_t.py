@@ -17,6 +17,7 @@ import pytest
 
 from couchbase.datastructures import (CouchbaseList,
                                       CouchbaseMap,
+                                      CouchbaseMapBatch,
                                       CouchbaseQueue,
                                       CouchbaseSet)
 from couchbase.exceptions import (DocumentNotFoundException,
@@ -29,12 +30,40 @@ from tests.environments import CollectionType
 class DatastructuresTestSuite:
 
     TEST_MANIFEST = [
+        'test_iter_paged',
         'test_list',
+        'test_list_extend',
         'test_map',
+        'test_map_batch',
+        'test_map_update',
         'test_queue',
+        'test_queue_many',
+        'test_queue_sharded',
+        'test_set_add_all',
+        'test_set_buckets',
         'test_sets',
     ]
 
+    def test_iter_paged(self, cb_env):
+        key = cb_env.get_existing_doc(key_only=True)
+        cb_list = cb_env.collection.couchbase_list(key)
+        cb_list.extend(range(40))
+
+        assert list(cb_list.iter_paged()) == list(range(40))
+        # the list is looked up in pages of 8, the last one partially filled
+        assert list(cb_list.iter_paged(page_size=8)) == list(range(40))
+        assert list(cb_list.iter_paged(page_size=3)) == list(range(40))
+        with pytest.raises(InvalidArgumentException):
+            cb_list.iter_paged(page_size=17)
+        cb_list.clear()
+        assert list(cb_list.iter_paged()) == []
+
+        cb_queue = cb_env.collection.couchbase_queue(key, num_shards=3)
+        cb_queue.push_many(range(20))
+        assert sorted(cb_queue.iter_paged(page_size=4)) == list(range(20))
+        assert list(cb_queue.iter_paged()) == list(cb_queue)
+        cb_queue.clear()
+
     def test_list(self, cb_env):
         key = cb_env.get_existing_doc(key_only=True)
         cb_list = cb_env.collection.couchbase_list(key)
@@ -78,6 +107,19 @@ class DatastructuresTestSuite:
 
         assert 0 == cb_list.size()
 
+    def test_list_extend(self, cb_env):
+        key = cb_env.get_existing_doc(key_only=True)
+        cb_list = cb_env.collection.couchbase_list(key)
+
+        cb_list.extend(['hello', 'world'])
+        cb_list.extend(str(i) for i in range(20))
+        cb_list.extend([])
+        res = cb_env.collection.get(key)
+        assert ['hello', 'world'] + [str(i) for i in range(20)] == res.content_as[list]
+
+        cb_list.clear()
+        assert 0 == cb_list.size()
+
     def test_map(self, cb_env):
         key = cb_env.get_existing_doc(key_only=True)
         cb_map = cb_env.collection.couchbase_map(key)
@@ -121,6 +163,101 @@ class DatastructuresTestSuite:
         cb_map.clear()
         assert 0 == cb_map.size()
 
+    def test_map_batch(self, cb_env):
+        key = cb_env.get_existing_doc(key_only=True)
+        cb_map = cb_env.collection.couchbase_map(key)
+        cb_map.add('key0', 'val')
+
+        with cb_map.batch() as batch:
+            assert isinstance(batch, CouchbaseMapBatch)
+            # more keys than fit in a single sub-document mutation
+            for i in range(1, 20):
+                batch.add(f'key{i}', i)
+            batch.remove('key0')
+            batch.remove('missing')
+            assert batch.get('key1') == 1
+            assert batch.exists('key0') is False
+            # nothing is written before the batch is flushed
+            assert 1 == cb_map.size()
+        assert batch.pending == 0
+        res = cb_env.collection.get(key)
+        assert {f'key{i}': i for i in range(1, 20)} == res.content_as[dict]
+
+        with pytest.raises(ValueError):
+            with cb_map.batch() as batch:
+                batch.add('key1', 'changed')
+                raise ValueError('discard the batch')
+        assert cb_map.get('key1') == 1
+
+        batch = cb_map.batch()
+        batch.update({'key1': 'flushed'})
+        # changes made after the batch was created are kept, only the batch's keys are written
+        cb_map.add('key2', 'concurrent')
+        batch.flush()
+        assert cb_map.get('key1') == 'flushed'
+        assert cb_map.get('key2') == 'concurrent'
+
+        cb_map.clear()
+        assert 0 == cb_map.size()
+
+    def test_map_update(self, cb_env):
+        key = cb_env.get_existing_doc(key_only=True)
+        cb_map = cb_env.collection.couchbase_map(key)
+
+        cb_map.add('key0', 'val')
+        # more keys than fit in a single sub-document mutation
+        cb_map.update({f'key{i}': i for i in range(20)})
+        cb_map.update([('key20', 20)])
+        res = cb_env.collection.get(key)
+        assert {f'key{i}': i for i in range(21)} == res.content_as[dict]
+
+        cb_map.clear()
+        assert 0 == cb_map.size()
+
+    def test_set_add_all(self, cb_env):
+        key = cb_env.get_existing_doc(key_only=True)
+        cb_set = cb_env.collection.couchbase_set(key)
+
+        assert cb_set.add_all([1, 2, 2, 3]) == 3
+        # 1 and 3 exist already, True is not the same value as 1
+        assert cb_set.add_all([1, True, 'a'] + list(range(3, 25))) == 23
+        assert cb_set.add_all([1, 2]) == 0
+        assert 25 == cb_set.size()
+        with pytest.raises(InvalidArgumentException):
+            cb_set.add_all([{'a': 1}])
+
+        cb_set.clear()
+        assert 0 == cb_set.size()
+
+    def test_set_buckets(self, cb_env):
+        key = cb_env.get_existing_doc(key_only=True)
+        cb_set = cb_env.collection.couchbase_set(key)
+        cb_set.add_all(range(20))
+
+        # the single array is migrated on first use
+        bucketed = cb_env.collection.couchbase_set(key, num_buckets=4)
+        assert bucketed.contains(5) is True
+        res = cb_env.collection.get(key)
+        assert sorted(res.content_as[dict].keys()) == ['b0', 'b1', 'b2', 'b3']
+        assert 20 == bucketed.size()
+
+        bucketed.remove(5)
+        assert bucketed.contains(5) is False
+        assert bucketed.add(5) is True
+        assert bucketed.add(5) is False
+        assert bucketed.add_all([1, 20, 21]) == 2
+        assert sorted(bucketed.values()) == list(range(22))
+
+        cb_set.migrate()
+        assert sorted(cb_env.collection.get(key).content_as[list]) == list(range(22))
+        assert 22 == cb_set.size()
+
+        bucketed.clear()
+        assert 0 == bucketed.size()
+        assert bucketed.contains(5) is False
+        with pytest.raises(InvalidArgumentException):
+            cb_env.collection.couchbase_set(key, num_buckets=0)
+
     def test_sets(self, cb_env):
         key = cb_env.get_existing_doc(key_only=True)
         cb_set = cb_env.collection.couchbase_set(key)
@@ -177,6 +314,48 @@ class DatastructuresTestSuite:
 
         assert 0 == cb_queue.size()
 
+    def test_queue_many(self, cb_env):
+        key = cb_env.get_existing_doc(key_only=True)
+        cb_queue = cb_env.collection.couchbase_queue(key)
+
+        cb_queue.push_many(range(20))
+        cb_queue.push(20)
+        assert cb_queue.size() == 21
+        # at most 16 items are removed per round trip
+        assert cb_queue.pop_many(18) == list(range(18))
+        assert cb_queue.pop_many(5) == [18, 19, 20]
+        with pytest.raises(QueueEmpty):
+            cb_queue.pop_many(5)
+        with pytest.raises(InvalidArgumentException):
+            cb_queue.pop_many(0)
+
+        cb_queue.clear()
+
+    def test_queue_sharded(self, cb_env):
+        key = cb_env.get_existing_doc(key_only=True)
+        cb_queue = cb_env.collection.couchbase_queue(key, num_shards=4)
+
+        for idx in range(10):
+            cb_queue.push_many([f'{idx}-a', f'{idx}-b'])
+        assert cb_queue.size() == 20
+        assert sorted(cb_queue) == sorted(f'{idx}-{s}' for idx in range(10) for s in 'ab')
+
+        popped = cb_queue.pop_many(15)
+        popped.extend(cb_queue.pop_many(15))
+        assert len(popped) == 20
+        # items pushed together are popped in order
+        for idx in range(10):
+            assert popped.index(f'{idx}-a') < popped.index(f'{idx}-b')
+        with pytest.raises(QueueEmpty):
+            cb_queue.pop()
+
+        cb_queue.push(1)
+        assert cb_queue.pop() == 1
+        cb_queue.clear()
+        assert 0 == cb_queue.size()
+        with pytest.raises(InvalidArgumentException):
+            cb_env.collection.couchbase_queue(key, num_shards=0)
+
 
 class LegacyDatastructuresTestSuite:
 
@@ -0,0 +1,93 @@
+#  Copyright 2016-2022. Couchbase, Inc.
+#  All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License")
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+# modules that are imported on first use, importing any of them when importing couchbase.cluster is a regression
+LAZY_MODULES = [
+    'acouchbase',
+    'asyncio',
+    'couchbase.analytics',
+    'couchbase.management',
+    'couchbase.n1ql',
+    'couchbase.search',
+    'couchbase.transactions',
+    'couchbase.views',
+]
+
+# generous upper bound for the cumulative import time of couchbase.cluster, override via the environment
+IMPORT_TIME_BUDGET_US = int(os.environ.get('PYCBC_IMPORT_TIME_BUDGET_US', 500000))
+
+
+def get_import_times(module  # type: str
+                     ):
+    """
+    Imports the module in a fresh interpreter with ``-X importtime``, returns {module: cumulative import time (us)}.
+    """
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                          stderr=subprocess.PIPE,
+                          stdout=subprocess.DEVNULL,
+                          check=True)
+    import_times = {}
+    for line in proc.stderr.decode('utf-8').splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        import_times[name.strip()] = int(cumulative)
+    return import_times
+
+
+class ImportTimeTestSuite:
+    TEST_MANIFEST = [
+        'test_import_time',
+        'test_lazy_module_attributes',
+    ]
+
+    def test_import_time(self):
+        import_times = get_import_times('couchbase.cluster')
+        eager = [m for m in import_times if any(m == lazy or m.startswith(f'{lazy}.') for lazy in LAZY_MODULES)]
+        assert eager == [], f'Modules expected to be imported lazily: {eager}'
+        assert import_times['couchbase.cluster'] < IMPORT_TIME_BUDGET_US
+
+    def test_lazy_module_attributes(self):
+        import couchbase.bucket
+        import couchbase.cluster
+        from couchbase.management.queries import QueryIndexManager
+        from couchbase.n1ql import QueryScanConsistency
+        from couchbase.views import ViewOrdering
+
+        # names previously imported eagerly remain available from the module
+        assert couchbase.cluster.QueryIndexManager is QueryIndexManager
+        assert couchbase.cluster.QueryScanConsistency is QueryScanConsistency
+        assert couchbase.bucket.ViewOrdering is ViewOrdering
+        with pytest.raises(AttributeError):
+            couchbase.cluster.NotAnAttribute
+
+
+class ClassicImportTimeTests(ImportTimeTestSuite):
+
+    @pytest.fixture(scope='class', autouse=True)
+    def manifest_validated(self):
+        def valid_test_method(meth):
+            attr = getattr(ClassicImportTimeTests, meth)
+            return callable(attr) and not meth.startswith('__') and meth.startswith('test')
+        method_list = [meth for meth in dir(ClassicImportTimeTests) if valid_test_method(meth)]
+        test_list = set(ImportTimeTestSuite.TEST_MANIFEST).symmetric_difference(method_list)
+        if test_list:
+            pytest.fail(f'Test manifest not validated.  Missing/extra tests: {test_list}.')
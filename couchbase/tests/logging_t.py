@@ -0,0 +1,105 @@
+#  Copyright 2016-2023. Couchbase, Inc.
+#  All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License")
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+import couchbase
+from couchbase.exceptions import InvalidArgumentException
+from couchbase.pycbc_core import pycbc_logger
+
+# the C++ client's logger is process-wide and cannot be reset once configured, tests that configure it run in a
+# fresh interpreter so the logging state of the test session is left untouched
+CONFIGURE_ASYNC_SINK = """
+import json
+import logging
+import couchbase
+from couchbase.exceptions import CouchbaseException
+logger = logging.getLogger('couchbase.tests.async_sink')
+logger.propagate = False
+couchbase.configure_logging(logger.name, level=logging.WARNING, async_sink=True, queue_size=100)
+result = {'stats': couchbase.get_logging_stats(), 'drainer_alive': couchbase._PYCBC_LOG_DRAINER.is_alive()}
+try:
+    couchbase.configure_logging(logger.name, level=logging.WARNING)
+    result['reconfigured'] = True
+except CouchbaseException:
+    result['reconfigured'] = False
+print(json.dumps(result))
+"""
+
+
+def run_in_subprocess(code  # type: str
+                      ):
+    """
+    Runs the code in a fresh interpreter (w/o the PYCBC_LOG_LEVEL env variable), returns the JSON it printed.
+    """
+    env = {k: v for k, v in os.environ.items() if k != 'PYCBC_LOG_LEVEL'}
+    proc = subprocess.run([sys.executable, '-c', code],
+                          stdout=subprocess.PIPE,
+                          env=env,
+                          check=True)
+    return json.loads(proc.stdout.decode('utf-8').splitlines()[-1])
+
+
+class LoggingTestSuite:
+    TEST_MANIFEST = [
+        'test_configure_logging_async_sink',
+        'test_configure_logging_invalid_queue_size',
+        'test_logging_sink_stats_sync_sink',
+    ]
+
+    def test_configure_logging_async_sink(self):
+        result = run_in_subprocess(CONFIGURE_ASYNC_SINK)
+        stats = result['stats']
+        assert set(stats.keys()) == {'capacity', 'queued', 'delivered', 'dropped'}
+        # the buffer's capacity is rounded up to a power of 2
+        assert stats['capacity'] == 128
+        assert stats['dropped'] == 0
+        assert result['drainer_alive'] is True
+        # the logger can only be configured once
+        assert result['reconfigured'] is False
+
+    @pytest.mark.parametrize('queue_size', [0, -1])
+    def test_configure_logging_invalid_queue_size(self, queue_size):
+        # the arguments are validated before the logger is configured, the session's logging state is unchanged
+        drainer = couchbase._PYCBC_LOG_DRAINER
+        py_logger = couchbase._PYCBC_PY_LOGGER
+        with pytest.raises(InvalidArgumentException):
+            couchbase.configure_logging('couchbase.tests.invalid_queue_size', async_sink=True, queue_size=queue_size)
+        assert couchbase._PYCBC_LOG_DRAINER is drainer
+        assert couchbase._PYCBC_PY_LOGGER is py_logger
+
+    def test_logging_sink_stats_sync_sink(self):
+        # w/o the async sink there are no counters to report and nothing to drain
+        logger = pycbc_logger()
+        assert logger.logging_sink_stats() == {}
+        assert logger.drain_logging_sink(timeout_ms=0) == 0
+
+
+class ClassicLoggingTests(LoggingTestSuite):
+
+    @pytest.fixture(scope='class', autouse=True)
+    def manifest_validated(self):
+        def valid_test_method(meth):
+            attr = getattr(ClassicLoggingTests, meth)
+            return callable(attr) and not meth.startswith('__') and meth.startswith('test')
+        method_list = [meth for meth in dir(ClassicLoggingTests) if valid_test_method(meth)]
+        test_list = set(LoggingTestSuite.TEST_MANIFEST).symmetric_difference(method_list)
+        if test_list:
+            pytest.fail(f'Test manifest not validated.  Missing/extra tests: {test_list}.')
@@ -13,9 +13,20 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 
+import time
+from datetime import timedelta
+
 import pytest
 
-from couchbase.exceptions import CouchbaseException
+from couchbase import profiling
+from couchbase.exceptions import (CouchbaseException,
+                                  DocumentNotFoundException,
+                                  InvalidArgumentException,
+                                  TemporaryFailException,
+                                  UnAmbiguousTimeoutException)
+from couchbase.logic.hedging import HedgedRead, HedgedReads
+from couchbase.metrics import HistogramMeter, LatencyHistogram
+from couchbase.pycbc_core import operations
 from tests.environments.tracing_and_metrics_environment import TracingAndMetricsTestEnvironment
 
 
@@ -23,6 +34,14 @@ class MetricsTestSuite:
 
     TEST_MANIFEST = [
         'test_custom_logging_meter_kv',
+        'test_hedge_delay_from_meter',
+        'test_hedged_read_definitive_error_is_final',
+        'test_hedged_read_expire',
+        'test_hedged_read_first_success_wins',
+        'test_histogram_meter_snapshot',
+        'test_latency_histogram_percentiles',
+        'test_operation_profiler_kv',
+        'test_operation_profiler_stages',
     ]
 
     @pytest.fixture()
@@ -64,6 +83,168 @@ class MetricsTestSuite:
 
         cb_env.validate_metrics(op)
 
+    def test_hedge_delay_from_meter(self):
+        meter = HistogramMeter()
+        hedged_reads = HedgedReads(meter)
+        # not enough samples yet, the default delay is used
+        assert hedged_reads.hedge_delay('default') == HedgedReads.DEFAULT_HEDGE_DELAY
+        assert hedged_reads.hedge_delay('default', hedge_delay=timedelta(milliseconds=5)) == 0.005
+
+        tags = {HistogramMeter.SERVICE_TAG: 'kv', HistogramMeter.OPERATION_TAG: 'get'}
+        recorder = meter.value_recorder(HistogramMeter.OPERATIONS_METER_NAME, tags)
+        for value in range(1, 1001):
+            recorder.record_value(value * 10)
+        hist = meter.operation_histogram('kv', 'get', bucket_name='default')
+        assert hist.count == 1000
+        assert meter.operation_histogram('kv', 'upsert') is None
+
+        # a new instance, the learned delay is cached for REFRESH_INTERVAL
+        hedged_reads = HedgedReads(meter)
+        assert abs(hedged_reads.hedge_delay('default') - 0.0095) <= 0.0095 * 0.032
+        assert abs(hedged_reads.hedge_delay('default', percentile=50) - 0.005) <= 0.005 * 0.032
+        with pytest.raises(InvalidArgumentException):
+            hedged_reads.hedge_delay('default', percentile=0)
+        assert HedgedReads().hedge_delay('default') == HedgedReads.DEFAULT_HEDGE_DELAY
+
+    def test_hedged_read_definitive_error_is_final(self):
+        completed = []
+        read = HedgedRead(completed.append)
+        _, active_err = read.callbacks()
+        replica_ok, _ = read.callbacks(is_replica=True)
+        active_err(DocumentNotFoundException())
+        # the document does not exist, a (possibly stale) replica must not be returned
+        assert completed == [read]
+        assert isinstance(read.exception, DocumentNotFoundException)
+        replica_ok('replica-result')
+        assert completed == [read] and read.result is None
+
+        read = HedgedRead(completed.append)
+        _, active_err = read.callbacks()
+        _, replica_err = read.callbacks(is_replica=True)
+        replica_err(TemporaryFailException())
+        assert not read.done
+        active_err(UnAmbiguousTimeoutException())
+        assert read.done and isinstance(read.exception, UnAmbiguousTimeoutException)
+
+    def test_hedged_read_expire(self):
+        hedged_reads = HedgedReads()
+        # successive hedges read from different replicas
+        assert [hedged_reads.next_replica_index() for _ in range(3)] == [1, 2, 3]
+
+        completed = []
+        read = HedgedRead(completed.append)
+        active_ok, _ = read.callbacks()
+        _, replica_err = read.callbacks(is_replica=True)
+        assert read.expire(UnAmbiguousTimeoutException()) is True
+        assert read.done and isinstance(read.exception, UnAmbiguousTimeoutException)
+        # late responses are ignored
+        active_ok('active-result')
+        replica_err(TemporaryFailException())
+        assert read.result is None and isinstance(read.exception, UnAmbiguousTimeoutException)
+        assert read.expire(UnAmbiguousTimeoutException()) is False
+        hedged_reads.record(read)
+        assert hedged_reads.snapshot()['failed'] == 1
+
+    def test_hedged_read_first_success_wins(self):
+        hedged_reads = HedgedReads()
+        completed = []
+        read = HedgedRead(completed.append)
+        _, active_err = read.callbacks()
+        replica_ok, _ = read.callbacks(is_replica=True)
+        active_err(TemporaryFailException())
+        assert completed == []
+        replica_ok('replica-result')
+        assert completed == [read]
+        assert read.result == 'replica-result' and read.is_replica is True and read.exception is None
+        # the read completed, a late hedge is not sent
+        assert read.callbacks(is_replica=True) is None
+        hedged_reads.record(read)
+
+        read = HedgedRead(completed.append)
+        _, active_err = read.callbacks()
+        active_err(DocumentNotFoundException())
+        assert read.done and isinstance(read.exception, DocumentNotFoundException)
+        hedged_reads.record(read)
+
+        stats = hedged_reads.snapshot(reset=True)
+        assert stats['reads'] == 2
+        assert stats['hedged'] == 1
+        assert stats['replica_wins'] == 1
+        assert stats['failed'] == 1
+        assert stats['hedge_rate'] == 0.5
+        assert hedged_reads.snapshot()['reads'] == 0
+
+    def test_histogram_meter_snapshot(self):
+        meter = HistogramMeter()
+        tags = {HistogramMeter.SERVICE_TAG: 'kv', HistogramMeter.OPERATION_TAG: 'get'}
+        recorder = meter.value_recorder(HistogramMeter.OPERATIONS_METER_NAME, tags)
+        assert recorder is meter.value_recorder(HistogramMeter.OPERATIONS_METER_NAME, tags)
+        for value in [100, 200, 300, 400]:
+            recorder.record_value(value)
+
+        snapshot = meter.snapshot(reset=True)
+        stats = snapshot['operations']['kv']['get']
+        assert stats['total_count'] == 4
+        assert stats['min_us'] == 100
+        assert stats['max_us'] == 400
+        assert set(stats['percentiles_us'].keys()) == {'50.0', '90.0', '99.0', '99.9'}
+        assert stats['percentiles_us']['99.9'] == 400
+        assert meter.snapshot()['operations'] == {}
+
+    def test_latency_histogram_percentiles(self):
+        hist = LatencyHistogram()
+        for value in range(1, 10001):
+            hist.record(value)
+        assert hist.count == 10000
+        assert hist.percentile(100) == 10000
+        # sub_bucket_bits=6 keeps the relative error within ~3%
+        for pct, expected in [(50, 5000), (90, 9000), (99, 9900), (99.9, 9990)]:
+            assert abs(hist.percentile(pct) - expected) <= expected * 0.032
+
+    def test_operation_profiler_kv(self, cb_env):
+        key, value = cb_env.get_existing_doc()
+        profiler = profiling.enable_profiling()
+        try:
+            cb_env.collection.upsert(key, value)
+            cb_env.collection.get(key)
+        finally:
+            assert profiling.disable_profiling() is profiler
+
+        snapshot = profiler.snapshot()
+        for stage in profiling.ProfileStage:
+            assert snapshot['stages'][stage.value]['total_count'] >= 1
+        for op in ['get', 'upsert']:
+            assert snapshot['operations'][op]['io']['total_count'] == 1
+            assert snapshot['operations'][op]['dispatch']['total_count'] == 1
+        assert profiling.profiling_snapshot() == {}
+
+    def test_operation_profiler_stages(self):
+        profiler = profiling.OperationProfiler()
+
+        def kv_operation(**kwargs):
+            # the C++ client reports the IO and GIL reacquisition times before a blocking call returns
+            time.sleep(0.01)
+            kwargs['op_args']['profiler'](8_000_000, 1_000)
+            return kwargs['key']
+
+        op_type = operations.GET.value
+        assert profiler.profile_kv_operation(kv_operation, key='k', op_type=op_type, op_args={}) == 'k'
+        # the result is delivered via a callback, the call only covers the dispatch
+        assert profiler.profile_kv_operation(kv_operation, key='k', op_type=op_type, op_args={'callback': None}) == 'k'
+        assert profiler.time_stage(profiling.ProfileStage.WRAP, str, 1) == '1'
+
+        snapshot = profiler.snapshot(reset=True)
+        get_stages = snapshot['operations']['get']
+        assert get_stages['io']['total_count'] == 2 and get_stages['io']['min_ns'] >= 7_800_000
+        assert get_stages['gil_reacquire']['max_ns'] <= 1_100
+        dispatch = get_stages['dispatch']
+        assert dispatch['total_count'] == 2
+        # the blocking call's dispatch excludes the IO and GIL reacquisition it waited on
+        assert dispatch['min_ns'] < 8_000_000 <= dispatch['max_ns']
+        assert snapshot['stages']['wrap']['total_count'] == 1
+        assert 'wrap' not in get_stages
+        assert profiler.snapshot() == {'stages': {}, 'operations': {}}
+
     # @TODO(jc): CXXCBC-207
     # @pytest.mark.usefixtures('skip_if_mock')
     # @pytest.mark.usefixtures("setup_query")
@@ -26,6 +26,7 @@ from couchbase.management.options import (CreatePrimaryQueryIndexOptions,
                                           DropPrimaryQueryIndexOptions,
                                           DropQueryIndexOptions,
                                           WatchQueryIndexOptions)
+from couchbase.management.queries import QueryIndexWatch
 from tests.environments import CollectionType
 from tests.environments.query_index_mgmt_environment import QueryIndexManagementTestEnvironment
 from tests.environments.test_environment import TestEnvironment
@@ -33,6 +34,7 @@ from tests.environments.test_environment import TestEnvironment
 
 class CollectionQueryCIndexManagementTestSuite:
     TEST_MANIFEST = [
+        'test_build_and_watch',
         'test_create_index_no_fields',
         'test_create_named_primary',
         'test_create_primary',
@@ -56,6 +58,23 @@ class CollectionQueryCIndexManagementTestSuite:
     def clear_all_indexes(self, cb_env):
         cb_env.clear_all_indexes()
 
+    @pytest.mark.flaky(reruns=5, reruns_delay=2)
+    @pytest.mark.usefixtures('clear_all_indexes')
+    def test_build_and_watch(self, cb_env):
+        # an existing deferred index is built with the new ones
+        cb_env.qixm.create_index('ix0', ['fld0'], deferred=True)
+        progress = []
+        cb_env.qixm.build_and_watch({f'ix{n}': [f'fld{n}'] for n in range(3)},
+                                    WatchQueryIndexOptions(timeout=timedelta(seconds=30),
+                                                           progress_callback=progress.append))
+        ixs = cb_env.qixm.get_all_indexes()
+        assert sorted(i.name for i in ixs) == ['ix0', 'ix1', 'ix2']
+        assert all(i.state == 'online' for i in ixs)
+        assert progress[-1].online == progress[-1].total == 3
+        assert progress[-1].pending == {}
+        # the indexes exist and are online already
+        cb_env.qixm.build_and_watch({'ix0': ['fld0']}, timeout=timedelta(seconds=30))
+
     @pytest.mark.usefixtures('clear_all_indexes')
     def test_create_index_no_fields(self, cb_env):
         # raises a TypeError b/c not providing fields means
@@ -307,6 +326,7 @@ class QueryIndexManagementCollectionTestSuite:
         'test_index_partition_info',
         'test_list_indexes',
         'test_watch',
+        'test_watch_keyspaces',
     ]
 
     @pytest.fixture()
@@ -722,9 +742,44 @@ class QueryIndexManagementCollectionTestSuite:
                                                              scope_name=cb_env.TEST_SCOPE,
                                                              collection_name=cb_env.TEST_COLLECTION))
 
+    @pytest.mark.flaky(reruns=5, reruns_delay=2)
+    @pytest.mark.usefixtures('clear_all_indexes')
+    def test_watch_keyspaces(self, cb_env):
+        cb_env.qixm.create_index(cb_env.bucket.name, 'ix0', ['fld0'], deferred=True)
+        cb_env.qixm.create_index(cb_env.bucket.name,
+                                 'ix1',
+                                 ['fld1'],
+                                 deferred=True,
+                                 scope_name=cb_env.TEST_SCOPE,
+                                 collection_name=cb_env.TEST_COLLECTION)
+        watches = [QueryIndexWatch(cb_env.bucket.name, ['ix0'], '_default', '_default'),
+                   QueryIndexWatch(cb_env.bucket.name, ['ix1'], cb_env.TEST_SCOPE, cb_env.TEST_COLLECTION)]
+        # the index of the named collection is not built, so should timeout
+        cb_env.qixm.build_deferred_indexes(cb_env.bucket.name)
+        progress = []
+        with pytest.raises(WatchQueryIndexTimeoutException):
+            cb_env.qixm.watch_keyspaces(watches,
+                                        WatchQueryIndexOptions(timeout=timedelta(seconds=5),
+                                                               progress_callback=progress.append))
+        assert progress[-1].total == 2
+        keyspace = f'{cb_env.bucket.name}.{cb_env.TEST_SCOPE}.{cb_env.TEST_COLLECTION}'
+        assert progress[-1].pending[keyspace] == ['ix1']
+
+        cb_env.qixm.build_deferred_indexes(cb_env.bucket.name,
+                                           scope_name=cb_env.TEST_SCOPE,
+                                           collection_name=cb_env.TEST_COLLECTION)
+        cb_env.qixm.watch_keyspaces(watches, timeout=timedelta(seconds=30))
+        with pytest.raises(QueryIndexNotFoundException):
+            cb_env.qixm.watch_keyspaces([QueryIndexWatch(cb_env.bucket.name,
+                                                         ['idontexist'],
+                                                         cb_env.TEST_SCOPE,
+                                                         cb_env.TEST_COLLECTION)],
+                                        timeout=timedelta(seconds=10))
+
 
 class QueryIndexManagementTestSuite:
     TEST_MANIFEST = [
+        'test_build_and_watch',
         'test_create_index_no_fields',
         'test_create_named_primary',
         'test_create_primary',
@@ -747,6 +802,17 @@ class QueryIndexManagementTestSuite:
     def clear_all_indexes(self, cb_env):
         cb_env.clear_all_indexes()
 
+    @pytest.mark.flaky(reruns=5, reruns_delay=2)
+    @pytest.mark.usefixtures('clear_all_indexes')
+    def test_build_and_watch(self, cb_env):
+        cb_env.qixm.create_primary_index(cb_env.bucket.name, deferred=True)
+        cb_env.qixm.build_and_watch(cb_env.bucket.name,
+                                    {f'ix{n}': [f'fld{n}'] for n in range(3)},
+                                    WatchQueryIndexOptions(timeout=timedelta(seconds=30), watch_primary=True))
+        ixs = cb_env.qixm.get_all_indexes(cb_env.bucket.name)
+        assert sorted(i.name for i in ixs) == ['#primary', 'ix0', 'ix1', 'ix2']
+        assert all(i.state == 'online' for i in ixs)
+
     @pytest.mark.usefixtures('clear_all_indexes')
     def test_create_index_no_fields(self, cb_env):
         # raises a TypeError b/c not providing fields means
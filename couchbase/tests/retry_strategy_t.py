@@ -0,0 +1,231 @@
+#  Copyright 2016-2022. Couchbase, Inc.
+#  All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License")
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import time
+from datetime import timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from couchbase.exceptions import (AmbiguousTimeoutException,
+                                  DocumentNotFoundException,
+                                  InvalidArgumentException,
+                                  KeyValueErrorContext,
+                                  TemporaryFailException,
+                                  UnAmbiguousTimeoutException)
+from couchbase.logic.collection import CollectionLogic
+from couchbase.metrics import CouchbaseMeter, CouchbaseValueRecorder
+from couchbase.retry import AdaptiveRetryStrategy, RetryRequest
+
+
+class RetryStrategyTestSuite:
+    TEST_MANIFEST = [
+        'test_ambiguous_timeout_retried_if_idempotent',
+        'test_attempts_exhausted',
+        'test_backoff',
+        'test_circuit_breaker',
+        'test_circuit_breaker_probe_not_completed',
+        'test_invalid_args',
+        'test_meter_records_outcomes',
+        'test_not_retriable',
+        'test_retry_budget',
+        'test_retry_deadline',
+        'test_snapshot_reset',
+        'test_timeouts_not_retried_by_default',
+    ]
+
+    @staticmethod
+    def _request(exc_cls=TemporaryFailException, attempt=1, idempotent=True, node='10.0.0.1:11210'):
+        exc = exc_cls(message='failed', context=KeyValueErrorContext(last_dispatched_to=node))
+        return RetryRequest('kv', 'get', attempt, idempotent, exc)
+
+    def test_ambiguous_timeout_retried_if_idempotent(self):
+        strategy = AdaptiveRetryStrategy(retry_timeouts=True)
+        assert strategy.retry_after(self._request(AmbiguousTimeoutException)) is not None
+        assert strategy.retry_after(self._request(AmbiguousTimeoutException, idempotent=False)) is None
+        assert strategy.retry_after(self._request(UnAmbiguousTimeoutException, idempotent=False)) is not None
+
+    def test_attempts_exhausted(self):
+        strategy = AdaptiveRetryStrategy(max_retries=2)
+        assert strategy.retry_after(self._request(attempt=2)) is not None
+        assert strategy.retry_after(self._request(attempt=3)) is None
+        assert strategy.snapshot()['kv']['attempts_exhausted'] == 1
+
+    def test_backoff(self):
+        strategy = AdaptiveRetryStrategy(initial_backoff=timedelta(milliseconds=10), max_backoff=0.05)
+        for attempt in range(1, 10):
+            cap = min(0.05, 0.01 * 2 ** (attempt - 1))
+            assert 0 <= strategy.backoff(attempt) <= cap
+
+    def test_circuit_breaker(self):
+        strategy = AdaptiveRetryStrategy(circuit_breaker_threshold=2,
+                                         circuit_breaker_open_time=timedelta(milliseconds=50))
+        assert strategy.retry_after(self._request()) is not None
+        # the second failure opens the node's circuit
+        assert strategy.retry_after(self._request()) is None
+        # other nodes are not affected
+        assert strategy.retry_after(self._request(node='10.0.0.2:11210')) is not None
+        snapshot = strategy.snapshot()
+        assert snapshot['kv']['circuit_rejected'] == 1
+        assert snapshot['circuit_breakers']['10.0.0.1:11210'] == 'open'
+
+        time.sleep(0.06)
+        assert strategy.snapshot()['circuit_breakers']['10.0.0.1:11210'] == 'half_open'
+        probe = self._request()
+        assert strategy.retry_after(probe) is not None
+        # a single probe is let through while half-open
+        assert strategy.retry_after(self._request()) is None
+        strategy.on_retry_success(probe)
+        assert strategy.snapshot()['circuit_breakers']['10.0.0.1:11210'] == 'closed'
+
+    def test_circuit_breaker_probe_not_completed(self):
+        class FixedBackoffStrategy(AdaptiveRetryStrategy):
+            def backoff(self, attempt):
+                return 0.5
+
+        node = '10.0.0.1:11210'
+        strategy = FixedBackoffStrategy(circuit_breaker_threshold=1,
+                                        circuit_breaker_open_time=timedelta(milliseconds=50))
+        assert strategy.retry_after(self._request(node=node)) is None
+        time.sleep(0.06)
+        assert strategy.snapshot()['circuit_breakers'][node] == 'half_open'
+
+        # the probe is granted, but the backoff exceeds what remains of the operation's timeout so it is not sent
+        scope = SimpleNamespace(connection=None, rate_limiter=None, retry_strategy=strategy, kv_timeout=2.5)
+        collection = CollectionLogic(scope, '_default')
+        attempts = []
+
+        def operation(**kwargs):
+            attempts.append(kwargs['op_args']['timeout'])
+            raise TemporaryFailException(message='failed', context=KeyValueErrorContext(last_dispatched_to=node))
+
+        with pytest.raises(TemporaryFailException):
+            collection._rate_limited(operation, op_type=0, op_args={'timeout': 100000})
+        assert len(attempts) == 1
+        assert strategy.snapshot()['circuit_breakers'][node] == 'half_open'
+
+        # the probe is sent, but ends with an error that is not retried
+        assert strategy.retry_after(self._request(node=node)) is not None
+        assert strategy.snapshot()['circuit_breakers'][node] == 'open'
+        assert strategy.retry_after(self._request(DocumentNotFoundException, attempt=2, node=node)) is None
+        assert strategy.snapshot()['circuit_breakers'][node] == 'half_open'
+
+    @pytest.mark.parametrize('kwargs', [{'max_retries': -1},
+                                        {'max_retries': True},
+                                        {'circuit_breaker_threshold': 0},
+                                        {'retry_budget_ratio': -0.1},
+                                        {'initial_backoff': 'fast'},
+                                        {'circuit_breaker_open_time': timedelta(seconds=-1)}])
+    def test_invalid_args(self, kwargs):
+        with pytest.raises(InvalidArgumentException):
+            AdaptiveRetryStrategy(**kwargs)
+
+    def test_meter_records_outcomes(self):
+        class CountingRecorder(CouchbaseValueRecorder):
+            def __init__(self):
+                super().__init__()
+                self.total = 0
+
+            def record_value(self, value):
+                self.total += value
+
+        class CountingMeter(CouchbaseMeter):
+            def __init__(self):
+                super().__init__()
+                self.recorders = {}
+
+            def value_recorder(self, name, tags):
+                return self.recorders.setdefault((name, tags['db.couchbase.service'], tags['outcome']),
+                                                 CountingRecorder())
+
+        meter = CountingMeter()
+        strategy = AdaptiveRetryStrategy(max_retries=1, meter=meter)
+        strategy.retry_after(self._request())
+        strategy.retry_after(self._request())
+        strategy.retry_after(self._request(attempt=2))
+        assert meter.recorders[('db.couchbase.retries', 'kv', 'retried')].total == 2
+        assert meter.recorders[('db.couchbase.retries', 'kv', 'attempts_exhausted')].total == 1
+
+    def test_not_retriable(self):
+        strategy = AdaptiveRetryStrategy()
+        assert strategy.retry_after(self._request(DocumentNotFoundException)) is None
+        snapshot = strategy.snapshot()
+        assert snapshot['kv']['not_retriable'] == 1
+        # errors that are not retried do not count against the node
+        assert snapshot['circuit_breakers'] == {}
+
+    def test_retry_budget(self):
+        strategy = AdaptiveRetryStrategy(retry_budget_ratio=0.5, min_retries_per_second=0)
+        for _ in range(4):
+            strategy.on_request('kv')
+        assert strategy.retry_after(self._request(node=None)) is not None
+        assert strategy.retry_after(self._request(node=None)) is not None
+        # 2 retries for 4 requests used up the budget
+        assert strategy.retry_after(self._request(node=None)) is None
+        strategy.on_request('kv')
+        strategy.on_request('kv')
+        assert strategy.retry_after(self._request(node=None)) is not None
+        snapshot = strategy.snapshot()
+        assert snapshot['kv']['requests'] == 6
+        assert snapshot['kv']['retries'] == 3
+        assert snapshot['kv']['budget_rejected'] == 1
+
+    def test_retry_deadline(self):
+        strategy = AdaptiveRetryStrategy(max_retries=100, initial_backoff=0.02, max_backoff=0.02,
+                                         min_retries_per_second=1000)
+        scope = SimpleNamespace(connection=None, rate_limiter=None, retry_strategy=strategy, kv_timeout=2.5)
+        collection = CollectionLogic(scope, '_default')
+        timeouts = []
+
+        def operation(**kwargs):
+            timeouts.append(kwargs['op_args']['timeout'])
+            raise TemporaryFailException()
+
+        start = time.monotonic()
+        with pytest.raises(TemporaryFailException):
+            collection._rate_limited(operation, op_type=0, op_args={'timeout': 200000})
+        # the operation's timeout bounds all of its attempts, every retry only gets the time that remains
+        assert time.monotonic() - start < 0.3
+        assert 1 < len(timeouts) < 100
+        assert timeouts[0] == 200000
+        assert all(prev > timeout for prev, timeout in zip(timeouts, timeouts[1:]))
+
+    def test_snapshot_reset(self):
+        strategy = AdaptiveRetryStrategy()
+        strategy.on_request('kv')
+        strategy.retry_after(self._request())
+        snapshot = strategy.snapshot(reset=True)
+        assert snapshot['kv']['requests'] == 1
+        assert snapshot['kv']['retries'] == 1
+        assert 'kv' not in strategy.snapshot()
+
+    def test_timeouts_not_retried_by_default(self):
+        strategy = AdaptiveRetryStrategy()
+        assert strategy.retry_after(self._request(AmbiguousTimeoutException)) is None
+        assert strategy.retry_after(self._request(UnAmbiguousTimeoutException)) is None
+        assert strategy.snapshot()['kv']['not_retriable'] == 2
+
+
+class ClassicRetryStrategyTests(RetryStrategyTestSuite):
+
+    @pytest.fixture(scope='class', autouse=True)
+    def manifest_validated(self):
+        def valid_test_method(meth):
+            attr = getattr(ClassicRetryStrategyTests, meth)
+            return callable(attr) and not meth.startswith('__') and meth.startswith('test')
+        method_list = [meth for meth in dir(ClassicRetryStrategyTests) if valid_test_method(meth)]
+        test_list = set(RetryStrategyTestSuite.TEST_MANIFEST).symmetric_difference(method_list)
+        if test_list:
+            pytest.fail(f'Test manifest not validated.  Missing/extra tests: {test_list}.')
@@ -13,9 +13,13 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 
+import logging
+from datetime import timedelta
+
 import pytest
 
-from couchbase.exceptions import CouchbaseException
+import couchbase
+from couchbase.exceptions import CouchbaseException, InvalidArgumentException
 from couchbase.options import (AnalyticsOptions,
                                GetOptions,
                                InsertOptions,
@@ -26,13 +30,23 @@ from couchbase.options import (AnalyticsOptions,
                                UpsertOptions,
                                ViewOptions)
 from couchbase.search import TermQuery
-from tests.environments.tracing_and_metrics_environment import TracingAndMetricsTestEnvironment
+from couchbase.tracing import (NoOpSpan,
+                               OrphanReport,
+                               SamplingTracer,
+                               ThresholdReport,
+                               ThresholdReportHandler,
+                               enable_threshold_reports)
+from tests.environments.tracing_and_metrics_environment import TestTracer, TracingAndMetricsTestEnvironment
 
 
 class TracerTestsSuite:
     TEST_MANIFEST = [
+        'test_enable_threshold_reports',
         'test_http',
         'test_kv',
+        'test_sampling_tracer_latency',
+        'test_sampling_tracer_rate',
+        'test_threshold_report_handler',
     ]
 
     @pytest.fixture(scope='class')
@@ -40,6 +54,21 @@ class TracerTestsSuite:
         if cb_env.is_mock_server:
             pytest.skip('Test needs real server')
 
+    def test_enable_threshold_reports(self, monkeypatch):
+        # the SDK's logger is not taken over, the application has to configure logging first
+        monkeypatch.setattr(couchbase, '_PYCBC_PY_LOGGER', None)
+        with pytest.raises(InvalidArgumentException):
+            enable_threshold_reports()
+
+        logger = logging.getLogger('couchbase.tests.configured')
+        monkeypatch.setattr(couchbase, '_PYCBC_PY_LOGGER', logger)
+        handler = enable_threshold_reports(maxsize=10)
+        try:
+            assert handler in logger.handlers
+            assert isinstance(handler, ThresholdReportHandler)
+        finally:
+            logger.removeHandler(handler)
+
     @pytest.mark.parametrize('op, span_name, opts, value', [
         ('get', 'cb.get', GetOptions, None),
         ('upsert', 'cb.upsert', UpsertOptions, {'some': 'thing'}),
@@ -78,6 +107,89 @@ class TracerTestsSuite:
         assert spans[0].get_name() == span_name
         assert spans[0].get_parent() == parent
 
+    @pytest.mark.parametrize('rate, expected', [(0.0, 0), (1.0, 10)])
+    def test_sampling_tracer_rate(self, rate, expected):
+        tracer = TestTracer()
+        sampler = SamplingTracer(tracer, sample_rate=rate)
+        for _ in range(10):
+            root = sampler.start_span(name='cb.get')
+            child = sampler.start_span(name='dispatch_to_server', parent=root)
+            child.finish()
+            root.finish()
+            if expected == 0:
+                assert isinstance(root, NoOpSpan)
+                assert isinstance(child, NoOpSpan)
+        assert len(tracer.spans()) == expected * 2
+
+    def test_sampling_tracer_latency(self):
+        tracer = TestTracer()
+        sampler = SamplingTracer(tracer, latency_threshold=timedelta(hours=1))
+        root = sampler.start_span(name='cb.get')
+        sampler.start_span(name='dispatch_to_server', parent=root).finish()
+        root.finish()
+        # below the threshold, nothing is forwarded
+        assert len(tracer.spans()) == 0
+
+        sampler = SamplingTracer(tracer, latency_threshold=timedelta(0))
+        root = sampler.start_span(name='cb.get')
+        root.set_attribute('db.operation', 'get')
+        sampler.start_span(name='dispatch_to_server', parent=root).finish()
+        root.finish()
+        spans = tracer.spans()
+        assert [s.get_name() for s in spans] == ['cb.get', 'dispatch_to_server']
+        assert spans[1].get_parent() is spans[0]
+        assert spans[0].get_attributes()['db.operation'] == 'get'
+        assert all(s.is_finished() for s in spans)
+
+    def test_threshold_report_handler(self):
+        # as logged by the C++ client's threshold logging tracer (INFO) and orphan reporter (WARNING)
+        threshold_line = ('Operations over threshold: {"count":3,"service":"kv","top":[{"last_dispatch_duration_us":'
+                          '1151,"last_local_id":"4a3b9f2e6d1c0b7a/8e5d2c1b0a9f8e7d","last_local_socket":'
+                          '"127.0.0.1:53094","last_remote_socket":"127.0.0.1:11210","last_server_duration_us":21,'
+                          '"operation_id":"0x1d","operation_name":"upsert","total_dispatch_duration_us":1151,'
+                          '"total_duration_us":1404,"total_server_duration_us":21},{"last_dispatch_duration_us":'
+                          '603,"last_local_id":"4a3b9f2e6d1c0b7a/8e5d2c1b0a9f8e7d","last_local_socket":'
+                          '"127.0.0.1:53094","last_remote_socket":"127.0.0.1:11210","last_server_duration_us":8,'
+                          '"operation_id":"0x1e","operation_name":"get","total_dispatch_duration_us":603,'
+                          '"total_duration_us":712,"total_server_duration_us":8}]}')
+        orphan_line = ('Orphan responses observed: {"count":1,"service":"kv","top":[{"last_local_id":'
+                       '"4a3b9f2e6d1c0b7a/8e5d2c1b0a9f8e7d","last_local_socket":"127.0.0.1:53094",'
+                       '"last_remote_socket":"127.0.0.1:11210","last_server_duration_us":4,"operation_id":"0x2a",'
+                       '"operation_name":"get","timeout_ms":2500,"total_server_duration_us":4}]}')
+        received = []
+        handler = ThresholdReportHandler(callback=received.append, maxsize=1)
+        logger = logging.getLogger('couchbase.tests.threshold_reports')
+        level = logger.level
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+        logger.addHandler(handler)
+        try:
+            logger.info(threshold_line)
+            logger.warning(orphan_line)
+            logger.info('Not a report')
+        finally:
+            logger.removeHandler(handler)
+            logger.setLevel(level)
+
+        assert len(received) == 2
+        threshold, orphan = received
+        assert type(threshold) is ThresholdReport
+        assert threshold.total_counts == {'kv': 3}
+        assert [op.operation_name for op in threshold.operations] == ['upsert', 'get']
+        op = threshold.operations[0]
+        assert (op.service, op.operation_name, op.total_duration_us) == ('kv', 'upsert', 1404)
+        assert op.last_dispatch_duration_us == 1151
+        assert op.last_server_duration_us == 21
+        assert op.remote_endpoint == '127.0.0.1:11210'
+        assert op.local_endpoint == '127.0.0.1:53094'
+        assert op.operation_id == '0x1d'
+        assert isinstance(orphan, OrphanReport)
+        assert orphan.total_counts == {'kv': 1}
+        assert orphan.operations[0].timeout_ms == 2500
+        # queue only holds a single report
+        assert handler.reports.get_nowait() is threshold
+        assert handler.dropped == 1
+
     @pytest.mark.parametrize('http_op, http_span_name, http_opts, query, extra', [
         ('query', 'cb.query', QueryOptions, 'Select 1', None),
         ('analytics_query', 'cb.analytics', AnalyticsOptions, "Select 1", None),
@@ -21,6 +21,7 @@ import pytest
 from couchbase.durability import DurabilityLevel, ServerDurability
 from couchbase.exceptions import (DocumentExistsException,
                                   DocumentNotFoundException,
+                                  InvalidArgumentException,
                                   ParsingFailedException,
                                   TransactionExpired,
                                   TransactionFailed,
@@ -29,7 +30,9 @@ from couchbase.n1ql import QueryProfile, QueryScanConsistency
 from couchbase.options import (TransactionConfig,
                                TransactionOptions,
                                TransactionQueryOptions)
-from couchbase.transactions import TransactionKeyspace, TransactionResult
+from couchbase.transactions import (TransactionKeyspace,
+                                    TransactionMetrics,
+                                    TransactionResult)
 from tests.environments import CollectionType
 from tests.environments.test_environment import TestEnvironment
 from tests.test_features import EnvironmentFeatures
@@ -39,6 +42,7 @@ class TransactionTestSuite:
     TEST_MANIFEST = [
         'test_adhoc',
         'test_bad_query',
+        'test_bulk_apply',
         'test_cleanup_client_attempts',
         'test_cleanup_lost_attempts',
         'test_cleanup_window',
@@ -47,9 +51,11 @@ class TransactionTestSuite:
         'test_get',
         'test_get_lambda_raises_doc_not_found',
         'test_get_inner_exc_doc_not_found',
+        'test_get_multi_not_found',
         'test_insert',
         'test_insert_lambda_raises_doc_exists',
         'test_insert_inner_exc_doc_exists',
+        'test_insert_replace_multi',
         'test_kv_timeout',
         'test_max_parallelism',
         'test_metadata_collection',
@@ -74,6 +80,7 @@ class TransactionTestSuite:
         'test_scan_consistency',
         'test_scope_qualifier',
         'test_transaction_config_durability',
+        'test_transaction_metrics',
         'test_transaction_result',
     ]
 
@@ -104,6 +111,27 @@ class TransactionTestSuite:
 
         cb_env.cluster.transactions.run(txn_logic)
 
+    def test_bulk_apply(self, cb_env):
+        existing = dict(cb_env.get_new_doc() for _ in range(4))
+        for key, value in existing.items():
+            cb_env.collection.upsert(key, value)
+        docs = {key: {'updated': key} for key in existing}
+        docs.update(cb_env.get_new_doc() for _ in range(6))
+
+        results = cb_env.cluster.transactions.bulk_apply(cb_env.collection, docs, chunk_size=3, parallelism=2)
+        assert len(results) == 4
+        assert [key for res in results for key in res.keys] == list(docs)
+        for res in results:
+            assert res.success is True
+            assert res.error is None
+            assert res.attempts == 1
+            assert isinstance(res.result, TransactionResult)
+        for key, value in docs.items():
+            assert cb_env.collection.get(key).content_as[dict] == value
+
+        with pytest.raises(InvalidArgumentException):
+            cb_env.cluster.transactions.bulk_apply(cb_env.collection, docs, chunk_size=0)
+
     @pytest.mark.parametrize('cleanup', [False, True])
     def test_cleanup_client_attempts(self, cleanup):
         cfg = TransactionConfig(cleanup_client_attempts=cleanup)
@@ -194,6 +222,18 @@ class TransactionTestSuite:
 
         assert num_attempts == 1
 
+    def test_get_multi_not_found(self, cb_env):
+        key, value = cb_env.get_existing_doc()
+        missing_key = cb_env.get_new_doc(key_only=True)
+
+        def txn_logic(ctx):
+            with pytest.raises(DocumentNotFoundException):
+                ctx.get_multi(cb_env.collection, [key, missing_key])
+            res = ctx.get_multi(cb_env.collection, [key])
+            assert res[0].content_as[dict] == value
+
+        cb_env.cluster.transactions.run(txn_logic)
+
     def test_insert(self, cb_env):
         key, value = cb_env.get_new_doc()
 
@@ -204,6 +244,27 @@ class TransactionTestSuite:
         get_result = cb_env.collection.get(key)
         assert get_result.content_as[dict] == value
 
+    def test_insert_replace_multi(self, cb_env):
+        docs = dict(cb_env.get_new_doc() for _ in range(5))
+        keys = list(docs.keys())
+
+        def insert_logic(ctx):
+            res = ctx.insert_multi(cb_env.collection, docs)
+            assert [r.id for r in res] == keys
+
+        cb_env.cluster.transactions.run(insert_logic)
+
+        def replace_logic(ctx):
+            res = ctx.get_multi(cb_env.collection, keys)
+            assert [r.id for r in res] == keys
+            assert [r.content_as[dict] for r in res] == list(docs.values())
+            replaced = ctx.replace_multi((r, {'replaced': r.id}) for r in res)
+            assert all(r.cas != replaced_r.cas for r, replaced_r in zip(res, replaced))
+
+        cb_env.cluster.transactions.run(replace_logic)
+        for key in keys:
+            assert cb_env.collection.get(key).content_as[dict] == {'replaced': key}
+
     def test_insert_lambda_raises_doc_exists(self, cb_env):
         key, value = cb_env.get_existing_doc()
         num_attempts = 0
@@ -582,6 +643,35 @@ class TransactionTestSuite:
         assert result.transaction_id is not None
         assert result.unstaging_complete is True
 
+    def test_transaction_metrics(self, cb_env):
+        key = cb_env.get_new_doc(key_only=True)
+        txns = cb_env.cluster.transactions
+        before = txns.stats()
+
+        def txn_logic(ctx):
+            ctx.insert(cb_env.collection, key, {'some': 'thing'})
+            doc = ctx.get(cb_env.collection, key)
+            ctx.replace(doc, {'some': 'thing else'})
+
+        metrics = txns.run(txn_logic).metrics
+        assert isinstance(metrics, TransactionMetrics)
+        assert metrics.attempts >= 1
+        assert len(metrics.staging_durations) == metrics.attempts
+        assert len(metrics.retry_reasons) == metrics.attempts - 1
+        assert metrics.duration >= metrics.commit_duration + metrics.staging_durations[-1]
+
+        def failing_logic(ctx):
+            raise RuntimeError('failing the transaction')
+
+        with pytest.raises(TransactionFailed):
+            txns.run(failing_logic)
+
+        stats = txns.stats()
+        assert stats['transactions'] == before['transactions'] + 2
+        assert stats['outcomes']['committed'] == before['outcomes'].get('committed', 0) + 1
+        assert stats['outcomes']['failed'] == before['outcomes'].get('failed', 0) + 1
+        assert stats['attempts'] >= before['attempts'] + 2
+
 
 class ClassicTransactionTests(TransactionTestSuite):
     @pytest.fixture(scope='class')
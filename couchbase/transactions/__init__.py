@@ -16,6 +16,8 @@
 from .transaction_get_result import TransactionGetResult  # noqa: F401
 from .transaction_keyspace import TransactionKeyspace  # noqa: F401
 from .transaction_query_results import TransactionQueryResults  # noqa: F401
+from .transaction_result import TransactionChunkResult  # noqa: F401
+from .transaction_result import TransactionMetrics  # noqa: F401
 from .transaction_result import TransactionResult  # noqa: F401
 from .transactions import AttemptContext  # noqa: F401
 from .transactions import Transactions  # noqa: F401
@@ -14,7 +14,10 @@
 #  limitations under the License.
 
 import logging
-from typing import TYPE_CHECKING, Optional
+from typing import (TYPE_CHECKING,
+                    Any,
+                    Optional,
+                    Tuple)
 
 from couchbase.pycbc_core import (transaction_op,
                                   transaction_operations,
@@ -25,6 +28,7 @@ if TYPE_CHECKING:
 
     from couchbase._utils import PyCapsuleType
     from couchbase.serializer import Serializer
+    from couchbase.transactions.logic.transaction_metrics import TransactionMetricsCollector
 
 log = logging.getLogger(__name__)
 
@@ -33,12 +37,39 @@ class AttemptContextLogic:
     def __init__(self,
                  ctx,    # type: PyCapsuleType
                  loop,    # type: Optional[AbstractEventLoop]
-                 serializer  # type: Serializer
+                 serializer,  # type: Serializer
+                 metrics=None  # type: Optional[TransactionMetricsCollector]
                  ):
         log.debug('creating new attempt context with context=%s, loop=%s, and serializer=%s', ctx, loop, serializer)
         self._ctx = ctx
         self._loop = loop
         self._serializer = serializer
+        self._metrics = metrics
+
+    @staticmethod
+    def _op_key(op_name,  # type: str
+                args  # type: Tuple[Any, ...]
+                ) -> Optional[str]:
+        """**INTERNAL**
+
+        Returns the document key of an operation from its positional arguments.
+        """
+        if op_name in ('get', 'insert'):
+            return args[1]
+        if op_name in ('replace', 'remove'):
+            return args[0].id
+        return None
+
+    def _record_op_error(self,
+                         key,  # type: Optional[str]
+                         exc  # type: BaseException
+                         ) -> None:
+        """**INTERNAL**
+
+        Records a failed operation in the transaction's metrics.
+        """
+        if self._metrics is not None:
+            self._metrics.op_failed(key, exc)
 
     def get(self, coll, key, **kwargs):
         kwargs.update(coll._get_connection_args())
@@ -0,0 +1,216 @@
+#  Copyright 2016-2022. Couchbase, Inc.
+#  All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License")
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import Counter
+from datetime import timedelta
+from typing import (TYPE_CHECKING,
+                    Any,
+                    Dict,
+                    List,
+                    Optional,
+                    Tuple)
+
+from couchbase.exceptions import (TransactionCommitAmbiguous,
+                                  TransactionExpired,
+                                  TransactionFailed,
+                                  TransactionOperationFailed)
+from couchbase.metrics import HistogramMeter
+
+if TYPE_CHECKING:
+    from couchbase.metrics import CouchbaseMeter
+    from couchbase.transactions.transaction_result import TransactionMetrics
+
+
+class TransactionMetricsCollector:
+    """
+    **INTERNAL**
+
+    Times the attempts of a single transaction and records the operations that failed them.  The core does not report
+    its phases, so staging is the time spent in the transaction logic, and commit is the time from the last attempt's
+    logic completing until the transaction completed.  Operations may fail on the C++ core's IO threads.
+    """
+
+    # the reason recorded for an attempt whose logic completed, but which was retried from the commit phase
+    COMMIT_REASON = 'commit'
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._start = time.monotonic()
+        self._attempt_start = None  # type: Optional[float]
+        self._logic_end = None  # type: Optional[float]
+        self._staging = []  # type: List[float]
+        # the reason each attempt failed, None if it has not failed (yet)
+        self._reasons = []  # type: List[Optional[str]]
+        # dict, to keep the keys in the order they conflicted
+        self._conflicts = {}  # type: Dict[str, int]
+
+    def attempt_started(self) -> None:
+        with self._lock:
+            self._attempt_start = time.monotonic()
+            self._staging.append(0.0)
+            self._reasons.append(None)
+
+    def attempt_ended(self,
+                      exc=None  # type: Optional[BaseException]
+                      ) -> None:
+        with self._lock:
+            self._logic_end = time.monotonic()
+            self._staging[-1] = self._logic_end - self._attempt_start
+            if exc is not None and self._reasons[-1] is None:
+                self._reasons[-1] = type(exc).__name__
+
+    def op_failed(self,
+                  key,  # type: Optional[str]
+                  exc  # type: BaseException
+                  ) -> None:
+        # other errors (e.g. DocumentNotFoundException) only fail the attempt if the logic raises them
+        if not isinstance(exc, TransactionOperationFailed):
+            return
+        with self._lock:
+            # once an operation failed the attempt, the core fails the operations that follow it as well
+            if not self._reasons or self._reasons[-1] is not None:
+                return
+            self._reasons[-1] = type(exc).__name__
+            if key is not None:
+                self._conflicts[key] = self._conflicts.get(key, 0) + 1
+
+    def finish(self) -> Dict[str, Any]:
+        """
+        Returns the keyword arguments of the transaction's :class:`~couchbase.transactions.TransactionMetrics`.
+        """
+        with self._lock:
+            now = time.monotonic()
+            return {
+                'attempts': len(self._staging),
+                'staging_durations': [timedelta(seconds=s) for s in self._staging],
+                'commit_duration': timedelta(seconds=now - self._logic_end if self._logic_end is not None else 0),
+                'duration': timedelta(seconds=now - self._start),
+                'retry_reasons': [r or self.COMMIT_REASON for r in self._reasons[:-1]],
+                'conflicting_keys': list(self._conflicts),
+            }
+
+
+class TransactionStats:
+    """
+    **INTERNAL**
+
+    Per cluster counters of the transactions run (see :meth:`~couchbase.transactions.Transactions.stats`).  The
+    durations are recorded as latencies of the ``transactions`` service in the cluster's meter, so a
+    :class:`~couchbase.metrics.HistogramMeter` reports their percentiles, the attempts, retries and conflicts as
+    counts.
+    """
+
+    ATTEMPTS_METER_NAME = 'db.couchbase.transactions.attempts'
+    RETRIES_METER_NAME = 'db.couchbase.transactions.retries'
+    CONFLICTS_METER_NAME = 'db.couchbase.transactions.conflicts'
+    SERVICE = 'transactions'
+    OUTCOME_TAG = 'outcome'
+    REASON_TAG = 'reason'
+    # the number of most conflicting keys reported by a snapshot
+    TOP_CONFLICTING_KEYS = 10
+    # conflicting keys are counted in memory, the least conflicting ones are dropped past this number
+    MAX_TRACKED_KEYS = 10000
+
+    def __init__(self,
+                 meter=None  # type: Optional[CouchbaseMeter]
+                 ):
+        self._meter = meter
+        self._lock = threading.Lock()
+        self._recorders = {}  # type: Dict[Tuple[str, str, str], Any]
+        self._reset_counters()
+
+    def _reset_counters(self) -> None:
+        self._outcomes = Counter()  # type: Counter
+        self._attempts = 0
+        self._retries = Counter()  # type: Counter
+        self._conflicts = Counter()  # type: Counter
+
+    @staticmethod
+    def outcome(exc=None  # type: Optional[BaseException]
+                ) -> str:
+        if exc is None:
+            return 'committed'
+        if isinstance(exc, TransactionCommitAmbiguous):
+            return 'commit_ambiguous'
+        if isinstance(exc, TransactionExpired):
+            return 'expired'
+        if isinstance(exc, TransactionFailed):
+            return 'failed'
+        return 'error'
+
+    def record(self,
+               metrics,  # type: TransactionMetrics
+               outcome  # type: str
+               ) -> None:
+        with self._lock:
+            self._outcomes[outcome] += 1
+            self._attempts += metrics.attempts
+            self._retries.update(metrics.retry_reasons)
+            self._conflicts.update(metrics.conflicting_keys)
+            if len(self._conflicts) > self.MAX_TRACKED_KEYS:
+                self._conflicts = Counter(dict(self._conflicts.most_common(self.MAX_TRACKED_KEYS // 2)))
+
+        if self._meter is None:
+            return
+        for staging in metrics.staging_durations:
+            self._record_duration('staging', staging)
+        self._record_duration('commit', metrics.commit_duration)
+        self._record_duration('transaction', metrics.duration)
+        self._recorder(self.ATTEMPTS_METER_NAME, self.OUTCOME_TAG, outcome).record_value(metrics.attempts)
+        for reason in metrics.retry_reasons:
+            self._recorder(self.RETRIES_METER_NAME, self.REASON_TAG, reason).record_value(1)
+        if metrics.conflicting_keys:
+            self._recorder(self.CONFLICTS_METER_NAME, self.OUTCOME_TAG, outcome).record_value(
+                len(metrics.conflicting_keys))
+
+    def _record_duration(self,
+                         phase,  # type: str
+                         duration  # type: timedelta
+                         ) -> None:
+        recorder = self._recorder(HistogramMeter.OPERATIONS_METER_NAME, HistogramMeter.OPERATION_TAG, phase)
+        recorder.record_value(int(duration.total_seconds() * 1e6))
+
+    def _recorder(self,
+                  name,  # type: str
+                  tag,  # type: str
+                  value  # type: str
+                  ) -> Any:
+        key = (name, tag, value)
+        recorder = self._recorders.get(key, None)
+        if recorder is None:
+            recorder = self._meter.value_recorder(name, {HistogramMeter.SERVICE_TAG: self.SERVICE, tag: value})
+            self._recorders[key] = recorder
+        return recorder
+
+    def snapshot(self,
+                 reset=False  # type: Optional[bool]
+                 ) -> Dict[str, Any]:
+        with self._lock:
+            transactions = sum(self._outcomes.values())
+            snapshot = {
+                'transactions': transactions,
+                'outcomes': dict(self._outcomes),
+                'attempts': self._attempts,
+                'attempts_per_transaction': self._attempts / transactions if transactions else 0.0,
+                'retry_reasons': dict(self._retries),
+                'conflicting_keys': self._conflicts.most_common(self.TOP_CONFLICTING_KEYS),
+            }
+            if reset:
+                self._reset_counters()
+        return snapshot
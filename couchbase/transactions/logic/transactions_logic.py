@@ -14,16 +14,24 @@
 #  limitations under the License.
 
 import logging
+from itertools import islice
 from typing import (TYPE_CHECKING,
                     Any,
                     Callable,
                     Dict,
-                    Optional)
+                    Iterable,
+                    Iterator,
+                    Mapping,
+                    Optional,
+                    Tuple,
+                    Union)
 
+from couchbase.exceptions import InvalidArgumentException
 from couchbase.logic.supportability import Supportability
 from couchbase.pycbc_core import (create_transactions,
                                   destroy_transactions,
                                   run_transaction)
+from couchbase.transactions.logic.transaction_metrics import TransactionStats
 
 if TYPE_CHECKING:
     from couchbase.logic.cluster import ClusterLogic
@@ -44,6 +52,7 @@ class TransactionsLogic:
         self._serializer = cluster._default_serializer
         if hasattr(cluster, "loop"):
             self._loop = cluster.loop
+        self._stats = TransactionStats(cluster._cluster_opts.get('meter', None))
         self._txns = create_transactions(cluster.connection, self._config._base)
         log.info('created transactions object using config=%s, serializer=%s', self._config, self._serializer)
 
@@ -64,6 +73,63 @@ class TransactionsLogic:
             log.debug('txn_logic.run() got %s:%s, re-raising it', e.__class__.__name__, e)
             raise e
 
+    def stats(self,
+              reset=False  # type: Optional[bool]
+              ) -> Dict[str, Any]:
+        """
+        **VOLATILE** This API is subject to change at any time.
+
+        Export the counters of the transactions run on this cluster, to find the documents transactions contend on.
+        The durations of the transactions' phases are recorded in the cluster's meter, see
+        :class:`~couchbase.transactions.TransactionMetrics`.
+
+        Args:
+            reset (bool, optional): If True, the counters are reset after the snapshot is taken.
+                Defaults to False.
+
+        Returns:
+            Dict[str, Any]: The number of ``transactions`` and their ``outcomes`` (``committed``, ``failed``,
+            ``expired``, ``commit_ambiguous`` or ``error``), the number of ``attempts`` and
+            ``attempts_per_transaction``, the ``retry_reasons`` counts and the ``conflicting_keys``, a list of the
+            (key, number of transactions that conflicted on it) pairs of the most conflicting keys.
+        """
+        return self._stats.snapshot(reset=reset)
+
+    @staticmethod
+    def _validate_bulk_apply(chunk_size,  # type: int
+                             parallelism,  # type: int
+                             retries  # type: int
+                             ) -> None:
+        """**INTERNAL**
+
+        Raises:
+            :class:`~couchbase.exceptions.InvalidArgumentException`: If ``chunk_size`` or ``parallelism`` is not a
+                positive int, or ``retries`` is not a non-negative int.
+        """
+        for name, value, minimum in [('chunk_size', chunk_size, 1),
+                                     ('parallelism', parallelism, 1),
+                                     ('retries', retries, 0)]:
+            if not isinstance(value, int) or isinstance(value, bool) or value < minimum:
+                raise InvalidArgumentException(message=f'{name} must be an int >= {minimum}.')
+
+    @staticmethod
+    def _bulk_chunks(items,  # type: Union[Mapping[str, Any], Iterable[Tuple[str, Any]]]
+                     chunk_size  # type: int
+                     ) -> Iterator[Dict[str, Any]]:
+        """**INTERNAL**
+
+        Yields the documents of ``items`` in dicts of at most ``chunk_size`` keys.  The items are consumed lazily, so
+        only the chunks in flight are held in memory.
+        """
+        if isinstance(items, Mapping):
+            items = items.items()
+        items = iter(items)
+        while True:
+            chunk = dict(islice(items, chunk_size))
+            if not chunk:
+                return
+            yield chunk
+
     def close(self, **kwargs):
         log.info('shutting down transactions...')
         return destroy_transactions(txns=self._txns, **kwargs)
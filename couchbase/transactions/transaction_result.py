@@ -14,6 +14,12 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import List, Optional
+
+
 class TransactionResult(dict):
 
     @property
@@ -24,8 +30,149 @@ class TransactionResult(dict):
     def unstaging_complete(self) -> bool:
         return self.get("unstaging_complete", None)
 
+    @property
+    def metrics(self) -> Optional[TransactionMetrics]:
+        """
+            Optional[:class:`~couchbase.transactions.TransactionMetrics`]: **VOLATILE** The attempts and phase
+            durations of the transaction.
+        """
+        return self.get("metrics", None)
+
     def __repr__(self):
         return f"{type(self).__name__}({super().__repr__()})"
 
     def __str__(self):
         return f"{type(self).__name__}({super().__str__()})"
+
+
+class TransactionMetrics:
+    """
+    **VOLATILE** This API is subject to change at any time.
+
+    How a transaction ran, see :attr:`couchbase.transactions.TransactionResult.metrics`.  The durations are measured
+    by the SDK around the transaction logic: staging is the time spent in the logic of an attempt, commit is the time
+    from the last attempt's logic completing until the transaction completed (committing and unstaging).
+    """
+
+    def __init__(self,
+                 attempts,  # type: int
+                 staging_durations,  # type: List[timedelta]
+                 commit_duration,  # type: timedelta
+                 duration,  # type: timedelta
+                 retry_reasons,  # type: List[str]
+                 conflicting_keys  # type: List[str]
+                 ):
+        self._attempts = attempts
+        self._staging_durations = staging_durations
+        self._commit_duration = commit_duration
+        self._duration = duration
+        self._retry_reasons = retry_reasons
+        self._conflicting_keys = conflicting_keys
+
+    @property
+    def attempts(self) -> int:
+        """
+            int: The number of attempts the transaction ran.
+        """
+        return self._attempts
+
+    @property
+    def staging_durations(self) -> List[timedelta]:
+        """
+            List[timedelta]: The time spent in the transaction logic, per attempt.
+        """
+        return self._staging_durations
+
+    @property
+    def commit_duration(self) -> timedelta:
+        """
+            timedelta: The time from the last attempt's logic completing until the transaction completed.
+        """
+        return self._commit_duration
+
+    @property
+    def duration(self) -> timedelta:
+        """
+            timedelta: The time the transaction took.
+        """
+        return self._duration
+
+    @property
+    def retry_reasons(self) -> List[str]:
+        """
+            List[str]: Why each attempt but the last was retried, the name of the error that failed it, or
+            ``commit`` if its logic completed but the attempt failed to commit.
+        """
+        return self._retry_reasons
+
+    @property
+    def conflicting_keys(self) -> List[str]:
+        """
+            List[str]: The keys of the documents whose operations failed an attempt with a
+            :class:`~couchbase.exceptions.TransactionOperationFailed`, typically a write-write conflict with another
+            transaction.
+        """
+        return self._conflicting_keys
+
+    def __repr__(self):
+        return (f'{type(self).__name__}(attempts={self._attempts}, duration={self._duration}, '
+                f'retry_reasons={self._retry_reasons}, conflicting_keys={self._conflicting_keys})')
+
+
+class TransactionChunkResult:
+    """
+    **VOLATILE** This API is subject to change at any time.
+
+    The outcome of one chunk of a bulk transactional load, see :meth:`couchbase.transactions.Transactions.bulk_apply`.
+    """
+
+    def __init__(self,
+                 keys,  # type: List[str]
+                 result=None,  # type: Optional[TransactionResult]
+                 error=None,  # type: Optional[Exception]
+                 attempts=1  # type: int
+                 ):
+        self._keys = keys
+        self._result = result
+        self._error = error
+        self._attempts = attempts
+
+    @property
+    def keys(self) -> List[str]:
+        """
+            List[str]: The keys of the documents in the chunk.
+        """
+        return self._keys
+
+    @property
+    def result(self) -> Optional[TransactionResult]:
+        """
+            Optional[:class:`~couchbase.transactions.TransactionResult`]: The result of the transaction that applied
+            the chunk, None if the chunk failed.
+        """
+        return self._result
+
+    @property
+    def error(self) -> Optional[Exception]:
+        """
+            Optional[Exception]: The error of the last transaction run for the chunk, None if the chunk was applied.
+        """
+        return self._error
+
+    @property
+    def attempts(self) -> int:
+        """
+            int: The number of transactions run for the chunk.
+        """
+        return self._attempts
+
+    @property
+    def success(self) -> bool:
+        """
+            bool: True if the chunk was applied.
+        """
+        return self._error is None
+
+    def __repr__(self):
+        return (f'{type(self).__name__}(keys={len(self._keys)}, result={self._result}, error={self._error!r}, '
+                f'attempts={self._attempts})')
@@ -14,24 +14,35 @@
 #  limitations under the License.
 
 import logging
-from functools import wraps
+import threading
+from functools import partial, wraps
 from typing import (TYPE_CHECKING,
                     Any,
                     Callable,
                     Dict,
-                    Optional)
+                    Iterable,
+                    List,
+                    Mapping,
+                    Optional,
+                    Tuple,
+                    Union)
 
 from couchbase.exceptions import (CouchbaseException,
+                                  DocumentNotFoundException,
                                   ErrorMapper,
+                                  TransactionException,
                                   TransactionsErrorContext)
 from couchbase.exceptions import exception as BaseCouchbaseException
 from couchbase.logic.supportability import Supportability
 from couchbase.options import TransactionQueryOptions
 from couchbase.transactions.logic import AttemptContextLogic, TransactionsLogic
+from couchbase.transactions.logic.transaction_metrics import TransactionMetricsCollector
 
 from .transaction_get_result import TransactionGetResult
 from .transaction_query_results import TransactionQueryResults
-from .transaction_result import TransactionResult
+from .transaction_result import (TransactionChunkResult,
+                                 TransactionMetrics,
+                                 TransactionResult)
 
 if TYPE_CHECKING:
     from couchbase._utils import JSONType, PyCapsuleType
@@ -63,6 +74,7 @@ class BlockingWrapper:
                         retval = return_cls(ret)
                     return retval
                 except CouchbaseException as cb_exc:
+                    self._record_op_error(self._op_key(fn.__name__, args), cb_exc)
                     raise cb_exc
                 except Exception as e:
                     raise CouchbaseException(message=str(e), context=TransactionsErrorContext())
@@ -87,7 +99,8 @@ class Transactions(TransactionsLogic):
             **kwargs (Dict[str, Any]): Override options for this transaction only - currently unimplemented.
 
         Returns:
-            :class:`~couchbase.transactions.TransactionResult`: Results of the transaction.
+            :class:`~couchbase.transactions.TransactionResult`: Results of the transaction, with its
+                :class:`~couchbase.transactions.TransactionMetrics`.
 
         Raises:
               :class:`~couchbase.exceptions.TransactionFailed`: If the transaction failed.
@@ -112,13 +125,19 @@ class Transactions(TransactionsLogic):
 
         """  # noqa: E501
 
+        metrics = TransactionMetricsCollector()
+
         def wrapped_txn_logic(c):
+            metrics.attempt_started()
             try:
-                ctx = AttemptContext(c, self._serializer)
-                return txn_logic(ctx)
+                ctx = AttemptContext(c, self._serializer, metrics)
+                ret = txn_logic(ctx)
             except Exception as e:
+                metrics.attempt_ended(e)
                 log.debug('wrapped_txn_logic got %s:%s, re-raising it', e.__class__.__name__, e)
                 raise e
+            metrics.attempt_ended()
+            return ret
 
         opts = None
         if transaction_options:
@@ -127,7 +146,103 @@ class Transactions(TransactionsLogic):
             Supportability.method_param_deprecated('per_txn_config', 'transaction_options')
             opts = kwargs.pop('per_txn_config', None)
 
-        return TransactionResult(**super().run(wrapped_txn_logic, opts))
+        try:
+            res = super().run(wrapped_txn_logic, opts)
+        except Exception as ex:
+            self._stats.record(TransactionMetrics(**metrics.finish()), self._stats.outcome(ex))
+            raise
+        txn_metrics = TransactionMetrics(**metrics.finish())
+        self._stats.record(txn_metrics, self._stats.outcome())
+        return TransactionResult(metrics=txn_metrics, **res)
+
+    def bulk_apply(self,
+                   collection,  # type: Collection
+                   items,  # type: Union[Mapping[str, JSONType], Iterable[Tuple[str, JSONType]]]
+                   chunk_size=100,  # type: int
+                   parallelism=4,  # type: int
+                   retries=2,  # type: int
+                   transaction_options=None,  # type: Optional[TransactionOptions]
+                   ) -> List[TransactionChunkResult]:
+        """
+        **VOLATILE** This API is subject to change at any time.
+
+        Upserts documents in independent transactions of at most ``chunk_size`` documents each, so every chunk is
+        applied atomically while the size of a single transaction stays bounded.  Up to ``parallelism`` chunks run
+        concurrently, and a chunk whose transaction failed is run again up to ``retries`` times.  A failed chunk does
+        not stop the others, check the returned results.
+
+        Args:
+            collection (:class:`couchbase.collection.Collection`): Collection to upsert the documents into.
+            items (Union[Mapping[str, :class:`couchbase._utils.JSONType`], Iterable[Tuple[str, :class:`couchbase._utils.JSONType`]]]):
+                Document keys and their contents.  Items are read lazily, in chunks.  If a key appears more than once
+                in a chunk, its last content is used.
+            chunk_size (int, optional): The maximum number of documents per transaction.  Defaults to 100.  Keep
+                chunks small enough to be applied well within the transaction's expiration time.
+            parallelism (int, optional): The maximum number of chunks run concurrently.  Defaults to 4.
+            retries (int, optional): The number of times a failed chunk is run again.  Defaults to 2.
+            transaction_options (:class:`~couchbase.options.TransactionOptions`, optional): Options to override those
+                in the :class:`couchbase.options.TransactionConfig` for each chunk's transaction.
+
+        Returns:
+            List[:class:`~couchbase.transactions.TransactionChunkResult`]: The outcome of each chunk, in the order of
+                ``items``.
+
+        Raises:
+            :class:`~couchbase.exceptions.InvalidArgumentException`: If ``chunk_size``, ``parallelism`` or
+                ``retries`` is invalid.
+
+        Examples:
+            Load documents 200 per transaction::
+
+                coll = cluster.bucket("default").default_collection()
+                docs = {f"doc-{i}": {"id": i} for i in range(10000)}
+                results = cluster.transactions.bulk_apply(coll, docs, chunk_size=200)
+                failed = [key for res in results if not res.success for key in res.keys]
+
+        """  # noqa: E501
+        self._validate_bulk_apply(chunk_size, parallelism, retries)
+        chunks = enumerate(self._bulk_chunks(items, chunk_size))
+        lock = threading.Lock()
+        results = {}
+
+        def worker():
+            while True:
+                with lock:
+                    idx, chunk = next(chunks, (None, None))
+                if chunk is None:
+                    return
+                results[idx] = self._apply_chunk(collection, chunk, retries, transaction_options)
+
+        # keeps concurrent.futures out of `import couchbase.transactions`
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=parallelism, thread_name_prefix='pycbc-bulk-apply') as executor:
+            workers = [executor.submit(worker) for _ in range(parallelism)]
+            for w in workers:
+                w.result()
+        return [results[idx] for idx in range(len(results))]
+
+    def _apply_chunk(self,
+                     collection,  # type: Collection
+                     chunk,  # type: Dict[str, JSONType]
+                     retries,  # type: int
+                     transaction_options  # type: Optional[TransactionOptions]
+                     ) -> TransactionChunkResult:
+        """**INTERNAL**
+
+        Upserts the chunk's documents in a transaction, running it again if it failed.
+        """
+        error = None
+        for attempt in range(1, retries + 2):
+            try:
+                result = self.run(lambda ctx: ctx._upsert_multi(collection, chunk), transaction_options)
+                return TransactionChunkResult(list(chunk), result=result, attempts=attempt)
+            except TransactionException as ex:
+                log.debug('bulk_apply chunk failed on attempt %s: %s', attempt, ex)
+                error = ex
+            except Exception as ex:
+                # not a transaction failure, running the chunk again will not help
+                return TransactionChunkResult(list(chunk), error=ex, attempts=attempt)
+        return TransactionChunkResult(list(chunk), error=error, attempts=retries + 1)
 
     def close(self):
         super().close()
@@ -138,9 +253,10 @@ class AttemptContext(AttemptContextLogic):
 
     def __init__(self,
                  ctx,  # type: PyCapsuleType
-                 serializer  # type: Serializer
+                 serializer,  # type: Serializer
+                 metrics=None  # type: Optional[TransactionMetricsCollector]
                  ):
-        super().__init__(ctx, None, serializer)
+        super().__init__(ctx, None, serializer, metrics)
 
     @BlockingWrapper.block(TransactionGetResult)
     def get(self,
@@ -234,6 +350,197 @@ class AttemptContext(AttemptContextLogic):
         """
         return super().remove(txn_get_result, **kwargs)
 
+    def get_multi(self,
+                  coll,  # type: Collection
+                  keys,  # type: Iterable[str]
+                  **kwargs  # type: Dict[str, Any]
+                  ) -> List[TransactionGetResult]:
+        """
+        **VOLATILE** This API is subject to change at any time.
+
+        Get multiple documents within this transaction.  The gets are dispatched concurrently and waited for once,
+        instead of one round trip after the other.
+
+        Args:
+            coll (:class:`couchbase.collection.Collection`): Collection to use to find the documents.
+            keys (Iterable[str]): document keys.
+            **kwargs (Dict[str, Any]): currently unused.
+
+        Returns:
+            List[:class:`couchbase.transactions.TransactionGetResult`]: Documents in collection, in the order of
+                ``keys``, in a form useful for passing to other transaction operations.
+        Raises:
+            :class:`couchbase.exceptions.DocumentNotFoundException`: If a document was not found.
+            :class:`couchbase.exceptions.TransactionOperationFailed`: If an operation failed.  In practice, there is
+                no need to handle the exception, as the transaction will rollback regardless.  The first error is
+                raised once every operation completed.
+        """
+        ops = [partial(AttemptContextLogic.get, self, coll, key, **kwargs) for key in keys]
+        return [TransactionGetResult(res, self._serializer) for res in self._dispatch_concurrently(ops)]
+
+    def insert_multi(self,
+                     coll,  # type: Collection
+                     docs,  # type: Mapping[str, JSONType]
+                     **kwargs  # type: Dict[str, Any]
+                     ) -> List[TransactionGetResult]:
+        """
+        **VOLATILE** This API is subject to change at any time.
+
+        Insert multiple new documents within a transaction.  The inserts are dispatched concurrently and waited for
+        once, instead of one round trip after the other.
+
+        Args:
+            coll (:class:`couchbase.collection.Collection`): Collection to insert the documents into.
+            docs (Mapping[str, :class:`couchbase._utils.JSONType`]): document keys and their contents.
+            **kwargs (Dict[str, Any]): currently unused.
+
+        Returns:
+            List[:class:`couchbase.transactions.TransactionGetResult`]: Documents in collection, in the order of
+                ``docs``, in a form useful for passing to other transaction operations.
+        Raises:
+            :class:`couchbase.exceptions.TransactionOperationFailed`: If an operation failed.  In practice, there is
+                no need to handle the exception, as the transaction will rollback regardless.  The first error is
+                raised once every operation completed.
+        """
+        ops = [partial(AttemptContextLogic.insert, self, coll, key, value, **kwargs) for key, value in docs.items()]
+        return [TransactionGetResult(res, self._serializer) for res in self._dispatch_concurrently(ops)]
+
+    def replace_multi(self,
+                      docs,  # type: Iterable[Tuple[TransactionGetResult, JSONType]]
+                      **kwargs  # type: Dict[str, Any]
+                      ) -> List[TransactionGetResult]:
+        """
+        **VOLATILE** This API is subject to change at any time.
+
+        Replace the contents of multiple documents within a transaction.  The replaces are dispatched concurrently and
+        waited for once, instead of one round trip after the other.
+
+        Args:
+            docs (Iterable[Tuple[:class:`couchbase.transactions.TransactionGetResult`, :class:`couchbase._utils.JSONType`]]):
+                Documents to replace, gotten from previous calls to other transaction operations, and their new
+                contents.
+            **kwargs (Dict[str, Any]): currently unused.
+
+        Returns:
+            List[:class:`couchbase.transactions.TransactionGetResult`]: Documents in collection, in the order of
+                ``docs``, in a form useful for passing to other transaction operations.
+        Raises:
+            :class:`couchbase.exceptions.TransactionOperationFailed`: If an operation failed.  In practice, there is
+                no need to handle the exception, as the transaction will rollback regardless.  The first error is
+                raised once every operation completed.
+        """  # noqa: E501
+        ops = [partial(AttemptContextLogic.replace, self, txn_get_result, value, **kwargs)
+               for txn_get_result, value in docs]
+        return [TransactionGetResult(res, self._serializer) for res in self._dispatch_concurrently(ops)]
+
+    def _upsert_multi(self,
+                      coll,  # type: Collection
+                      docs  # type: Mapping[str, JSONType]
+                      ) -> None:
+        """**INTERNAL**
+
+        Replaces the documents that exist and inserts the others, dispatching the gets, then the mutations,
+        concurrently.
+        """
+        keys = list(docs)
+        ops = [partial(AttemptContextLogic.get, self, coll, key) for key in keys]
+        found = self._dispatch_concurrently(ops, return_exceptions=True)
+        ops = []
+        for key, res in zip(keys, found):
+            if isinstance(res, DocumentNotFoundException):
+                ops.append(partial(AttemptContextLogic.insert, self, coll, key, docs[key]))
+            elif isinstance(res, Exception):
+                raise res
+            else:
+                txn_get_result = TransactionGetResult(res, self._serializer)
+                ops.append(partial(AttemptContextLogic.replace, self, txn_get_result, docs[key]))
+        self._dispatch_concurrently(ops)
+
+    def _dispatch_concurrently(self,
+                               ops,  # type: List[Callable[..., Any]]
+                               return_exceptions=False  # type: bool
+                               ) -> List[Any]:
+        """**INTERNAL**
+
+        Dispatches the transaction operations with callbacks, so the core runs them concurrently, then waits once for
+        all of them to complete.  Like :func:`asyncio.gather`, errors are returned in place of the results instead of
+        raised if ``return_exceptions`` is set.
+        """
+        if not ops:
+            return []
+        results = [None] * len(ops)
+        errors = [None] * len(ops)
+        remaining = [len(ops)]
+        lock = threading.Lock()
+        done = threading.Event()
+
+        def on_complete(idx, res=None, exc=None):
+            results[idx], errors[idx] = self._concurrent_op_outcome(ops[idx], res, exc)
+            with lock:
+                remaining[0] -= 1
+                if remaining[0] == 0:
+                    done.set()
+
+        for idx, op in enumerate(ops):
+            try:
+                op(callback=partial(on_complete, idx),
+                   errback=lambda exc, idx=idx: on_complete(idx, exc=exc or RuntimeError('unknown transaction error')))
+            except Exception as e:
+                on_complete(idx, exc=self._unwrap_dispatch_error(e))
+        done.wait()
+        return self._collect_concurrent_results(results, errors, return_exceptions)
+
+    def _concurrent_op_outcome(self,
+                               op,  # type: Callable[..., Any]
+                               res,  # type: Any
+                               exc  # type: Optional[Exception]
+                               ) -> Tuple[Any, Optional[Exception]]:
+        """**INTERNAL**
+
+        Returns the (result, error) of a completed concurrent operation, recording the error for the attempt's
+        metrics.
+        """
+        # BUG(PYCBC-1476): a get that does not find the document passes the error to the callback
+        if isinstance(res, (Exception, BaseCouchbaseException)):
+            res, exc = None, res
+        if isinstance(exc, BaseCouchbaseException):
+            exc = ErrorMapper.build_exception(exc)
+        if exc is not None:
+            self._record_op_error(self._op_key(op.func.__name__, op.args[1:]), exc)
+        return res, exc
+
+    @staticmethod
+    def _unwrap_dispatch_error(exc  # type: Exception
+                               ) -> Exception:
+        """**INTERNAL**
+
+        Returns the error an operation raised when it was dispatched, the bindings chain the actual error to a
+        SystemError.
+        """
+        if isinstance(exc, SystemError) and exc.__cause__:
+            return exc.__cause__
+        return exc
+
+    @staticmethod
+    def _collect_concurrent_results(results,  # type: List[Any]
+                                    errors,  # type: List[Optional[Exception]]
+                                    return_exceptions  # type: bool
+                                    ) -> List[Any]:
+        """**INTERNAL**
+
+        Raises the first error of the concurrent operations, or returns it in place of the operation's result if
+        ``return_exceptions`` is set.
+        """
+        for idx, exc in enumerate(errors):
+            if exc is None:
+                continue
+            if not isinstance(exc, CouchbaseException):
+                exc = CouchbaseException(message=str(exc), context=TransactionsErrorContext())
+            if not return_exceptions:
+                raise exc
+            results[idx] = exc
+        return results
+
     @BlockingWrapper.block(TransactionQueryResults)
     def query(self,
               query,    # type: str
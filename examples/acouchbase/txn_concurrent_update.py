@@ -0,0 +1,60 @@
+"""
+Measures the time a transaction takes to read and update many documents: awaiting each get and replace in turn
+against staging them concurrently with asyncio.gather.  Operations on different documents staged concurrently are
+dispatched together; operations on the same document are still applied in the order they were called.
+
+Usage:  python txn_concurrent_update.py [connection string] [bucket] [documents]
+"""
+import asyncio
+import sys
+import time
+
+from acouchbase.cluster import Cluster
+from couchbase.auth import PasswordAuthenticator
+from couchbase.options import ClusterOptions
+
+
+async def sequential_update(ctx, collection, keys):
+    for key in keys:
+        res = await ctx.get(collection, key)
+        await ctx.replace(res, {'value': res.content_as[dict]['value'] + 1})
+
+
+async def concurrent_update(ctx, collection, keys):
+    results = await asyncio.gather(*(ctx.get(collection, key) for key in keys))
+    await asyncio.gather(*(ctx.replace(res, {'value': res.content_as[dict]['value'] + 1}) for res in results))
+
+
+async def run(cluster, collection, keys, update):
+    start = time.perf_counter()
+    await cluster.transactions.run(lambda ctx: update(ctx, collection, keys))
+    return time.perf_counter() - start
+
+
+async def main(connstr, bucket_name, num_docs):
+    cluster = Cluster(connstr, ClusterOptions(PasswordAuthenticator('Administrator', 'password')))
+    await cluster.on_connect()
+    bucket = cluster.bucket(bucket_name)
+    await bucket.on_connect()
+    collection = bucket.default_collection()
+
+    keys = [f'txn-concurrent-update-{idx}' for idx in range(num_docs)]
+    await asyncio.gather(*(collection.upsert(key, {'value': 0}) for key in keys))
+
+    print(f'{num_docs} documents, get + replace each')
+    baseline = None
+    for label, update in [('sequential', sequential_update), ('concurrent', concurrent_update)]:
+        elapsed = await run(cluster, collection, keys, update)
+        baseline = baseline or elapsed
+        print(f'{label:<12} {elapsed * 1000:10.1f} ms  {baseline / elapsed:6.2f}x')
+
+    await asyncio.gather(*(collection.remove(key) for key in keys))
+    await cluster.close()
+
+
+if __name__ == '__main__':
+    connstr = sys.argv[1] if len(sys.argv) > 1 else 'couchbase://localhost'
+    bucket_name = sys.argv[2] if len(sys.argv) > 2 else 'default'
+    num_docs = int(sys.argv[3]) if len(sys.argv) > 3 else 100
+    loop = asyncio.get_event_loop()
+    loop.run_until_complete(main(connstr, bucket_name, num_docs))
@@ -0,0 +1,67 @@
+"""
+Measures KV get throughput of a single Cluster as the number of IO threads and the number of underlying
+connections (ClusterOptions.num_connections) grows with the number of available cores.  Intended to be run against
+a local mock server (e.g. CouchbaseMock or the caves mock) so the network is not the bottleneck.
+
+Usage:  python io_scaling.py [connection string] [bucket] [seconds per run] [worker threads]
+"""
+import sys
+import threading
+import time
+
+from couchbase._utils import available_cpu_count
+from couchbase.auth import PasswordAuthenticator
+from couchbase.cluster import Cluster
+from couchbase.options import ClusterOptions
+
+
+def run(connstr, bucket_name, duration, num_workers, **opts):
+    auth = PasswordAuthenticator('Administrator', 'password')
+    cluster = Cluster(connstr, ClusterOptions(auth, **opts))
+    collection = cluster.bucket(bucket_name).default_collection()
+    keys = [f'io-scaling-{i}' for i in range(1000)]
+    for key in keys:
+        collection.upsert(key, {'id': key})
+
+    counts = [0] * num_workers
+    stop = threading.Event()
+
+    def worker(idx):
+        count = 0
+        while not stop.is_set():
+            collection.get(keys[count % len(keys)])
+            count += 1
+        counts[idx] = count
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(num_workers)]
+    for t in threads:
+        t.start()
+    time.sleep(duration)
+    stop.set()
+    for t in threads:
+        t.join()
+    cluster.close()
+    return sum(counts) / duration
+
+
+if __name__ == '__main__':
+    connstr = sys.argv[1] if len(sys.argv) > 1 else 'couchbase://localhost'
+    bucket_name = sys.argv[2] if len(sys.argv) > 2 else 'default'
+    duration = float(sys.argv[3]) if len(sys.argv) > 3 else 5
+    num_workers = int(sys.argv[4]) if len(sys.argv) > 4 else 32
+
+    cpus = available_cpu_count()
+    print(f'{cpus} available CPUs, {num_workers} worker threads')
+    configs = [('1 io thread, 1 connection', {})]
+    configs.append(("auto io threads, 1 connection", {'num_io_threads': 'auto'}))
+    num_connections = 2
+    while num_connections <= cpus:
+        configs.append((f'auto io threads, {num_connections} connections',
+                        {'num_io_threads': 'auto', 'num_connections': num_connections}))
+        num_connections *= 2
+
+    baseline = None
+    for label, opts in configs:
+        ops = run(connstr, bucket_name, duration, num_workers, **opts)
+        baseline = baseline or ops
+        print(f'{label:<36} {ops:12.0f} ops/s  {ops / baseline:5.2f}x')
@@ -0,0 +1,70 @@
+"""
+Measures CouchbaseQueue pop throughput with many concurrent consumers: the single document queue popping one item
+at a time against a sharded queue (CouchbaseQueue num_shards) popping batches with pop_many.  Each run fills the queue,
+then the consumer threads drain it.
+
+Usage:  python queue_throughput.py [connection string] [bucket] [items] [consumer threads] [shards] [batch size]
+"""
+import sys
+import threading
+import time
+
+from couchbase.auth import PasswordAuthenticator
+from couchbase.cluster import Cluster
+from couchbase.exceptions import QueueEmpty
+from couchbase.options import ClusterOptions
+
+
+def run(collection, num_items, num_consumers, num_shards=None, batch_size=1):
+    queue = collection.couchbase_queue('queue-throughput', num_shards=num_shards)
+    queue.clear()
+    for idx in range(0, num_items, 100):
+        queue.push_many(range(idx, min(idx + 100, num_items)))
+
+    counts = [0] * num_consumers
+
+    def consumer(idx):
+        count = 0
+        while True:
+            try:
+                count += len(queue.pop_many(batch_size))
+            except QueueEmpty:
+                break
+        counts[idx] = count
+
+    threads = [threading.Thread(target=consumer, args=(i,)) for i in range(num_consumers)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    queue.clear()
+    if sum(counts) != num_items:
+        raise RuntimeError(f'Expected to pop {num_items} items, popped {sum(counts)}.')
+    return num_items / elapsed
+
+
+if __name__ == '__main__':
+    connstr = sys.argv[1] if len(sys.argv) > 1 else 'couchbase://localhost'
+    bucket_name = sys.argv[2] if len(sys.argv) > 2 else 'default'
+    num_items = int(sys.argv[3]) if len(sys.argv) > 3 else 5000
+    num_consumers = int(sys.argv[4]) if len(sys.argv) > 4 else 16
+    num_shards = int(sys.argv[5]) if len(sys.argv) > 5 else 16
+    batch_size = int(sys.argv[6]) if len(sys.argv) > 6 else 8
+
+    auth = PasswordAuthenticator('Administrator', 'password')
+    cluster = Cluster(connstr, ClusterOptions(auth))
+    collection = cluster.bucket(bucket_name).default_collection()
+
+    print(f'{num_items} items, {num_consumers} consumer threads')
+    configs = [('1 document, pop()', {}),
+               ('1 document, pop_many()', {'batch_size': batch_size}),
+               (f'{num_shards} shards, pop()', {'num_shards': num_shards}),
+               (f'{num_shards} shards, pop_many()', {'num_shards': num_shards, 'batch_size': batch_size})]
+    baseline = None
+    for label, opts in configs:
+        items_per_sec = run(collection, num_items, num_consumers, **opts)
+        baseline = baseline or items_per_sec
+        print(f'{label:<28} {items_per_sec:12.0f} items/s  {items_per_sec / baseline:6.2f}x')
+    cluster.close()
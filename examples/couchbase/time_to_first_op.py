@@ -0,0 +1,71 @@
+"""
+Measures time-to-first-op of a freshly started process, i.e. the time from creating the Cluster until the first
+KV get returns, with and without the bootstrap cache (ClusterOptions.bootstrap_cache_path).  Each sample runs in a
+new interpreter to mimic a short-lived (serverless/cron) worker.
+
+Usage:  python time_to_first_op.py [connection string] [bucket] [samples]
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+
+def first_op(connstr, bucket_name, cache_path):
+    from couchbase.auth import PasswordAuthenticator
+    from couchbase.cluster import Cluster
+    from couchbase.options import ClusterOptions
+
+    opts = {}
+    if cache_path:
+        opts['bootstrap_cache_path'] = cache_path
+    start = time.perf_counter()
+    cluster = Cluster(connstr, ClusterOptions(PasswordAuthenticator('Administrator', 'password'), **opts))
+    created = time.perf_counter()
+    collection = cluster.bucket(bucket_name).default_collection()
+    collection.get('time-to-first-op')
+    done = time.perf_counter()
+    print(json.dumps({'create_ms': (created - start) * 1e3,
+                      'first_op_ms': (done - start) * 1e3,
+                      'cached_seeds': cluster.bootstrap_info['cached_seeds']}))
+
+
+def sample(connstr, bucket_name, cache_path):
+    out = subprocess.check_output([sys.executable, __file__, '--child', connstr, bucket_name, cache_path or ''])
+    return json.loads(out.decode('utf-8').strip().splitlines()[-1])
+
+
+def report(label, samples):
+    first_op_ms = [s['first_op_ms'] for s in samples]
+    create_ms = [s['create_ms'] for s in samples]
+    print(f'{label:<24} first op: median {statistics.median(first_op_ms):8.2f}ms  '
+          f'max {max(first_op_ms):8.2f}ms   Cluster(): median {statistics.median(create_ms):8.2f}ms')
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1 and sys.argv[1] == '--child':
+        first_op(sys.argv[2], sys.argv[3], sys.argv[4] or None)
+        sys.exit(0)
+
+    connstr = sys.argv[1] if len(sys.argv) > 1 else 'couchbase://localhost'
+    bucket_name = sys.argv[2] if len(sys.argv) > 2 else 'default'
+    num_samples = int(sys.argv[3]) if len(sys.argv) > 3 else 10
+
+    from couchbase.auth import PasswordAuthenticator
+    from couchbase.cluster import Cluster
+    from couchbase.options import ClusterOptions
+    cluster = Cluster(connstr, ClusterOptions(PasswordAuthenticator('Administrator', 'password')))
+    cluster.bucket(bucket_name).default_collection().upsert('time-to-first-op', {'foo': 'bar'})
+    cluster.close()
+
+    report('no bootstrap cache', [sample(connstr, bucket_name, None) for _ in range(num_samples)])
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache_path = os.path.join(cache_dir, 'bootstrap.json')
+        # populate the cache
+        sample(connstr, bucket_name, cache_path)
+        samples = [sample(connstr, bucket_name, cache_path) for _ in range(num_samples)]
+        assert all(s['cached_seeds'] for s in samples)
+        report('bootstrap cache', samples)
@@ -0,0 +1,75 @@
+"""
+Measures the per-operation cost of the available tracing modes for KV gets:
+no tracer (the default threshold logging tracer), tracing disabled, a Python tracer tracing every
+operation and the SamplingTracer (rate and latency based).
+
+Usage:  python tracing_overhead.py [connection string] [bucket] [iterations]
+"""
+import sys
+import time
+from datetime import timedelta
+
+from couchbase.auth import PasswordAuthenticator
+from couchbase.cluster import Cluster
+from couchbase.options import ClusterOptions
+from couchbase.tracing import (CouchbaseSpan,
+                               CouchbaseTracer,
+                               SamplingTracer)
+
+
+class CountingSpan(CouchbaseSpan):
+    def __init__(self, name):
+        super().__init__(name)
+
+    def set_attribute(self, key, value):
+        pass
+
+    def finish(self):
+        pass
+
+
+class CountingTracer(CouchbaseTracer):
+    def __init__(self):
+        super().__init__(None)
+        self.count = 0
+
+    def start_span(self, name, parent=None):
+        self.count += 1
+        return CountingSpan(name)
+
+
+def run(label, connstr, bucket_name, iterations, **opts):
+    auth = PasswordAuthenticator('Administrator', 'password')
+    cluster = Cluster(connstr, ClusterOptions(auth, **opts))
+    collection = cluster.bucket(bucket_name).default_collection()
+    collection.upsert('tracing-overhead', {'foo': 'bar'})
+    # warm up
+    for _ in range(1000):
+        collection.get('tracing-overhead')
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        collection.get('tracing-overhead')
+    elapsed = time.perf_counter() - start
+    cluster.close()
+    per_op_us = elapsed / iterations * 1e6
+    print(f'{label:<28} {per_op_us:8.2f} us/op')
+    return per_op_us
+
+
+if __name__ == '__main__':
+    connstr = sys.argv[1] if len(sys.argv) > 1 else 'couchbase://localhost'
+    bucket_name = sys.argv[2] if len(sys.argv) > 2 else 'default'
+    iterations = int(sys.argv[3]) if len(sys.argv) > 3 else 20000
+
+    baseline = run('threshold logging tracer', connstr, bucket_name, iterations)
+    modes = [
+        ('tracing disabled', {'enable_tracing': False}),
+        ('python tracer (all ops)', {'tracer': CountingTracer()}),
+        ('sampling tracer rate=1%', {'tracer': SamplingTracer(CountingTracer(), sample_rate=0.01)}),
+        ('sampling tracer >=10ms', {'tracer': SamplingTracer(CountingTracer(),
+                                                             latency_threshold=timedelta(milliseconds=10))}),
+    ]
+    for label, opts in modes:
+        per_op_us = run(label, connstr, bucket_name, iterations, **opts)
+        print(f'{"":<28} {per_op_us - baseline:+8.2f} us/op vs. default')
@@ -615,11 +615,17 @@ handle_binary_multi_op([[maybe_unused]] PyObject* self, PyObject* args, PyObject
             auto f = barrier->get_future();
             if (PyDict_Check(pyObj_op_dict) && !k.empty()) {
                 PyObject* pyObj_value = PyDict_GetItemString(pyObj_op_dict, "value");
+                // routed by the key's hash when key-value operations are sharded across several connections
+                connection* key_conn = conn;
+                PyObject* pyObj_key_conn = PyDict_GetItemString(pyObj_op_dict, "conn");
+                if (pyObj_key_conn != nullptr && PyCapsule_IsValid(pyObj_key_conn, "conn_")) {
+                    key_conn = reinterpret_cast<connection*>(PyCapsule_GetPointer(pyObj_key_conn, "conn_"));
+                }
                 switch (op_type) {
                     case Operations::APPEND:
                     case Operations::PREPEND: {
                         auto opts = get_binary_mutation_options(pyObj_op_dict);
-                        opts.conn = conn;
+                        opts.conn = key_conn;
                         opts.id = couchbase::core::document_id{ bucket, scope, collection, k };
                         opts.op_type = op_type;
                         if (pyObj_value != nullptr) {
@@ -637,7 +643,7 @@ handle_binary_multi_op([[maybe_unused]] PyObject* self, PyObject* args, PyObject
                     case Operations::INCREMENT:
                     case Operations::DECREMENT: {
                         auto opts = get_counter_options(pyObj_op_dict);
-                        opts.conn = conn;
+                        opts.conn = key_conn;
                         opts.id = couchbase::core::document_id{ bucket, scope, collection, k };
                         opts.op_type = op_type;
 
@@ -238,6 +238,8 @@ struct connection {
     asio::io_context io_;
     std::shared_ptr<couchbase::core::cluster> cluster_;
     std::list<std::thread> io_threads_;
+    // true when tracing is enabled w/ a Python tracer, parent spans provided in op options are only of use then
+    bool external_tracer_{ false };
 
     connection(int num_io_threads)
     {
@@ -248,6 +250,28 @@ struct connection {
             io_threads_.emplace_back([&] { io_.run(); });
         }
     }
+
+    bool is_io_thread() const
+    {
+        auto id = std::this_thread::get_id();
+        for (const auto& t : io_threads_) {
+            if (t.get_id() == id) {
+                return true;
+            }
+        }
+        return false;
+    }
+
+    // a thread cannot join itself, the calling thread is skipped if it is one of the IO threads
+    void join_io_threads()
+    {
+        auto id = std::this_thread::get_id();
+        for (auto& t : io_threads_) {
+            if (t.joinable() && t.get_id() != id) {
+                t.join();
+            }
+        }
+    }
 };
 
 void
@@ -74,16 +74,30 @@ dealloc_conn(PyObject* obj)
 {
     auto conn = reinterpret_cast<connection*>(PyCapsule_GetPointer(obj, "conn_"));
     if (conn) {
-        auto barrier = std::make_shared<std::promise<void>>();
-        auto f = barrier->get_future();
-        conn->cluster_->close([barrier]() { barrier->set_value(); });
-        f.get();
-        conn->io_.stop();
-        for (auto& t : conn->io_threads_) {
-            if (t.joinable()) {
-                t.join();
+        if (conn->is_io_thread()) {
+            // the last reference was dropped w/in a callback on one of the connection's own IO threads (i.e. the
+            // close connection callback), that thread can neither wait on the close nor join itself.  Stop the IO
+            // context once the close completes and let the threads exit on their own, the connection is not
+            // deleted as the threads still reference it.
+            conn->cluster_->close([conn]() { conn->io_.stop(); });
+            for (auto& t : conn->io_threads_) {
+                t.detach();
             }
+            CB_LOG_DEBUG("{}: dealloc_conn deferred to IO threads", "PYCBC");
+            return;
         }
+        // closing the cluster and joining the IO threads can take a while (in-flight ops are drained and the
+        // callbacks for those ops need the GIL), do not hold the GIL while waiting
+        Py_BEGIN_ALLOW_THREADS if (!conn->io_.stopped())
+        {
+            auto barrier = std::make_shared<std::promise<void>>();
+            auto f = barrier->get_future();
+            conn->cluster_->close([barrier]() { barrier->set_value(); });
+            f.get();
+            conn->io_.stop();
+        }
+        conn->join_io_threads();
+        Py_END_ALLOW_THREADS
     }
     CB_LOG_DEBUG("{}: dealloc_conn completed", "PYCBC");
     delete conn;
@@ -787,6 +801,7 @@ handle_create_connection([[maybe_unused]] PyObject* self, PyObject* args, PyObje
     }
 
     connection* const conn = new connection(num_io_threads);
+    conn->external_tracer_ = connection_str.options.enable_tracing && connection_str.options.tracer != nullptr;
     PyObject* pyObj_conn = PyCapsule_New(conn, "conn_", dealloc_conn);
 
     if (pyObj_conn == nullptr) {
@@ -1151,6 +1166,22 @@ get_connection_info([[maybe_unused]] PyObject* self, PyObject* args, PyObject* k
     }
     Py_XDECREF(pyObj_creds);
 
+    // the nodes of the most recent cluster config (hostname, KV port), used by the bootstrap cache
+    PyObject* pyObj_nodes = PyList_New(static_cast<Py_ssize_t>(0));
+    for (auto const& [hostname, port] : cluster_info.second.get_nodes()) {
+        pyObj_tmp = Py_BuildValue("(ss)", hostname.c_str(), port.c_str());
+        if (-1 == PyList_Append(pyObj_nodes, pyObj_tmp)) {
+            PyErr_Print();
+            PyErr_Clear();
+        }
+        Py_XDECREF(pyObj_tmp);
+    }
+    if (-1 == PyDict_SetItemString(pyObj_opts, "nodes", pyObj_nodes)) {
+        PyErr_Print();
+        PyErr_Clear();
+    }
+    Py_XDECREF(pyObj_nodes);
+
     return pyObj_opts;
 }
 
@@ -1202,7 +1233,10 @@ handle_close_connection([[maybe_unused]] PyObject* self, PyObject* args, PyObjec
     }
     if (nullptr == pyObj_callback || nullptr == pyObj_errback) {
         PyObject* ret = nullptr;
+        // the close callback stops the IO context, join the IO threads here so the (GIL holding) dealloc of the
+        // connection has nothing left to wait on
         Py_BEGIN_ALLOW_THREADS ret = f.get();
+        conn->join_io_threads();
         Py_END_ALLOW_THREADS return ret;
     }
     Py_RETURN_NONE;
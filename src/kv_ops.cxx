@@ -21,6 +21,10 @@
 #include "tracing.hxx"
 #include "utils.hxx"
 
+#include <functional>
+#include <map>
+#include <mutex>
+
 template<typename T>
 result*
 add_extras_to_result([[maybe_unused]] const T& resp, result* res)
@@ -417,6 +421,28 @@ create_result_from_get_operation_response<couchbase::core::operations::get_all_r
     PyGILState_Release(state);
 }
 
+/**
+ * Report the native stage timings of a profiled operation (see couchbase/profiling.py) to the Python profiler.
+ * Called w/ the GIL held, *prior* to the result being created so that a blocking caller is guaranteed to have
+ * the timings available once the operation's barrier is set.
+ */
+void
+record_native_timings(PyObject* pyObj_profiler,
+                      std::chrono::steady_clock::time_point dispatched,
+                      std::chrono::steady_clock::time_point completed,
+                      std::chrono::steady_clock::time_point acquired)
+{
+    auto io_ns = std::chrono::duration_cast<std::chrono::nanoseconds>(completed - dispatched).count();
+    auto gil_ns = std::chrono::duration_cast<std::chrono::nanoseconds>(acquired - completed).count();
+    PyObject* pyObj_res = PyObject_CallFunction(pyObj_profiler, "LL", static_cast<long long>(io_ns), static_cast<long long>(gil_ns));
+    if (pyObj_res == nullptr) {
+        // profiling must never fail the operation
+        PyErr_Clear();
+    } else {
+        Py_DECREF(pyObj_res);
+    }
+}
+
 template<typename Request>
 void
 do_get(connection& conn,
@@ -424,12 +450,220 @@ do_get(connection& conn,
        PyObject* pyObj_callback,
        PyObject* pyObj_errback,
        std::shared_ptr<std::promise<PyObject*>> barrier,
-       result* multi_result = nullptr)
+       result* multi_result = nullptr,
+       PyObject* pyObj_profiler = nullptr)
 {
     using response_type = typename Request::response_type;
+    if (pyObj_profiler == nullptr) {
+        Py_BEGIN_ALLOW_THREADS conn.cluster_->execute(
+          req, [key = req.id.key(), pyObj_callback, pyObj_errback, barrier, multi_result](response_type resp) {
+              create_result_from_get_operation_response(key.c_str(), resp, pyObj_callback, pyObj_errback, barrier, multi_result);
+          });
+        Py_END_ALLOW_THREADS
+        return;
+    }
+
+    Py_INCREF(pyObj_profiler);
+    auto dispatched = std::chrono::steady_clock::now();
     Py_BEGIN_ALLOW_THREADS conn.cluster_->execute(
-      req, [key = req.id.key(), pyObj_callback, pyObj_errback, barrier, multi_result](response_type resp) {
+      req,
+      [key = req.id.key(), pyObj_callback, pyObj_errback, barrier, multi_result, pyObj_profiler, dispatched](response_type resp) {
+          auto completed = std::chrono::steady_clock::now();
+          PyGILState_STATE state = PyGILState_Ensure();
+          record_native_timings(pyObj_profiler, dispatched, completed, std::chrono::steady_clock::now());
+          Py_DECREF(pyObj_profiler);
+          create_result_from_get_operation_response(key.c_str(), resp, pyObj_callback, pyObj_errback, barrier, multi_result);
+          PyGILState_Release(state);
+      });
+    Py_END_ALLOW_THREADS
+}
+
+/**
+ * State of a replica read that reads the active and each replica individually, get_all_replicas_request only
+ * completes once every copy responded.
+ */
+struct replica_read_context {
+    using response_type = couchbase::core::operations::get_all_replicas_response;
+
+    std::mutex mutex{};
+    couchbase::core::document_id id{};
+    std::size_t expected{ 0 };
+    std::size_t responded{ 0 };
+    std::size_t max_responses{ 0 };
+    std::size_t quorum{ 0 };
+    bool done{ false };
+    std::map<std::uint64_t, std::size_t> copies_per_cas{};
+    response_type response{};
+    std::function<void(response_type)> handler{};
+};
+
+/**
+ * Marks the replica read done, returns the callback delivering its result.  The caller *must* hold the context's
+ * lock and call the callback once the lock is released.
+ */
+std::function<void()>
+complete_replica_read(replica_read_context& ctx, std::optional<std::error_code> ec = {})
+{
+    ctx.done = true;
+    if (ec.has_value()) {
+        ctx.response.ctx = couchbase::core::make_key_value_error_context(ec.value(), ctx.id);
+    }
+    return [handler = std::move(ctx.handler), response = std::move(ctx.response)]() mutable { handler(std::move(response)); };
+}
+
+void
+on_replica_read_response(std::shared_ptr<replica_read_context> ctx,
+                         std::optional<replica_read_context::response_type::entry> entry)
+{
+    std::function<void()> deliver{};
+    {
+        std::scoped_lock lock(ctx->mutex);
+        if (ctx->done) {
+            // the read already completed, e.g. w/ the k-th fastest response
+            return;
+        }
+        ctx->responded++;
+        auto reached = false;
+        if (entry.has_value()) {
+            auto copies = ++ctx->copies_per_cas[entry->cas.value()];
+            ctx->response.entries.emplace_back(std::move(entry.value()));
+            if (ctx->quorum > 0) {
+                reached = copies >= ctx->quorum;
+            } else {
+                reached = ctx->max_responses > 0 && ctx->response.entries.size() >= ctx->max_responses;
+            }
+        }
+        if (reached) {
+            deliver = complete_replica_read(*ctx);
+        } else if (ctx->responded >= ctx->expected) {
+            if (ctx->response.entries.empty() || ctx->quorum > 0) {
+                // no copy responded, or no version was returned by a quorum of the copies
+                deliver = complete_replica_read(*ctx, couchbase::errc::key_value::document_irretrievable);
+            } else {
+                deliver = complete_replica_read(*ctx);
+            }
+        }
+    }
+    if (deliver) {
+        deliver();
+    }
+}
+
+void
+do_get_replicas(struct read_options* options,
+                PyObject* pyObj_callback,
+                PyObject* pyObj_errback,
+                std::shared_ptr<std::promise<PyObject*>> barrier,
+                result* multi_result = nullptr)
+{
+    using response_type = replica_read_context::response_type;
+    auto ctx = std::make_shared<replica_read_context>();
+    ctx->id = options->id;
+    ctx->max_responses = options->max_responses;
+    ctx->handler = [key = options->id.key(), pyObj_callback, pyObj_errback, barrier, multi_result](response_type resp) {
+        create_result_from_get_operation_response(key.c_str(), resp, pyObj_callback, pyObj_errback, barrier, multi_result);
+    };
+
+    auto cluster = options->conn->cluster_;
+    auto timeout = options->timeout_ms;
+    auto quorum = options->quorum;
+    // the replica count is taken from the bucket configuration the core already holds
+    Py_BEGIN_ALLOW_THREADS cluster->with_bucket_configuration(
+      options->id.bucket(),
+      [cluster, ctx, timeout, quorum](std::error_code ec, const couchbase::core::topology::configuration& config) {
+          auto num_replicas = static_cast<std::size_t>(config.num_replicas.value_or(0U));
+          if (ec) {
+              std::function<void()> deliver{};
+              {
+                  std::scoped_lock lock(ctx->mutex);
+                  deliver = complete_replica_read(*ctx, ec);
+              }
+              return deliver();
+          }
+          {
+              std::scoped_lock lock(ctx->mutex);
+              ctx->expected = num_replicas + 1;
+              if (quorum.has_value()) {
+                  // by default a majority of the document's copies, the active and its replicas
+                  ctx->quorum = quorum.value() > 0 ? quorum.value() : (num_replicas + 1) / 2 + 1;
+              }
+          }
+          for (std::size_t idx = 1U; idx <= num_replicas; ++idx) {
+              couchbase::core::document_id replica_id{ ctx->id };
+              replica_id.node_index(idx);
+              cluster->execute(couchbase::core::impl::get_replica_request{ std::move(replica_id), timeout },
+                               [ctx](couchbase::core::impl::get_replica_response&& resp) {
+                                   std::optional<response_type::entry> entry{};
+                                   if (!resp.ctx.ec()) {
+                                       entry.emplace();
+                                       entry->value = std::move(resp.value);
+                                       entry->cas = resp.cas;
+                                       entry->flags = resp.flags;
+                                       entry->replica = true;
+                                   }
+                                   on_replica_read_response(ctx, std::move(entry));
+                               });
+          }
+          couchbase::core::operations::get_request req{ ctx->id };
+          req.timeout = timeout;
+          cluster->execute(req, [ctx](couchbase::core::operations::get_response&& resp) {
+              std::optional<response_type::entry> entry{};
+              if (!resp.ctx.ec()) {
+                  entry.emplace();
+                  entry->value = std::move(resp.value);
+                  entry->cas = resp.cas;
+                  entry->flags = resp.flags;
+                  entry->replica = false;
+              }
+              on_replica_read_response(ctx, std::move(entry));
+          });
+      });
+    Py_END_ALLOW_THREADS
+}
+
+void
+do_get_replica(struct read_options* options,
+               PyObject* pyObj_callback,
+               PyObject* pyObj_errback,
+               std::shared_ptr<std::promise<PyObject*>> barrier,
+               result* multi_result = nullptr)
+{
+    using response_type = couchbase::core::operations::get_any_replica_response;
+    std::function<void(response_type)> handler =
+      [key = options->id.key(), pyObj_callback, pyObj_errback, barrier, multi_result](response_type resp) {
           create_result_from_get_operation_response(key.c_str(), resp, pyObj_callback, pyObj_errback, barrier, multi_result);
+      };
+
+    auto cluster = options->conn->cluster_;
+    auto id = options->id;
+    auto timeout = options->timeout_ms;
+    auto replica_index = options->replica_index;
+    // the replica count is taken from the bucket configuration the core already holds
+    Py_BEGIN_ALLOW_THREADS cluster->with_bucket_configuration(
+      id.bucket(),
+      [cluster, id, timeout, replica_index, handler](std::error_code ec, const couchbase::core::topology::configuration& config) {
+          auto num_replicas = static_cast<std::size_t>(config.num_replicas.value_or(0U));
+          if (!ec && num_replicas == 0) {
+              ec = couchbase::errc::key_value::document_irretrievable;
+          }
+          if (ec) {
+              response_type resp{};
+              resp.ctx = couchbase::core::make_key_value_error_context(ec, id);
+              return handler(std::move(resp));
+          }
+          couchbase::core::document_id replica_id{ id };
+          // the index rotates over the bucket's replicas
+          replica_id.node_index((replica_index - 1) % num_replicas + 1);
+          cluster->execute(couchbase::core::impl::get_replica_request{ std::move(replica_id), timeout },
+                           [handler](couchbase::core::impl::get_replica_response&& resp) {
+                               response_type res{};
+                               res.ctx = std::move(resp.ctx);
+                               res.value = std::move(resp.value);
+                               res.cas = resp.cas;
+                               res.flags = resp.flags;
+                               res.replica = true;
+                               handler(std::move(res));
+                           });
       });
     Py_END_ALLOW_THREADS
 }
@@ -448,7 +682,7 @@ prepare_and_execute_read_op(struct read_options* options,
             if (nullptr != options->span) {
                 req.parent_span = std::make_shared<pycbc::request_span>(options->span);
             }
-            do_get<couchbase::core::operations::get_request>(*(options->conn), req, pyObj_callback, pyObj_errback, barrier, multi_result);
+            do_get<couchbase::core::operations::get_request>(*(options->conn), req, pyObj_callback, pyObj_errback, barrier, multi_result, options->profiler);
             break;
         }
         case Operations::GET_PROJECTED: {
@@ -502,19 +736,29 @@ prepare_and_execute_read_op(struct read_options* options,
                 req.parent_span = std::make_shared<pycbc::request_span>(options->span);
             }
             do_get<couchbase::core::operations::get_projected_request>(
-              *(options->conn), req, pyObj_callback, pyObj_errback, barrier, multi_result);
+              *(options->conn), req, pyObj_callback, pyObj_errback, barrier, multi_result, options->profiler);
             break;
         }
         case Operations::GET_ANY_REPLICA: {
+            if (options->replica_index > 0) {
+                // a single replica read, e.g. the hedge of a hedged read
+                do_get_replica(options, pyObj_callback, pyObj_errback, barrier, multi_result);
+                break;
+            }
             couchbase::core::operations::get_any_replica_request req{ options->id, options->timeout_ms };
             do_get<couchbase::core::operations::get_any_replica_request>(
-              *(options->conn), req, pyObj_callback, pyObj_errback, barrier, multi_result);
+              *(options->conn), req, pyObj_callback, pyObj_errback, barrier, multi_result, options->profiler);
             break;
         }
         case Operations::GET_ALL_REPLICAS: {
+            if (options->max_responses > 0 || options->quorum.has_value()) {
+                // completes w/ the k-th fastest response rather than the slowest
+                do_get_replicas(options, pyObj_callback, pyObj_errback, barrier, multi_result);
+                break;
+            }
             couchbase::core::operations::get_all_replicas_request req{ options->id, options->timeout_ms };
             do_get<couchbase::core::operations::get_all_replicas_request>(
-              *(options->conn), req, pyObj_callback, pyObj_errback, barrier, multi_result);
+              *(options->conn), req, pyObj_callback, pyObj_errback, barrier, multi_result, options->profiler);
             break;
         }
         case Operations::GET_AND_TOUCH: {
@@ -525,7 +769,7 @@ prepare_and_execute_read_op(struct read_options* options,
                 req.parent_span = std::make_shared<pycbc::request_span>(options->span);
             }
             do_get<couchbase::core::operations::get_and_touch_request>(
-              *(options->conn), req, pyObj_callback, pyObj_errback, barrier, multi_result);
+              *(options->conn), req, pyObj_callback, pyObj_errback, barrier, multi_result, options->profiler);
             break;
         }
         case Operations::GET_AND_LOCK: {
@@ -536,7 +780,7 @@ prepare_and_execute_read_op(struct read_options* options,
                 req.parent_span = std::make_shared<pycbc::request_span>(options->span);
             }
             do_get<couchbase::core::operations::get_and_lock_request>(
-              *(options->conn), req, pyObj_callback, pyObj_errback, barrier, multi_result);
+              *(options->conn), req, pyObj_callback, pyObj_errback, barrier, multi_result, options->profiler);
             break;
         }
         case Operations::EXISTS: {
@@ -546,7 +790,7 @@ prepare_and_execute_read_op(struct read_options* options,
                 req.parent_span = std::make_shared<pycbc::request_span>(options->span);
             }
             do_get<couchbase::core::operations::exists_request>(
-              *(options->conn), req, pyObj_callback, pyObj_errback, barrier, multi_result);
+              *(options->conn), req, pyObj_callback, pyObj_errback, barrier, multi_result, options->profiler);
             break;
         }
         case Operations::TOUCH: {
@@ -556,7 +800,7 @@ prepare_and_execute_read_op(struct read_options* options,
             if (nullptr != options->span) {
                 req.parent_span = std::make_shared<pycbc::request_span>(options->span);
             }
-            do_get<couchbase::core::operations::touch_request>(*(options->conn), req, pyObj_callback, pyObj_errback, barrier, multi_result);
+            do_get<couchbase::core::operations::touch_request>(*(options->conn), req, pyObj_callback, pyObj_errback, barrier, multi_result, options->profiler);
             break;
         }
         case Operations::UNLOCK: {
@@ -567,7 +811,7 @@ prepare_and_execute_read_op(struct read_options* options,
                 req.parent_span = std::make_shared<pycbc::request_span>(options->span);
             }
             do_get<couchbase::core::operations::unlock_request>(
-              *(options->conn), req, pyObj_callback, pyObj_errback, barrier, multi_result);
+              *(options->conn), req, pyObj_callback, pyObj_errback, barrier, multi_result, options->profiler);
             break;
         }
         default: {
@@ -744,12 +988,30 @@ do_mutation(connection& conn,
             PyObject* pyObj_callback,
             PyObject* pyObj_errback,
             std::shared_ptr<std::promise<PyObject*>> barrier,
-            result* multi_result = nullptr)
+            result* multi_result = nullptr,
+            PyObject* pyObj_profiler = nullptr)
 {
     using response_type = typename Request::response_type;
+    if (pyObj_profiler == nullptr) {
+        Py_BEGIN_ALLOW_THREADS conn.cluster_->execute(
+          req, [key = req.id.key(), pyObj_callback, pyObj_errback, barrier, multi_result](response_type resp) {
+              create_result_from_mutation_operation_response(key.c_str(), resp, pyObj_callback, pyObj_errback, barrier, multi_result);
+          });
+        Py_END_ALLOW_THREADS
+        return;
+    }
+
+    Py_INCREF(pyObj_profiler);
+    auto dispatched = std::chrono::steady_clock::now();
     Py_BEGIN_ALLOW_THREADS conn.cluster_->execute(
-      req, [key = req.id.key(), pyObj_callback, pyObj_errback, barrier, multi_result](response_type resp) {
+      req,
+      [key = req.id.key(), pyObj_callback, pyObj_errback, barrier, multi_result, pyObj_profiler, dispatched](response_type resp) {
+          auto completed = std::chrono::steady_clock::now();
+          PyGILState_STATE state = PyGILState_Ensure();
+          record_native_timings(pyObj_profiler, dispatched, completed, std::chrono::steady_clock::now());
+          Py_DECREF(pyObj_profiler);
           create_result_from_mutation_operation_response(key.c_str(), resp, pyObj_callback, pyObj_errback, barrier, multi_result);
+          PyGILState_Release(state);
       });
     Py_END_ALLOW_THREADS
 }
@@ -809,11 +1071,11 @@ prepare_and_execute_mutation_op(struct mutation_options* options,
             if (options->use_legacy_durability) {
                 auto req_legacy_durability =
                   couchbase::core::operations::insert_request_with_legacy_durability{ req, options->persist_to, options->replicate_to };
-                do_mutation(*(options->conn), req_legacy_durability, pyObj_callback, pyObj_errback, barrier, multi_result);
+                do_mutation(*(options->conn), req_legacy_durability, pyObj_callback, pyObj_errback, barrier, multi_result, options->profiler);
                 break;
             }
             req.durability_level = options->durability_level;
-            do_mutation(*(options->conn), req, pyObj_callback, pyObj_errback, barrier, multi_result);
+            do_mutation(*(options->conn), req, pyObj_callback, pyObj_errback, barrier, multi_result, options->profiler);
             break;
         }
         case Operations::UPSERT: {
@@ -833,11 +1095,11 @@ prepare_and_execute_mutation_op(struct mutation_options* options,
             if (options->use_legacy_durability) {
                 auto req_legacy_durability =
                   couchbase::core::operations::upsert_request_with_legacy_durability{ req, options->persist_to, options->replicate_to };
-                do_mutation(*(options->conn), req_legacy_durability, pyObj_callback, pyObj_errback, barrier, multi_result);
+                do_mutation(*(options->conn), req_legacy_durability, pyObj_callback, pyObj_errback, barrier, multi_result, options->profiler);
                 break;
             }
             req.durability_level = options->durability_level;
-            do_mutation(*(options->conn), req, pyObj_callback, pyObj_errback, barrier, multi_result);
+            do_mutation(*(options->conn), req, pyObj_callback, pyObj_errback, barrier, multi_result, options->profiler);
             break;
         }
         case Operations::REPLACE: {
@@ -858,11 +1120,11 @@ prepare_and_execute_mutation_op(struct mutation_options* options,
             if (options->use_legacy_durability) {
                 auto req_legacy_durability =
                   couchbase::core::operations::replace_request_with_legacy_durability{ req, options->persist_to, options->replicate_to };
-                do_mutation(*(options->conn), req_legacy_durability, pyObj_callback, pyObj_errback, barrier, multi_result);
+                do_mutation(*(options->conn), req_legacy_durability, pyObj_callback, pyObj_errback, barrier, multi_result, options->profiler);
                 break;
             }
             req.durability_level = options->durability_level;
-            do_mutation(*(options->conn), req, pyObj_callback, pyObj_errback, barrier, multi_result);
+            do_mutation(*(options->conn), req, pyObj_callback, pyObj_errback, barrier, multi_result, options->profiler);
             break;
         }
         case Operations::REMOVE: {
@@ -875,11 +1137,11 @@ prepare_and_execute_mutation_op(struct mutation_options* options,
             if (options->use_legacy_durability) {
                 auto req_legacy_durability =
                   couchbase::core::operations::remove_request_with_legacy_durability{ req, options->persist_to, options->replicate_to };
-                do_mutation(*(options->conn), req_legacy_durability, pyObj_callback, pyObj_errback, barrier, multi_result);
+                do_mutation(*(options->conn), req_legacy_durability, pyObj_callback, pyObj_errback, barrier, multi_result, options->profiler);
                 break;
             }
             req.durability_level = options->durability_level;
-            do_mutation(*(options->conn), req, pyObj_callback, pyObj_errback, barrier, multi_result);
+            do_mutation(*(options->conn), req, pyObj_callback, pyObj_errback, barrier, multi_result, options->profiler);
             break;
         }
         default: {
@@ -915,6 +1177,11 @@ get_read_options(PyObject* op_args)
     struct read_options opts {
     };
 
+    PyObject* pyObj_profiler = PyDict_GetItemString(op_args, "profiler");
+    if (pyObj_profiler != nullptr && pyObj_profiler != Py_None) {
+        opts.profiler = pyObj_profiler;
+    }
+
     PyObject* pyObj_span = PyDict_GetItemString(op_args, "span");
     if (pyObj_span != nullptr) {
         opts.span = pyObj_span;
@@ -955,6 +1222,21 @@ get_read_options(PyObject* op_args)
     PyObject* pyObj_with_expiry = PyDict_GetItemString(op_args, "with_expiry");
     opts.with_expiry = pyObj_with_expiry != nullptr && pyObj_with_expiry == Py_True ? true : false;
 
+    PyObject* pyObj_max_responses = PyDict_GetItemString(op_args, "max_responses");
+    if (pyObj_max_responses != nullptr) {
+        opts.max_responses = static_cast<std::size_t>(PyLong_AsUnsignedLong(pyObj_max_responses));
+    }
+
+    PyObject* pyObj_replica_index = PyDict_GetItemString(op_args, "replica_index");
+    if (pyObj_replica_index != nullptr) {
+        opts.replica_index = static_cast<std::size_t>(PyLong_AsUnsignedLong(pyObj_replica_index));
+    }
+
+    PyObject* pyObj_quorum = PyDict_GetItemString(op_args, "quorum");
+    if (pyObj_quorum != nullptr) {
+        opts.quorum = static_cast<std::size_t>(PyLong_AsUnsignedLong(pyObj_quorum));
+    }
+
     return opts;
 }
 
@@ -963,6 +1245,11 @@ get_mutation_options(PyObject* op_args)
 {
     struct mutation_options opts;
 
+    PyObject* pyObj_profiler = PyDict_GetItemString(op_args, "profiler");
+    if (pyObj_profiler != nullptr && pyObj_profiler != Py_None) {
+        opts.profiler = pyObj_profiler;
+    }
+
     PyObject* pyObj_span = PyDict_GetItemString(op_args, "span");
     if (pyObj_span != nullptr) {
         opts.span = pyObj_span;
@@ -1080,6 +1367,10 @@ handle_kv_op([[maybe_unused]] PyObject* self, PyObject* args, PyObject* kwargs)
             auto opts = get_mutation_options(pyObj_op_args);
             opts.conn = conn;
             opts.id = couchbase::core::document_id{ bucket, scope, collection, key };
+            if (!conn->external_tracer_) {
+                // fast path:  w/o a Python tracer there is no need to wrap the provided parent span
+                opts.span = nullptr;
+            }
             opts.op_type = op_type;
             if (pyObj_value != nullptr) {
                 opts.value = pyObj_value;
@@ -1109,6 +1400,10 @@ handle_kv_op([[maybe_unused]] PyObject* self, PyObject* args, PyObject* kwargs)
             auto opts = get_read_options(pyObj_op_args);
             opts.conn = conn;
             opts.id = couchbase::core::document_id{ bucket, scope, collection, key };
+            if (!conn->external_tracer_) {
+                // fast path:  w/o a Python tracer there is no need to wrap the provided parent span
+                opts.span = nullptr;
+            }
             PyObject* pyObj_project = PyDict_GetItemString(pyObj_op_args, "project");
             if (pyObj_project != nullptr || opts.with_expiry) {
                 op_type = Operations::GET_PROJECTED;
@@ -1205,6 +1500,12 @@ handle_kv_multi_op([[maybe_unused]] PyObject* self, PyObject* args, PyObject* kw
             auto f = barrier->get_future();
             if (PyDict_Check(pyObj_op_dict) && !k.empty()) {
                 PyObject* pyObj_value = PyDict_GetItemString(pyObj_op_dict, "value");
+                // routed by the key's hash when key-value operations are sharded across several connections
+                connection* key_conn = conn;
+                PyObject* pyObj_key_conn = PyDict_GetItemString(pyObj_op_dict, "conn");
+                if (pyObj_key_conn != nullptr && PyCapsule_IsValid(pyObj_key_conn, "conn_")) {
+                    key_conn = reinterpret_cast<connection*>(PyCapsule_GetPointer(pyObj_key_conn, "conn_"));
+                }
 
                 switch (op_type) {
                     case Operations::INSERT:
@@ -1212,7 +1513,7 @@ handle_kv_multi_op([[maybe_unused]] PyObject* self, PyObject* args, PyObject* kw
                     case Operations::REPLACE:
                     case Operations::REMOVE: {
                         auto opts = get_mutation_options(pyObj_op_dict);
-                        opts.conn = conn;
+                        opts.conn = key_conn;
                         opts.id = couchbase::core::document_id{ bucket, scope, collection, k };
                         opts.op_type = op_type;
                         if (pyObj_value != nullptr) {
@@ -1237,7 +1538,7 @@ handle_kv_multi_op([[maybe_unused]] PyObject* self, PyObject* args, PyObject* kw
                     case Operations::EXISTS:
                     case Operations::UNLOCK: {
                         auto opts = get_read_options(pyObj_op_dict);
-                        opts.conn = conn;
+                        opts.conn = key_conn;
                         opts.id = couchbase::core::document_id{ bucket, scope, collection, k };
                         PyObject* pyObj_project = PyDict_GetItemString(pyObj_op_dict, "project");
                         if (pyObj_project != nullptr || opts.with_expiry) {
@@ -26,6 +26,7 @@
 #include <couchbase/upsert_options.hxx>
 #include <couchbase/persist_to.hxx>
 #include <couchbase/replicate_to.hxx>
+#include <optional>
 
 /**
  * GET, GET_PROJECTED, GET_AND_LOCK, GET_AND_TOUCH
@@ -47,6 +48,16 @@ struct read_options {
     couchbase::cas cas;
     PyObject* span{ nullptr };
     PyObject* project{ nullptr };
+    PyObject* profiler{ nullptr };
+
+    // optional: GET_ALL_REPLICAS, complete once max_responses copies responded or, for a quorum read, once quorum
+    // copies returned the same CAS (0: a majority of the document's copies)
+    std::size_t max_responses{ 0 };
+    std::optional<std::size_t> quorum{};
+
+    // optional: GET_ANY_REPLICA, read only the replica at this index (taken modulo the bucket's replica count)
+    // rather than the active and every replica
+    std::size_t replica_index{ 0 };
 
     // TODO:
     // retries?
@@ -71,6 +82,7 @@ struct mutation_options {
     uint32_t expiry{ 0 };
     std::chrono::milliseconds timeout_ms = couchbase::core::timeout_defaults::key_value_timeout;
     PyObject* span = nullptr;
+    PyObject* profiler = nullptr;
 
     // optional: REPLACE
     couchbase::cas cas;
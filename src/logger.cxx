@@ -15,14 +15,23 @@ pycbc_logger__configure_logging_sink__(PyObject* self, PyObject* args, PyObject*
     auto logger = reinterpret_cast<pycbc_logger*>(self);
     PyObject* pyObj_logger = nullptr;
     PyObject* pyObj_level = nullptr;
-    const char* kw_list[] = { "logger", "level", nullptr };
-    const char* kw_format = "OO";
-    if (!PyArg_ParseTupleAndKeywords(args, kwargs, kw_format, const_cast<char**>(kw_list), &pyObj_logger, &pyObj_level)) {
+    int async_sink = 0;
+    Py_ssize_t queue_size = 8192;
+    const char* kw_list[] = { "logger", "level", "async_sink", "queue_size", nullptr };
+    const char* kw_format = "OO|in";
+    if (!PyArg_ParseTupleAndKeywords(
+          args, kwargs, kw_format, const_cast<char**>(kw_list), &pyObj_logger, &pyObj_level, &async_sink, &queue_size)) {
         pycbc_set_python_exception(
           PycbcError::InvalidArgument, __FILE__, __LINE__, "Cannot set pycbc_logger sink.  Unable to parse args/kwargs.");
         return nullptr;
     }
 
+    if (queue_size <= 0) {
+        pycbc_set_python_exception(
+          PycbcError::InvalidArgument, __FILE__, __LINE__, "Cannot set pycbc_logger sink.  queue_size must be a positive value.");
+        return nullptr;
+    }
+
     if (couchbase::core::logger::is_initialized()) {
         pycbc_set_python_exception(PycbcError::UnsuccessfulOperation,
                                    __FILE__,
@@ -33,7 +42,12 @@ pycbc_logger__configure_logging_sink__(PyObject* self, PyObject* args, PyObject*
     }
 
     if (pyObj_logger != nullptr) {
-        logger->logger_sink_ = std::make_shared<pycbc_logger_sink>(pyObj_logger);
+        if (async_sink) {
+            logger->async_logger_sink_ = std::make_shared<pycbc_async_logger_sink>(pyObj_logger, static_cast<size_t>(queue_size));
+            logger->logger_sink_ = logger->async_logger_sink_;
+        } else {
+            logger->logger_sink_ = std::make_shared<pycbc_logger_sink>(pyObj_logger);
+        }
     }
 
     couchbase::core::logger::configuration logger_settings;
@@ -78,6 +92,62 @@ pycbc_logger__create_console_logger__(PyObject* self, PyObject* args, PyObject*
     Py_RETURN_NONE;
 }
 
+PyObject*
+pycbc_logger__drain_logging_sink__(PyObject* self, PyObject* args, PyObject* kwargs)
+{
+    auto logger = reinterpret_cast<pycbc_logger*>(self);
+    unsigned long long timeout_ms = 100;
+    Py_ssize_t max_batch = 512;
+    const char* kw_list[] = { "timeout_ms", "max_batch", nullptr };
+    const char* kw_format = "|Kn";
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, kw_format, const_cast<char**>(kw_list), &timeout_ms, &max_batch)) {
+        pycbc_set_python_exception(
+          PycbcError::InvalidArgument, __FILE__, __LINE__, "Cannot drain pycbc_logger sink.  Unable to parse args/kwargs.");
+        return nullptr;
+    }
+
+    // hold a reference, the sink could be replaced while we wait w/o the GIL
+    auto sink = logger->async_logger_sink_;
+    if (!sink || max_batch <= 0) {
+        return PyLong_FromSize_t(0);
+    }
+
+    std::vector<log_msg_copy> batch;
+    batch.reserve(static_cast<size_t>(max_batch));
+    Py_BEGIN_ALLOW_THREADS sink->wait_and_pop(batch, static_cast<size_t>(max_batch), std::chrono::milliseconds(timeout_ms));
+    Py_END_ALLOW_THREADS
+
+    if (!batch.empty() && 0 == _Py_IsFinalizing()) {
+        sink->dispatch(batch);
+    }
+    return PyLong_FromSize_t(batch.size());
+}
+
+PyObject*
+pycbc_logger__logging_sink_stats__(PyObject* self, PyObject* Py_UNUSED(ignored))
+{
+    auto logger = reinterpret_cast<pycbc_logger*>(self);
+    PyObject* pyObj_stats = PyDict_New();
+    auto sink = logger->async_logger_sink_;
+    if (!sink) {
+        return pyObj_stats;
+    }
+
+    const std::pair<const char*, size_t> stats[] = { { "capacity", sink->capacity() },
+                                                     { "queued", sink->queued() },
+                                                     { "delivered", sink->delivered() },
+                                                     { "dropped", sink->dropped() } };
+    for (const auto& [name, value] : stats) {
+        PyObject* pyObj_tmp = PyLong_FromSize_t(value);
+        if (-1 == PyDict_SetItemString(pyObj_stats, name, pyObj_tmp)) {
+            PyErr_Print();
+            PyErr_Clear();
+        }
+        Py_XDECREF(pyObj_tmp);
+    }
+    return pyObj_stats;
+}
+
 static PyMethodDef pycbc_logger_methods[] = { { "configure_logging_sink",
                                                 (PyCFunction)pycbc_logger__configure_logging_sink__,
                                                 METH_VARARGS | METH_KEYWORDS,
@@ -86,6 +156,14 @@ static PyMethodDef pycbc_logger_methods[] = { { "configure_logging_sink",
                                                 (PyCFunction)pycbc_logger__create_console_logger__,
                                                 METH_VARARGS | METH_KEYWORDS,
                                                 PyDoc_STR("Create a console logger") },
+                                              { "drain_logging_sink",
+                                                (PyCFunction)pycbc_logger__drain_logging_sink__,
+                                                METH_VARARGS | METH_KEYWORDS,
+                                                PyDoc_STR("Deliver buffered messages from the async logging sink") },
+                                              { "logging_sink_stats",
+                                                (PyCFunction)pycbc_logger__logging_sink_stats__,
+                                                METH_NOARGS,
+                                                PyDoc_STR("Get the async logging sink's counters") },
                                               { NULL } };
 
 static PyObject*
@@ -18,7 +18,13 @@
 #include "Python.h"
 #include <spdlog/sinks/base_sink.h>
 #include <spdlog/details/log_msg.h>
+#include <atomic>
+#include <condition_variable>
+#include <cstdint>
+#include <memory>
+#include <mutex>
 #include <queue>
+#include <vector>
 #include <core/logger/logger.hxx>
 #include <core/logger/configuration.hxx>
 #include <core/transactions.hxx>
@@ -30,11 +36,13 @@
 
 struct log_msg_copy {
     std::string logger_name;
-    spdlog::level::level_enum level;
+    spdlog::level::level_enum level{ spdlog::level::level_enum::off };
     std::chrono::system_clock::time_point time;
     spdlog::source_loc source;
     std::string payload;
 
+    log_msg_copy() = default;
+
     log_msg_copy(const spdlog::details::log_msg& msg)
     {
         logger_name = std::string(msg.logger_name.data(), msg.logger_name.size());
@@ -62,6 +70,9 @@ convert_python_log_level(PyObject* level);
 // loggers now.   This is probably the best solution, which we can do when we merge the txn lib
 // into the client lib.
 //
+// NOTE: pycbc_async_logger_sink (below) decouples the IO threads from the GIL by buffering messages
+// and letting a Python thread deliver them in batches.
+//
 class pycbc_logger_sink : public spdlog::sinks::sink
 {
   public:
@@ -87,7 +98,7 @@ class pycbc_logger_sink : public spdlog::sinks::sink
         }
     }
 
-    void log(const spdlog::details::log_msg& msg) final
+    void log(const spdlog::details::log_msg& msg) override
     {
         if (0 == _Py_IsFinalizing()) {
             log_it_(msg);
@@ -104,41 +115,46 @@ class pycbc_logger_sink : public spdlog::sinks::sink
     {
         PyGILState_STATE state = PyGILState_Ensure();
         try {
-
-            // static initialize the type and method once.   These 'leak' a single
-            // object, but that is fine.  Same for an empty tuple we will on each call.
-            static PyObject* pyObj_log_record_type = init_log_record_type();
-            static PyObject* pyObj_logger_handle_method = init_logger_handle_method();
-
-            // convert the log_msg_copy to a dict first...
-            auto pyObj_log_record_details = convert_log_msg(msg);
-
-            // now, create an actual LogRecord from it...
-            auto pyObj_log_record = PyObject_CallObject(pyObj_log_record_type, pyObj_log_record_details);
-            Py_DECREF(pyObj_log_record_details);
-            if (nullptr != pyObj_log_record) {
-                // we need to fixup the created time, which cannot be passed in the constructor...
-                // The created member is a float containing a float expressed as seconds since the epoch, in UTC.
-                PyObject* log_time = convert_time_to_float(msg.time);
-                PyObject_SetAttrString(pyObj_log_record, "created", log_time);
-                Py_DECREF(log_time);
-
-                // now, we want to hand this record to the logger...
-                PyObject* pyObj_args = PyTuple_Pack(1, pyObj_log_record);
-                PyObject_CallObject(pyObj_logger_handle_method, pyObj_args);
-
-                // that's it, now cleanup.
-                Py_DECREF(pyObj_log_record);
-                Py_DECREF(pyObj_args);
-            } else {
-                PyErr_Print();
-            }
+            emit_(msg);
             PyGILState_Release(state);
         } catch (...) {
             PyGILState_Release(state);
         }
     }
 
+    // hand a single message to the Python logger, the caller *must* hold the GIL
+    void emit_(const log_msg_copy& msg)
+    {
+        // static initialize the type and method once.   These 'leak' a single
+        // object, but that is fine.  Same for an empty tuple we will on each call.
+        static PyObject* pyObj_log_record_type = init_log_record_type();
+        static PyObject* pyObj_logger_handle_method = init_logger_handle_method();
+
+        // convert the log_msg_copy to a dict first...
+        auto pyObj_log_record_details = convert_log_msg(msg);
+
+        // now, create an actual LogRecord from it...
+        auto pyObj_log_record = PyObject_CallObject(pyObj_log_record_type, pyObj_log_record_details);
+        Py_DECREF(pyObj_log_record_details);
+        if (nullptr != pyObj_log_record) {
+            // we need to fixup the created time, which cannot be passed in the constructor...
+            // The created member is a float containing a float expressed as seconds since the epoch, in UTC.
+            PyObject* log_time = convert_time_to_float(msg.time);
+            PyObject_SetAttrString(pyObj_log_record, "created", log_time);
+            Py_DECREF(log_time);
+
+            // now, we want to hand this record to the logger...
+            PyObject* pyObj_args = PyTuple_Pack(1, pyObj_log_record);
+            PyObject_CallObject(pyObj_logger_handle_method, pyObj_args);
+
+            // that's it, now cleanup.
+            Py_DECREF(pyObj_log_record);
+            Py_DECREF(pyObj_args);
+        } else {
+            PyErr_Print();
+        }
+    }
+
     PyObject* convert_time_to_float(std::chrono::system_clock::time_point tm)
     {
         auto duration_us = std::chrono::duration_cast<std::chrono::microseconds>(tm.time_since_epoch());
@@ -216,8 +232,191 @@ class pycbc_logger_sink : public spdlog::sinks::sink
     PyObject* pyObj_logger_;
 };
 
+// Bounded, lock-free multi-producer/multi-consumer ring buffer (D. Vyukov's design).  Producers are the
+// cxx client's IO threads (and the txns threads), the consumer is the Python log drain thread.  Neither
+// side blocks the other; when the ring is full the producer drops the message.
+template<typename T>
+class bounded_log_queue
+{
+  public:
+    explicit bounded_log_queue(size_t capacity)
+    {
+        // capacity needs to be a power of 2 so we can mask instead of mod
+        size_t size = 2;
+        while (size < capacity) {
+            size <<= 1;
+        }
+        mask_ = size - 1;
+        buffer_ = std::unique_ptr<cell[]>(new cell[size]);
+        for (size_t i = 0; i < size; i++) {
+            buffer_[i].sequence.store(i, std::memory_order_relaxed);
+        }
+    }
+
+    bounded_log_queue(const bounded_log_queue&) = delete;
+    bounded_log_queue& operator=(const bounded_log_queue&) = delete;
+
+    bool try_push(T&& data)
+    {
+        cell* c;
+        size_t pos = enqueue_pos_.load(std::memory_order_relaxed);
+        for (;;) {
+            c = &buffer_[pos & mask_];
+            size_t seq = c->sequence.load(std::memory_order_acquire);
+            auto diff = static_cast<std::intptr_t>(seq) - static_cast<std::intptr_t>(pos);
+            if (diff == 0) {
+                if (enqueue_pos_.compare_exchange_weak(pos, pos + 1, std::memory_order_relaxed)) {
+                    break;
+                }
+            } else if (diff < 0) {
+                // full
+                return false;
+            } else {
+                pos = enqueue_pos_.load(std::memory_order_relaxed);
+            }
+        }
+        c->data = std::move(data);
+        c->sequence.store(pos + 1, std::memory_order_release);
+        return true;
+    }
+
+    bool try_pop(T& data)
+    {
+        cell* c;
+        size_t pos = dequeue_pos_.load(std::memory_order_relaxed);
+        for (;;) {
+            c = &buffer_[pos & mask_];
+            size_t seq = c->sequence.load(std::memory_order_acquire);
+            auto diff = static_cast<std::intptr_t>(seq) - static_cast<std::intptr_t>(pos + 1);
+            if (diff == 0) {
+                if (dequeue_pos_.compare_exchange_weak(pos, pos + 1, std::memory_order_relaxed)) {
+                    break;
+                }
+            } else if (diff < 0) {
+                // empty
+                return false;
+            } else {
+                pos = dequeue_pos_.load(std::memory_order_relaxed);
+            }
+        }
+        data = std::move(c->data);
+        c->sequence.store(pos + mask_ + 1, std::memory_order_release);
+        return true;
+    }
+
+    size_t capacity() const
+    {
+        return mask_ + 1;
+    }
+
+    size_t size_approx() const
+    {
+        auto enq = enqueue_pos_.load(std::memory_order_relaxed);
+        auto deq = dequeue_pos_.load(std::memory_order_relaxed);
+        return enq > deq ? enq - deq : 0;
+    }
+
+  private:
+    struct cell {
+        std::atomic<size_t> sequence;
+        T data;
+    };
+
+    std::unique_ptr<cell[]> buffer_;
+    size_t mask_;
+    alignas(64) std::atomic<size_t> enqueue_pos_{ 0 };
+    alignas(64) std::atomic<size_t> dequeue_pos_{ 0 };
+};
+
+// Asynchronous variant of the pycbc_logger_sink.  log() only copies the message into a bounded ring buffer
+// and *never* takes the GIL, so the IO threads are not serialized on the GIL when debug/trace logging is
+// enabled.  A Python thread drains the ring in batches (see drain()), converting messages to LogRecords
+// while holding the GIL once per batch.  If the ring is full, the message is dropped and counted.
+class pycbc_async_logger_sink : public pycbc_logger_sink
+{
+  public:
+    pycbc_async_logger_sink(PyObject* pyObj_logger, size_t capacity)
+      : pycbc_logger_sink(pyObj_logger)
+      , queue_(capacity)
+    {
+    }
+
+    void log(const spdlog::details::log_msg& msg) final
+    {
+        if (!queue_.try_push(log_msg_copy(msg))) {
+            dropped_.fetch_add(1, std::memory_order_relaxed);
+            return;
+        }
+        if (waiting_.load(std::memory_order_acquire)) {
+            cv_.notify_one();
+        }
+    }
+
+    // Wait (w/o the GIL) for messages to become available and pop up to max_batch of them.
+    size_t wait_and_pop(std::vector<log_msg_copy>& batch, size_t max_batch, std::chrono::milliseconds timeout)
+    {
+        log_msg_copy msg;
+        if (!queue_.try_pop(msg)) {
+            if (timeout.count() == 0) {
+                return 0;
+            }
+            std::unique_lock<std::mutex> lock(mutex_);
+            waiting_.store(true, std::memory_order_release);
+            // producers notify w/o holding the lock, so a wakeup can be missed; the timeout bounds that delay
+            auto popped = cv_.wait_for(lock, timeout, [this, &msg]() { return queue_.try_pop(msg); });
+            waiting_.store(false, std::memory_order_release);
+            if (!popped) {
+                return 0;
+            }
+        }
+        batch.emplace_back(std::move(msg));
+        while (batch.size() < max_batch && queue_.try_pop(msg)) {
+            batch.emplace_back(std::move(msg));
+        }
+        return batch.size();
+    }
+
+    // dispatch a batch of messages to the Python logger, the caller *must* hold the GIL
+    void dispatch(const std::vector<log_msg_copy>& batch)
+    {
+        for (const auto& msg : batch) {
+            emit_(msg);
+        }
+        delivered_.fetch_add(batch.size(), std::memory_order_relaxed);
+    }
+
+    size_t capacity() const
+    {
+        return queue_.capacity();
+    }
+
+    size_t queued() const
+    {
+        return queue_.size_approx();
+    }
+
+    size_t dropped() const
+    {
+        return dropped_.load(std::memory_order_relaxed);
+    }
+
+    size_t delivered() const
+    {
+        return delivered_.load(std::memory_order_relaxed);
+    }
+
+  private:
+    bounded_log_queue<log_msg_copy> queue_;
+    std::atomic<size_t> dropped_{ 0 };
+    std::atomic<size_t> delivered_{ 0 };
+    std::atomic<bool> waiting_{ false };
+    std::mutex mutex_;
+    std::condition_variable cv_;
+};
+
 struct pycbc_logger {
     PyObject_HEAD std::shared_ptr<pycbc_logger_sink> logger_sink_;
+    std::shared_ptr<pycbc_async_logger_sink> async_logger_sink_;
 };
 
 int
@@ -25,6 +25,8 @@ from couchbase.logic.analytics import AnalyticsRequestLogic
 
 
 class AnalyticsRequest(AnalyticsRequestLogic):
+    _WAIT_FOR_RATE_LIMITER = False
+
     def __init__(self,
                  connection,
                  loop,
@@ -240,7 +240,8 @@ class Cluster(ClusterLogic):
         request = N1QLRequest.generate_n1ql_request(self.connection,
                                                     self.loop,
                                                     query.params,
-                                                    default_serializer=self.default_serializer)
+                                                    default_serializer=self.default_serializer,
+                                                    rate_limiter=self.rate_limiter)
         d = Deferred()
 
         def _on_ok(_):
@@ -266,7 +267,8 @@ class Cluster(ClusterLogic):
         request = AnalyticsRequest.generate_analytics_request(self.connection,
                                                               self.loop,
                                                               query.params,
-                                                              default_serializer=self.default_serializer)
+                                                              default_serializer=self.default_serializer,
+                                                              rate_limiter=self.rate_limiter)
         d = Deferred()
 
         def _on_ok(_):
@@ -293,7 +295,8 @@ class Cluster(ClusterLogic):
         request = SearchRequest.generate_search_request(self.connection,
                                                         self.loop,
                                                         query.as_encodable(),
-                                                        default_serializer=self.default_serializer)
+                                                        default_serializer=self.default_serializer,
+                                                        rate_limiter=self.rate_limiter)
         d = Deferred()
 
         def _on_ok(_):
@@ -25,6 +25,8 @@ from couchbase.logic.n1ql import QueryRequestLogic
 
 
 class N1QLRequest(QueryRequestLogic):
+    _WAIT_FOR_RATE_LIMITER = False
+
     def __init__(self,
                  connection,
                  loop,
@@ -23,9 +23,11 @@ from twisted.internet.defer import Deferred
 from couchbase.logic.analytics import AnalyticsQuery
 from couchbase.logic.n1ql import N1QLQuery
 from couchbase.logic.search import SearchQueryBuilder
+from couchbase.rate_limiter import ClientRateLimiter
 from couchbase.result import (AnalyticsResult,
                               QueryResult,
                               SearchResult)
+from couchbase.retry import RetryStrategy
 from couchbase.transcoder import Transcoder
 from txcouchbase.analytics import AnalyticsRequest
 from txcouchbase.collection import Collection
@@ -65,6 +67,27 @@ class Scope:
     def default_transcoder(self) -> Optional[Transcoder]:
         return self._bucket.default_transcoder
 
+    @property
+    def rate_limiter(self) -> Optional[ClientRateLimiter]:
+        """
+        **INTERNAL**
+        """
+        return self._bucket.rate_limiter
+
+    @property
+    def retry_strategy(self) -> Optional[RetryStrategy]:
+        """
+        **INTERNAL**
+        """
+        return self._bucket.retry_strategy
+
+    @property
+    def kv_timeout(self) -> float:
+        """
+        **INTERNAL**
+        """
+        return self._bucket.kv_timeout
+
     @property
     def name(self):
         return self._scope_name
@@ -101,7 +124,8 @@ class Scope:
         request = N1QLRequest.generate_n1ql_request(self.connection,
                                                     self.loop,
                                                     query.params,
-                                                    default_serializer=self.default_serializer)
+                                                    default_serializer=self.default_serializer,
+                                                    rate_limiter=self.rate_limiter)
         d = Deferred()
 
         def _on_ok(_):
@@ -138,7 +162,8 @@ class Scope:
         request = AnalyticsRequest.generate_analytics_request(self.connection,
                                                               self.loop,
                                                               query.params,
-                                                              default_serializer=self.default_serializer)
+                                                              default_serializer=self.default_serializer,
+                                                              rate_limiter=self.rate_limiter)
         d = Deferred()
 
         def _on_ok(_):
@@ -177,7 +202,8 @@ class Scope:
         request = SearchRequest.generate_search_request(self.connection,
                                                         self.loop,
                                                         query.as_encodable(),
-                                                        default_serializer=self.default_serializer)
+                                                        default_serializer=self.default_serializer,
+                                                        rate_limiter=self.rate_limiter)
         d = Deferred()
 
         def _on_ok(_):
@@ -25,6 +25,8 @@ from couchbase.logic.search import SearchRequestLogic
 
 
 class SearchRequest(SearchRequestLogic):
+    _WAIT_FOR_RATE_LIMITER = False
+
     def __init__(self,
                  connection,
                  loop,